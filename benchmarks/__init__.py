@@ -0,0 +1,24 @@
+"""
+Benchmarks of the trigger conversion on generated triggers.
+
+- generator.py: synthetic Oracle triggers with a tunable shape (`TriggerSpec`)
+- suite.py: timings and peak memory of the analyzer, the renderers, the
+  PL/JSON split and the whole pipeline, compared against baseline.json
+- __main__.py: `python -m benchmarks` (see `--help`)
+"""
+
+from benchmarks.generator import TriggerSpec, generate_corpus, generate_trigger, write_corpus
+from benchmarks.suite import CASES, compare_to_baseline, load_baseline, log_results, run_suite, save_baseline
+
+__all__ = [
+    "CASES",
+    "TriggerSpec",
+    "compare_to_baseline",
+    "generate_corpus",
+    "generate_trigger",
+    "load_baseline",
+    "log_results",
+    "run_suite",
+    "save_baseline",
+    "write_corpus",
+]
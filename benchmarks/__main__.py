@@ -0,0 +1,115 @@
+"""
+Command line of the benchmark suite.
+
+Run from the repository root, so the mapping workbook is found:
+
+    python -m benchmarks                     # run and compare with benchmarks/baseline.json
+    python -m benchmarks --save-baseline     # run and record the baseline
+    python -m benchmarks --cases analyze,split --lines 2000 --depth 8 --baseline /tmp/deep.json
+    python -m benchmarks --write-corpus files/oracle --files 50
+
+The exit status is 1 when a case regressed beyond the thresholds and 2 when the
+baseline was recorded on a different corpus.
+"""
+
+import argparse
+import sys
+
+from benchmarks.generator import TriggerSpec, write_corpus
+from benchmarks.suite import (
+    BASELINE_PATH,
+    CASES,
+    DEFAULT_MEMORY_THRESHOLD,
+    DEFAULT_TIME_THRESHOLD,
+    compare_to_baseline,
+    load_baseline,
+    log_results,
+    run_suite,
+    save_baseline,
+)
+from utilities.common import error, info, setup_logging, warning
+
+
+def main(argv=None) -> int:
+    defaults = TriggerSpec()
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmark trigger parsing, rendering and splitting on generated triggers.")
+    parser.add_argument("--files", type=int, default=10, help="number of generated triggers (default: 10)")
+    parser.add_argument("--lines", type=int, default=defaults.lines, help=f"source lines per trigger (default: {defaults.lines})")
+    parser.add_argument("--depth", type=int, default=defaults.max_depth, help=f"maximum block nesting depth (default: {defaults.max_depth})")
+    parser.add_argument(
+        "--mix",
+        default=f"{defaults.if_weight},{defaults.case_weight},{defaults.for_weight},{defaults.begin_weight}",
+        help="weights of IF,CASE,FOR,BEGIN blocks (default: %(default)s)",
+    )
+    parser.add_argument("--block-ratio", type=float, default=defaults.block_ratio, help="share of statements that open a block (default: %(default)s)")
+    parser.add_argument("--call-ratio", type=float, default=defaults.call_ratio, help="share of simple statements that are function_list calls (default: %(default)s)")
+    parser.add_argument(
+        "--operation-ratio",
+        type=float,
+        default=defaults.operation_ratio,
+        help="share of conditions testing INSERTING/UPDATING/DELETING (default: %(default)s)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first trigger (default: 0)")
+    parser.add_argument("--cases", default=",".join(CASES), help="comma-separated cases to run (default: %(default)s)")
+    parser.add_argument("--render-cache", action="store_true", help="run the render and split cases with FormatSQL's render cache")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case; the fastest is kept (default: 3)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline results JSON (default: benchmarks/baseline.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results to --baseline instead of comparing")
+    parser.add_argument("--output", metavar="PATH", help="also write the results JSON to PATH")
+    parser.add_argument("--time-threshold", type=float, default=DEFAULT_TIME_THRESHOLD, help="allowed relative growth of seconds (default: %(default)s)")
+    parser.add_argument("--memory-threshold", type=float, default=DEFAULT_MEMORY_THRESHOLD, help="allowed relative growth of peak memory (default: %(default)s)")
+    parser.add_argument("--write-corpus", metavar="DIR", help="only write the generated triggers to DIR")
+    args = parser.parse_args(argv)
+
+    try:
+        if_weight, case_weight, for_weight, begin_weight = (float(weight) for weight in args.mix.split(","))
+    except ValueError:
+        parser.error("--mix needs four comma-separated numbers")
+    spec = TriggerSpec(
+        lines=args.lines,
+        max_depth=args.depth,
+        if_weight=if_weight,
+        case_weight=case_weight,
+        for_weight=for_weight,
+        begin_weight=begin_weight,
+        block_ratio=args.block_ratio,
+        call_ratio=args.call_ratio,
+        operation_ratio=args.operation_ratio,
+    )
+    setup_logging(profile="production")
+
+    if args.write_corpus:
+        paths = write_corpus(args.write_corpus, spec, args.files, args.seed)
+        info("Wrote %d triggers to %s", len(paths), args.write_corpus)
+        return 0
+
+    cases = [case.strip() for case in args.cases.split(",") if case.strip()]
+    results = run_suite(spec, files=args.files, seed=args.seed, cases=cases, repeat=args.repeat, render_cache=args.render_cache)
+    if args.output:
+        save_baseline(results, args.output)
+    if args.save_baseline:
+        log_results(results)
+        save_baseline(results, args.baseline)
+        info("Baseline written to %s", args.baseline)
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    log_results(results, baseline if baseline is not None and baseline.get("corpus") == results["corpus"] else None)
+    if baseline is None:
+        warning("No baseline at %s; run with --save-baseline to record one", args.baseline)
+        return 0
+    try:
+        regressions = compare_to_baseline(results, baseline, args.time_threshold, args.memory_threshold)
+    except ValueError as e:
+        error("%s", str(e))
+        return 2
+    for regression in regressions:
+        warning("Regression: %s", regression)
+    if regressions:
+        return 1
+    info("No regression against %s", args.baseline)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
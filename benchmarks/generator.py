@@ -0,0 +1,278 @@
+"""
+Synthetic Oracle trigger bodies for the benchmark suite.
+
+The sample triggers under files/oracle are too few and too small to show
+whether a change made conversion faster or slower. This generator writes
+trigger bodies in the layout OracleTriggerAnalyzer expects (DECLARE,
+BEGIN ... EXCEPTION ... END; four spaces per level). The knobs of
+`TriggerSpec` set the shape:
+
+- `lines`: source lines per trigger. Every statement and block gets the
+  lines left before the EXCEPTION section as its budget, and a block whose
+  budget runs low closes early, so a trigger ends at `lines` unless its
+  declarations alone are longer
+- `max_depth`: nesting depth of IF / CASE / FOR / BEGIN blocks
+- `if_weight`, `case_weight`, `for_weight`, `begin_weight`: mix of block kinds
+- `block_ratio`: share of statements that open a block (while depth allows)
+- `call_ratio`: share of simple statements that call a procedure from the
+  "function_list" sheet (or `functions`)
+- `operation_ratio`: share of IF conditions testing INSERTING / UPDATING /
+  DELETING, which JSONTOPLJSON splits on
+
+Output depends only on the spec and the seed.
+
+Usage:
+    spec = TriggerSpec(lines=800, max_depth=6)
+    text = generate_trigger(spec, seed=1)
+    paths = write_corpus("files/oracle", spec, count=20)
+"""
+
+import os
+import random
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+from utilities.mapping_store import MappingStore
+
+INDENT = "    "
+# Used when the "function_list" sheet is missing or empty
+FALLBACK_FUNCTIONS = ("RAISE_APPLICATION_ERROR", "DBMS_OUTPUT.PUT_LINE", "TXO_UTIL.SET_WARNING")
+OPERATION_CONDITIONS = (
+    "INSERTING",
+    "UPDATING",
+    "DELETING",
+    "INSERTING OR UPDATING",
+    "UPDATING AND :OLD.STATUS_CD <> :NEW.STATUS_CD",
+    "UPDATING OR DELETING",
+)
+VALUE_CONDITIONS = (
+    ":NEW.STATUS_CD = 'A'",
+    "NVL(:OLD.ACTIVE_FLAG, 'N') = 'Y'",
+    ":NEW.COMPANY_ID IS NOT NULL",
+    "v_cntr > 2",
+    "v_status IN ('D', 'A')",
+    "NVL(txo_util.get_userid, 'GENERIC') = 'GENERIC'",
+)
+# Lines of the longest plain statement (a multi-line call or SELECT INTO)
+MAX_STATEMENT_LINES = 4
+# Lines of the smallest block: CASE, WHEN, one statement, END CASE;
+MIN_BLOCK_LINES = 4
+COLUMNS = ("REQUEST_ID", "COMPANY_ID", "STATUS_CD", "CODE", "LAST_UPDATE", "COMMENT_NEW")
+
+
+@dataclass(frozen=True)
+class TriggerSpec:
+    """Shape of the generated triggers (see the module docstring)."""
+
+    lines: int = 400
+    max_depth: int = 4
+    if_weight: float = 0.5
+    case_weight: float = 0.2
+    for_weight: float = 0.2
+    begin_weight: float = 0.1
+    block_ratio: float = 0.3
+    call_ratio: float = 0.3
+    operation_ratio: float = 0.3
+    variables: int = 6
+    exceptions: int = 3
+    functions: Optional[Tuple[str, ...]] = None
+
+
+def function_names(spec: TriggerSpec) -> Tuple[str, ...]:
+    """Return the procedure names calls are drawn from: spec.functions, else the "function_list" sheet."""
+    if spec.functions:
+        return tuple(spec.functions)
+    try:
+        names = tuple(str(name) for name in MappingStore.column("function_list", "function_name") if str(name).strip())
+    except Exception:
+        names = ()
+    return names or FALLBACK_FUNCTIONS
+
+
+class _TriggerWriter:
+    """Builds the lines of one trigger."""
+
+    def __init__(self, spec: TriggerSpec, rng: random.Random, functions: Sequence[str]):
+        self.spec = spec
+        self.rng = rng
+        self.functions = functions
+        self.lines: List[str] = []
+        self.block_kinds = ("if", "case", "for", "begin")
+        self.block_weights = (spec.if_weight, spec.case_weight, spec.for_weight, spec.begin_weight)
+
+    def emit(self, depth: int, text: str) -> None:
+        self.lines.append(INDENT * depth + text)
+
+    def condition(self) -> str:
+        if self.rng.random() < self.spec.operation_ratio:
+            return self.rng.choice(OPERATION_CONDITIONS)
+        return self.rng.choice(VALUE_CONDITIONS)
+
+    def room(self, end: int) -> int:
+        """Return the lines left before line `end`."""
+        return end - len(self.lines)
+
+    def body(self, depth: int, level: int, end: int) -> None:
+        """Write 1-4 statements at `depth`, ending by line `end`; `level` is the block nesting depth."""
+        for index in range(self.rng.randint(1, 4)):
+            if index and self.room(end) < 1:
+                break
+            self.statement(depth, level, end)
+
+    def statement(self, depth: int, level: int, end: int) -> None:
+        """Write one statement or block ending by line `end` (at least one line must be left)."""
+        room = self.room(end)
+        if (
+            room >= MIN_BLOCK_LINES
+            and level < self.spec.max_depth
+            and sum(self.block_weights) > 0
+            and self.rng.random() < self.spec.block_ratio
+        ):
+            kind = self.rng.choices(self.block_kinds, weights=self.block_weights)[0]
+            getattr(self, f"_{kind}_block")(depth, level + 1, end)
+        elif room < MAX_STATEMENT_LINES:
+            self.emit(depth, "v_cntr := v_cntr + 1;")
+        elif self.rng.random() < self.spec.call_ratio:
+            self.call(depth)
+        else:
+            self.simple(depth)
+
+    def _if_block(self, depth: int, level: int, end: int) -> None:
+        # The last line is kept for END IF;
+        self.emit(depth, f"IF {self.condition()} THEN")
+        self.body(depth + 1, level, end - 1)
+        for _ in range(self.rng.choice((0, 0, 1, 2))):
+            if self.room(end - 1) < 2:
+                break
+            self.emit(depth, f"ELSIF {self.condition()} THEN")
+            self.body(depth + 1, level, end - 1)
+        if self.rng.random() < 0.5 and self.room(end - 1) >= 2:
+            self.emit(depth, "ELSE")
+            self.body(depth + 1, level, end - 1)
+        self.emit(depth, "END IF;")
+
+    def _case_block(self, depth: int, level: int, end: int) -> None:
+        self.emit(depth, "CASE")
+        for index in range(self.rng.randint(1, 3)):
+            if index and self.room(end - 1) < 2:
+                break
+            self.emit(depth + 1, f"WHEN {self.condition()} THEN")
+            self.body(depth + 2, level, end - 1)
+        if self.rng.random() < 0.6 and self.room(end - 1) >= 2:
+            self.emit(depth + 1, "ELSE")
+            self.body(depth + 2, level, end - 1)
+        self.emit(depth, "END CASE;")
+
+    def _for_block(self, depth: int, level: int, end: int) -> None:
+        column = self.rng.choice(COLUMNS)
+        self.emit(depth, f"FOR rec IN (SELECT {column.lower()} FROM mdm_companies WHERE {column.lower()} = :NEW.{column}) LOOP")
+        self.body(depth + 1, level, end - 1)
+        self.emit(depth, "END LOOP;")
+
+    def _begin_block(self, depth: int, level: int, end: int) -> None:
+        self.emit(depth, "BEGIN")
+        self.body(depth + 1, level, end - 1)
+        if self.rng.random() < 0.5 and self.room(end - 1) >= 3:
+            self.emit(depth, "EXCEPTION")
+            self.emit(depth + 1, "WHEN OTHERS THEN")
+            self.body(depth + 2, level, end - 1)
+        self.emit(depth, "END;")
+
+    def call(self, depth: int) -> None:
+        name = self.rng.choice(self.functions)
+        column = self.rng.choice(COLUMNS)
+        if self.rng.random() < 0.5:
+            self.emit(depth, f"{name}(:NEW.{column}, '{column.lower()}');")
+        else:
+            self.emit(depth, f"{name}(")
+            self.emit(depth + 1, f"p_id => :NEW.{column},")
+            self.emit(depth + 1, f"p_old => :OLD.{column}")
+            self.emit(depth, ");")
+
+    def simple(self, depth: int) -> None:
+        column = self.rng.choice(COLUMNS)
+        kind = self.rng.randrange(7)
+        if kind == 0:
+            self.emit(depth, f"v_{self.rng.randrange(self.spec.variables)} := NVL(:NEW.{column}, :OLD.{column});")
+        elif kind == 1:
+            self.emit(depth, f"SELECT :NEW.{column}")
+            self.emit(depth + 3, f",:NEW.{self.rng.choice(COLUMNS)}")
+            self.emit(depth, f"INTO v_{self.rng.randrange(self.spec.variables)}, v_status")
+            self.emit(depth, "FROM DUAL;")
+        elif kind == 2:
+            self.emit(depth, "INSERT INTO mdm_audit_log (request_id, status_cd)")
+            self.emit(depth, f"VALUES (:NEW.REQUEST_ID, :NEW.{column});")
+        elif kind == 3:
+            self.emit(depth, f"UPDATE mdm_companies SET {column.lower()} = :NEW.{column}")
+            self.emit(depth, "WHERE company_id = :OLD.COMPANY_ID;")
+        elif kind == 4:
+            self.emit(depth, "DELETE FROM mdm_company_links WHERE company_id = :OLD.COMPANY_ID;")
+        elif kind == 5 and self.spec.exceptions:
+            self.emit(depth, f"RAISE err_{self.rng.randrange(self.spec.exceptions)};")
+        else:
+            self.emit(depth, "v_cntr := v_cntr + 1;")
+
+    def trigger(self) -> str:
+        spec = self.spec
+        self.lines.append("DECLARE")
+        self.emit(1, "v_cntr    PLS_INTEGER := 0;")
+        self.emit(1, "v_status  VARCHAR2(10);")
+        for index in range(spec.variables):
+            self.emit(1, f"v_{index}    VARCHAR2(100);")
+        self.emit(1, "c_max_rows CONSTANT PLS_INTEGER := 100;")
+        for index in range(spec.exceptions):
+            self.emit(1, f"err_{index}   EXCEPTION;")
+        self.lines.append("BEGIN")
+        # Keep room for the exception section and END; (and write at least one statement)
+        end = spec.lines - 1 - (1 + 2 * spec.exceptions if spec.exceptions else 0)
+        end = max(end, len(self.lines) + 1)
+        while len(self.lines) < end:
+            self.statement(1, 0, end)
+        if spec.exceptions:
+            self.lines.append("EXCEPTION")
+            for index in range(spec.exceptions):
+                self.emit(1, f"WHEN err_{index} THEN")
+                self.emit(2, f"raise_application_error (-{20100 + index}, 'BENCHMARK_TRIGGER_{index}');")
+        self.lines.append("END;")
+        return "\n".join(self.lines) + "\n"
+
+
+def generate_trigger(spec: TriggerSpec, seed: int = 0) -> str:
+    """
+    Generate one trigger body.
+
+    Args:
+        spec (TriggerSpec): Shape of the trigger
+        seed (int): Random seed; the same spec and seed give the same text
+
+    Returns:
+        str: The trigger body, from DECLARE to END;
+    """
+    return _TriggerWriter(spec, random.Random(seed), function_names(spec)).trigger()
+
+
+def generate_corpus(spec: TriggerSpec, count: int, seed: int = 0) -> List[Tuple[str, str]]:
+    """
+    Generate `count` triggers with seeds seed, seed + 1, ...
+
+    Returns:
+        List[Tuple[str, str]]: (file name, text) pairs, e.g. ("BENCH_0000.sql", "DECLARE ...")
+    """
+    return [(f"BENCH_{index:04d}.sql", generate_trigger(spec, seed + index)) for index in range(count)]
+
+
+def write_corpus(directory: str, spec: TriggerSpec, count: int, seed: int = 0) -> List[str]:
+    """
+    Write a generated corpus to `directory` (created if needed).
+
+    Returns:
+        List[str]: Paths of the written files
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for file_name, text in generate_corpus(spec, count, seed):
+        path = os.path.join(directory, file_name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        paths.append(path)
+    return paths
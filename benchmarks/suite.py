@@ -0,0 +1,275 @@
+"""
+Throughput benchmarks for the conversion stages, compared against a stored baseline.
+
+Each case converts the same generated corpus (see generator.py):
+
+- "analyze": OracleTriggerAnalyzer(...).to_json()
+- "render_oracle" / "render_postgresql": FormatSQL(analysis).to_sql(...)
+- "split": JSONTOPLJSON(analysis).to_sql()
+- "pipeline": main.main() on the corpus, in a temporary working directory
+
+A case is timed `repeat` times and the fastest run is kept. Then it runs
+once more under tracemalloc for its peak memory (allocations made by
+Python; the workbook cache is warmed first, so mapping loads are not
+counted). Results carry seconds, files/s, lines/s (source lines of the
+corpus) and peak_memory_bytes.
+
+Rest strings and exception names found by the analyzer cases are collected
+in memory (OracleTriggerAnalyzer.deferred_writes), so the mapping workbook
+and rest_list.csv are not written. The pipeline case works on copies of
+both.
+
+With `render_cache=True` the render and split cases run with a fresh
+FormatSQL.render_cache per run, and their results also carry the cache
+statistics of the last run.
+
+A baseline is the results JSON of an earlier run. `compare_to_baseline`
+reports the cases whose time or peak memory grew by more than the
+thresholds. Timings depend on the machine, so record the baseline on the
+machine that runs the comparison.
+
+Usage:
+    results = run_suite(TriggerSpec(), files=10)
+    baseline = load_baseline()
+    log_results(results, baseline)
+    regressions = compare_to_baseline(results, baseline)
+"""
+
+import json
+import os
+import platform
+import shutil
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from benchmarks.generator import TriggerSpec, generate_corpus
+from utilities.common import info, main_excel_file
+from utilities.FormatSQL import FormatSQL
+from utilities.JSONTOPLJSON import JSONTOPLJSON
+from utilities.OracleTriggerAnalyzer import OracleTriggerAnalyzer
+from utilities.render_cache import RenderCache
+
+CASES = ("analyze", "render_oracle", "render_postgresql", "split", "pipeline")
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+# Allowed growth over the baseline before a case counts as a regression (0.25 = 25%)
+DEFAULT_TIME_THRESHOLD = 0.25
+DEFAULT_MEMORY_THRESHOLD = 0.25
+
+
+@contextmanager
+def _deferred_analyzer_writes() -> Iterator[None]:
+    """Collect the analyzer's rest strings and exception names in memory inside the block."""
+    with OracleTriggerAnalyzer.deferring_writes(flush=False):
+        yield
+
+
+def _analyze(corpus: Sequence[Tuple[str, str]]) -> List[Dict[str, Any]]:
+    """Analyze every trigger of the corpus, as step 1 does."""
+    with _deferred_analyzer_writes():
+        return [OracleTriggerAnalyzer(file_name, sql_content=text).to_json() for file_name, text in corpus]
+
+
+def _run_pipeline(corpus: Sequence[Tuple[str, str]]) -> None:
+    """Run main.main() on the corpus in a temporary working directory holding a copy of the workbook."""
+    import main
+
+    cwd = os.getcwd()
+    work_dir = tempfile.mkdtemp(prefix="trigger_benchmark_")
+    try:
+        os.makedirs(os.path.join(work_dir, main.ORACLE_SQL_DIR))
+        for file_name, text in corpus:
+            with open(os.path.join(work_dir, main.ORACLE_SQL_DIR, file_name), "w", encoding="utf-8") as f:
+                f.write(text)
+        os.makedirs(os.path.join(work_dir, os.path.dirname(main_excel_file)))
+        shutil.copy2(os.path.join(cwd, main_excel_file), os.path.join(work_dir, main_excel_file))
+        os.chdir(work_dir)
+        main.main(workers=1, save_exception_names=False, log_profile="production", profile_top=0)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def _with_render_cache(run: Callable[[], Any], stats: Dict[str, Any]) -> Callable[[], Any]:
+    """Wrap a case so each run renders with a fresh FormatSQL.render_cache, keeping its stats."""
+
+    def cached_run() -> Any:
+        previous = FormatSQL.render_cache
+        cache = FormatSQL.render_cache = RenderCache()
+        try:
+            return run()
+        finally:
+            FormatSQL.render_cache = previous
+            stats.update(cache.stats())
+
+    return cached_run
+
+
+def _measure(run: Callable[[], Any], repeat: int) -> Tuple[float, int]:
+    """Return (fastest of `repeat` runs in seconds, peak traced memory of one more run in bytes)."""
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def run_suite(
+    spec: TriggerSpec,
+    files: int = 10,
+    seed: int = 0,
+    cases: Sequence[str] = CASES,
+    repeat: int = 3,
+    render_cache: bool = False,
+) -> Dict[str, Any]:
+    """
+    Generate a corpus and time each case on it.
+
+    Args:
+        spec (TriggerSpec): Shape of the generated triggers
+        files (int): Number of triggers in the corpus
+        seed (int): Seed of the first trigger
+        cases (Sequence[str]): Names from CASES to run
+        repeat (int): Timed runs per case (the fastest is kept)
+        render_cache (bool): Run the render and split cases with a fresh RenderCache per run
+
+    Returns:
+        Dict[str, Any]: Corpus description (spec, files, seed, source_lines), environment
+        and, per case, seconds, files_per_second, lines_per_second and peak_memory_bytes
+
+    Raises:
+        ValueError: If a case name is not in CASES
+    """
+    unknown = [case for case in cases if case not in CASES]
+    if unknown:
+        raise ValueError(f"Unknown benchmark cases: {', '.join(unknown)} (expected any of {', '.join(CASES)})")
+    corpus = generate_corpus(spec, files, seed)
+    source_lines = sum(text.count("\n") for _, text in corpus)
+    info("Benchmark corpus: %d triggers, %d source lines", len(corpus), source_lines)
+
+    # Analyses for the render and split cases, read back from JSON as the later stages do
+    analyses = json.loads(json.dumps(_analyze(corpus)))
+    runs: Dict[str, Callable[[], Any]] = {
+        "analyze": lambda: _analyze(corpus),
+        "render_oracle": lambda: [FormatSQL(analysis).to_sql("Oracle") for analysis in analyses],
+        "render_postgresql": lambda: [FormatSQL(analysis).to_sql("PostgreSQL") for analysis in analyses],
+        "split": lambda: [JSONTOPLJSON(analysis).to_sql() for analysis in analyses],
+        "pipeline": lambda: _run_pipeline(corpus),
+    }
+    cache_stats: Dict[str, Dict[str, Any]] = {}
+    if render_cache:
+        for case in ("render_oracle", "render_postgresql", "split"):
+            cache_stats[case] = {}
+            runs[case] = _with_render_cache(runs[case], cache_stats[case])
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for case in cases:
+        info("Benchmark case %s (%d runs)", case, max(1, repeat))
+        seconds, peak = _measure(runs[case], repeat)
+        results[case] = {
+            "seconds": round(seconds, 6),
+            "files_per_second": round(len(corpus) / seconds, 3) if seconds else None,
+            "lines_per_second": round(source_lines / seconds, 1) if seconds else None,
+            "peak_memory_bytes": peak,
+        }
+        if case in cache_stats:
+            results[case]["render_cache"] = cache_stats[case]
+    return {
+        # Through JSON so the corpus compares equal to a loaded baseline (tuples become lists)
+        "corpus": json.loads(json.dumps({"spec": asdict(spec), "files": files, "seed": seed, "source_lines": source_lines})),
+        "environment": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "recorded": datetime.now().isoformat(timespec="seconds"),
+        },
+        "repeat": repeat,
+        "cases": results,
+    }
+
+
+def log_results(results: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> None:
+    """Log one line per case, with the change of seconds against the baseline when given."""
+    corpus = results["corpus"]
+    info("Benchmark results (%d triggers, %d source lines, best of %d):", corpus["files"], corpus["source_lines"], results["repeat"])
+    for case, current in results["cases"].items():
+        previous = (baseline or {}).get("cases", {}).get(case)
+        change = ""
+        if previous and previous.get("seconds"):
+            change = f" ({(current['seconds'] / previous['seconds'] - 1) * 100:+.1f}% vs baseline)"
+        info(
+            "  %-18s %9.3f s %10.1f files/s %12.1f lines/s %8.1f MiB peak%s",
+            case,
+            current["seconds"],
+            current["files_per_second"] or 0,
+            current["lines_per_second"] or 0,
+            current["peak_memory_bytes"] / 2**20,
+            change,
+        )
+        if "render_cache" in current:
+            stats = current["render_cache"]
+            info("  %-18s render cache: %d/%d hits (%.1f%%)", "", stats["hits"], stats["lookups"], stats["hit_rate"] * 100)
+
+
+def load_baseline(path: str = BASELINE_PATH) -> Optional[Dict[str, Any]]:
+    """Load a baseline written by `save_baseline`, or return None if the file does not exist."""
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(results: Dict[str, Any], path: str = BASELINE_PATH) -> None:
+    """Write suite results as the baseline of later runs."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+        f.write("\n")
+
+
+def compare_to_baseline(
+    results: Dict[str, Any],
+    baseline: Dict[str, Any],
+    time_threshold: float = DEFAULT_TIME_THRESHOLD,
+    memory_threshold: float = DEFAULT_MEMORY_THRESHOLD,
+) -> List[str]:
+    """
+    Compare suite results with a baseline.
+
+    Cases missing from either side are skipped.
+
+    Args:
+        results (Dict[str, Any]): Results of `run_suite`
+        baseline (Dict[str, Any]): Results of an earlier run
+        time_threshold (float): Allowed relative growth of seconds
+        memory_threshold (float): Allowed relative growth of peak_memory_bytes
+
+    Returns:
+        List[str]: One message per regression (empty if none)
+
+    Raises:
+        ValueError: If the baseline was recorded on a different corpus
+    """
+    if results["corpus"] != baseline.get("corpus"):
+        raise ValueError("The baseline was recorded on a different corpus (spec, files or seed); record a new one")
+    regressions = []
+    for case, current in results["cases"].items():
+        previous = baseline.get("cases", {}).get(case)
+        if previous is None:
+            continue
+        for metric, threshold in (("seconds", time_threshold), ("peak_memory_bytes", memory_threshold)):
+            before, after = previous.get(metric), current.get(metric)
+            if before and after is not None and after > before * (1 + threshold):
+                regressions.append(
+                    f"{case}: {metric} {after:g} vs baseline {before:g} (+{(after / before - 1) * 100:.1f}%, threshold {threshold * 100:.0f}%)"
+                )
+    return regressions
@@ -5,9 +5,12 @@ and rendering them back into formatted PL/SQL.
 
 
 High-level flow:
-- Read all `*.sql` files from `files/oracle`.
+- Read all `*.sql` files from `files/oracle` (or, with `--dump PATH`, every
+  CREATE TRIGGER unit of a multi-trigger schema dump).
 - For each file, build an `OracleTriggerAnalyzer` to parse and analyze SQL into JSON.
-- Write the analysis JSON into `files/format_json/trigger{N}_analysis.json`.
+- Write the analysis JSON into `files/format_json/trigger{N}_analysis.json`
+  (`--json-format compact|gzip` and `--strip-line-no` write smaller artifacts;
+  every stage reads all formats).
 - Read each `*_analysis.json` and render it back to PL/SQL with
   `FORMATOracleTriggerAnalyzer`, writing to `files/format_sql/trigger{N}.sql`.
 
@@ -16,17 +19,24 @@ Logging:
 - All operations are logged to both console and a timestamped log file in 'output/'.
 - The log file name format is 'oracle_conversion_YYYYMMDD_HHMMSS.log'.
 - Log levels: DEBUG for detailed operations, INFO for main steps, ERROR for failures.
+- The run ends with the slowest files and their slowest parse and render passes
+  (`--profile-top N`), taken from each analysis' `metadata.profile`.
 """
 
 
 import json
 import os
+import pickle
 import re
+import tempfile
 import time
-from typing import Any, Dict, List, Tuple
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from utilities.common import (
     clean_json_files,
     logger,
+    LOG_PROFILES,
     setup_logging,
     debug,
     info,
@@ -35,20 +45,28 @@ from utilities.common import (
     critical,
     alert,
 )
-import pandas as pd
 
 
-from utilities.OracleTriggerAnalyzer import OracleTriggerAnalyzer
+from utilities.OracleTriggerAnalyzer import PARSER_ENGINES, OracleTriggerAnalyzer
 from utilities.FormatSQL import FormatSQL
 from utilities.JSONTOPLJSON import JSONTOPLJSON
+from utilities.rest_string_sink import RestStringSink
+from utilities.artifact_json import JSON_FORMATS, ArtifactJSON
+from utilities.artifact_store import ARTIFACT_STORES, DEFAULT_ARCHIVE_PATH, ArtifactStore
+from utilities.build_cache import BuildCache
+from utilities.pass_profile import slowest_files, top_spans
+from utilities.render_cache import RenderCache
+from utilities.trigger_dump import TriggerDump, TriggerUnit
 
 
 from datetime import datetime
 
 
 # Directory constants
+ORACLE_SQL_DIR = "files/oracle"
 FORMAT_JSON_DIR = "files/format_json"
 FORMAT_SQL_DIR = "files/format_sql"
+FORMAT_PL_JSON_DIR = "files/format_pl_json"
 FORMAT_PL_SQL_DIR = "files/format_plsql"
 
 
@@ -57,6 +75,24 @@ ANALYSIS_JSON_SUFFIX = "_analysis.json"
 JSON_FILE_SUFFIX = ".json"
 
 
+# Mapping sheets each stage's output depends on (part of the build cache key)
+ANALYZER_MAPPING_SHEETS = ("function_list", "statement_mappings")
+RENDER_MAPPING_SHEETS = ("function_mappings", "data_type_mappings", "exception_mappings", "schema_mappings")
+# Writes a run defers to its end: the workbook is rewritten once; rest strings are already
+# buffered by RestStringSink (see OracleTriggerAnalyzer.deferring_writes)
+RUN_DEFERRED_WRITES = ("exception_names",)
+
+
+# Artifacts the in-memory pipeline can write (same names and locations as the staged steps):
+# analysis_json           files/format_json/{name}_analysis.json          (step 1)
+# oracle_sql              files/format_sql/{name}_analysis.sql            (step 2)
+# pl_json                 files/format_pl_json/{name}.json                (step 5)
+# postgresql_json         files/format_plsql/{name}_postgresql.json       (step 6)
+# analysis_postgresql_sql files/format_plsql/{name}_analysis_postgresql.sql (step 7)
+# postgresql_sql          files/format_plsql/{name}_postgresql.sql        (step 8)
+DIRECT_ARTIFACTS = ("analysis_json", "oracle_sql", "pl_json", "postgresql_json", "analysis_postgresql_sql", "postgresql_sql")
+
+
 def convert_complex_structure_to_sql(complex_structure):
     """
     Convert the complex PL/JSON structure to a proper PostgreSQL SQL string.
@@ -113,7 +149,11 @@ def process_files(
     file_pattern: str,
     output_suffix: str,
     processor_func,
-) -> None:
+    workers: int = 1,
+    build_cache: Optional[BuildCache] = None,
+    cache_step: str = "",
+    mapping_sheets: Tuple[str, ...] = (),
+) -> Dict[str, Any]:
     """process_files function."""
     """
     Process files from source_dir to target_dir using the provided processor function.
@@ -134,6 +174,17 @@ def process_files(
         file_pattern (str): File extension pattern to match (e.g., ".sql")
         output_suffix (str): Suffix to add to output filenames
         processor_func: Function to process each file (src_path, out_path, file_name)
+        workers (int): Number of worker processes; values above 1 run the processor
+            in a ProcessPoolExecutor (processor_func must be a module-level function)
+        build_cache (Optional[BuildCache]): Incremental-mode manifest; files whose input,
+            mapping sheets and parser version are unchanged keep their existing output
+        cache_step (str): Stage name used as the build cache namespace
+        mapping_sheets (Tuple[str, ...]): Mapping sheets the stage output depends on
+
+
+    Returns:
+        Dict[str, Any]: processed_count, error_count, total_file_size, per-file durations,
+        cache_hits and file_profiles (the dicts returned by processor_func, per file)
     """
     info("=== Starting file processing ===")
     info("Source directory: '%s'", source_dir)
@@ -149,14 +200,14 @@ def process_files(
 
     # Get all matching files from the source directory
     try:
-        files = [f for f in os.listdir(source_dir) if f.endswith(file_pattern)]
+        files = [f for f in ArtifactStore.list_names(source_dir) if ArtifactJSON.matches(f, file_pattern)]
         debug("Found %d files in source directory", len(files))
     except FileNotFoundError:
         error("Source directory not found: %s", source_dir)
-        return
+        return {"processed_count": 0, "error_count": 0, "total_file_size": 0, "file_durations": {}, "cache_hits": 0, "file_profiles": {}}
     except PermissionError:
         error("Permission denied accessing source directory: %s", source_dir)
-        return
+        return {"processed_count": 0, "error_count": 0, "total_file_size": 0, "file_durations": {}, "cache_hits": 0, "file_profiles": {}}
 
 
     debug("Files matching pattern '%s': %s", file_pattern, files)
@@ -166,63 +217,172 @@ def process_files(
     processed_count = 0
     error_count = 0
     total_file_size = 0
+    cache_hits = 0
+    file_durations: Dict[str, float] = {}
+    # Profiles returned by the processor (see utilities/pass_profile.py); none for cache hits
+    file_profiles: Dict[str, Dict[str, Any]] = {}
+    # Side effects of cache hits and captured runs, applied once for the stage
+    stage_writes = {"rest_strings": [], "exception_names": {}}
+
+
+    # Resolve output paths and build cache entries up front, in file order
+    jobs = []
+    for file_name in files:
+        src_path = os.path.join(source_dir, file_name)
+        out_path = os.path.join(target_dir, f"{file_name.split('.')[0]}{output_suffix}")
+        if output_suffix.endswith(JSON_FILE_SUFFIX):
+            out_path = ArtifactJSON.output_path(out_path)
+        cache_key, cached_entry = _lookup_build_cache(build_cache, cache_step, src_path, out_path, mapping_sheets)
+        jobs.append((file_name, src_path, out_path, cache_key, cached_entry))
+    pending_jobs = sum(1 for job in jobs if job[4] is None)
+
+
+    executor = None
+    futures = {}
+    if workers > 1 and pending_jobs > 1:
+        info("Processing %d files with %d worker processes", pending_jobs, workers)
+        executor = ProcessPoolExecutor(max_workers=workers)
+        # Submit in file order and collect in file order so logs and merged side effects stay deterministic
+        for index, (file_name, src_path, out_path, _, cached_entry) in enumerate(jobs):
+            if cached_entry is None:
+                futures[index] = executor.submit(_run_processor_in_worker, processor_func, src_path, out_path, file_name)
+    # One archive transaction for the stage's writes (no-op for the directory layout); the
+    # archive is in WAL mode, so workers can still read it while the transaction is open
+    ArtifactStore.begin()
+    try:
+        i = 1
+        while i <= len(jobs):
+            file_name, src_path, out_path, cache_key, cached_entry = jobs[i - 1]
+            debug("=== Processing file %d/%d: %s ===", i, len(jobs), file_name)
+            try:
+                debug("Source path: %s", src_path)
+                debug("Output path: %s", out_path)
+                if cached_entry is not None:
+                    # Unchanged input, mappings and parser version: keep the existing output
+                    debug("Build cache hit, keeping %s", out_path)
+                    _merge_deferred_writes(stage_writes, cached_entry)
+                    cache_hits += 1
+                    processed_count += 1
+                    i += 1
+                    continue
+
+
+                # Run the processor function
+                file_writes = None
+                if executor is not None:
+                    duration, file_size, file_writes, artifact_writes, profile = futures[i - 1].result()
+                    ArtifactStore.apply(artifact_writes)
+                elif build_cache is not None:
+                    # Capture the side effects so they can be replayed on later cache hits
+                    duration, file_size, file_writes, artifact_writes, profile = _run_processor_in_worker(processor_func, src_path, out_path, file_name)
+                    ArtifactStore.apply(artifact_writes)
+                else:
+                    file_start = time.time()
+                    profile = processor_func(src_path, out_path, file_name)
+                    duration = time.time() - file_start
+                    file_size = ArtifactStore.size(src_path)
+                if isinstance(profile, dict):
+                    file_profiles[file_name] = profile
+                if file_writes is not None:
+                    _merge_deferred_writes(stage_writes, file_writes)
+                if build_cache is not None and cache_key is not None:
+                    build_cache.store(cache_step, src_path, cache_key, out_path, file_writes)
+                file_durations[file_name] = duration
+                total_file_size += file_size
+
+
+                debug("✓ Created %s", os.path.basename(out_path))
+                processed_count += 1
+
+
+            except FileNotFoundError as e:
+                error("File not found: %s - %s", file_name, str(e))
+                error_count += 1
+            except PermissionError as e:
+                error("Permission denied: %s - %s", file_name, str(e))
+                error_count += 1
+            except Exception as exc:
+                error("Failed to process %s: %s", file_name, str(exc))
+                error_count += 1
+                raise
+            i += 1
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        ArtifactStore.commit()
+        # Apply the side-effect writes collected from workers and cache hits once, in the parent
+        OracleTriggerAnalyzer.flush_deferred_writes(stage_writes)
+        if build_cache is not None:
+            build_cache.save()
+
+
+    # Write the rest strings collected during this stage in one append
+    RestStringSink.flush()
 
+    info("=== File processing complete ===")
+    info("Successfully processed: %d files", processed_count)
+    if build_cache is not None:
+        info("Build cache: %d hits, %d rebuilt", cache_hits, len(jobs) - cache_hits)
+    if total_file_size > 0:
+        info("Total file size processed: %d bytes (%.2f KB)", total_file_size, total_file_size / 1024)
+    if error_count > 0:
+        warning("Failed to process: %d files", error_count)
+    return {
+        "processed_count": processed_count,
+        "error_count": error_count,
+        "total_file_size": total_file_size,
+        "file_durations": file_durations,
+        "cache_hits": cache_hits,
+        "file_profiles": file_profiles,
+    }
 
-    i = 1
-    while i <= len(files):
-        file_name = files[i - 1]
-        debug("=== Processing file %d/%d: %s ===", i, len(files), file_name)
-        try:
-            # Process the file
-            src_path = os.path.join(source_dir, file_name)
-            filename = file_name.split('.')[0]  # Remove extension for output filename
-            output_filename = f"{filename}{output_suffix}"
-            out_path = os.path.join(target_dir, output_filename)
 
+def _lookup_build_cache(build_cache: Optional[BuildCache], cache_step: str, src_path: str, out_path: str, mapping_sheets: Tuple[str, ...]) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+    """
+    Return (cache key, manifest entry) for one input; the entry is None on a miss.
 
-            debug("Source path: %s", src_path)
-            debug("Output path: %s", out_path)
-            
-            # # Log file details if available
-            # try:
-            #     file_details = OracleTriggerAnalyzer.extract_file_details(src_path)
-            #     file_size = file_details.get("filesize", 0)
-            #     total_file_size += file_size
-            #     debug("File size: %d bytes", file_size)
-            # except Exception as e:
-            #     debug("Could not extract file details: %s", str(e))
+
+    Unreadable inputs are treated as misses so the processor reports the error as usual.
+    """
+    if build_cache is None:
+        return None, None
+    try:
+        cache_key = build_cache.input_key(cache_step, src_path, mapping_sheets)
+    except OSError as e:
+        debug("Could not hash %s for the build cache: %s", src_path, str(e))
+        return None, None
+    return cache_key, build_cache.lookup(cache_step, src_path, cache_key, out_path)
 
 
-            # Run the processor function
-            processor_func(src_path, out_path, file_name)
+def _merge_deferred_writes(target: Dict[str, Any], file_writes: Dict[str, Any]) -> None:
+    """Merge one file's deferred rest strings and exception names into `target`, keeping file order."""
+    target["rest_strings"].extend(file_writes.get("rest_strings", []))
+    for exception_name, message in file_writes.get("exception_names", {}).items():
+        target["exception_names"].setdefault(exception_name, message)
 
 
-            debug("✓ Created %s", output_filename)
-            processed_count += 1
+def _run_processor_in_worker(processor_func, src_path: str, out_path: str, file_name: str) -> Tuple[float, int, Dict[str, Any], List[Any], Any]:
+    """
+    Run a processor function inside a worker process of `process_files`.
 
 
-        except FileNotFoundError as e:
-            error("File not found: %s - %s", file_name, str(e))
-            error_count += 1
-        except PermissionError as e:
-            error("Permission denied: %s - %s", file_name, str(e))
-            error_count += 1
-        except Exception as exc:
-            error("Failed to process %s: %s", file_name, str(exc))
-            error_count += 1
-            raise
-        i += 1
+    rest_list.csv and Excel writes are deferred on OracleTriggerAnalyzer and returned
+    to the parent instead of being written concurrently by every worker. So are the
+    artifact archive writes (ArtifactStore.capture), which the parent applies.
 
 
-    info("=== File processing complete ===")
-    info("Successfully processed: %d files", processed_count)
-    if total_file_size > 0:
-        info("Total file size processed: %d bytes (%.2f KB)", total_file_size, total_file_size / 1024)
-    if error_count > 0:
-        warning("Failed to process: %d files", error_count)
+    Returns:
+        Tuple[float, int, Dict[str, Any], List[Any], Any]: (duration in seconds, source file size,
+        deferred writes, captured artifact writes, return value of processor_func)
+    """
+    with OracleTriggerAnalyzer.deferring_writes(flush=False) as file_writes, ArtifactStore.capture() as artifact_writes:
+        file_start = time.time()
+        result = processor_func(src_path, out_path, file_name)
+        duration = time.time() - file_start
+    return duration, ArtifactStore.size(src_path), file_writes, artifact_writes, result
 
 
-def sql_to_json_processor(src_path: str, out_path: str, file_name: str) -> None:
+def sql_to_json_processor(src_path: str, out_path: str, file_name: str) -> Dict[str, Any]:
     """
     Process a SQL file to JSON analysis.
 
@@ -237,12 +397,15 @@ def sql_to_json_processor(src_path: str, out_path: str, file_name: str) -> None:
         src_path (str): Path to the source SQL file
         out_path (str): Path to the output JSON file
         file_name (str): Trigger number extracted from filename
+
+    Returns:
+        Dict[str, Any]: The parse profile of the trigger (metadata.profile)
     """
     debug("=== SQL to JSON processing for trigger %s ===", file_name)
     
     # Step 1: Create analyzer directly from file (includes file details)
     debug("Creating OracleTriggerAnalyzer instance from file...")
-    logger.debug(f"Reading SQL file: {src_path}")
+    logger.debug("Reading SQL file: %s", src_path)
     try:
         analyzer = OracleTriggerAnalyzer(src_path)
         debug("OracleTriggerAnalyzer created successfully with file details")
@@ -290,8 +453,7 @@ def sql_to_json_processor(src_path: str, out_path: str, file_name: str) -> None:
     # Step 3: Write to JSON file
     debug("Writing analysis JSON to: %s", out_path)
     try:
-        with open(out_path, "w", encoding="utf-8") as f:
-            json.dump(json_content, f, indent=2)
+        out_path = ArtifactJSON.write(json_content, out_path, indent=2)
         debug("Successfully wrote analysis JSON to %s", out_path)
     except Exception as e:
         error("Failed to write JSON file %s: %s", out_path, str(e))
@@ -299,9 +461,10 @@ def sql_to_json_processor(src_path: str, out_path: str, file_name: str) -> None:
 
 
     debug("=== SQL to JSON processing complete for trigger %s ===", file_name)
+    return metadata.get("profile", {})
 
 
-def read_oracle_triggers_to_json() -> None:
+def read_oracle_triggers_to_json(workers: int = 1, save_exception_names: bool = True, build_cache: Optional[BuildCache] = None) -> Dict[str, Any]:
     """
     Convert all Oracle trigger SQL files into analysis JSON files.
 
@@ -314,28 +477,179 @@ def read_oracle_triggers_to_json() -> None:
     2. For each file, extract the trigger number from the filename
     3. Parse the SQL content using OracleTriggerAnalyzer with file details
     4. Save the resulting structured JSON to the target directory with metadata
+    5. Merge the exception names found in all files into the exception_mappings sheet
+       in one write (skipped when save_exception_names is False, e.g. for read-only runs)
+
+
+    Args:
+        workers (int): Number of worker processes for process_files
+        save_exception_names (bool): Write newly found exception names to the mapping workbook
+
+    Returns:
+        Dict[str, Any]: The process_files statistics; file_profiles holds each parsed
+        file's metadata.profile
     """
     info("=== Starting Oracle triggers to JSON conversion ===")
     debug("Workflow Phase 1: Convert Oracle SQL files to JSON analysis structure")
-    debug("Source directory: files/oracle")
+    debug("Source directory: %s", ORACLE_SQL_DIR)
     debug("Target directory: %s", FORMAT_JSON_DIR)
     debug("File details will be included in metadata for each processed file")
    
-    # Process all files using the processor function
-    process_files(
-        source_dir="files/oracle",
-        target_dir=FORMAT_JSON_DIR,
-        file_pattern=".sql",
-        output_suffix=ANALYSIS_JSON_SUFFIX,
-        processor_func=sql_to_json_processor,
-    )
+    # Collect exception names across the whole run instead of rewriting the workbook per trigger;
+    # names found before a failure are still merged, as the per-trigger writes used to do
+    with OracleTriggerAnalyzer.deferring_writes(RUN_DEFERRED_WRITES, save_exception_names=save_exception_names):
+        # Process all files using the processor function
+        stats = process_files(
+            source_dir=ORACLE_SQL_DIR,
+            target_dir=FORMAT_JSON_DIR,
+            file_pattern=".sql",
+            output_suffix=ANALYSIS_JSON_SUFFIX,
+            processor_func=sql_to_json_processor,
+            workers=workers,
+            build_cache=build_cache,
+            cache_step="sql_to_json",
+            mapping_sheets=ANALYZER_MAPPING_SHEETS,
+        )
    
     # Log successful completion
     info("=== Oracle triggers to JSON conversion complete ===")
     debug("Phase 1 complete: Oracle SQL files converted to JSON analysis structure with file metadata")
+    return stats
+
+
+def read_trigger_dump_to_json(dump_path: str, workers: int = 1, save_exception_names: bool = True) -> Dict[str, Any]:
+    """
+    Convert every trigger of a multi-trigger schema dump into an analysis JSON file.
+
+
+    Step 1 for DBMS_METADATA exports: the dump is memory-mapped and split into
+    CREATE TRIGGER units (utilities/trigger_dump.py), and each unit's PL/SQL block is
+    analyzed as if it were files/oracle/<TRIGGER_NAME>.sql. Units are read one at a
+    time, so memory is bounded by the largest trigger instead of the dump size. With
+    workers > 1 at most 2 * workers units are in flight; each worker maps the dump
+    itself and receives only the unit offsets.
+
+
+    Args:
+        dump_path (str): Path of the dump file
+        workers (int): Number of worker processes (1 = sequential)
+        save_exception_names (bool): Write newly found exception names to the mapping workbook
+
+
+    Returns:
+        Dict[str, Any]: processed_count, file_durations and file_profiles (metadata.profile
+        of each trigger)
+    """
+    info("=== Starting trigger dump to JSON conversion ===")
+    info("Dump file: '%s'", dump_path)
+    ensure_dir(FORMAT_JSON_DIR)
+    file_durations: Dict[str, float] = {}
+    file_profiles: Dict[str, Dict[str, Any]] = {}
+    seen_names = set()
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    # (unit, future), collected in dump order so logs and merged side effects stay deterministic
+    in_flight = deque()
+
+    def collect(unit: TriggerUnit, future) -> None:
+        _, file_writes, duration, artifact_writes, profile = future.result()
+        OracleTriggerAnalyzer.flush_deferred_writes(file_writes)
+        ArtifactStore.apply(artifact_writes)
+        file_durations[unit.file_name] = duration
+        file_profiles[unit.file_name] = profile
+        debug("✓ Created %s%s", unit.name, ANALYSIS_JSON_SUFFIX)
+
+    try:
+        with OracleTriggerAnalyzer.deferring_writes(RUN_DEFERRED_WRITES, save_exception_names=save_exception_names), ArtifactStore.batch(), TriggerDump(dump_path) as dump:
+            for unit in dump.units():
+                if unit.name in seen_names:
+                    warning("Trigger %s appears more than once in %s; the later unit overwrites the earlier output", unit.name, dump_path)
+                seen_names.add(unit.name)
+                out_path = os.path.join(FORMAT_JSON_DIR, f"{unit.name}{ANALYSIS_JSON_SUFFIX}")
+                debug("=== Processing trigger %s (bytes %d-%d) ===", unit.name, unit.start, unit.end)
+                if executor is None:
+                    file_start = time.time()
+                    analysis = analyze_dump_unit(dump, unit, out_path)
+                    file_durations[unit.file_name] = time.time() - file_start
+                    file_profiles[unit.file_name] = analysis["metadata"]["profile"]
+                    debug("✓ Created %s", os.path.basename(out_path))
+                    continue
+                in_flight.append((unit, executor.submit(_analyze_dump_unit_in_worker, dump_path, unit, out_path, False)))
+                if len(in_flight) >= 2 * workers:
+                    collect(*in_flight.popleft())
+            while in_flight:
+                collect(*in_flight.popleft())
+    except Exception as e:
+        error("Failed to convert trigger dump %s: %s", dump_path, str(e))
+        raise
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        RestStringSink.flush()
+
+    info("=== Trigger dump to JSON conversion complete (%d triggers) ===", len(file_durations))
+    return {"processed_count": len(file_durations), "file_durations": file_durations, "file_profiles": file_profiles}
+
+
+def render_oracle_sql(analysis: Dict[str, Any], file_name: str) -> str:
+    """
+    Validate an analysis dict and render it as formatted Oracle SQL.
+
+
+    Args:
+        analysis (Dict[str, Any]): Analysis produced by OracleTriggerAnalyzer.to_json()
+        file_name (str): File name used in log messages
+
+
+    Returns:
+        str: The rendered SQL
+    """
+    return _render_oracle_sql_profiled(analysis, file_name)[0]
+
+
+def _render_oracle_sql_profiled(analysis: Dict[str, Any], file_name: str) -> Tuple[str, Dict[str, Any]]:
+    """Run `render_oracle_sql`, returning the rendered SQL and FormatSQL's render profile."""
+    # Step 1: Enhanced JSON validation
+    debug("Validating JSON structure...")
+    validation_result = validate_json_structure(analysis, file_name)
+    if not validation_result["is_valid"]:
+        error("JSON validation failed for %s: %s", file_name, validation_result["errors"])
+        raise ValueError(f"Invalid JSON structure: {validation_result['errors']}")
+    
+    debug("JSON validation passed")
+    
+    # Step 2: Render the SQL
+    debug("Creating FormatSQL instance...")
+    try:
+        analyzer = FormatSQL(analysis)
+        debug("FormatSQL created successfully")
+    except Exception as e:
+        error("Failed to create FormatSQL: %s", str(e))
+        raise
+
+
+    # Step 3: Generate SQL content with performance monitoring
+    debug("Rendering SQL from analysis...")
+    try:
+        sql_content: str = analyzer.to_sql("Oracle")
+        analyzer_sql = sql_content["sql"]
+        render_profile = sql_content["profile"]
+        
+        debug("SQL rendering completed successfully")
+        debug("Rendered SQL length: %d characters", len(analyzer_sql))
+        debug("SQL rendering took: %.3f seconds", render_profile["total_ns"] / 1e9)
+        
+        # Validate generated SQL
+        sql_validation = validate_generated_sql(analyzer_sql, file_name)
+        if not sql_validation["is_valid"]:
+            warning("Generated SQL validation warnings for %s: %s", file_name, sql_validation["warnings"])
+        
+    except Exception as e:
+        error("Failed to render SQL: %s", str(e))
+        raise
+    return analyzer_sql, render_profile
 
 
-def json_to_sql_processor(src_path: str, out_path: str, file_name: str) -> None:
+def json_to_sql_processor(src_path: str, out_path: str, file_name: str) -> Optional[Dict[str, Any]]:
     """
     Process a JSON analysis file to formatted SQL.
 
@@ -352,6 +666,9 @@ def json_to_sql_processor(src_path: str, out_path: str, file_name: str) -> None:
         src_path (str): Path to the source JSON analysis file
         out_path (str): Path to the output SQL file
         file_name (str): Trigger number extracted from filename
+
+    Returns:
+        Optional[Dict[str, Any]]: FormatSQL's render profile (None for an analysis with an error)
     """
     debug("=== JSON to SQL processing for trigger %s ===", file_name)
 
@@ -359,83 +676,50 @@ def json_to_sql_processor(src_path: str, out_path: str, file_name: str) -> None:
     # Step 1: Read the JSON file
     debug("Reading JSON analysis file: %s", src_path)
     try:
-        with open(src_path, "r", encoding="utf-8") as f:
-            analysis = json.load(f)
+        analysis = ArtifactJSON.read(src_path)
         logger.debug(
             f"Successfully loaded analysis JSON with keys: {list(analysis.keys())}"
         )
     except json.JSONDecodeError as e:
-        error(f"JSON decode error reading {src_path}: {str(e)}" )
+        error("JSON decode error reading %s: %s", src_path, str(e))
         raise
     except Exception as e:
         error("Error reading JSON file %s: %s", src_path, str(e))
         raise
 
-    # Step 1.5: Enhanced JSON validation
+    # Step 2: Validate and render the SQL
     if "error" not in analysis:
-        debug("Validating JSON structure...")
-        validation_result = validate_json_structure(analysis, file_name)
-        if not validation_result["is_valid"]:
-            error("JSON validation failed for %s: %s", file_name, validation_result["errors"])
-            raise ValueError(f"Invalid JSON structure: {validation_result['errors']}")
-        
-        debug("JSON validation passed")
-        
-        # Step 2: Render the SQL
-        debug("Creating FormatSQL instance...")
-        try:
-            analyzer = FormatSQL(analysis)
-            debug("FormatSQL created successfully")
-        except Exception as e:
-            error("Failed to create FormatSQL: %s", str(e))
-            raise
+        analyzer_sql, render_profile = _render_oracle_sql_profiled(analysis, file_name)
 
 
-        # Step 3: Generate SQL content with performance monitoring
-        debug("Rendering SQL from analysis...")
-        try:
-            render_start_time = time.time()
-            sql_content: str = analyzer.to_sql("Oracle")
-            analyzer_sql = sql_content["sql"]
-            render_duration = time.time() - render_start_time
-            
-            debug("SQL rendering completed successfully")
-            debug(f"Rendered SQL length: {len(analyzer_sql)} characters")
-            debug(f"SQL rendering took: {render_duration:.3f} seconds")
-            
-            # Validate generated SQL
-            sql_validation = validate_generated_sql(analyzer_sql, file_name)
-            if not sql_validation["is_valid"]:
-                warning("Generated SQL validation warnings for %s: %s", file_name, sql_validation["warnings"])
-            
-        except Exception as e:
-            error("Failed to render SQL: %s", str(e))
-            raise
-
-
-        # Step 4: Write to SQL file
+        # Step 3: Write to SQL file
         debug("Writing formatted SQL to: %s", out_path)
         try:
-            with open(out_path, "w", encoding="utf-8") as f:
-                f.write(analyzer_sql)
-            debug(f"Successfully wrote formatted SQL to {out_path}")
+            ArtifactStore.write_text(out_path, analyzer_sql)
+            debug("Successfully wrote formatted SQL to %s", out_path)
         except Exception as e:
-            error(f"Failed to write SQL file {out_path}: {str(e)}")
+            error("Failed to write SQL file %s: %s", out_path, str(e))
             raise
 
 
         debug("=== JSON to SQL processing complete for trigger %s ===", file_name)
-    else:
-        error("Analysis Sql contains error: %s", analysis["error"])
+        return render_profile
+    error("Analysis Sql contains error: %s", analysis["error"])
+    return None
 
 
-def render_oracle_sql_from_analysis() -> None:
+def render_oracle_sql_from_analysis(workers: int = 1, build_cache: Optional[BuildCache] = None) -> Dict[str, Any]:
     """
     Render formatted PL/SQL for each analysis JSON file.
 
 
     This function processes all _analysis.json files in the files/format_json directory,
     converting them to formatted SQL files in the files/format_sql directory.
+
+
+    Returns:
+        Dict[str, Any]: The process_files statistics; file_profiles holds each rendered
+        file's FormatSQL profile
     """
     info("=== Starting JSON analysis to formatted Oracle SQL conversion ===")
     
@@ -448,12 +732,16 @@ def render_oracle_sql_from_analysis() -> None:
         "comparison_results": []
     }
     
-    process_files(
+    stats = process_files(
         source_dir=FORMAT_JSON_DIR,
         target_dir=FORMAT_SQL_DIR,
         file_pattern=ANALYSIS_JSON_SUFFIX,
         output_suffix=".sql",
         processor_func=json_to_sql_processor,
+        workers=workers,
+        build_cache=build_cache,
+        cache_step="json_to_oracle_sql",
+        mapping_sheets=RENDER_MAPPING_SHEETS,
     )
     
     # Perform comparison with original files
@@ -477,6 +765,7 @@ def render_oracle_sql_from_analysis() -> None:
                 info("File %s: Conversion successful", result["file_name"])
     
     info("=== JSON analysis to formatted Oracle SQL conversion complete ===")
+    return stats
 
 
 def validate_json_structure(analysis: Dict[str, Any], file_name: str) -> Dict[str, Any]:
@@ -542,7 +831,7 @@ def validate_json_structure(analysis: Dict[str, Any], file_name: str) -> Dict[st
             sql_counts = stats["sql_convert_count"]
             if isinstance(sql_counts, dict):
                 total_statements = sum(sql_counts.values())
-                debug(f"JSON contains {total_statements} total statements")
+                debug("JSON contains %d total statements", total_statements)
                 
                 # Check for potentially problematic statement types
                 problematic_types = ["unknown_statement"]
@@ -652,8 +941,7 @@ def compare_original_and_generated(original_path: str, generated_path: str, file
             original_content = f.read()
         
         # Read generated SQL
-        with open(generated_path, "r", encoding="utf-8") as f:
-            generated_content = f.read()
+        generated_content = ArtifactStore.read_text(generated_path)
         
         # Basic line count comparison
         original_lines = original_content.split('\n')
@@ -691,7 +979,12 @@ def compare_original_and_generated(original_path: str, generated_path: str, file
                     f"{description}: {'Missing' if not generated_has else 'Extra'} in generated"
                 )
         
-        debug(f"Comparison complete for {file_name}: {comparison_result['original_lines']} original, {comparison_result['generated_lines']} generated lines")
+        debug(
+            "Comparison complete for %s: %s original, %s generated lines",
+            file_name,
+            comparison_result['original_lines'],
+            comparison_result['generated_lines'],
+        )
         
     except Exception as e:
         comparison_result["warnings"].append(f"Comparison failed: {str(e)}")
@@ -716,7 +1009,7 @@ def perform_comparison_analysis() -> Dict[str, Any]:
     
     try:
         # Get list of original SQL files
-        oracle_dir = "files/oracle"
+        oracle_dir = ORACLE_SQL_DIR
         format_sql_dir = FORMAT_SQL_DIR
         
         if not os.path.exists(oracle_dir) or not os.path.exists(format_sql_dir):
@@ -724,7 +1017,7 @@ def perform_comparison_analysis() -> Dict[str, Any]:
             return comparison_stats
         
         original_files = [f for f in os.listdir(oracle_dir) if f.endswith(".sql")]
-        generated_files = [f for f in os.listdir(format_sql_dir) if f.endswith(".sql")]
+        generated_files = [f for f in ArtifactStore.list_names(format_sql_dir) if f.endswith(".sql")]
         
         comparison_stats["total_files"] = len(original_files)
         
@@ -762,11 +1055,16 @@ def perform_comparison_analysis() -> Dict[str, Any]:
     return comparison_stats
 
 
-def read_json_to_oracle_triggers() -> None:
-    """read_json_to_oracle_triggers function."""
+def read_json_to_oracle_triggers(build_cache: Optional[BuildCache] = None) -> None:
+    """
+    Convert analysis JSON files to PL/JSON (files/format_pl_json).
+
+    Args:
+        build_cache (Optional[BuildCache]): Skip files whose PL/JSON output is up to date
+    """
     # Define directories
     json_dir = FORMAT_JSON_DIR
-    sql_out_dir = "files/format_pl_json"
+    sql_out_dir = FORMAT_PL_JSON_DIR
 
 
     # Ensure directories exist
@@ -777,31 +1075,74 @@ def read_json_to_oracle_triggers() -> None:
 
 
     # Process each analysis JSON file
-    json_files = [f for f in os.listdir(json_dir) if f.endswith(ANALYSIS_JSON_SUFFIX)]
-
+    json_files = [f for f in ArtifactStore.list_names(json_dir) if ArtifactJSON.matches(f, ANALYSIS_JSON_SUFFIX)]
 
-    i = 0
-    while i < len(json_files):
-        json_file = json_files[i]
-        json_path = os.path.join(json_dir, json_file)
-        with open(json_path, "r", encoding="utf-8") as f:
-            analysis = json.load(f)
-        if "error" not in analysis:
-            debug(f"processing {json_file}")
-            analyzer = JSONTOPLJSON(analysis)
-            sql_content = analyzer.to_sql()
 
-
-            # Save as JSON with the new structure
+    with ArtifactStore.batch():
+        i = 0
+        while i < len(json_files):
+            json_file = json_files[i]
+            json_path = os.path.join(json_dir, json_file)
             json_file_name = json_file.replace(ANALYSIS_JSON_SUFFIX, "").split('.')[0]
             out_filename = f"{json_file_name}.json"
-            out_path = os.path.join(sql_out_dir, out_filename)
-            with open(out_path, "w", encoding="utf-8") as f:
-                f.write(sql_content)
-            debug(f"Created {out_filename}")
-        else:
-            debug(f"Skipping {json_file} due to error in analysis: {analysis['error']}")
-        i += 1
+            out_path = ArtifactJSON.output_path(os.path.join(sql_out_dir, out_filename))
+            cache_key, cached_entry = _lookup_build_cache(build_cache, "json_to_pl_json", json_path, out_path, RENDER_MAPPING_SHEETS)
+            if cached_entry is not None:
+                debug("Up to date: %s", out_filename)
+                i += 1
+                continue
+            analysis = ArtifactJSON.read(json_path)
+            if "error" not in analysis:
+                debug("processing %s", json_file)
+                analyzer = JSONTOPLJSON(analysis)
+
+
+                # Save as JSON with the new structure
+                ArtifactJSON.write(analyzer.to_dict(), out_path, indent=2, ensure_ascii=False)
+                debug("Created %s", out_filename)
+                if build_cache is not None:
+                    build_cache.store("json_to_pl_json", json_path, cache_key, out_path)
+            else:
+                debug("Skipping %s due to error in analysis: %s", json_file, analysis['error'])
+            i += 1
+
+    if build_cache is not None:
+        build_cache.save()
+
+
+def write_postgresql_sql(analysis: Dict[str, Any], out_path: str) -> None:
+    """
+    Render an analysis dict as formatted PostgreSQL SQL straight into an artifact.
+
+
+    The lines are written through ArtifactStore.open_text as they are rendered, so the
+    SQL is never held as one string (an archive artifact is buffered by the store).
+
+
+    Args:
+        analysis (Dict[str, Any]): Analysis produced by OracleTriggerAnalyzer.to_json()
+        out_path (str): Path of the PostgreSQL SQL file
+    """
+    # Step 1: Create the renderer
+    debug("Creating FormatSQL instance...")
+    try:
+        analyzer = FormatSQL(analysis)
+        debug("FormatSQL created successfully")
+    except Exception as e:
+        error("Failed to create FormatSQL: %s", str(e))
+        raise
+
+
+    # Step 2: Stream the SQL content to the file
+    debug("Rendering PostgreSQL SQL from analysis to: %s", out_path)
+    try:
+        with ArtifactStore.open_text(out_path) as f:
+            sql_content = analyzer.write_sql(f, "PostgreSQL")
+        debug("PostgreSQL SQL rendering completed successfully")
+        debug("Rendered SQL lines: %d", sql_content["profile"]["sql_line_count"])
+    except Exception as e:
+        error("Failed to render PostgreSQL SQL to %s: %s", out_path, str(e))
+        raise
 
 
 def json_to_pl_sql_processor(src_path: str, out_path: str, file_name: str) -> None:
@@ -812,8 +1153,7 @@ def json_to_pl_sql_processor(src_path: str, out_path: str, file_name: str) -> No
     This function:
     1. Reads the JSON analysis file
     2. Creates a FormatSQL instance
-    3. Renders the PostgreSQL SQL content
-    4. Writes the formatted SQL to the output file
+    3. Renders the PostgreSQL SQL content straight into the output file
 
 
     Args:
@@ -827,56 +1167,27 @@ def json_to_pl_sql_processor(src_path: str, out_path: str, file_name: str) -> No
     # Step 1: Read the JSON file
     debug("Reading JSON analysis file: %s", src_path)
     try:
-        with open(src_path, "r", encoding="utf-8") as f:
-            analysis = json.load(f)
+        analysis = ArtifactJSON.read(src_path)
         logger.debug(
             f"Successfully loaded analysis JSON with keys: {list(analysis.keys())}"
         )
     except json.JSONDecodeError as e:
-        error(f"JSON decode error reading {src_path}: {str(e)}")
+        error("JSON decode error reading %s: %s", src_path, str(e))
         raise
     except Exception as e:
         error("Error reading JSON file %s: %s", src_path, str(e))
         raise
 
 
-    # Step 2: Render the SQL
-    debug("Creating FormatSQL instance...")
-    try:
-        analyzer = FormatSQL(analysis)
-        debug("FormatSQL created successfully")
-    except Exception as e:
-        error("Failed to create FormatSQL: %s", str(e))
-        raise
-
-
-    # Step 3: Generate SQL content
-    debug("Rendering PostgreSQL SQL from analysis...")
-    try:
-        sql_content: str = analyzer.to_sql("PostgreSQL")
-        analyzer_sql = sql_content["sql"]
-        debug("PostgreSQL SQL rendering completed successfully")
-        debug("Rendered SQL length: %d characters", len(analyzer_sql))
-    except Exception as e:
-        error("Failed to render PostgreSQL SQL: %s", str(e))
-        raise
-
-
-    # Step 4: Write to SQL file
-    debug("Writing formatted PostgreSQL SQL to: %s", out_path)
-    try:
-        with open(out_path, "w", encoding="utf-8") as f:
-            f.write(analyzer_sql)
-        debug("Successfully wrote formatted PostgreSQL SQL to %s", out_path)
-    except Exception as e:
-        error("Failed to write PostgreSQL SQL file %s: %s", out_path, str(e))
-        raise
+    # Step 2: Render the SQL straight into the SQL file
+    write_postgresql_sql(analysis, out_path)
+    debug("Successfully wrote formatted PostgreSQL SQL to %s", out_path)
 
 
     debug("=== JSON to PostgreSQL SQL processing complete for trigger %s ===", file_name)
 
 
-def read_json_to_postsql_triggers() -> None:
+def read_json_to_postsql_triggers(workers: int = 1, build_cache: Optional[BuildCache] = None) -> None:
     """
     Convert PL/JSON files to PostgreSQL format.
 
@@ -886,16 +1197,20 @@ def read_json_to_postsql_triggers() -> None:
     """
     info("=== Starting PL/JSON to PostgreSQL format conversion ===")
     process_files(
-        source_dir="files/format_pl_json",
+        source_dir=FORMAT_PL_JSON_DIR,
         target_dir=FORMAT_PL_SQL_DIR,
         file_pattern=JSON_FILE_SUFFIX,
         output_suffix="_postgresql.json",
         processor_func=convert_pl_json_to_postgresql_format,
+        workers=workers,
+        build_cache=build_cache,
+        cache_step="pl_json_to_postgresql",
+        mapping_sheets=RENDER_MAPPING_SHEETS,
     )
     info("=== PL/JSON to PostgreSQL format conversion complete ===")
 
 
-def convert_json_analysis_to_postgresql_sql() -> None:
+def convert_json_analysis_to_postgresql_sql(workers: int = 1, build_cache: Optional[BuildCache] = None) -> None:
     """
     Convert JSON analysis files directly to PostgreSQL SQL.
     
@@ -909,10 +1224,70 @@ def convert_json_analysis_to_postgresql_sql() -> None:
         file_pattern=ANALYSIS_JSON_SUFFIX,
         output_suffix="_postgresql.sql",
         processor_func=json_to_pl_sql_processor,
+        workers=workers,
+        build_cache=build_cache,
+        cache_step="json_to_postgresql_sql",
+        mapping_sheets=RENDER_MAPPING_SHEETS,
     )
     info("=== JSON analysis to PostgreSQL SQL conversion complete ===")
 
 
+def build_postgresql_format(pl_json_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert PL/JSON data to the PostgreSQL format (on_insert, on_update, on_delete SQL entries).
+
+
+    Args:
+        pl_json_data (Dict[str, Any]): PL/JSON produced by JSONTOPLJSON
+
+
+    Returns:
+        Dict[str, Any]: PostgreSQL format with one {"type": "sql", "sql": ...} entry per operation
+    """
+    debug("Converting to PostgreSQL format...")
+    try:
+        # Create the expected PostgreSQL format structure
+        postgresql_format = {}
+
+        # Convert the PL/JSON structure to PostgreSQL format
+        # The PL/JSON files have on_insert, on_update, on_delete arrays with complex objects
+        # We need to convert these to simple SQL strings
+
+        # Handle on_insert
+        if "on_insert" in pl_json_data and pl_json_data["on_insert"]:
+            # Convert the complex structure to a simple SQL string
+            sql_content = convert_complex_structure_to_sql(pl_json_data["on_insert"])
+            # Split into individual statements for better handling
+            # statements = [stmt.strip() for stmt in sql_content.split(';') if stmt.strip()]
+            # for stmt in statements:
+            #     if stmt:
+            postgresql_format["on_insert"] = [{"type": "sql", "sql": sql_content}]
+
+        # Handle on_update
+        if "on_update" in pl_json_data and pl_json_data["on_update"]:
+            sql_content = convert_complex_structure_to_sql(pl_json_data["on_update"])
+            # statements = [stmt.strip() for stmt in sql_content.split(';') if stmt.strip()]
+            # for stmt in statements:
+            #     if stmt:
+            postgresql_format["on_update"] = [{"type": "sql", "sql": sql_content}]
+
+        # Handle on_delete
+        if "on_delete" in pl_json_data and pl_json_data["on_delete"]:
+            sql_content = convert_complex_structure_to_sql(pl_json_data["on_delete"])
+            # statements = [stmt.strip() for stmt in sql_content.split(';') if stmt.strip()]
+            # for stmt in statements:
+            #     if stmt:
+            postgresql_format["on_delete"] = [{"type": "sql", "sql": sql_content}]
+
+        debug("PostgreSQL format conversion completed")
+
+
+    except Exception as e:
+        error("Failed to convert to PostgreSQL format: %s", str(e))
+        raise
+    return postgresql_format
+
+
 def convert_pl_json_to_postgresql_format(
     src_path: str, out_path: str, file_name: str
 ) -> None:
@@ -938,8 +1313,7 @@ def convert_pl_json_to_postgresql_format(
     # Step 1: Read the PL/JSON file
     debug("Reading PL/JSON file: %s", src_path)
     try:
-        with open(src_path, "r", encoding="utf-8") as f:
-            pl_json_data = json.load(f)
+        pl_json_data = ArtifactJSON.read(src_path)
         debug(
             "Successfully loaded PL/JSON data with keys: %s", list(pl_json_data.keys())
         )
@@ -951,54 +1325,13 @@ def convert_pl_json_to_postgresql_format(
         raise
     if "error" not in pl_json_data:
         # Step 2: Convert to PostgreSQL format
-        debug("Converting to PostgreSQL format...")
-        try:
-            # Create the expected PostgreSQL format structure
-            postgresql_format = {}
-
-            # Convert the PL/JSON structure to PostgreSQL format
-            # The PL/JSON files have on_insert, on_update, on_delete arrays with complex objects
-            # We need to convert these to simple SQL strings
-
-            # Handle on_insert
-            if "on_insert" in pl_json_data and pl_json_data["on_insert"]:
-                # Convert the complex structure to a simple SQL string
-                sql_content = convert_complex_structure_to_sql(pl_json_data["on_insert"])
-                # Split into individual statements for better handling
-                # statements = [stmt.strip() for stmt in sql_content.split(';') if stmt.strip()]
-                # for stmt in statements:
-                #     if stmt:
-                postgresql_format["on_insert"] = [{"type": "sql", "sql": sql_content}]
-
-            # Handle on_update
-            if "on_update" in pl_json_data and pl_json_data["on_update"]:
-                sql_content = convert_complex_structure_to_sql(pl_json_data["on_update"])
-                # statements = [stmt.strip() for stmt in sql_content.split(';') if stmt.strip()]
-                # for stmt in statements:
-                #     if stmt:
-                postgresql_format["on_update"] = [{"type": "sql", "sql": sql_content}]
-
-            # Handle on_delete
-            if "on_delete" in pl_json_data and pl_json_data["on_delete"]:
-                sql_content = convert_complex_structure_to_sql(pl_json_data["on_delete"])
-                # statements = [stmt.strip() for stmt in sql_content.split(';') if stmt.strip()]
-                # for stmt in statements:
-                #     if stmt:
-                postgresql_format["on_delete"] = [{"type": "sql", "sql": sql_content}]
-
-            debug("PostgreSQL format conversion completed")
-
-
-        except Exception as e:
-            error("Failed to convert to PostgreSQL format: %s", str(e))
-            raise
+        postgresql_format = build_postgresql_format(pl_json_data)
 
 
         # Step 3: Write to PostgreSQL format file
         debug("Writing PostgreSQL format to: %s", out_path)
         try:
-            with open(out_path, "w", encoding="utf-8") as f:
-                json.dump(postgresql_format, f, indent=4)
+            out_path = ArtifactJSON.write(postgresql_format, out_path, indent=4)
             debug("Successfully wrote PostgreSQL format to %s", out_path)
         except Exception as e:
             error("Failed to write PostgreSQL format file %s: %s", out_path, str(e))
@@ -1013,46 +1346,19 @@ def convert_pl_json_to_postgresql_format(
         error("PL/JSON file %s does not contain an error key, skipping conversion", src_path)
 
 
-def convert_postgresql_format_to_sql(
-    src_path: str, out_path: str, file_name: str
-) -> None:
-    """convert_postgresql_format_to_sql function."""
+def build_postgresql_sql(postgresql_data: Dict[str, Any], file_name: str) -> str:
     """
-    Convert PostgreSQL format JSON files to actual SQL files.
-
-
-    This function:
-    1. Reads the PostgreSQL format JSON file
-    2. Extracts the SQL content from on_insert, on_update, on_delete sections
-    3. Writes the SQL content to a .sql file
+    Build the final PostgreSQL SQL file content from PostgreSQL format data.
 
 
     Args:
-        src_path (str): Path to the source PostgreSQL format JSON file
-        out_path (str): Path to the output SQL file
-        file_name (str): Trigger number extracted from filename
-    """
-    debug("=== Converting PostgreSQL format to SQL for trigger %s ===", file_name)
+        postgresql_data (Dict[str, Any]): PostgreSQL format produced by build_postgresql_format()
+        file_name (str): Name shown in the file header
 
 
-    # Step 1: Read the PostgreSQL format JSON file
-    debug("Reading PostgreSQL format file: %s", src_path)
-    try:
-        with open(src_path, "r", encoding="utf-8") as f:
-            postgresql_data = json.load(f)
-        debug(
-            "Successfully loaded PostgreSQL format data with keys: %s",
-            list(postgresql_data.keys()),
-        )
-    except json.JSONDecodeError as e:
-        error("JSON decode error reading %s: %s", src_path, str(e))
-        raise
-    except Exception as e:
-        error("Error reading PostgreSQL format file %s: %s", src_path, str(e))
-        raise
-
-
-    # Step 2: Extract SQL content
+    Returns:
+        str: The SQL file content
+    """
     debug("Extracting SQL content...")
     try:
         sql_lines = []
@@ -1097,13 +1403,55 @@ def convert_postgresql_format_to_sql(
     except Exception as e:
         error("Failed to extract SQL content: %s", str(e))
         raise
+    return sql_content
+
+
+def convert_postgresql_format_to_sql(
+    src_path: str, out_path: str, file_name: str
+) -> None:
+    """convert_postgresql_format_to_sql function."""
+    """
+    Convert PostgreSQL format JSON files to actual SQL files.
+
+
+    This function:
+    1. Reads the PostgreSQL format JSON file
+    2. Extracts the SQL content from on_insert, on_update, on_delete sections
+    3. Writes the SQL content to a .sql file
+
+
+    Args:
+        src_path (str): Path to the source PostgreSQL format JSON file
+        out_path (str): Path to the output SQL file
+        file_name (str): Trigger number extracted from filename
+    """
+    debug("=== Converting PostgreSQL format to SQL for trigger %s ===", file_name)
+
+
+    # Step 1: Read the PostgreSQL format JSON file
+    debug("Reading PostgreSQL format file: %s", src_path)
+    try:
+        postgresql_data = ArtifactJSON.read(src_path)
+        debug(
+            "Successfully loaded PostgreSQL format data with keys: %s",
+            list(postgresql_data.keys()),
+        )
+    except json.JSONDecodeError as e:
+        error("JSON decode error reading %s: %s", src_path, str(e))
+        raise
+    except Exception as e:
+        error("Error reading PostgreSQL format file %s: %s", src_path, str(e))
+        raise
+
+
+    # Step 2: Extract SQL content (the header names the .json artifact in every format)
+    sql_content = build_postgresql_sql(postgresql_data, ArtifactJSON.logical_name(file_name))
 
 
     # Step 3: Write to SQL file
     debug("Writing SQL to: %s", out_path)
     try:
-        with open(out_path, "w", encoding="utf-8") as f:
-            f.write(sql_content)
+        ArtifactStore.write_text(out_path, sql_content)
         debug("Successfully wrote SQL to %s", out_path)
     except Exception as e:
         error("Failed to write SQL file %s: %s", out_path, str(e))
@@ -1116,7 +1464,7 @@ def convert_postgresql_format_to_sql(
     )
 
 
-def convert_postgresql_format_files_to_sql() -> None:
+def convert_postgresql_format_files_to_sql(workers: int = 1, build_cache: Optional[BuildCache] = None) -> None:
     """
     Convert PostgreSQL format JSON files to actual SQL files.
 
@@ -1131,11 +1479,394 @@ def convert_postgresql_format_files_to_sql() -> None:
         file_pattern="_postgresql.json",
         output_suffix=".sql",
         processor_func=convert_postgresql_format_to_sql,
+        workers=workers,
+        build_cache=build_cache,
+        cache_step="postgresql_json_to_sql",
+        mapping_sheets=RENDER_MAPPING_SHEETS,
     )
     info("=== PostgreSQL format to SQL conversion complete ===")
 
 
-def main() -> None:
+def _write_artifact(path: str, content: str) -> None:
+    """Write one text artifact of the in-memory pipeline."""
+    ArtifactStore.write_text(path, content)
+    debug("Successfully wrote %s", path)
+
+
+def analyze_trigger(src_path: str, out_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Parse one Oracle trigger and return its analysis dict, writing it to `out_path` if given.
+
+
+    Args:
+        src_path (str): Path to the source Oracle SQL file
+        out_path (Optional[str]): Path of the analysis JSON file to write
+
+
+    Returns:
+        Dict[str, Any]: The analysis produced by OracleTriggerAnalyzer.to_json()
+    """
+    analysis: Dict[str, Any] = OracleTriggerAnalyzer(src_path).to_json()
+    if out_path is not None:
+        ArtifactJSON.write(analysis, out_path, indent=2)
+    return analysis
+
+
+def analyze_dump_unit(dump: TriggerDump, unit: TriggerUnit, out_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Parse one trigger of a schema dump and return its analysis dict, writing it to `out_path` if given.
+
+
+    Args:
+        dump (TriggerDump): The open dump
+        unit (TriggerUnit): The trigger to parse
+        out_path (Optional[str]): Path of the analysis JSON file to write
+
+
+    Returns:
+        Dict[str, Any]: The analysis produced by OracleTriggerAnalyzer.to_json()
+    """
+    analyzer = OracleTriggerAnalyzer(unit.file_name, sql_content=dump.body(unit), file_details=dump.file_details(unit))
+    analysis: Dict[str, Any] = analyzer.to_json()
+    if out_path is not None:
+        ArtifactJSON.write(analysis, out_path, indent=2)
+    return analysis
+
+
+def _analyze_dump_unit_in_worker(
+    dump_path: str, unit: TriggerUnit, out_path: Optional[str], return_analysis: bool = True
+) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any], float, List[Any], Dict[str, Any]]:
+    """
+    Run `analyze_dump_unit` in a worker process on its own map of the dump.
+
+
+    Returns:
+        Tuple: (analysis, or None if not requested; deferred writes; duration in seconds;
+        captured artifact writes; the analysis' metadata.profile)
+    """
+    file_start = time.time()
+    with OracleTriggerAnalyzer.deferring_writes(flush=False) as file_writes, ArtifactStore.capture() as artifact_writes, TriggerDump(dump_path) as dump:
+        analysis = analyze_dump_unit(dump, unit, out_path)
+    return (
+        (analysis if return_analysis else None),
+        file_writes,
+        time.time() - file_start,
+        artifact_writes,
+        analysis["metadata"]["profile"],
+    )
+
+
+def _analyze_trigger_in_worker(src_path: str, out_path: Optional[str]) -> Tuple[Dict[str, Any], Dict[str, Any], float, List[Any], Dict[str, Any]]:
+    """Run `analyze_trigger` in a worker process; returns the same tuple as `_analyze_dump_unit_in_worker`."""
+    file_start = time.time()
+    with OracleTriggerAnalyzer.deferring_writes(flush=False) as file_writes, ArtifactStore.capture() as artifact_writes:
+        analysis = analyze_trigger(src_path, out_path)
+    return analysis, file_writes, time.time() - file_start, artifact_writes, analysis["metadata"]["profile"]
+
+
+def _render_trigger_artifacts_in_worker(analysis: Dict[str, Any], file_name: str, artifacts: Sequence[str]) -> Tuple[List[Any], Optional[Dict[str, Any]]]:
+    """Run `render_trigger_artifacts` in a worker process, returning the captured artifact writes and its result."""
+    with ArtifactStore.capture() as artifact_writes:
+        render_profile = render_trigger_artifacts(analysis, file_name, artifacts)
+    return artifact_writes, render_profile
+
+
+def render_trigger_artifacts(analysis: Dict[str, Any], file_name: str, artifacts: Sequence[str] = DIRECT_ARTIFACTS) -> Optional[Dict[str, Any]]:
+    """
+    Render one analysis through steps 2 and 5-8 in memory and write only the requested artifacts.
+
+
+    The analysis dict is passed straight to FormatSQL and JSONTOPLJSON, and the PL/JSON dict
+    straight to the PostgreSQL format conversion, instead of being written to disk and parsed
+    again by the next step. Neither renderer modifies its input, so one analysis dict serves
+    every step.
+
+
+    Args:
+        analysis (Dict[str, Any]): Analysis produced by OracleTriggerAnalyzer.to_json()
+        file_name (str): Source Oracle SQL file name
+        artifacts (Sequence[str]): Names from DIRECT_ARTIFACTS to write
+
+    Returns:
+        Optional[Dict[str, Any]]: FormatSQL's profile of the Oracle SQL render (None when
+        oracle_sql is not requested or the analysis has an error)
+    """
+    base_name = file_name.split('.')[0]
+    render_profile = None
+    if "error" not in analysis:
+        # Step 2: analysis → Oracle SQL
+        if "oracle_sql" in artifacts:
+            oracle_sql, render_profile = _render_oracle_sql_profiled(analysis, file_name)
+            _write_artifact(os.path.join(FORMAT_SQL_DIR, f"{base_name}_analysis.sql"), oracle_sql)
+
+        # Steps 5, 6 and 8: analysis → PL/JSON → PostgreSQL format → PostgreSQL SQL
+        if any(artifact in artifacts for artifact in ("pl_json", "postgresql_json", "postgresql_sql")):
+            pl_json_data = JSONTOPLJSON(analysis).to_dict()
+            if "pl_json" in artifacts:
+                ArtifactJSON.write(pl_json_data, os.path.join(FORMAT_PL_JSON_DIR, f"{base_name}.json"), indent=2, ensure_ascii=False)
+            if "error" not in pl_json_data and ("postgresql_json" in artifacts or "postgresql_sql" in artifacts):
+                postgresql_format = build_postgresql_format(pl_json_data)
+                postgresql_json_name = f"{base_name}_postgresql.json"
+                if "postgresql_json" in artifacts:
+                    ArtifactJSON.write(postgresql_format, os.path.join(FORMAT_PL_SQL_DIR, postgresql_json_name), indent=4)
+                if "postgresql_sql" in artifacts:
+                    _write_artifact(
+                        os.path.join(FORMAT_PL_SQL_DIR, f"{base_name}_postgresql.sql"),
+                        build_postgresql_sql(postgresql_format, postgresql_json_name),
+                    )
+    else:
+        error("Analysis Sql contains error: %s", analysis["error"])
+
+    # Step 7: analysis → PostgreSQL SQL
+    if "analysis_postgresql_sql" in artifacts:
+        out_path = os.path.join(FORMAT_PL_SQL_DIR, f"{base_name}_analysis_postgresql.sql")
+        write_postgresql_sql(analysis, out_path)
+        debug("Successfully wrote %s", out_path)
+    return render_profile
+
+
+def convert_triggers_in_memory(
+    artifacts: Sequence[str] = DIRECT_ARTIFACTS,
+    workers: int = 1,
+    save_exception_names: bool = True,
+    dump_path: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Convert all Oracle trigger SQL files (or all triggers of a schema dump) without the
+    intermediate JSON round-trips.
+
+
+    The conversion runs in two phases:
+    1. Parse every trigger once (`analyze_trigger`) and spill its analysis dict to a
+       temporary spool file (pickled, in file order)
+    2. Merge the exception names found into the workbook, as step 1 of the staged run does,
+       so the renderers see them; then read the analyses back one at a time and render
+       each (`render_trigger_artifacts`)
+
+    Only the workbook merge has to wait for every trigger to be parsed. No analysis is kept
+    in memory across the phases, so memory is bounded by the largest trigger (times the
+    2 * workers jobs in flight) rather than by the corpus or dump size.
+
+
+    Only the requested artifacts are written. With all artifacts requested the output files
+    are the same as those of the staged steps.
+
+
+    Args:
+        artifacts (Sequence[str]): Names from DIRECT_ARTIFACTS to write
+        workers (int): Number of worker processes per phase (1 = sequential)
+        save_exception_names (bool): Write newly found exception names to the mapping workbook
+        dump_path (Optional[str]): Read the triggers from this multi-trigger dump
+            (see read_trigger_dump_to_json) instead of files/oracle
+
+
+    Returns:
+        Dict[str, Any]: processed_count and file_profiles (per file: the "analysis" profile
+        and, when oracle_sql is written, the "render" profile)
+
+    Raises:
+        ValueError: If an artifact name is not in DIRECT_ARTIFACTS
+    """
+    unknown = [artifact for artifact in artifacts if artifact not in DIRECT_ARTIFACTS]
+    if unknown:
+        raise ValueError(f"Unknown artifacts: {', '.join(unknown)} (expected any of {', '.join(DIRECT_ARTIFACTS)})")
+    artifacts = tuple(artifacts)
+
+    info("=== Starting in-memory Oracle trigger conversion ===")
+    info("Artifacts: %s", ", ".join(artifacts))
+    for artifact, directory in (
+        ("analysis_json", FORMAT_JSON_DIR),
+        ("oracle_sql", FORMAT_SQL_DIR),
+        ("pl_json", FORMAT_PL_JSON_DIR),
+        ("postgresql_json", FORMAT_PL_SQL_DIR),
+        ("analysis_postgresql_sql", FORMAT_PL_SQL_DIR),
+        ("postgresql_sql", FORMAT_PL_SQL_DIR),
+    ):
+        if artifact in artifacts:
+            ensure_dir(directory)
+
+    # (file name, source path, analysis JSON path, dump unit or None)
+    jobs = []
+    if dump_path is not None:
+        with TriggerDump(dump_path) as dump:
+            units = list(dump.units())
+        for unit in units:
+            out_path = os.path.join(FORMAT_JSON_DIR, f"{unit.name}{ANALYSIS_JSON_SUFFIX}") if "analysis_json" in artifacts else None
+            jobs.append((unit.file_name, dump_path, out_path, unit))
+    else:
+        try:
+            file_names = [f for f in os.listdir(ORACLE_SQL_DIR) if f.endswith(".sql")]
+        except FileNotFoundError:
+            error("Source directory not found: %s", ORACLE_SQL_DIR)
+            return {"processed_count": 0, "file_profiles": {}}
+        for file_name in file_names:
+            out_path = None
+            if "analysis_json" in artifacts:
+                out_path = os.path.join(FORMAT_JSON_DIR, f"{file_name.split('.')[0]}{ANALYSIS_JSON_SUFFIX}")
+            jobs.append((file_name, os.path.join(ORACLE_SQL_DIR, file_name), out_path, None))
+
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 and len(jobs) > 1 else None
+    file_profiles: Dict[str, Dict[str, Any]] = {}
+    parsed_count = 0
+    # (file name, future), collected in file order so logs and merged side effects stay
+    # deterministic; at most 2 * workers jobs are in flight in either phase
+    in_flight = deque()
+    # Phase 1 spills each analysis here; phase 2 reads them back one at a time
+    spool = tempfile.TemporaryFile(prefix="direct_analyses_")
+
+    def spill(file_name: str, analysis: Dict[str, Any]) -> None:
+        nonlocal parsed_count
+        file_profiles[file_name] = {"analysis": analysis["metadata"]["profile"]}
+        pickle.dump((file_name, analysis), spool, pickle.HIGHEST_PROTOCOL)
+        parsed_count += 1
+
+    def collect_analysis(file_name: str, future) -> None:
+        analysis, file_writes, _, artifact_writes, _ = future.result()
+        OracleTriggerAnalyzer.flush_deferred_writes(file_writes)
+        ArtifactStore.apply(artifact_writes)
+        spill(file_name, analysis)
+
+    def collect_render(file_name: str, future) -> None:
+        artifact_writes, render_profile = future.result()
+        ArtifactStore.apply(artifact_writes)
+        if render_profile is not None:
+            file_profiles[file_name]["render"] = render_profile
+
+    ArtifactStore.begin()
+    try:
+        # Phase 1: parse every trigger; exception names are collected for one workbook write
+        info("Parsing %d Oracle triggers...", len(jobs))
+        try:
+            with OracleTriggerAnalyzer.deferring_writes(RUN_DEFERRED_WRITES, save_exception_names=save_exception_names):
+                if executor is not None:
+                    for file_name, src_path, out_path, unit in jobs:
+                        if unit is not None:
+                            future = executor.submit(_analyze_dump_unit_in_worker, src_path, unit, out_path)
+                        else:
+                            future = executor.submit(_analyze_trigger_in_worker, src_path, out_path)
+                        in_flight.append((file_name, future))
+                        if len(in_flight) >= 2 * workers:
+                            collect_analysis(*in_flight.popleft())
+                    while in_flight:
+                        collect_analysis(*in_flight.popleft())
+                elif dump_path is not None:
+                    with TriggerDump(dump_path) as dump:
+                        for file_name, _, out_path, unit in jobs:
+                            debug("Parsing %s", file_name)
+                            spill(file_name, analyze_dump_unit(dump, unit, out_path))
+                else:
+                    for file_name, src_path, out_path, _ in jobs:
+                        debug("Parsing %s", file_name)
+                        spill(file_name, analyze_trigger(src_path, out_path))
+        finally:
+            RestStringSink.flush()
+
+        # Phase 2: render every analysis with the updated mappings
+        info("Rendering %d analyses...", parsed_count)
+        spool.seek(0)
+        for _ in range(parsed_count):
+            file_name, analysis = pickle.load(spool)
+            if executor is None:
+                debug("Rendering %s", file_name)
+                render_profile = render_trigger_artifacts(analysis, file_name, artifacts)
+                if render_profile is not None:
+                    file_profiles[file_name]["render"] = render_profile
+                continue
+            in_flight.append((file_name, executor.submit(_render_trigger_artifacts_in_worker, analysis, file_name, artifacts)))
+            if len(in_flight) >= 2 * workers:
+                collect_render(*in_flight.popleft())
+        while in_flight:
+            collect_render(*in_flight.popleft())
+    except Exception as e:
+        error("In-memory conversion failed: %s", str(e))
+        raise
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        spool.close()
+        ArtifactStore.commit()
+
+    info("=== In-memory Oracle trigger conversion complete (%d files) ===", parsed_count)
+    return {"processed_count": parsed_count, "file_profiles": file_profiles}
+
+
+def _trigger_name(file_name: str) -> str:
+    """Return the trigger name of a stage input ("TRG.sql" and "TRG_analysis.json" give "TRG")."""
+    name = os.path.basename(file_name).split('.')[0]
+    analysis_suffix = ANALYSIS_JSON_SUFFIX.split('.')[0]
+    return name[:-len(analysis_suffix)] if name.endswith(analysis_suffix) else name
+
+
+def _add_stage_profiles(run_profiles: Dict[str, Dict[str, Dict[str, Any]]], stage: str, stats: Dict[str, Any]) -> None:
+    """Add the file_profiles of a stage's statistics to the run's profiles, per trigger, under `stage`."""
+    for file_name, profile in stats.get("file_profiles", {}).items():
+        run_profiles.setdefault(_trigger_name(file_name), {})[stage] = profile
+
+
+def log_slowest_files(run_profiles: Dict[str, Dict[str, Dict[str, Any]]], top_n: int = 10) -> None:
+    """
+    Log the files that took longest to parse and render, with their slowest passes.
+
+
+    Args:
+        run_profiles (Dict[str, Dict[str, Dict[str, Any]]]): Trigger name -> stage
+            ("analysis", "render") -> profile (see utilities/pass_profile.py)
+        top_n (int): Number of files to report (0 disables the report)
+    """
+    ranked = slowest_files(run_profiles, top_n)
+    if not ranked:
+        return
+    info("Slowest files (top %d of %d):", len(ranked), len(run_profiles))
+    for trigger_name, total_ns, profiles in ranked:
+        analysis_profile = profiles.get("analysis", {})
+        info(
+            "  - %-32s %8.3f seconds (%d nodes, depth %d, %d source lines)",
+            trigger_name,
+            total_ns / 1e9,
+            analysis_profile.get("node_count", 0),
+            analysis_profile.get("max_depth", 0),
+            analysis_profile.get("source_line_count", 0),
+        )
+        for stage, profile in profiles.items():
+            spans = ", ".join("%s %.3fs" % (name, duration_ns / 1e9) for name, duration_ns in top_spans(profile))
+            info("      %-8s %8.3f seconds: %s", stage, profile.get("total_ns", 0) / 1e9, spans)
+
+
+def log_render_cache(workers: int = 1) -> None:
+    """Log the hit rate of FormatSQL.render_cache (nothing when the cache is off)."""
+    cache = FormatSQL.render_cache
+    if cache is None:
+        return
+    stats = cache.stats()
+    info(
+        "Render cache: %d hits / %d lookups (%.1f%%), %d entries holding %d lines, %d evictions",
+        stats["hits"],
+        stats["lookups"],
+        stats["hit_rate"] * 100,
+        stats["entries"],
+        stats["lines"],
+        stats["evictions"],
+    )
+    if workers > 1:
+        info("  Renders in worker processes use each worker's own cache and are not counted here")
+
+
+def main(
+    workers: int = 1,
+    save_exception_names: bool = True,
+    incremental: bool = False,
+    direct: bool = False,
+    artifacts: Optional[Sequence[str]] = None,
+    dump_path: Optional[str] = None,
+    log_profile: Optional[str] = None,
+    json_format: str = "pretty",
+    strip_line_no: bool = False,
+    artifact_store: str = "directory",
+    artifact_archive: Optional[str] = None,
+    profile_top: int = 10,
+    render_cache: bool = False,
+    parser_engine: str = "legacy",
+) -> None:
     """
     Main execution function for the Oracle trigger conversion process.
 
@@ -1152,19 +1883,87 @@ def main() -> None:
 
     Each step is timed and logged for performance monitoring and debugging.
     The function includes comprehensive error handling with detailed logging.
+
+
+    Args:
+        workers (int): Number of worker processes used by the `process_files` steps
+        save_exception_names (bool): Write newly found exception names to the mapping workbook
+        incremental (bool): Skip files whose inputs, mapping sheets and parser version are
+            unchanged since the last run (manifest: files/.build_cache.json)
+        direct (bool): Carry each trigger through every step in memory
+            (convert_triggers_in_memory) instead of running the staged steps
+        artifacts (Optional[Sequence[str]]): Artifacts written in direct mode
+            (default: all of DIRECT_ARTIFACTS)
+        dump_path (Optional[str]): Read the Oracle triggers from this multi-trigger
+            schema dump instead of files/oracle
+        log_profile (Optional[str]): Logging profile passed to `setup_logging`
+            ("development" or "production")
+        json_format (str): Format of the JSON artifacts, one of JSON_FORMATS
+            ("pretty", "compact" or "gzip"); every stage reads all of them
+        strip_line_no (bool): Leave "line_no" keys and the duplicated rest_string_list
+            out of the JSON artifacts while writing them
+        artifact_store (str): Backend of the stage artifacts, one of ARTIFACT_STORES:
+            "directory" (one file per artifact) or "sqlite" (one archive file)
+        artifact_archive (Optional[str]): Archive file of the "sqlite" backend
+            (default: DEFAULT_ARCHIVE_PATH)
+        profile_top (int): Number of slowest files reported at the end of the run, from
+            the parse profiles (metadata.profile) and render profiles (0 disables the report)
+        render_cache (bool): Reuse the rendered SQL of identical statement subtrees across
+            renders (FormatSQL.render_cache, see utilities/render_cache.py) and log its hit rate
+        parser_engine (str): Parser engine of every OracleTriggerAnalyzer, one of PARSER_ENGINES;
+            "single_pass" is experimental (see utilities/single_pass_parser.py)
     """
     start_time = time.time()
 
 
     try:
         # Set up logging for the main script
-        _ , log_path = setup_logging()
+        _ , log_path = setup_logging(profile=log_profile)
         debug("Starting main conversion workflow")
         info("=== Starting Oracle Trigger Conversion Process ===")
         info("Logging to: %s", log_path)
+        if workers > 1:
+            info("Using %d worker processes", workers)
+        # Set before any worker process starts so the workers inherit it
+        ArtifactJSON.configure(json_format=json_format, strip_line_no=strip_line_no)
+        if json_format != "pretty" or strip_line_no:
+            info("JSON artifacts: %s%s", json_format, ", without line_no" if strip_line_no else "")
+        ArtifactStore.configure(backend=artifact_store, archive_path=artifact_archive)
+        if artifact_store != "directory":
+            info("Artifact store: %s (%s)", artifact_store, artifact_archive or DEFAULT_ARCHIVE_PATH)
+        if render_cache:
+            # Set before any worker process starts; each worker then fills its own copy
+            FormatSQL.render_cache = RenderCache()
+            info("Render cache: on")
+        if parser_engine not in PARSER_ENGINES:
+            raise ValueError(f"Unknown parser engine: {parser_engine} (expected one of {', '.join(PARSER_ENGINES)})")
+        # Set before any worker process starts so the workers inherit it
+        OracleTriggerAnalyzer.default_parser_engine = parser_engine
+        if parser_engine != "legacy":
+            info("Parser engine: %s (experimental)", parser_engine)
+        build_cache = BuildCache.load() if incremental else None
         debug("Logging system initialized")
         # clean the rest_list.csv file
-        pd.DataFrame(columns=["filename", "line", "line_no"]).to_csv("utilities/rest_list.csv",mode='w',index=False)
+        RestStringSink.reset()
+        # Trigger name -> stage -> profile, for the slowest-files report
+        run_profiles: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+        if direct:
+            if incremental:
+                warning("The build cache is not used in direct mode; converting every file")
+            info("Converting Oracle SQL files in memory...")
+            direct_start = time.time()
+            direct_stats = convert_triggers_in_memory(
+                artifacts=artifacts or DIRECT_ARTIFACTS, workers=workers, save_exception_names=save_exception_names, dump_path=dump_path
+            )
+            info("✓ In-memory conversion complete! (Duration: %.2f seconds)", time.time() - direct_start)
+            info("=== Batch conversion finished successfully ===")
+            info("Total execution time: %.2f seconds", time.time() - start_time)
+            for file_name, profiles in direct_stats["file_profiles"].items():
+                run_profiles[_trigger_name(file_name)] = profiles
+            log_slowest_files(run_profiles, profile_top)
+            log_render_cache(workers)
+            return
 
         # Step 1: Convert SQL to JSON
         # --------------------------
@@ -1173,11 +1972,17 @@ def main() -> None:
         step1_start = time.time()
        
         # Parse Oracle trigger files into structured JSON representation
-        read_oracle_triggers_to_json()
+        if dump_path is not None:
+            if incremental:
+                info("The build cache is not used for step 1 with --dump; parsing every trigger of the dump")
+            step1_stats = read_trigger_dump_to_json(dump_path, workers=workers, save_exception_names=save_exception_names)
+        else:
+            step1_stats = read_oracle_triggers_to_json(workers=workers, save_exception_names=save_exception_names, build_cache=build_cache)
+        _add_stage_profiles(run_profiles, "analysis", step1_stats)
        
         step1_duration = time.time() - step1_start
         info("✓ JSON conversion complete! (Duration: %.2f seconds)", step1_duration)
-        debug(f"Step 1 completed in {step1_duration:.2f} seconds")
+        debug("Step 1 completed in %.2f seconds", step1_duration)
 
         # Step 2: Convert JSON back to SQL
         # -------------------------------
@@ -1186,11 +1991,12 @@ def main() -> None:
         step2_start = time.time()
        
         # Generate formatted SQL from the JSON analysis
-        render_oracle_sql_from_analysis()
+        step2_stats = render_oracle_sql_from_analysis(workers=workers, build_cache=build_cache)
+        _add_stage_profiles(run_profiles, "render", step2_stats)
        
         step2_duration = time.time() - step2_start
         info("✓ SQL formatting complete! (Duration: %.2f seconds)", step2_duration)
-        debug(f"Step 2 completed in {step2_duration:.2f} seconds")
+        debug("Step 2 completed in %.2f seconds", step2_duration)
 
 
         # # Step 3: Clean JSON files
@@ -1204,7 +2010,7 @@ def main() -> None:
        
         # step3_duration = time.time() - step3_start
         # info("✓ JSON cleaning complete! (Duration: %.2f seconds)", step3_duration)
-        # debug(f"Step 3 completed in {step3_duration:.2f} seconds")
+        # debug("Step 3 completed in %.2f seconds", step3_duration)
 
 
         # Step 5: Convert JSON to PL/JSON
@@ -1214,11 +2020,11 @@ def main() -> None:
         step5_start = time.time()
        
         # Transform JSON to operation-specific structure for PostgreSQL
-        read_json_to_oracle_triggers()
+        read_json_to_oracle_triggers(build_cache=build_cache)
        
         step5_duration = time.time() - step5_start
         info("✓ PL/JSON conversion complete! (Duration: %.2f seconds)", step5_duration)
-        debug(f"Step 5 completed in {step5_duration:.2f} seconds")
+        debug("Step 5 completed in %.2f seconds", step5_duration)
 
 
         # Step 6: Convert PL/JSON to PostgreSQL format
@@ -1228,11 +2034,11 @@ def main() -> None:
         step6_start = time.time()
        
         # Convert PL/JSON to PostgreSQL trigger structure
-        read_json_to_postsql_triggers()
+        read_json_to_postsql_triggers(workers=workers, build_cache=build_cache)
        
         step6_duration = time.time() - step6_start
         info("✓ PostgreSQL format conversion complete! (Duration: %.2f seconds)", step6_duration)
-        debug(f"Step 6 completed in {step6_duration:.2f} seconds")
+        debug("Step 6 completed in %.2f seconds", step6_duration)
 
 
         # Step 7: Convert JSON analysis directly to PostgreSQL SQL
@@ -1242,11 +2048,11 @@ def main() -> None:
         step7_start = time.time()
        
         # Convert JSON analysis directly to PostgreSQL SQL
-        convert_json_analysis_to_postgresql_sql()
+        convert_json_analysis_to_postgresql_sql(workers=workers, build_cache=build_cache)
        
         step7_duration = time.time() - step7_start
         info("✓ Direct PostgreSQL SQL conversion complete! (Duration: %.2f seconds)", step7_duration)
-        debug(f"Step 7 completed in {step7_duration:.2f} seconds")
+        debug("Step 7 completed in %.2f seconds", step7_duration)
 
 
         # Step 8: Generate final PostgreSQL SQL files
@@ -1256,11 +2062,11 @@ def main() -> None:
         step8_start = time.time()
        
         # Generate the final PostgreSQL SQL files
-        convert_postgresql_format_files_to_sql()
+        convert_postgresql_format_files_to_sql(workers=workers, build_cache=build_cache)
        
         step8_duration = time.time() - step8_start
         info("✓ Final SQL generation complete! (Duration: %.2f seconds)", step8_duration)
-        debug(f"Step 8 completed in {step8_duration:.2f} seconds")
+        debug("Step 8 completed in %.2f seconds", step8_duration)
 
 
         # Final summary
@@ -1277,6 +2083,14 @@ def main() -> None:
         info("  - Step 6 (PL/JSON → PostgreSQL):    %.2f seconds (%.1f%%)", step6_duration, step6_duration/total_duration*100)
         info("  - Step 7 (JSON → PostgreSQL SQL):   %.2f seconds (%.1f%%)", step7_duration, step7_duration/total_duration*100)
         info("  - Step 8 (PostgreSQL JSON → SQL):   %.2f seconds (%.1f%%)", step8_duration, step8_duration/total_duration*100)
+
+        if build_cache is not None:
+            info("Build cache (hits / rebuilt):")
+            for cache_step, step_stats in build_cache.stats.items():
+                info("  - %-24s %d / %d", cache_step, step_stats["hits"], step_stats["misses"])
+
+        log_slowest_files(run_profiles, profile_top)
+        log_render_cache(workers)
        
         debug("Main conversion workflow completed successfully")
 
@@ -1289,14 +2103,84 @@ def main() -> None:
     except Exception as e:
         critical("Fatal error during conversion: %s", str(e))
         critical("Process failed after %.2f seconds", time.time() - start_time)
-        debug(f"Fatal error details: {type(e).__name__}: {str(e)}")
+        debug("Fatal error details: %s: %s", type(e).__name__, str(e))
         import traceback
-        debug(f"Error traceback: {traceback.format_exc()}")
+        debug("Error traceback: %s", traceback.format_exc())
         raise
 
 
 if __name__ == "__main__":
-    main()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert Oracle triggers to JSON, formatted SQL and PostgreSQL.")
+    parser.add_argument("--workers", type=int, default=1, help="number of worker processes per step (default: 1, sequential)")
+    parser.add_argument("--incremental", action="store_true", help="skip files whose inputs and mappings are unchanged since the last run")
+    parser.add_argument("--direct", action="store_true", help="convert the triggers without the intermediate JSON round-trips (analyses are spooled to one temporary file between parsing and rendering)")
+    parser.add_argument(
+        "--artifacts",
+        default=",".join(DIRECT_ARTIFACTS),
+        help=f"comma-separated artifacts written in --direct mode (default: all of {', '.join(DIRECT_ARTIFACTS)})",
+    )
+    parser.add_argument("--dump", metavar="PATH", help="read the triggers from a multi-trigger schema dump instead of files/oracle")
+    parser.add_argument(
+        "--log-profile",
+        choices=LOG_PROFILES,
+        help="logging profile: development logs everything to the file, production skips debug records and rotates the log (default: development)",
+    )
+    parser.add_argument(
+        "--json-format",
+        choices=JSON_FORMATS,
+        default="pretty",
+        help="format of the JSON artifacts: pretty (indented), compact or gzip (compact, .json.gz); every stage reads all of them (default: pretty)",
+    )
+    parser.add_argument("--strip-line-no", action="store_true", help="leave line_no keys and the duplicated rest_string_list out of the JSON artifacts")
+    parser.add_argument(
+        "--artifact-store",
+        choices=ARTIFACT_STORES,
+        default="directory",
+        help="where the stage artifacts are kept: directory (one file each under files/) or sqlite (one archive file) (default: directory)",
+    )
+    parser.add_argument("--artifact-archive", metavar="PATH", help=f"archive file of --artifact-store sqlite (default: {DEFAULT_ARCHIVE_PATH})")
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=10,
+        metavar="N",
+        help="report the N slowest files with their slowest parse and render passes at the end of the run (0: no report; default: 10)",
+    )
+    parser.add_argument(
+        "--render-cache",
+        action="store_true",
+        help="reuse the rendered SQL of identical statement subtrees (operation splits, repeated blocks) and report the hit rate",
+    )
+    parser.add_argument(
+        "--parser-engine",
+        choices=PARSER_ENGINES,
+        default="legacy",
+        help="parser engine of step 1: legacy, or the experimental single_pass (one recursive descent, same JSON) (default: legacy)",
+    )
+    parser.add_argument("--no-save-exceptions", action="store_true", help="do not write newly found exception names to the mapping workbook")
+    args = parser.parse_args()
+    artifacts = [artifact.strip() for artifact in args.artifacts.split(",") if artifact.strip()]
+    unknown = [artifact for artifact in artifacts if artifact not in DIRECT_ARTIFACTS]
+    if unknown:
+        parser.error(f"unknown artifacts: {', '.join(unknown)}")
+    main(
+        workers=max(1, args.workers),
+        save_exception_names=not args.no_save_exceptions,
+        incremental=args.incremental,
+        direct=args.direct,
+        artifacts=artifacts,
+        dump_path=args.dump,
+        log_profile=args.log_profile,
+        json_format=args.json_format,
+        strip_line_no=args.strip_line_no,
+        artifact_store=args.artifact_store,
+        artifact_archive=args.artifact_archive,
+        profile_top=max(0, args.profile_top),
+        render_cache=args.render_cache,
+        parser_engine=args.parser_engine,
+    )
 
 
 
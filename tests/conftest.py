@@ -0,0 +1,124 @@
+"""
+Shared fixtures of the test suite.
+
+Tests run from the repository root, so relative paths such as the mapping
+workbook (utilities/oracle_postgresql_mappings.xlsx) resolve as they do for
+main.py. Rest strings and exception names found by the analyzer are collected
+in memory, so no test writes the workbook or rest_list.csv.
+
+`run_pipeline` runs main.main() in a temporary working directory holding a
+copy of the workbook, like the `pipeline` benchmark case.
+`stage_artifacts` reads back what a run wrote, without the fields that
+differ between runs.
+"""
+
+import gzip
+import json
+import os
+import shutil
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from utilities.artifact_json import ArtifactJSON  # noqa: E402
+from utilities.artifact_store import ARTIFACT_ARCHIVE_ENV, ARTIFACT_STORE_ENV, ArtifactStore  # noqa: E402
+from utilities.common import main_excel_file  # noqa: E402
+from utilities.FormatSQL import FormatSQL  # noqa: E402
+from utilities.OracleTriggerAnalyzer import OracleTriggerAnalyzer  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def repo_root(monkeypatch):
+    """Run each test from the repository root."""
+    monkeypatch.chdir(REPO_ROOT)
+    return REPO_ROOT
+
+
+@pytest.fixture(autouse=True)
+def deferred_analyzer_writes():
+    """Collect the analyzer's rest strings and exception names in memory during the test."""
+    with OracleTriggerAnalyzer.deferring_writes(flush=False) as writes:
+        yield writes
+
+
+# Analysis fields that differ between runs of the same input
+VOLATILE_KEYS = ("parse_timestamp", "profile", "filepath", "last_modified", "created_time")
+# SQL header line holding the render time
+GENERATED_ON = "-- Generated on:"
+
+
+def analyze(file_name, text):
+    """Analyze one trigger body as step 1 does and return its analysis dict."""
+    return OracleTriggerAnalyzer(file_name, sql_content=text).to_json()
+
+
+def without_volatile_keys(value):
+    """Return JSON data without VOLATILE_KEYS at any depth."""
+    if isinstance(value, dict):
+        return {key: without_volatile_keys(item) for key, item in value.items() if key not in VOLATILE_KEYS}
+    if isinstance(value, list):
+        return [without_volatile_keys(item) for item in value]
+    return value
+
+
+def comparable_artifact(name, content):
+    """Decode an artifact (gzip included) without VOLATILE_KEYS or GENERATED_ON lines."""
+    if name.endswith(".gz"):
+        name, content = name[:-len(".gz")], gzip.decompress(content)
+    text = content.decode("utf-8")
+    if name.endswith(".json"):
+        return without_volatile_keys(json.loads(text))
+    return "".join(line for line in text.splitlines(keepends=True) if not line.startswith(GENERATED_ON))
+
+
+def stage_artifacts(work_dir, stage_directories):
+    """Return {stage directory: {name: comparable artifact}} of the files a run wrote (a missing directory is empty)."""
+    artifacts = {}
+    for directory in stage_directories:
+        path = os.path.join(work_dir, directory)
+        artifacts[directory] = {}
+        for name in sorted(os.listdir(path)) if os.path.isdir(path) else []:
+            with open(os.path.join(path, name), "rb") as f:
+                artifacts[directory][name] = comparable_artifact(name, f.read())
+    return artifacts
+
+
+@pytest.fixture
+def run_pipeline(tmp_path, monkeypatch):
+    """
+    Return run(name, corpus, **options): main.main() on the corpus in tmp_path/name.
+
+    The process-wide settings main() changes (JSON format, artifact store, render cache,
+    parser engine) are restored after the test. run() returns the working directory.
+    """
+    import main
+
+    monkeypatch.setattr(ArtifactJSON, "json_format", ArtifactJSON.json_format)
+    monkeypatch.setattr(ArtifactJSON, "strip_line_no", ArtifactJSON.strip_line_no)
+    monkeypatch.setattr(FormatSQL, "render_cache", FormatSQL.render_cache)
+    monkeypatch.setattr(OracleTriggerAnalyzer, "default_parser_engine", OracleTriggerAnalyzer.default_parser_engine)
+    monkeypatch.delenv(ARTIFACT_STORE_ENV, raising=False)
+    monkeypatch.delenv(ARTIFACT_ARCHIVE_ENV, raising=False)
+
+    def run(name, corpus, **options):
+        work_dir = tmp_path / name
+        (work_dir / main.ORACLE_SQL_DIR).mkdir(parents=True)
+        for file_name, text in corpus:
+            (work_dir / main.ORACLE_SQL_DIR / file_name).write_text(text, encoding="utf-8")
+        (work_dir / os.path.dirname(main_excel_file)).mkdir(parents=True)
+        shutil.copy2(os.path.join(REPO_ROOT, main_excel_file), work_dir / main_excel_file)
+        monkeypatch.chdir(work_dir)
+        try:
+            main.main(save_exception_names=False, log_profile="production", profile_top=0, **options)
+        finally:
+            ArtifactStore.close()
+            monkeypatch.chdir(REPO_ROOT)
+        return str(work_dir)
+
+    yield run
+    ArtifactStore.close()
+    ArtifactStore._backend = None
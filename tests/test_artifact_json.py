@@ -0,0 +1,109 @@
+import gzip
+import json
+import os
+
+import pytest
+
+from utilities.artifact_json import ArtifactJSON, encode_stripped
+
+DATA = {
+    "file_details": {"filename": "TRG.sql", "filesize": 42, "ratio": 0.5},
+    "main": [
+        {"line_no": 1, "line": "BEGIN", "indent": 0},
+        {"line_no": 2, "line": "v := 'café';", "nested": {"end_line_no": 2, "items": [], "flags": {}}},
+    ],
+    "declarations": {"variables": [{"name": "v", "data_type": "VARCHAR2", "default_value": None, "is_constant": False}]},
+    "rest_string_list": [{"line_no": 3, "line": "x"}],
+}
+STRIPPED = {
+    "file_details": DATA["file_details"],
+    "main": [
+        {"line": "BEGIN", "indent": 0},
+        {"line": "v := 'café';", "nested": {"items": [], "flags": {}}},
+    ],
+    "declarations": DATA["declarations"],
+}
+
+
+@pytest.fixture
+def artifact_json(monkeypatch):
+    """ArtifactJSON with its process-wide settings restored afterwards."""
+    monkeypatch.setattr(ArtifactJSON, "json_format", "pretty")
+    monkeypatch.setattr(ArtifactJSON, "strip_line_no", False)
+    return ArtifactJSON
+
+
+@pytest.mark.parametrize("json_format", ["pretty", "compact", "gzip"])
+@pytest.mark.parametrize("strip_line_no", [False, True])
+def test_round_trip(artifact_json, tmp_path, json_format, strip_line_no):
+    artifact_json.configure(json_format=json_format, strip_line_no=strip_line_no)
+    path = str(tmp_path / "TRG_analysis.json")
+    out_path = artifact_json.write(DATA, path)
+    assert out_path == (path + ".gz" if json_format == "gzip" else path)
+    assert artifact_json.read(out_path) == (STRIPPED if strip_line_no else DATA)
+    # The .json path finds the gzip file too
+    assert artifact_json.read(path) == artifact_json.read(out_path)
+
+
+def test_pretty_matches_indented_json_dump(artifact_json, tmp_path):
+    path = str(tmp_path / "TRG_analysis.json")
+    artifact_json.write(DATA, path)
+    with open(path, encoding="utf-8") as f:
+        assert f.read() == json.dumps(DATA, indent=2)
+
+
+def test_gzip_is_deterministic_compact_json(artifact_json, tmp_path):
+    artifact_json.configure(json_format="gzip")
+    path = str(tmp_path / "TRG_analysis.json")
+    out_path = artifact_json.write(DATA, path)
+    with open(out_path, "rb") as f:
+        first = f.read()
+    artifact_json.write(DATA, path)
+    with open(out_path, "rb") as f:
+        assert f.read() == first
+    assert gzip.decompress(first).decode("utf-8") == json.dumps(DATA, separators=(",", ":"))
+    assert artifact_json.read_text(out_path) == json.dumps(DATA, separators=(",", ":"))
+
+
+@pytest.mark.parametrize("indent", [None, 2, 4])
+@pytest.mark.parametrize("ensure_ascii", [True, False])
+def test_encode_stripped_matches_json_dumps(indent, ensure_ascii):
+    separators = (",", ":") if indent is None else None
+    expected = json.dumps(STRIPPED, indent=indent, ensure_ascii=ensure_ascii, separators=separators)
+    assert encode_stripped(DATA, indent=indent, ensure_ascii=ensure_ascii) == expected
+
+
+def test_encode_stripped_rejects_unserializable_values():
+    with pytest.raises(TypeError):
+        encode_stripped({"value": object()})
+
+
+def test_writing_one_form_removes_the_other(artifact_json, tmp_path):
+    path = str(tmp_path / "TRG_analysis.json")
+    artifact_json.configure(json_format="gzip")
+    artifact_json.write(DATA, path)
+    artifact_json.configure(json_format="compact")
+    artifact_json.write(DATA, path)
+    assert os.listdir(tmp_path) == ["TRG_analysis.json"]
+    artifact_json.configure(json_format="gzip")
+    artifact_json.write(DATA, path)
+    assert os.listdir(tmp_path) == ["TRG_analysis.json.gz"]
+
+
+def test_read_missing_artifact(artifact_json, tmp_path):
+    with pytest.raises(FileNotFoundError):
+        artifact_json.read(str(tmp_path / "missing.json"))
+
+
+def test_unknown_format(artifact_json):
+    with pytest.raises(ValueError):
+        artifact_json.configure(json_format="yaml")
+    assert artifact_json.json_format == "pretty"
+
+
+def test_names():
+    assert ArtifactJSON.matches("TRG_analysis.json.gz", "_analysis.json")
+    assert ArtifactJSON.matches("TRG_analysis.json", "_analysis.json")
+    assert not ArtifactJSON.matches("TRG_analysis.sql.gz", "_analysis.sql")
+    assert ArtifactJSON.logical_name("TRG_analysis.json.gz") == "TRG_analysis.json"
+    assert ArtifactJSON.logical_name("TRG_analysis.sql") == "TRG_analysis.sql"
@@ -0,0 +1,60 @@
+import os
+import sqlite3
+
+import pytest
+
+from benchmarks.generator import TriggerSpec, generate_corpus
+from conftest import comparable_artifact, stage_artifacts
+from utilities.artifact_store import ARTIFACT_ARCHIVE_ENV, ARTIFACT_STORE_ENV, STAGE_DIRECTORIES, ArtifactStore
+
+CORPUS = generate_corpus(TriggerSpec(lines=150, max_depth=4), count=4, seed=2)
+ARCHIVE = "archive/artifacts.sqlite"
+
+
+def archive_artifacts(work_dir):
+    """Return the archive rows of a run in the layout of stage_artifacts()."""
+    artifacts = {directory: {} for directory in STAGE_DIRECTORIES.values()}
+    with sqlite3.connect(os.path.join(work_dir, ARCHIVE)) as connection:
+        for stage, name, content in connection.execute("SELECT stage, name, content FROM artifacts ORDER BY stage, name"):
+            artifacts[STAGE_DIRECTORIES[stage]][name] = comparable_artifact(name, content)
+    return artifacts
+
+
+@pytest.mark.parametrize("options", [{}, {"workers": 2}, {"direct": True}, {"json_format": "gzip"}], ids=["staged", "workers", "direct", "gzip"])
+def test_sqlite_archive_matches_directory_files(run_pipeline, options):
+    directory_run = run_pipeline("directory", CORPUS, **options)
+    sqlite_run = run_pipeline("sqlite", CORPUS, artifact_store="sqlite", artifact_archive=ARCHIVE, **options)
+
+    files = stage_artifacts(directory_run, STAGE_DIRECTORIES.values())
+    assert all(files.values())
+    assert archive_artifacts(sqlite_run) == files
+    # Nothing of the stages was written as a file by the sqlite run
+    for directory in STAGE_DIRECTORIES.values():
+        path = os.path.join(sqlite_run, directory)
+        assert not os.path.isdir(path) or not os.listdir(path)
+
+
+@pytest.mark.parametrize("backend", ["directory", "sqlite"])
+def test_captured_writes_are_applied(tmp_path, monkeypatch, backend):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv(ARTIFACT_STORE_ENV, raising=False)
+    monkeypatch.delenv(ARTIFACT_ARCHIVE_ENV, raising=False)
+    directory = STAGE_DIRECTORIES["format_sql"]
+    os.makedirs(directory)
+    try:
+        ArtifactStore.configure(backend=backend, archive_path=ARCHIVE)
+        with ArtifactStore.capture() as writes:
+            ArtifactStore.write_text(os.path.join(directory, "A_analysis.sql"), "BEGIN\n    NULL;\nEND;\n")
+            ArtifactStore.write_bytes(os.path.join(directory, "B_analysis.sql"), b"NULL;")
+        assert len(writes) == (2 if backend == "sqlite" else 0)
+        ArtifactStore.apply(writes)
+        with ArtifactStore.batch():
+            ArtifactStore.delete(os.path.join(directory, "B_analysis.sql"))
+
+        assert ArtifactStore.is_archive(directory) == (backend == "sqlite")
+        assert ArtifactStore.list_names(directory) == ["A_analysis.sql"]
+        assert ArtifactStore.read_text(os.path.join(directory, "A_analysis.sql")) == "BEGIN\n    NULL;\nEND;\n"
+        assert os.listdir(directory) == ([] if backend == "sqlite" else ["A_analysis.sql"])
+    finally:
+        ArtifactStore.close()
+        ArtifactStore._backend = None
@@ -0,0 +1,109 @@
+import pandas as pd
+import pytest
+
+from utilities.build_cache import BuildCache
+from utilities.mapping_store import MappingStore
+
+SHEETS = ("function_list",)
+
+
+def write_workbook(path, functions, types=("NUMBER",)):
+    with pd.ExcelWriter(path) as writer:
+        pd.DataFrame({"function_name": list(functions)}).to_excel(writer, sheet_name="function_list", index=False)
+        pd.DataFrame({"Oracle_Type": list(types), "PostgreSQL_Type": ["numeric"] * len(types)}).to_excel(writer, sheet_name="data_type_mappings", index=False)
+    MappingStore.invalidate()
+
+
+@pytest.fixture
+def workbook(tmp_path, monkeypatch):
+    """A small mapping workbook in place of utilities/oracle_postgresql_mappings.xlsx."""
+    path = str(tmp_path / "mappings.xlsx")
+    write_workbook(path, ["TXO_UTIL.SET_WARNING"])
+    monkeypatch.setattr(MappingStore, "EXCEL_MAPPING_PATH", path)
+    MappingStore.invalidate()
+    yield path
+    MappingStore.invalidate()
+
+
+@pytest.fixture
+def stage(tmp_path):
+    """Paths of one stage input and its output."""
+    src_path, out_path = tmp_path / "TRG.sql", tmp_path / "TRG_analysis.json"
+    src_path.write_text("BEGIN\n    NULL;\nEND;\n", encoding="utf-8")
+    return str(src_path), str(out_path)
+
+
+def build(cache, stage, deferred_writes=None):
+    """Run the stage for the input: look it up, and on a miss write the output and store it."""
+    src_path, out_path = stage
+    key = cache.input_key("sql_to_json", src_path, SHEETS)
+    entry = cache.lookup("sql_to_json", src_path, key, out_path)
+    if entry is None:
+        with open(out_path, "w", encoding="utf-8") as f:
+            f.write("{}")
+        cache.store("sql_to_json", src_path, key, out_path, deferred_writes)
+    return entry
+
+
+def test_hit_after_store(workbook, stage, tmp_path):
+    cache = BuildCache(str(tmp_path / "manifest.json"))
+
+    assert build(cache, stage) is None
+    assert build(cache, stage) is not None
+    assert cache.stats["sql_to_json"] == {"hits": 1, "misses": 1}
+
+
+def test_source_change_misses(workbook, stage, tmp_path):
+    cache = BuildCache(str(tmp_path / "manifest.json"))
+    build(cache, stage)
+    with open(stage[0], "a", encoding="utf-8") as f:
+        f.write("-- changed\n")
+
+    assert build(cache, stage) is None
+
+
+def test_mapping_sheet_change_misses(workbook, stage, tmp_path):
+    cache = BuildCache(str(tmp_path / "manifest.json"))
+    build(cache, stage)
+    write_workbook(workbook, ["TXO_UTIL.SET_WARNING", "TXO_UTIL.SET_ERROR"])
+
+    assert build(cache, stage) is None
+
+
+def test_unrelated_sheet_change_hits(workbook, stage, tmp_path):
+    cache = BuildCache(str(tmp_path / "manifest.json"))
+    build(cache, stage)
+    write_workbook(workbook, ["TXO_UTIL.SET_WARNING"], types=("NUMBER", "VARCHAR2"))
+
+    assert build(cache, stage) is not None
+
+
+def test_changed_or_missing_output_misses(workbook, stage, tmp_path):
+    cache = BuildCache(str(tmp_path / "manifest.json"))
+    build(cache, stage)
+    with open(stage[1], "w", encoding="utf-8") as f:
+        f.write('{"edited": true}')
+
+    assert build(cache, stage) is None
+    (tmp_path / "TRG_analysis.json").unlink()
+    assert build(cache, stage) is None
+
+
+def test_saved_manifest_replays_deferred_writes(workbook, stage, tmp_path):
+    manifest_path = str(tmp_path / "manifest.json")
+    cache = BuildCache(manifest_path)
+    deferred_writes = {"rest_strings": [{"filename": "TRG.sql", "line": "x"}], "exception_names": {"ERR_A": "a"}}
+    build(cache, stage, deferred_writes)
+    cache.save()
+
+    entry = build(BuildCache.load(manifest_path), stage)
+
+    assert entry["rest_strings"] == deferred_writes["rest_strings"]
+    assert entry["exception_names"] == deferred_writes["exception_names"]
+
+
+def test_unreadable_manifest_starts_empty(tmp_path):
+    manifest_path = tmp_path / "manifest.json"
+    manifest_path.write_text("not json", encoding="utf-8")
+
+    assert BuildCache.load(str(manifest_path)).entries == {}
@@ -0,0 +1,52 @@
+import pytest
+
+from utilities.OracleTriggerAnalyzer import OracleTriggerAnalyzer
+
+
+@pytest.fixture
+def recorded_writes(monkeypatch):
+    """Record the rest-string and workbook writes instead of making them; no block is open."""
+    writes = {"rest_strings": [], "exception_names": []}
+    monkeypatch.setattr(OracleTriggerAnalyzer, "deferred_writes", None)
+    monkeypatch.setattr(OracleTriggerAnalyzer, "append_rest_strings", classmethod(lambda cls, rows: writes["rest_strings"].append(list(rows))))
+    monkeypatch.setattr(OracleTriggerAnalyzer, "save_exception_names", classmethod(lambda cls, names: writes["exception_names"].append(dict(names))))
+    return writes
+
+
+def test_flush_without_an_open_block_writes(recorded_writes):
+    OracleTriggerAnalyzer.flush_deferred_writes({"rest_strings": [{"line": "x"}], "exception_names": {"ERR_A": "a"}})
+
+    assert recorded_writes == {"rest_strings": [[{"line": "x"}]], "exception_names": [{"ERR_A": "a"}]}
+
+
+def test_run_block_writes_the_workbook_once(recorded_writes):
+    with OracleTriggerAnalyzer.deferring_writes(("exception_names",)) as run_writes:
+        # A worker's block collects both kinds and is merged by the parent
+        with OracleTriggerAnalyzer.deferring_writes(flush=False) as file_writes:
+            OracleTriggerAnalyzer.flush_deferred_writes({"rest_strings": [{"line": "x"}], "exception_names": {"ERR_A": "a"}})
+        assert file_writes == {"rest_strings": [{"line": "x"}], "exception_names": {"ERR_A": "a"}}
+        OracleTriggerAnalyzer.flush_deferred_writes(file_writes)
+        OracleTriggerAnalyzer.flush_deferred_writes({"exception_names": {"ERR_B": "b", "ERR_A": "later"}})
+
+        # Rest strings pass through to the sink; exception names wait for the block
+        assert recorded_writes == {"rest_strings": [[{"line": "x"}]], "exception_names": []}
+        assert run_writes == {"exception_names": {"ERR_A": "a", "ERR_B": "b"}}
+
+    assert OracleTriggerAnalyzer.deferred_writes is None
+    assert recorded_writes["exception_names"] == [{"ERR_A": "a", "ERR_B": "b"}]
+
+
+def test_read_only_block_drops_exception_names(recorded_writes):
+    with OracleTriggerAnalyzer.deferring_writes(("exception_names",), save_exception_names=False):
+        OracleTriggerAnalyzer.flush_deferred_writes({"exception_names": {"ERR_A": "a"}})
+
+    assert recorded_writes["exception_names"] == []
+
+
+def test_block_flushes_on_error(recorded_writes):
+    with pytest.raises(RuntimeError):
+        with OracleTriggerAnalyzer.deferring_writes(("exception_names",)):
+            OracleTriggerAnalyzer.flush_deferred_writes({"exception_names": {"ERR_A": "a"}})
+            raise RuntimeError("parse failed")
+
+    assert recorded_writes["exception_names"] == [{"ERR_A": "a"}]
@@ -0,0 +1,30 @@
+import pytest
+
+from benchmarks.generator import TriggerSpec, generate_corpus
+from conftest import REPO_ROOT, stage_artifacts
+from utilities.artifact_store import STAGE_DIRECTORIES
+
+with open(f"{REPO_ROOT}/files/oracle/zzz.sql", encoding="utf-8") as f:
+    CORPUS = generate_corpus(TriggerSpec(lines=200, max_depth=5), count=6, seed=4) + [("zzz.sql", f.read())]
+
+
+@pytest.fixture
+def staged(run_pipeline):
+    """Artifacts of a staged run of the corpus."""
+    return stage_artifacts(run_pipeline("staged", CORPUS), STAGE_DIRECTORIES.values())
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_direct_matches_staged(run_pipeline, staged, workers):
+    direct = stage_artifacts(run_pipeline("direct", CORPUS, direct=True, workers=workers), STAGE_DIRECTORIES.values())
+
+    assert all(staged.values())
+    assert direct == staged
+
+
+def test_direct_writes_only_requested_artifacts(run_pipeline, staged):
+    direct = stage_artifacts(run_pipeline("direct", CORPUS, direct=True, artifacts=["postgresql_sql"]), STAGE_DIRECTORIES.values())
+
+    final_sql = {name: sql for name, sql in staged["files/format_plsql"].items() if name.endswith("_postgresql.sql") and "_analysis_" not in name}
+    assert final_sql
+    assert direct == {directory: (final_sql if directory == "files/format_plsql" else {}) for directory in STAGE_DIRECTORIES.values()}
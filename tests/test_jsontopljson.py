@@ -0,0 +1,85 @@
+from utilities.ast_nodes import tree_to_dicts
+from utilities.FormatSQL import FormatSQL
+from utilities.JSONTOPLJSON import JSONTOPLJSON, referenced_identifiers
+
+from tests.conftest import analyze
+
+# IF INSERTING keeps an ELSIF and an ELSE that the on_insert render skips (IF TRUE)
+SPLIT_TRIGGER = """DECLARE
+    v_ins_cnt  PLS_INTEGER := 0;
+    v_upd_cnt  PLS_INTEGER := 0;
+    v_act_cnt  PLS_INTEGER := 0;
+    v_del_cnt  PLS_INTEGER := 0;
+    v_status   VARCHAR2(1);
+    err_upd    EXCEPTION;
+BEGIN
+    IF INSERTING THEN
+        v_ins_cnt := v_ins_cnt + 1;
+    ELSIF :NEW.STATUS_CD = 'A' THEN
+        v_act_cnt := v_act_cnt + 1;
+    ELSE
+        v_del_cnt := v_del_cnt + 1;
+    END IF;
+    IF UPDATING THEN
+        v_upd_cnt := v_upd_cnt + 1;
+    END IF;
+    v_status := :NEW.STATUS_CD;
+EXCEPTION
+    WHEN err_upd THEN
+        NULL;
+END;
+"""
+
+
+def render_based_declarations(declarations, main):
+    """The declarations _find_declarations kept before user-025: names found in the PostgreSQL render."""
+    sql = FormatSQL({"main": tree_to_dicts(main)}).to_sql("PostgreSQL")["sql"]
+    return {
+        decl_type: [decl for decl in declarations.get(decl_type, []) if decl["name"] in sql]
+        for decl_type in ("variables", "constants", "exceptions")
+    }
+
+
+def declared_names(declarations):
+    return {decl_type: [decl["name"] for decl in decls] for decl_type, decls in declarations.items()}
+
+
+def test_pruned_declarations_match_the_render_based_result():
+    analysis = analyze("TRG_SPLIT.sql", SPLIT_TRIGGER)
+    splitter = JSONTOPLJSON(analysis)
+    converted = splitter.to_dict()
+
+    assert set(converted) == {"on_insert", "on_update", "metadata"}
+    for operation, main in (("on_insert", splitter.after_parse_on_insert), ("on_update", splitter.after_parse_on_update)):
+        expected = render_based_declarations(analysis["declarations"], main)
+        assert declared_names(converted[operation]["declarations"]) == declared_names(expected)
+
+    assert declared_names(converted["on_insert"]["declarations"]) == {
+        "variables": ["v_ins_cnt", "v_status"],
+        "constants": [],
+        "exceptions": [],
+    }
+    # on_update: the IF INSERTING is replaced by its ELSIF, which keeps the ELSE
+    assert declared_names(converted["on_update"]["declarations"])["variables"] == ["v_upd_cnt", "v_act_cnt", "v_del_cnt", "v_status"]
+
+
+def test_referenced_identifiers_skip_unrendered_branches():
+    analysis = analyze("TRG_SPLIT.sql", SPLIT_TRIGGER)
+    splitter = JSONTOPLJSON(analysis)
+    splitter.to_dict()
+    on_insert = referenced_identifiers(splitter.after_parse_on_insert)
+
+    assert {"V_INS_CNT", "V_STATUS", "STATUS_CD"} <= on_insert
+    # ELSIF and ELSE of the IF TRUE, and the main block's exception handlers
+    assert not {"V_ACT_CNT", "V_DEL_CNT", "ERR_UPD"} & on_insert
+    # Whole tokens, any case
+    assert "V_INS" not in on_insert
+
+
+def test_referenced_identifiers_of_the_unsplit_tree():
+    analysis = analyze("TRG_SPLIT.sql", SPLIT_TRIGGER)
+    identifiers = referenced_identifiers(analysis["main"])
+
+    assert {"INSERTING", "V_INS_CNT", "V_ACT_CNT", "V_DEL_CNT", "V_UPD_CNT"} <= identifiers
+    assert "ERR_UPD" not in identifiers
+    assert "TRG_SPLIT" not in identifiers
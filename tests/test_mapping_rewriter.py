@@ -0,0 +1,61 @@
+import random
+import re
+
+import pytest
+
+from utilities.FormatSQL import FormatSQL
+from utilities.mapping_rewriter import MappingRewriter
+
+
+def legacy_rewrite(entries, text):
+    """The per-key loop MappingRewriter replaced: one whole-word, case-insensitive sub per entry."""
+    for key, replacement in entries:
+        try:
+            text = re.compile(r'\b' + re.escape(str(key)) + r'\b', re.IGNORECASE).sub(str(replacement), text)
+        except Exception:
+            continue
+    return text
+
+
+WORDS = ("nvl", "NVL2", "substr", "sysdate", "to_char", "to_date", "v_id", "v_id_old", "trunc", "dbms_lob", "Ümlaut")
+KEYS = WORDS + ("dbms_lob.substr", "sysdate()", ":new.", "a+b")
+REPLACEMENTS = ("coalesce", "substring", "now()", "dbms_lob.substr", "nvl", r"\1", "x\\y", "to_char", "CURRENT_DATE", "")
+
+
+def random_table(rng):
+    return [(rng.choice(KEYS), rng.choice(REPLACEMENTS)) for _ in range(rng.randint(1, 8))]
+
+
+def random_text(rng):
+    separators = (" ", ", ", "(", ")", ".", " || ", "\n", "'")
+    return "".join(rng.choice(WORDS + KEYS) + rng.choice(separators) for _ in range(rng.randint(1, 12)))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_rewriter_matches_the_legacy_loop_on_random_tables(seed):
+    rng = random.Random(seed)
+    for _ in range(50):
+        entries = random_table(rng)
+        rewriter = MappingRewriter(entries, "function")
+        for _ in range(5):
+            text = random_text(rng)
+            assert rewriter.rewrite(text) == legacy_rewrite(entries, text), (entries, text)
+
+
+def test_rewriter_matches_the_legacy_loop_on_the_function_table():
+    entries = list(FormatSQL({}).func_mapping.items())
+    rewriter = MappingRewriter(entries, "function")
+    texts = [
+        "SELECT NVL(a, 0), nvl2(b, 1, 2), SUBSTR(c, 1, 3) INTO v_x FROM DUAL;",
+        "v_date := TRUNC(SYSDATE) + 1;",
+        "IF NVL(txo_util.get_userid,'GENERIC') = 'GENERIC' THEN",
+        "DBMS_LOB.SUBSTR(v_clob, 10, 1) || TO_CHAR(v_num)",
+    ]
+    for text in texts:
+        assert rewriter.rewrite(text) == legacy_rewrite(entries, text)
+
+
+def test_chained_entries_rewrite_replacements():
+    entries = [("substr", "dbms_lob.substr"), ("dbms_lob", "pkg")]
+
+    assert MappingRewriter(entries).rewrite("SUBSTR(x)") == "pkg.substr(x)" == legacy_rewrite(entries, "SUBSTR(x)")
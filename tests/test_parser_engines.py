@@ -0,0 +1,34 @@
+import pytest
+
+from benchmarks.generator import TriggerSpec, generate_corpus
+from utilities.OracleTriggerAnalyzer import PARSER_ENGINES, OracleTriggerAnalyzer
+
+CORPUS = generate_corpus(TriggerSpec(lines=300, max_depth=5), count=12, seed=1)
+
+
+def comparable(analysis):
+    """The analysis without the fields that differ between runs (timestamp, profile)."""
+    metadata = {key: value for key, value in analysis["metadata"].items() if key not in ("parse_timestamp", "profile")}
+    return {**analysis, "metadata": metadata}
+
+
+@pytest.mark.parametrize("file_name, text", CORPUS, ids=[file_name for file_name, _ in CORPUS])
+def test_single_pass_matches_legacy(file_name, text):
+    legacy = OracleTriggerAnalyzer(file_name, sql_content=text, parser_engine="legacy").to_json()
+    single_pass = OracleTriggerAnalyzer(file_name, sql_content=text, parser_engine="single_pass").to_json()
+
+    assert comparable(single_pass) == comparable(legacy)
+    assert single_pass["metadata"]["profile"]["parser_engine"] == "single_pass"
+
+
+def test_single_pass_matches_legacy_on_the_sample_trigger(repo_root):
+    with open("files/oracle/zzz.sql", encoding="utf-8") as f:
+        text = f.read()
+    analyses = [OracleTriggerAnalyzer("zzz.sql", sql_content=text, parser_engine=engine).to_json() for engine in PARSER_ENGINES]
+
+    assert comparable(analyses[1]) == comparable(analyses[0])
+
+
+def test_unknown_parser_engine():
+    with pytest.raises(ValueError):
+        OracleTriggerAnalyzer("TRG.sql", sql_content="BEGIN\n    NULL;\nEND;\n", parser_engine="fast")
@@ -0,0 +1,118 @@
+import copy
+
+import pytest
+
+from benchmarks.generator import TriggerSpec, generate_corpus
+from conftest import analyze
+from utilities.FormatSQL import FormatSQL
+from utilities.render_cache import RenderCache, structural_hashes
+
+CORPUS = generate_corpus(TriggerSpec(lines=200, max_depth=5), count=6, seed=5)
+TRIGGER = """DECLARE
+    v_cnt NUMBER := 0;
+BEGIN
+    IF :NEW.STATUS_CD = 'A' THEN
+        v_cnt := v_cnt + 1;
+    END IF;
+    UPDATE hr.employees SET status_cd = 'X' WHERE employee_id = :NEW.EMPLOYEE_ID;
+END;
+"""
+
+
+def render(analysis, db_type, cache=None):
+    result = FormatSQL(analysis, render_cache=cache).to_sql(db_type)
+    return result["sql"], result["json_convert_sql"], result["profile"].get("render_cache")
+
+
+@pytest.mark.parametrize("db_type", ["Oracle", "PostgreSQL"])
+def test_cached_render_matches_uncached(db_type):
+    cache = RenderCache()
+    for file_name, text in CORPUS:
+        analysis = analyze(file_name, text)
+        sql, counts, _ = render(analysis, db_type)
+        for _ in range(2):
+            assert render(analysis, db_type, cache)[:2] == (sql, counts)
+    assert cache.stats()["hits"] > 0
+
+
+def test_miss_then_hit():
+    analysis = analyze("TRG.sql", TRIGGER)
+    cache = RenderCache()
+
+    _, _, first = render(analysis, "Oracle", cache)
+    assert first["hits"] == 0 and first["misses"] > 0
+    # The second render is served by the entry of the whole main block
+    _, _, second = render(analysis, "Oracle", cache)
+    assert second == {"hits": 1, "misses": 0}
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, first["misses"])
+    assert stats["hit_rate"] == 1 / (1 + first["misses"])
+
+
+def test_line_numbers_do_not_change_the_key():
+    analysis = analyze("TRG.sql", TRIGGER)
+    moved = analyze("TRG.sql", "\n\n" + TRIGGER)
+    assert moved["main"] != analysis["main"]
+    cache = RenderCache()
+
+    render(analysis, "Oracle", cache)
+    _, _, stats = render(moved, "Oracle", cache)
+    assert stats == {"hits": 1, "misses": 0}
+
+
+def test_changed_statement_misses_only_its_path():
+    analysis = analyze("TRG.sql", TRIGGER)
+    changed = analyze("TRG.sql", TRIGGER.replace("v_cnt + 1", "v_cnt + 2"))
+    cache = RenderCache()
+
+    render(analysis, "Oracle", cache)
+    sql, _, stats = render(changed, "Oracle", cache)
+    assert stats["misses"] > 0 and stats["hits"] > 0
+    assert "v_cnt + 2" in sql
+    assert sql == render(changed, "Oracle")[0]
+
+
+def test_database_type_is_part_of_the_key():
+    analysis = analyze("TRG.sql", TRIGGER)
+    cache = RenderCache()
+
+    render(analysis, "Oracle", cache)
+    _, _, stats = render(analysis, "PostgreSQL", cache)
+    assert stats["hits"] == 0
+
+
+def test_structural_hashes_ignore_positions():
+    analysis = analyze("TRG.sql", TRIGGER)
+    moved = copy.deepcopy(analysis["main"])
+    moved["begin_end_statements"][0]["indent"] = 99
+    first, second = structural_hashes(analysis["main"]), structural_hashes(moved)
+    assert first[id(analysis["main"])] != second[id(moved)]
+    assert first[id(analysis["main"]["begin_end_statements"][1])] == second[id(moved["begin_end_statements"][1])]
+
+
+def test_mapping_change_drops_entries():
+    cache = RenderCache()
+    functions, types = {"NVL": "COALESCE"}, {"NUMBER": "numeric"}
+    assert cache.mapping_version((functions, types)) == 1
+    cache.put(("key",), ("NULL;",), ())
+    # The same mappings, or equal copies, keep the entries
+    assert cache.mapping_version((functions, types)) == 1
+    assert cache.mapping_version((dict(functions), dict(types))) == 1
+    assert cache.get(("key",)) == (("NULL;",), ())
+    assert cache.mapping_version(({"NVL": "COALESCE", "SYSDATE": "now()"}, types)) == 2
+    assert cache.get(("key",)) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = RenderCache(max_lines=3)
+    cache.put("a", ("1", "2"), ())
+    cache.put("b", ("3",), ())
+    cache.get("a")
+    cache.put("c", ("4",), ())
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    # An entry larger than the whole budget is not kept
+    cache.put("d", ("1", "2", "3", "4"), ())
+    assert cache.get("d") is None
+    assert cache.stats()["evictions"] == 1
@@ -0,0 +1,67 @@
+import os
+
+import pytest
+
+from utilities.rest_string_sink import RestStringSink
+
+ROWS = [
+    {"filename": "A.sql", "line": "x := 1", "line_no": 3, "indent": 4},
+    {"filename": "B.sql", "line": "'quoted, text'", "line_no": 7, "indent": 0},
+]
+
+
+@pytest.fixture
+def sink(tmp_path, monkeypatch):
+    """RestStringSink writing to a temporary CSV with an empty buffer."""
+    monkeypatch.setattr(RestStringSink, "PATH", str(tmp_path / "rest_list.csv"))
+    monkeypatch.setattr(RestStringSink, "_buffer", [])
+    yield RestStringSink
+    RestStringSink._buffer = []
+
+
+def read_lines(sink):
+    with open(sink.PATH, encoding="utf-8") as f:
+        return f.read().splitlines()
+
+
+def test_append_is_buffered_until_flush(sink):
+    sink.append(ROWS)
+    assert not os.path.exists(sink.PATH)
+    assert sink.flush() == 2
+    assert read_lines(sink) == ["filename,line,line_no,indent", "A.sql,x := 1,3,4", "B.sql,\"'quoted, text'\",7,0"]
+    assert sink.flush() == 0
+
+
+def test_flush_appends_to_existing_file(sink):
+    sink.reset()
+    sink.append(ROWS[:1])
+    sink.flush()
+    sink.append(ROWS[1:])
+    sink.flush()
+    assert read_lines(sink) == ["filename,line,line_no,indent", "A.sql,x := 1,3,4", "B.sql,\"'quoted, text'\",7,0"]
+
+
+def test_flush_widens_an_older_header(sink):
+    with open(sink.PATH, "w", encoding="utf-8") as f:
+        f.write("filename,line\nOLD.sql,y\n")
+    sink.append(ROWS[:1])
+    sink.flush()
+    assert read_lines(sink) == ["filename,line,line_no,indent", "OLD.sql,y,,", "A.sql,x := 1,3,4"]
+
+
+def test_load_flushes_pending_rows(sink):
+    sink.reset()
+    sink.append(ROWS)
+    frame = sink.load()
+    assert frame["filename"].tolist() == ["A.sql", "B.sql"]
+    assert frame["line_no"].tolist() == [3, 7]
+    assert sink._buffer == []
+
+
+def test_buffer_flushes_itself_when_full(sink, monkeypatch):
+    monkeypatch.setattr(RestStringSink, "MAX_BUFFERED_ROWS", 2)
+    sink.append(ROWS[:1])
+    assert sink._buffer == ROWS[:1]
+    sink.append(ROWS[1:])
+    assert sink._buffer == []
+    assert len(read_lines(sink)) == 3
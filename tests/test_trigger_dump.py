@@ -0,0 +1,83 @@
+import pytest
+
+from utilities.trigger_dump import TriggerDump
+
+DUMP = """-- DBMS_METADATA export
+  CREATE OR REPLACE EDITIONABLE TRIGGER "HR"."EMP_BIU"
+  BEFORE INSERT OR UPDATE ON hr.employees
+  FOR EACH ROW
+DECLARE
+    v_cnt NUMBER;
+BEGIN
+    v_cnt := 1;
+END;
+/
+ALTER TRIGGER "HR"."EMP_BIU" ENABLE;
+
+CREATE TRIGGER hr.dept_aiu
+AFTER INSERT ON hr.departments
+BEGIN
+    NULL;
+END;
+/
+
+CREATE OR REPLACE TRIGGER "MixedCase"
+BEFORE DELETE ON jobs
+BEGIN
+    RAISE_APPLICATION_ERROR(-20001, 'no deletes');
+END;
+
+"""
+
+
+@pytest.fixture
+def dump_path(tmp_path):
+    path = tmp_path / "hr_triggers.sql"
+    path.write_text(DUMP, encoding="utf-8")
+    return str(path)
+
+
+def test_units_in_file_order_including_last(dump_path):
+    with TriggerDump(dump_path) as dump:
+        units = list(dump.units())
+    assert [(unit.schema, unit.name) for unit in units] == [("HR", "EMP_BIU"), ("HR", "DEPT_AIU"), (None, "MixedCase")]
+    assert [unit.file_name for unit in units] == ["EMP_BIU.sql", "DEPT_AIU.sql", "MixedCase.sql"]
+
+
+def test_text_and_body_bounds(dump_path):
+    with TriggerDump(dump_path) as dump:
+        first, second, last = dump.units()
+        assert dump.text(first).startswith('CREATE OR REPLACE EDITIONABLE TRIGGER "HR"."EMP_BIU"')
+        assert dump.body(first) == "DECLARE\n    v_cnt NUMBER;\nBEGIN\n    v_cnt := 1;\nEND;"
+        assert dump.body(second) == "BEGIN\n    NULL;\nEND;"
+        # The last unit has no terminator and runs to the end of the file
+        assert dump.body(last) == "BEGIN\n    RAISE_APPLICATION_ERROR(-20001, 'no deletes');\nEND;"
+        for unit in (first, second, last):
+            assert "/" not in dump.text(unit).splitlines()
+            assert "ALTER TRIGGER" not in dump.text(unit)
+
+
+def test_last_unit_without_terminator_stops_at_next_unit(tmp_path):
+    path = tmp_path / "two.sql"
+    path.write_text("CREATE TRIGGER a\nBEGIN\n    NULL;\nEND;\nCREATE TRIGGER b\nBEGIN\n    NULL;\nEND;", encoding="utf-8")
+    with TriggerDump(str(path)) as dump:
+        units = list(dump.units())
+        assert [unit.name for unit in units] == ["A", "B"]
+        assert [dump.body(unit) for unit in units] == ["BEGIN\n    NULL;\nEND;"] * 2
+
+
+def test_file_details(dump_path):
+    with TriggerDump(dump_path) as dump:
+        unit = next(dump.units())
+        details = dump.file_details(unit)
+    assert details["filename"] == "EMP_BIU.sql"
+    assert details["dump_schema"] == "HR"
+    assert (details["dump_offset"], details["dump_end"]) == (unit.start, unit.end)
+    assert details["filesize"] == unit.end - unit.body_start
+
+
+def test_empty_dump(tmp_path):
+    path = tmp_path / "empty.sql"
+    path.write_bytes(b"")
+    with TriggerDump(str(path)) as dump:
+        assert list(dump.units()) == []
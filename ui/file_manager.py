@@ -71,7 +71,7 @@ def file_manager_page():
                     file_path = os.path.join(directory, selected_file)
                     
                     # Check if file still exists (might have been deleted)
-                    if not os.path.exists(file_path):
+                    if not FileManager.file_exists(file_path):
                         st.warning(f"File {selected_file} no longer exists. It may have been deleted.")
                         st.rerun()
                         return
@@ -110,8 +110,7 @@ def file_manager_page():
                             with col_save:
                                 if st.button("💾 Save Changes", key=f"save_edit_{os.path.basename(file_path)}"):
                                     try:
-                                        with open(file_path, 'w', encoding='utf-8') as f:
-                                            f.write(edited_content)
+                                        FileManager.write_file_content(file_path, edited_content)
                                         st.success("File saved successfully!")
                                         SessionManager.add_to_history("File Edit", "Success", f"Edited {os.path.basename(file_path)}")
                                         st.session_state['editing_mode'] = False
@@ -142,7 +141,7 @@ def file_manager_page():
                                 if st.button("💾 Rename", key=f"save_rename_{os.path.basename(file_path)}"):
                                     try:
                                         new_path = os.path.join(os.path.dirname(file_path), new_name)
-                                        os.rename(file_path, new_path)
+                                        FileManager.rename_file(file_path, new_path)
                                         st.success(f"File renamed to: {new_name}")
                                         SessionManager.add_to_history("File Rename", "Success", f"Renamed {current_name} to {new_name}")
                                         st.session_state['rename_mode'] = False
@@ -199,7 +199,7 @@ def _sql_conversions_tab():
         
         with col2:
             # Show final PostgreSQL files if they exist
-            final_postgresql_files = [f for f in os.listdir(FileManager.DIRECTORIES["format_plsql"]) if f.endswith('.sql')] if os.path.exists(FileManager.DIRECTORIES["format_plsql"]) else []
+            final_postgresql_files = [f for f in FileManager.get_files_in_directory(FileManager.DIRECTORIES["format_plsql"]) if f.endswith('.sql')]
             st.metric("Final PostgreSQL SQL Files", len(final_postgresql_files))
     else:
         st.info("No PL/JSON format files found. Please run the JSON → PL/JSON Format conversion first.")
@@ -1,18 +1,22 @@
+import io
 import psycopg2
 from psycopg2.extensions import quote_ident
 import json
 import logging
-import time
-import re
-import pandas as pd
-import os
-from typing import Dict, List, Any, Union
+from typing import Callable, Dict, List, Any, Mapping, Optional, Tuple, Union
 from datetime import datetime
+from types import MappingProxyType
+from utilities.ast_nodes import Node
 from utilities.common import (
     logger,
     main_excel_file,
     setup_logging,
 )
+from utilities.mapping_rewriter import MappingRewriter
+from utilities.mapping_store import MappingStore
+from utilities.pass_profile import PassProfile
+from utilities.render_cache import RenderCache, structural_hashes
+from utilities.sql_writer import SqlWriter
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -21,6 +25,104 @@ logger = logging.getLogger(__name__)
 # Type alias for JSON nodes
 JsonNode = Union[Dict[str, Any], List[Dict[str, Any]]]
 
+# Built-in mappings used when the workbook or one of its sheets is missing. Built once, so
+# every FormatSQL instance shares the same (read-only) objects.
+DEFAULT_MAPPINGS: Dict[str, Mapping[str, str]] = {
+    "data_type_mappings": MappingProxyType({
+        "VARCHAR2": "VARCHAR",
+        "NVARCHAR2": "VARCHAR",
+        "CHAR": "CHAR",
+        "NCHAR": "CHAR",
+        "NUMBER": "NUMERIC",
+        "FLOAT": "REAL",
+        "BINARY_FLOAT": "REAL",
+        "BINARY_DOUBLE": "DOUBLE PRECISION",
+        "DATE": "TIMESTAMP",
+        "TIMESTAMP": "TIMESTAMP",
+        "CLOB": "TEXT",
+        "NCLOB": "TEXT",
+        "BLOB": "BYTEA",
+        "RAW": "BYTEA",
+        "LONG": "TEXT",
+        "LONG RAW": "BYTEA",
+        "BFILE": "TEXT",
+        "BINARY_INTEGER": "INTEGER",
+        "PLS_INTEGER": "INTEGER",
+        "NATURAL": "INTEGER",
+        "POSITIVE": "INTEGER",
+        "SIGNTYPE": "SMALLINT",
+        "BOOLEAN": "BOOLEAN"
+    }),
+    "function_mappings": MappingProxyType({
+        "SYSDATE": "CURRENT_TIMESTAMP",
+        "SYSTIMESTAMP": "CURRENT_TIMESTAMP",
+        "USER": "CURRENT_USER",
+        "UID": "CURRENT_USER",
+        "ROWNUM": "ROW_NUMBER() OVER()",
+        "ROWID": "CTID",
+        "NVL": "COALESCE",
+        "NVL2": "CASE WHEN",
+        "DECODE": "CASE",
+        "TO_CHAR": "TO_CHAR",
+        "TO_DATE": "TO_TIMESTAMP",
+        "TO_NUMBER": "CAST",
+        "SUBSTR": "SUBSTRING",
+        "INSTR": "POSITION",
+        "LENGTH": "LENGTH",
+        "UPPER": "UPPER",
+        "LOWER": "LOWER",
+        "TRIM": "TRIM",
+        "LTRIM": "LTRIM",
+        "RTRIM": "RTRIM",
+        "REPLACE": "REPLACE",
+        "CONCAT": "||",
+        "ROUND": "ROUND",
+        "TRUNC": "TRUNC",
+        "MOD": "MOD",
+        "POWER": "POWER",
+        "SQRT": "SQRT",
+        "ABS": "ABS",
+        "CEIL": "CEILING",
+        "FLOOR": "FLOOR",
+        "SIGN": "SIGN",
+        "GREATEST": "GREATEST",
+        "LEAST": "LEAST"
+    }),
+    "exception_mappings": MappingProxyType({
+        "NO_DATA_FOUND": "EXCEPTION WHEN NO_DATA_FOUND THEN",
+        "TOO_MANY_ROWS": "EXCEPTION WHEN TOO_MANY_ROWS THEN",
+        "DUP_VAL_ON_INDEX": "EXCEPTION WHEN UNIQUE_VIOLATION THEN",
+        "INVALID_CURSOR": "EXCEPTION WHEN INVALID_CURSOR THEN",
+        "CURSOR_ALREADY_OPEN": "EXCEPTION WHEN CURSOR_ALREADY_OPEN THEN",
+        "INVALID_NUMBER": "EXCEPTION WHEN INVALID_NUMBER THEN",
+        "VALUE_ERROR": "EXCEPTION WHEN VALUE_ERROR THEN",
+        "ZERO_DIVIDE": "EXCEPTION WHEN ZERO_DIVIDE THEN",
+        "STORAGE_ERROR": "EXCEPTION WHEN STORAGE_ERROR THEN",
+        "PROGRAM_ERROR": "EXCEPTION WHEN PROGRAM_ERROR THEN",
+        "OTHERS": "EXCEPTION WHEN OTHERS THEN"
+    }),
+    "schema_mappings": MappingProxyType({
+        "HR": "hr_schema",
+        "SCOTT": "scott_schema", 
+        "SYS": "public",
+        "SYSTEM": "public",
+        "PUBLIC": "public",
+        "APEX_040000": "public",
+        "APEX_PUBLIC_USER": "public",
+        "FLOWS_FILES": "public",
+        "MDSYS": "public",
+        "OLAPSYS": "public",
+        "ORACLE_OCM": "public",
+        "ORDDATA": "public",
+        "ORDPLUGINS": "public",
+        "ORDSYS": "public",
+        "OUTLN": "public",
+        "SI_INFORMTN_SCHEMA": "public",
+        "WMSYS": "public",
+        "XDB": "public"
+    }),
+}
+
 class FormatSQL:
     """
     Enhanced Oracle Trigger Analyzer that converts JSON analysis back to properly formatted SQL.
@@ -62,20 +164,38 @@ class FormatSQL:
     
     """
 
-    def __init__(self, analysis: Dict[str, Any]):
+    # Process-wide render cache (utilities/render_cache.py); None renders every subtree
+    render_cache: Optional[RenderCache] = None
+
+    def __init__(self, analysis: Dict[str, Any], render_cache: Optional[RenderCache] = None):
         """
         Initialize the analyzer with JSON analysis data.
         
         Args:
             analysis (Dict[str, Any]): The JSON analysis data
+            render_cache (Optional[RenderCache]): Cache of rendered subtrees for this
+                renderer (default: FormatSQL.render_cache)
         """
         self.analysis = analysis
+        if render_cache is not None:
+            self.render_cache = render_cache
+        # Render cache state of the current write_sql() call
+        self._digests: Dict[int, bytes] = {}
+        self._mapping_version = 0
+        self._cache_hits = 0
+        self._cache_misses = 0
         self.indent_unit = "  "  # 2 spaces for indentation        
+        # perf_counter_ns spans of the render phases, returned by to_sql() as "profile"
+        self.profile = PassProfile()
+        # Sheet name -> (mapping loaded for it, MappingStore fingerprint or "default"), the
+        # key of the compiled rewriters shared by all instances
+        self._mapping_sources: Dict[str, Tuple[Mapping[str, str], str]] = {}
         # Load mappings from Excel file
-        self.func_mapping = self.load_mapping("function_mappings")
-        self.type_mapping = self.load_mapping("data_type_mappings")
-        self.exception_mapping = self.load_mapping("exception_mappings")
-        self.schema_mappings = self.load_mapping("schema_mappings")
+        with self.profile.span("load_mappings"):
+            self.func_mapping = self.load_mapping("function_mappings")
+            self.type_mapping = self.load_mapping("data_type_mappings")
+            self.exception_mapping = self.load_mapping("exception_mappings")
+            self.schema_mappings = self.load_mapping("schema_mappings")
         self.json_convert_sql: Dict = self._initialize_conversion_stats()
         
         # Validate analysis structure
@@ -109,7 +229,7 @@ class FormatSQL:
                 if statement_type not in base_stats:
                     base_stats[statement_type] = 0
         except Exception as e:
-            logger.debug(f"Could not load statement mappings for stats initialization: {str(e)}")
+            logger.debug("Could not load statement mappings for stats initialization: %s", str(e))
             # Add default statement types if loading fails
             default_statements = [
                 "select_statement", "insert_statement", "update_statement", 
@@ -121,53 +241,47 @@ class FormatSQL:
                     base_stats[stmt_type] = 0
         
         return base_stats
-    def load_mapping(self, sheet_name: str) -> Dict[str, str]:
+    def load_mapping(self, sheet_name: str) -> Mapping[str, str]:
         """
         Load mappings from Excel file for type, function, and exception conversions.
         
         This function reads the Excel file containing Oracle to PostgreSQL mappings
-        and returns a dictionary for the specified sheet. If the Excel file is not
-        found or cannot be read, it falls back to default mappings.
+        through the process-wide MappingStore and returns a read-only mapping for the
+        specified sheet. If the Excel file is not found or cannot be read, it falls back
+        to default mappings.
         
         Args:
             sheet_name (str): Name of the Excel sheet to load ("data_type_mappings", 
                             "function_mappings", or "exception_mappings")
             
         Returns:
-            Dict[str, str]: Mapping dictionary with Oracle keys and PostgreSQL values
+            Mapping[str, str]: Mapping with Oracle keys and PostgreSQL values
         """
         mapping_file = main_excel_file
         
         try:
-            if os.path.exists(mapping_file):
-                logger.debug(f"Loading {sheet_name} from Excel file: {mapping_file}")
-                df = pd.read_excel(mapping_file, sheet_name=sheet_name)
+            if MappingStore.exists():
+                logger.debug("Loading %s from Excel file: %s", sheet_name, mapping_file)
+                mapping_dict = MappingStore.mapping(sheet_name)
                 
-                # Convert DataFrame to dictionary
-                if len(df.columns) >= 2:
-                    # Try to use column names first, fall back to index-based access
-                    if 'Oracle_Type' in df.columns and 'PostgreSQL_Type' in df.columns:
-                        mapping_dict = dict(zip(df['Oracle_Type'], df['PostgreSQL_Type']))
-                    else:
-                        mapping_dict = dict(zip(df.iloc[:, 0], df.iloc[:, 1]))
-                    
-                    # Remove any None or NaN values
-                    mapping_dict = {k: v for k, v in mapping_dict.items() if k is not None and v is not None and str(k).strip() and str(v).strip()}
-                    
-                    logger.debug(f"Loaded {len(mapping_dict)} {sheet_name} mappings from Excel")
+                if mapping_dict is not None:
+                    logger.debug("Loaded %s %s mappings from Excel", len(mapping_dict), sheet_name)
+                    self._mapping_sources[sheet_name] = (mapping_dict, MappingStore.fingerprint((sheet_name,)))
                     return mapping_dict
                 else:
-                 logger.warning(f"Excel sheet {sheet_name} has insufficient columns, using defaults")
+                 logger.warning("Excel sheet %s has insufficient columns, using defaults", sheet_name)
             else:
-             logger.warning(f"Excel mapping file not found: {mapping_file}, using defaults")
+             logger.warning("Excel mapping file not found: %s, using defaults", mapping_file)
                 
         except Exception as e:
-         logger.error(f"Error loading {sheet_name} from Excel: {str(e)}, using defaults")
+         logger.error("Error loading %s from Excel: %s, using defaults", sheet_name, str(e))
         
         # Return default mappings if Excel loading fails
-        return self._get_default_mappings(sheet_name)
+        mapping_dict = self._get_default_mappings(sheet_name)
+        self._mapping_sources[sheet_name] = (mapping_dict, "default")
+        return mapping_dict
 
-    def _get_default_mappings(self, sheet_name: str) -> Dict[str, str]:
+    def _get_default_mappings(self, sheet_name: str) -> Mapping[str, str]:
         """
         Get default mappings when Excel file is not available.
         
@@ -175,201 +289,126 @@ class FormatSQL:
             sheet_name (str): Type of mappings to return
             
         Returns:
-            Dict[str, str]: Default mapping dictionary
+            Mapping[str, str]: Default mapping (DEFAULT_MAPPINGS entry; empty for unknown types)
         """
-        if sheet_name == "data_type_mappings":
-            return {
-                "VARCHAR2": "VARCHAR",
-                "NVARCHAR2": "VARCHAR",
-                "CHAR": "CHAR",
-                "NCHAR": "CHAR",
-                "NUMBER": "NUMERIC",
-                "FLOAT": "REAL",
-                "BINARY_FLOAT": "REAL",
-                "BINARY_DOUBLE": "DOUBLE PRECISION",
-                "DATE": "TIMESTAMP",
-                "TIMESTAMP": "TIMESTAMP",
-                "CLOB": "TEXT",
-                "NCLOB": "TEXT",
-                "BLOB": "BYTEA",
-                "RAW": "BYTEA",
-                "LONG": "TEXT",
-                "LONG RAW": "BYTEA",
-                "BFILE": "TEXT",
-                "BINARY_INTEGER": "INTEGER",
-                "PLS_INTEGER": "INTEGER",
-                "NATURAL": "INTEGER",
-                "POSITIVE": "INTEGER",
-                "SIGNTYPE": "SMALLINT",
-                "BOOLEAN": "BOOLEAN"
-            }
-        elif sheet_name == "function_mappings":
-            return {
-                "SYSDATE": "CURRENT_TIMESTAMP",
-                "SYSTIMESTAMP": "CURRENT_TIMESTAMP",
-                "USER": "CURRENT_USER",
-                "UID": "CURRENT_USER",
-                "ROWNUM": "ROW_NUMBER() OVER()",
-                "ROWID": "CTID",
-                "NVL": "COALESCE",
-                "NVL2": "CASE WHEN",
-                "DECODE": "CASE",
-                "TO_CHAR": "TO_CHAR",
-                "TO_DATE": "TO_TIMESTAMP",
-                "TO_NUMBER": "CAST",
-                "SUBSTR": "SUBSTRING",
-                "INSTR": "POSITION",
-                "LENGTH": "LENGTH",
-                "UPPER": "UPPER",
-                "LOWER": "LOWER",
-                "TRIM": "TRIM",
-                "LTRIM": "LTRIM",
-                "RTRIM": "RTRIM",
-                "REPLACE": "REPLACE",
-                "CONCAT": "||",
-                "ROUND": "ROUND",
-                "TRUNC": "TRUNC",
-                "MOD": "MOD",
-                "POWER": "POWER",
-                "SQRT": "SQRT",
-                "ABS": "ABS",
-                "CEIL": "CEILING",
-                "FLOOR": "FLOOR",
-                "SIGN": "SIGN",
-                "GREATEST": "GREATEST",
-                "LEAST": "LEAST"
-            }
-        elif sheet_name == "exception_mappings":
-            return {
-                "NO_DATA_FOUND": "EXCEPTION WHEN NO_DATA_FOUND THEN",
-                "TOO_MANY_ROWS": "EXCEPTION WHEN TOO_MANY_ROWS THEN",
-                "DUP_VAL_ON_INDEX": "EXCEPTION WHEN UNIQUE_VIOLATION THEN",
-                "INVALID_CURSOR": "EXCEPTION WHEN INVALID_CURSOR THEN",
-                "CURSOR_ALREADY_OPEN": "EXCEPTION WHEN CURSOR_ALREADY_OPEN THEN",
-                "INVALID_NUMBER": "EXCEPTION WHEN INVALID_NUMBER THEN",
-                "VALUE_ERROR": "EXCEPTION WHEN VALUE_ERROR THEN",
-                "ZERO_DIVIDE": "EXCEPTION WHEN ZERO_DIVIDE THEN",
-                "STORAGE_ERROR": "EXCEPTION WHEN STORAGE_ERROR THEN",
-                "PROGRAM_ERROR": "EXCEPTION WHEN PROGRAM_ERROR THEN",
-                "OTHERS": "EXCEPTION WHEN OTHERS THEN"
-            }
-        elif sheet_name == "schema_mappings":
-            return {
-                "HR": "hr_schema",
-                "SCOTT": "scott_schema", 
-                "SYS": "public",
-                "SYSTEM": "public",
-                "PUBLIC": "public",
-                "APEX_040000": "public",
-                "APEX_PUBLIC_USER": "public",
-                "FLOWS_FILES": "public",
-                "MDSYS": "public",
-                "OLAPSYS": "public",
-                "ORACLE_OCM": "public",
-                "ORDDATA": "public",
-                "ORDPLUGINS": "public",
-                "ORDSYS": "public",
-                "OUTLN": "public",
-                "SI_INFORMTN_SCHEMA": "public",
-                "WMSYS": "public",
-                "XDB": "public"
-            }
-        else:
-            logger.warning(f"Unknown mapping type: {sheet_name}")
-            return {}
+        mapping = DEFAULT_MAPPINGS.get(sheet_name)
+        if mapping is not None:
+            return mapping
+        logger.warning("Unknown mapping type: %s", sheet_name)
+        return {}
 
     def to_sql(self, db_type: str = "Oracle") -> Dict:
         """
         Convert the JSON analysis to formatted SQL code for the specified database type.
         
-        This method orchestrates the entire SQL generation process:
-        1. Creates header comments with timestamp
-        2. Renders the declarations section (variables, constants, exceptions)
-        3. Renders the main execution block with proper structure
-        4. Adds footer comments
-        
-        The code is formatted with proper indentation and structure according to
-        the specified database type (Oracle or PostgreSQL).
+        Renders through `write_sql` into an in-memory buffer. Use `write_sql` directly to
+        stream the SQL to a file or socket instead of holding it as one string.
         
         Args:
             db_type (str): Database type - "Oracle" or "PostgreSQL" (default: "Oracle")
             
         Returns:
-            str: Formatted SQL code ready for execution
+            Dict: "sql" (the formatted SQL), "json_convert_sql" (rendered statements per
+            type) and "profile" (time spent in each render phase, see utilities/pass_profile.py)
         """
-        start_time = time.time()
-        logger.debug(f"SQL generation: Converting JSON analysis to formatted {db_type} SQL")
-        logger.debug(f"Analysis contains {len(self.analysis.get('declarations', {}).get('variables', []))} variables,{len(self.analysis.get('declarations', {}).get('constants', []))} constants,{len(self.analysis.get('declarations', {}).get('exceptions', []))} exceptions")
+        buffer = io.StringIO()
+        result = self.write_sql(buffer, db_type)
+        return {"sql": buffer.getvalue(), **result}
+
+    def write_sql(self, sink: Any, db_type: str = "Oracle") -> Dict:
+        """
+        Render the JSON analysis as formatted SQL and write it to a sink.
         
-        lines: List[str] = []
+        This method orchestrates the entire SQL generation process:
+        1. Renders the declarations section (variables, constants, exceptions)
+        2. Renders the main execution block with proper structure
         
-        # Step 1: Add header comment
-        logger.debug(f"Adding header comments with timestamp for {db_type}")
+        Each line is written to the sink as soon as it is rendered (see
+        utilities/sql_writer.py), so nothing but the sink holds the whole output.
+        Oracle SQL is written as indented lines; PostgreSQL SQL as one
+        "DO $$ ... $$ LANGUAGE plpgsql;" line.
         
-        # Step 2: Render declarations
+        Args:
+            sink (Any): Object with a `write(str)` method (io.StringIO, an open text file,
+                socket.makefile("w"), ...)
+            db_type (str): Database type - "Oracle" or "PostgreSQL" (default: "Oracle")
+            
+        Returns:
+            Dict: "json_convert_sql" (rendered statements per type) and "profile" (time spent
+            in each render phase, see utilities/pass_profile.py)
+        """
+        logger.debug("SQL generation: Converting JSON analysis to formatted %s SQL", db_type)
+        logger.debug("Analysis contains %s variables,%s constants,%s exceptions", len(self.analysis.get('declarations', {}).get('variables', [])), len(self.analysis.get('declarations', {}).get('constants', [])), len(self.analysis.get('declarations', {}).get('exceptions', [])))
+        
+        single_line = db_type == "PostgreSQL"
+        out = SqlWriter(sink, self.indent_unit, single_line=single_line)
+        if self.render_cache is not None and "main" in self.analysis:
+            with self.profile.span("render_cache_keys"):
+                self._digests = structural_hashes(self.analysis["main"])
+                self._mapping_version = self.render_cache.mapping_version(
+                    (self.func_mapping, self.type_mapping, self.exception_mapping, self.schema_mappings)
+                )
+        if single_line:
+            out.raw("DO $$ ")
+        
+        # Step 1: Render declarations
         logger.debug("Starting declarations section rendering")
-        declaration_start = time.time()
-        if "declarations" in self.analysis:
-            decl_lines = self._render_declarations(self.analysis.get("declarations", {}), db_type)
-        else:
-            decl_lines = []
-        logger.debug(f"Generated {len(decl_lines)} lines of declarations")
-        lines.extend(decl_lines)
-        logger.debug(f"Declarations rendering took {time.time() - declaration_start:.3f}s")
-        
-        # Step 3: Render main execution block
+        with self.profile.span("declarations"):
+            if "declarations" in self.analysis:
+                self._render_declarations(out, self.analysis.get("declarations", {}), db_type)
+        decl_line_count = out.line_count
+        logger.debug("Generated %s lines of declarations", decl_line_count)
+        logger.debug("Declarations rendering took %.3fs", self.profile.spans_ns["declarations"] / 1e9)
+        
+        # Step 2: Render main execution block
         logger.debug("Starting main execution block rendering")
-        main_start = time.time()
-        if "main" in self.analysis:
-            main_lines = self._render_main_block(self.analysis.get("main", {}), 0, wrap_begin_end=True, db_type=db_type)
-        else:
-            main_lines = []
-        logger.debug(f"Generated {len(main_lines)} lines in main execution block")
-        lines.extend(main_lines)
-        logger.debug(f"Main block rendering took {time.time() - main_start:.3f}s")
-        
-        # Step 4: Add footer
-        logger.debug("Adding footer comments")
-        if db_type == "PostgreSQL":
-            result = "DO $$ " + " ".join([line.strip() for line in lines]) + " $$ LANGUAGE plpgsql;"
-        elif db_type == "Oracle":
-            result = "\n".join(lines)
-        logger.debug(f"Final SQL contains {len(lines)} lines, {len(result)} characters")
-        final_sql = {
-            "sql": result,
-            "json_convert_sql": self.json_convert_sql
+        with self.profile.span("main"):
+            if "main" in self.analysis:
+                main = self.analysis.get("main", {})
+                if self.render_cache is not None:
+                    self._render_cached(out, main, "main", 0, db_type, lambda: self._render_main_block(out, main, 0, wrap_begin_end=True, db_type=db_type))
+                else:
+                    self._render_main_block(out, main, 0, wrap_begin_end=True, db_type=db_type)
+        logger.debug("Generated %s lines in main execution block", out.line_count - decl_line_count)
+        logger.debug("Main block rendering took %.3fs", self.profile.spans_ns["main"] / 1e9)
+        
+        if single_line:
+            out.raw(" $$ LANGUAGE plpgsql;")
+        logger.debug("Final SQL contains %s lines, %s characters", out.line_count, out.char_count)
+        extra: Dict[str, Any] = {}
+        if self.render_cache is not None:
+            extra["render_cache"] = {"hits": self._cache_hits, "misses": self._cache_misses}
+            self._digests = {}
+        profile = self.profile.to_dict(db_type=db_type, sql_line_count=out.line_count, **extra)
+        logger.debug("%s SQL generation: %s lines generated in %.3fs", db_type, out.line_count, profile["total_ns"] / 1e9)
+        return {
+            "json_convert_sql": self.json_convert_sql,
+            "profile": profile,
         }
-        duration = time.time() - start_time
-        logger.debug(f"{db_type} SQL generation: {len(lines)} lines generated in {duration:.3f}s")
-        return final_sql
 
     # -----------------------------
     # Declaration Rendering Methods
     # -----------------------------
-    def _render_declarations(self, decl: Dict[str, Any], db_type: str) -> List[str]:
+    def _render_declarations(self, out: SqlWriter, decl: Dict[str, Any], db_type: str) -> None:
         """
         Render variable, constant, and exception declarations for the specified database type.
         
         Args:
+            out (SqlWriter): Writer the lines are written to
             decl (Dict[str, Any]): Declarations section
             db_type (str): Database type ("Oracle" or "PostgreSQL")
-            
-        Returns:
-            List[str]: List of formatted declaration lines
         """
         if decl == {}:
-            return []
-        logger.debug(f"=== Rendering {db_type} declarations ===")
-        lines: List[str] = []
-        
+            return
+        logger.debug("=== Rendering %s declarations ===", db_type)
         if db_type == "Oracle":
             # Oracle uses DECLARE...BEGIN...END; structure
-            lines.append("DECLARE")
+            out.line("DECLARE")
             
             # Variables
             variables = decl.get("variables", []) or []
             if variables:
-                logger.debug(f"Rendering {len(variables)} variables")
+                logger.debug("Rendering %s variables", len(variables))
                 for var in variables:
                     name = var.get("name", "")
                     data_type = var.get("data_type", "")
@@ -378,38 +417,38 @@ class FormatSQL:
                     if name and data_type:
                         # Oracle variable declaration syntax
                         if default_value is not None and str(default_value).upper() != "NULL":
-                            lines.append(f"   {name} {data_type} := {default_value};")
+                            out.line(f"   {name} {data_type} := {default_value};")
                         else:
-                            lines.append(f"   {name} {data_type};")
+                            out.line(f"   {name} {data_type};")
             
             # Constants - Oracle uses CONSTANT keyword
             constants = decl.get("constants", []) or []
             if constants:
-                logger.debug(f"Rendering {len(constants)} constants")
+                logger.debug("Rendering %s constants", len(constants))
                 for const in constants:
                     name = const.get("name", "")
                     data_type = const.get("data_type", "")
                     value = const.get("value", "")
                     
                     if name and data_type and value is not None:
-                        lines.append(f"   {name} CONSTANT {data_type} := {value};")
+                        out.line(f"   {name} CONSTANT {data_type} := {value};")
             
             # Exceptions - Oracle exception declarations
             if db_type == "Oracle":
                 exceptions = decl.get("exceptions", []) or []
                 if exceptions:
-                    logger.debug(f"Rendering {len(exceptions)} exceptions")
+                    logger.debug("Rendering %s exceptions", len(exceptions))
                     for exc in exceptions:
                         name = exc.get("name", "")
                         if name:
-                            lines.append(f"   {name} EXCEPTION;")
+                            out.line(f"   {name} EXCEPTION;")
                         
         elif db_type == "PostgreSQL":
-            lines.append("DECLARE")
+            out.line("DECLARE")
             # Add variable declarations for PostgreSQL
             variables = self.analysis.get("declarations", {}).get("variables", []) or []
             if variables:
-                logger.debug(f"Rendering {len(variables)} variables for PostgreSQL")
+                logger.debug("Rendering %s variables for PostgreSQL", len(variables))
                 for var in variables:
                     name = var.get("name", "")
                     data_type = var.get("data_type", "")
@@ -420,11 +459,11 @@ class FormatSQL:
                         mapped_type = data_type.upper()
                         for oracle_type, postgres_type in self.type_mapping.items():
                             if oracle_type.upper() == mapped_type:
-                                logger.debug(f"Replacing {oracle_type} with {postgres_type} in {data_type}")
+                                logger.debug("Replacing %s with %s in %s", oracle_type, postgres_type, data_type)
                                 mapped_type = postgres_type
                                 break
                             elif mapped_type.find(oracle_type.upper()) != -1:
-                                logger.debug(f"Replacing {oracle_type} with {postgres_type} in {data_type}")
+                                logger.debug("Replacing %s with %s in %s", oracle_type, postgres_type, data_type)
                                 mapped_type = mapped_type.replace(oracle_type.upper(), postgres_type)
                                 break
                         
@@ -435,13 +474,13 @@ class FormatSQL:
                             #     default_str = f"'{default_value}'"
                             # else:
                             #     default_str = str(default_value)
-                            lines.append(f"   {name} {mapped_type} := {default_value};")
+                            out.line(f"   {name} {mapped_type} := {default_value};")
                         else:
-                            lines.append(f"   {name} {mapped_type};")
+                            out.line(f"   {name} {mapped_type};")
             # Add constant declarations for PostgreSQL
             constants = self.analysis.get("declarations", {}).get("constants", []) or []
             if constants:
-                logger.debug(f"Rendering {len(constants)} constants for PostgreSQL")
+                logger.debug("Rendering %s constants for PostgreSQL", len(constants))
                 for const in constants:
                     name = const.get("name", "")
                     data_type = const.get("data_type", "")
@@ -452,169 +491,207 @@ class FormatSQL:
                         mapped_type = data_type.upper()
                         for oracle_type, postgres_type in self.type_mapping.items():
                             if oracle_type.upper() == mapped_type:
-                                logger.debug(f"Replacing {oracle_type} with {postgres_type} in {data_type}")
+                                logger.debug("Replacing %s with %s in %s", oracle_type, postgres_type, data_type)
                                 mapped_type = postgres_type
                                 break
                             if mapped_type.find(oracle_type.upper()) != -1:
-                                logger.debug(f"Replacing {oracle_type} with {postgres_type} in {data_type}")
+                                logger.debug("Replacing %s with %s in %s", oracle_type, postgres_type, data_type)
                                 mapped_type = mapped_type.replace(oracle_type.upper(), postgres_type)
                                 break
 
                         # PostgreSQL constant declaration syntax
-                        lines.append(f"   {name} CONSTANT {mapped_type} := {value};")
+                        out.line(f"   {name} CONSTANT {mapped_type} := {value};")
         
-        logger.debug(f"=== {db_type} declarations complete ===")
-        return lines
+        logger.debug("=== %s declarations complete ===", db_type)
 
     # -----------------------------
     # Main Block Rendering Methods
     # -----------------------------
-    def _render_main_block(self, node: Dict[str, Any], indent_level: int, wrap_begin_end: bool = False, db_type: str = "Oracle") -> List[str]:
+    def _render_main_block(self, out: SqlWriter, node: Dict[str, Any], indent_level: int, wrap_begin_end: bool = False, db_type: str = "Oracle") -> None:
         """
         Render the main execution block with proper database-specific structure.
         
         Args:
+            out (SqlWriter): Writer the lines are written to
             node (Dict[str, Any]): Main block node
             indent_level (int): Current indentation level
             wrap_begin_end (bool): Whether to wrap in BEGIN-END
             db_type (str): Database type ("Oracle" or "PostgreSQL")
-            
-        Returns:
-            List[str]: List of formatted main block lines
         """
         if node == {}:
-            return []
-        logger.debug(f"=== Rendering main block for {db_type} ===")
-        lines: List[str] = []
-        
+            return
+        logger.debug("=== Rendering main block for %s ===", db_type)
         # Handle PostgreSQL structure
         # if db_type == "PostgreSQL":
         #     lines.append("BEGIN")
         # if wrap_begin_end:
-        lines.append(self._indent("BEGIN", indent_level))
+        out.line("BEGIN", indent_level)
         
         # Process begin_end_statements
         statements = node.get("begin_end_statements", [])
         if statements:
-            logger.debug(f"Processing {len(statements)} statements in main block")
-            logger.debug(f"begin_end_statements statements: {len(statements)}")
-            statement_lines = self._render_statement_list(statements, indent_level + 1, db_type, "begin_end_statements")
-            lines.extend(statement_lines)
+            logger.debug("Processing %s statements in main block", len(statements))
+            logger.debug("begin_end_statements statements: %s", len(statements))
+            self._render_statement_list(out, statements, indent_level + 1, db_type, "begin_end_statements")
         
         # Process exception handlers
         if db_type == "Oracle" or (db_type == "PostgreSQL" and not wrap_begin_end):
             exception_handlers = node.get("exception_handlers", [])
             if exception_handlers:
-                logger.debug(f"Processing {len(exception_handlers)} exception handlers")
-                lines.append(self._indent("EXCEPTION", indent_level))
+                logger.debug("Processing %s exception handlers", len(exception_handlers))
+                out.line("EXCEPTION", indent_level)
                 for handler in exception_handlers:
-                    handler_lines = self._render_exception_handler(handler, indent_level + 1, db_type)
-                    lines.extend(handler_lines)
+                    self._render_exception_handler(out, handler, indent_level + 1, db_type)
         
         if wrap_begin_end:
             if db_type == "PostgreSQL":
-                lines.append("END;")
+                out.line("END;")
             else:
-                lines.append(self._indent("END;", indent_level))
+                out.line("END;", indent_level)
         
-        logger.debug(f"=== Main block complete for {db_type} ===")
-        return lines
+        logger.debug("=== Main block complete for %s ===", db_type)
 
-    def _render_statement_list(self, statements: List[Dict[str, Any]], indent_level: int, db_type: str, json_path: str) -> List[str]:
+    def _render_statement_list(self, out: SqlWriter, statements: List[Dict[str, Any]], indent_level: int, db_type: str, json_path: str) -> None:
         """
         Render a list of statements with proper indentation and database-specific formatting.
         
         Args:
+            out (SqlWriter): Writer the lines are written to
             statements (List[Dict[str, Any]]): List of statement nodes
             indent_level (int): Current indentation level
             db_type (str): Database type ("Oracle" or "PostgreSQL")
-            
-        Returns:
-            List[str]: List of formatted statement lines
         """
-        lines: List[str] = []
         for statement in statements:
             # Handle case where statement might be a string instead of dict
             if isinstance(statement, str):
-                logger.warning(f"Found string statement instead of dict: {statement[:50]}...")
-                lines.append(self._indent(f"-- String statement: {statement}", indent_level))
+                logger.warning("Found string statement instead of dict: %s...", statement[:50])
+                out.line(f"-- String statement: {statement}", indent_level)
                 continue
             # if json_path == "begin_end_statements":
-            logger.debug(f"statement: {statement}")
-            if not isinstance(statement, dict):
-                logger.warning(f"Found non-dict statement: {type(statement)}")
-                logger.debug(f"Found non-dict statement: {type(statement)} {statement} {json_path} {statement_type}")
-                lines.append(self._indent(f"-- Non-dict statement: {statement}", indent_level))
+            logger.debug("statement: %s", statement)
+            if not isinstance(statement, (dict, Node)):
+                logger.warning("Found non-dict statement: %s", type(statement))
+                logger.debug("Found non-dict statement: %s %s %s %s", type(statement), statement, json_path, statement_type)
+                out.line(f"-- Non-dict statement: {statement}", indent_level)
                 continue
             
-            statement_type = statement.get("type", "")
-            logger.debug(f"Rendering statement type: {statement_type}")
-            if statement_type in self.json_convert_sql:
-                self.json_convert_sql[statement_type] += 1
-            
-            try:
-                if statement_type == "if_else":
-                    statement_lines = self._render_if_else(statement, indent_level, db_type)
-                elif statement_type == "case_when":
-                    statement_lines = self._render_case_when(statement, indent_level, db_type)
-                elif statement_type == "for_loop":
-                    statement_lines = self._render_for_loop(statement, indent_level, db_type)
-                elif statement_type == "begin_end":
-                    statement_lines = self._render_begin_end_block(statement, indent_level, db_type)
-                # elif statement_type == "select_statement":
-                #     statement_lines = self._render_sql_statement(statement, indent_level, db_type)
-                # elif statement_type == "insert_statement":
-                #     statement_lines = self._render_sql_statement(statement, indent_level, db_type)
-                # elif statement_type == "update_statement":
-                #     statement_lines = self._render_sql_statement(statement, indent_level, db_type)
-                # elif statement_type == "delete_statement":
-                #     statement_lines = self._render_sql_statement(statement, indent_level, db_type)
-                # elif statement_type == "merge_statement":
-                #     statement_lines = self._render_sql_statement(statement, indent_level, db_type)
-                # elif statement_type == "bulk_statement":
-                #     statement_lines = self._render_sql_statement(statement, indent_level, db_type)
-                elif statement_type == "assignment":
-                    statement_lines = self._render_assignment(statement, indent_level, db_type)
-                elif statement_type == "raise_statement":
-                    statement_lines = self._render_raise_statement(statement, indent_level, db_type)
-                elif statement_type == "function_calling":
-                    statement_lines = self._render_function_call(statement, indent_level, db_type)
-                elif statement_type == "with_statement":
-                    statement_lines = self._render_with_statement(statement, indent_level, db_type)
-                elif statement_type == "null_statement":
-                    statement_lines = self._render_null_statement(statement, indent_level, db_type)
-                elif statement_type == "return_statement":
-                    statement_lines = self._render_return_statement(statement, indent_level, db_type)
-                elif statement_type.endswith("_statement"):
-                    statement_lines = self._render_sql_statement(statement, indent_level, db_type)
-                else:
-                    # Fallback for unknown statement types
-                    logger.debug(statement)
-                    statement_lines = self._render_unknown_statement(statement, indent_level, db_type)
-                
-                lines.extend(statement_lines)
-            except Exception as e:
-                logger.error(f"Error rendering statement type '{statement_type}': {str(e)}")
-                lines.append(self._indent(f"-- Error rendering statement: {str(e)}", indent_level))
+            if self.render_cache is not None:
+                self._render_cached(out, statement, "statement", indent_level, db_type, lambda: self._render_statement(out, statement, indent_level, db_type))
+            else:
+                self._render_statement(out, statement, indent_level, db_type)
+
+    def _render_statement(self, out: SqlWriter, statement: Dict[str, Any], indent_level: int, db_type: str) -> None:
+        """
+        Render one statement node by its type.
         
-        return lines
+        Args:
+            out (SqlWriter): Writer the lines are written to
+            statement (Dict[str, Any]): Statement node
+            indent_level (int): Current indentation level
+            db_type (str): Database type ("Oracle" or "PostgreSQL")
+        """
+        statement_type = statement.get("type", "")
+        logger.debug("Rendering statement type: %s", statement_type)
+        if statement_type in self.json_convert_sql:
+            self.json_convert_sql[statement_type] += 1
+        
+        try:
+            if statement_type == "if_else":
+                self._render_if_else(out, statement, indent_level, db_type)
+            elif statement_type == "case_when":
+                self._render_case_when(out, statement, indent_level, db_type)
+            elif statement_type == "for_loop":
+                self._render_for_loop(out, statement, indent_level, db_type)
+            elif statement_type == "begin_end":
+                self._render_begin_end_block(out, statement, indent_level, db_type)
+            # elif statement_type == "select_statement":
+            #     self._render_sql_statement(out, statement, indent_level, db_type)
+            # elif statement_type == "insert_statement":
+            #     self._render_sql_statement(out, statement, indent_level, db_type)
+            # elif statement_type == "update_statement":
+            #     self._render_sql_statement(out, statement, indent_level, db_type)
+            # elif statement_type == "delete_statement":
+            #     self._render_sql_statement(out, statement, indent_level, db_type)
+            # elif statement_type == "merge_statement":
+            #     self._render_sql_statement(out, statement, indent_level, db_type)
+            # elif statement_type == "bulk_statement":
+            #     self._render_sql_statement(out, statement, indent_level, db_type)
+            elif statement_type == "assignment":
+                self._render_assignment(out, statement, indent_level, db_type)
+            elif statement_type == "raise_statement":
+                self._render_raise_statement(out, statement, indent_level, db_type)
+            elif statement_type == "function_calling":
+                self._render_function_call(out, statement, indent_level, db_type)
+            elif statement_type == "with_statement":
+                self._render_with_statement(out, statement, indent_level, db_type)
+            elif statement_type == "null_statement":
+                self._render_null_statement(out, statement, indent_level, db_type)
+            elif statement_type == "return_statement":
+                self._render_return_statement(out, statement, indent_level, db_type)
+            elif statement_type.endswith("_statement"):
+                self._render_sql_statement(out, statement, indent_level, db_type)
+            else:
+                # Fallback for unknown statement types
+                logger.debug(statement)
+                self._render_unknown_statement(out, statement, indent_level, db_type)
+        except Exception as e:
+            # Lines the statement wrote before the error stay in the output, above the comment
+            logger.error("Error rendering statement type '%s': %s", statement_type, str(e))
+            out.line(f"-- Error rendering statement: {str(e)}", indent_level)
+
+    def _render_cached(self, out: SqlWriter, node: Any, kind: str, indent_level: int, db_type: str, render: Callable[[], None]) -> None:
+        """
+        Write a subtree from the render cache, or render it with `render` and store the result.
+        
+        A hit replays the cached lines and the json_convert_sql counts of the first render.
+        Nodes without a digest (not part of the analysis tree) are always rendered.
+        
+        Args:
+            out (SqlWriter): Writer the lines are written to
+            node (Any): Node being rendered
+            kind (str): How the node is rendered ("main" block or "statement")
+            indent_level (int): Current indentation level
+            db_type (str): Database type ("Oracle" or "PostgreSQL")
+            render (Callable[[], None]): Renders the node into `out`
+        """
+        digest = self._digests.get(id(node))
+        if digest is None:
+            render()
+            return
+        key = (digest, kind, db_type, indent_level, self.indent_unit, self._mapping_version)
+        entry = self.render_cache.get(key)
+        if entry is not None:
+            self._cache_hits += 1
+            lines, counts = entry
+            out.replay(lines)
+            for name, count in counts:
+                self.json_convert_sql[name] = self.json_convert_sql.get(name, 0) + count
+            return
+        self._cache_misses += 1
+        counts_before = dict(self.json_convert_sql)
+        mark = out.start_recording()
+        try:
+            render()
+        finally:
+            lines = out.stop_recording(mark)
+        counts = tuple(
+            (name, count - counts_before.get(name, 0)) for name, count in self.json_convert_sql.items() if count != counts_before.get(name, 0)
+        )
+        self.render_cache.put(key, lines, counts)
 
     # -----------------------------
     # Statement Rendering Methods
     # -----------------------------
-    def _render_if_else(self, node: Dict[str, Any], indent_level: int, db_type: str) -> List[str]:
+    def _render_if_else(self, out: SqlWriter, node: Dict[str, Any], indent_level: int, db_type: str) -> None:
         """
         Render IF-ELSE statements with ELSIF support for the specified database type.
         
         Args:
+            out (SqlWriter): Writer the lines are written to
             node (Dict[str, Any]): IF-ELSE node
             indent_level (int): Current indentation level
             db_type (str): Database type ("Oracle" or "PostgreSQL")
-            
-        Returns:
-            List[str]: List of formatted IF-ELSE lines
         """
-        lines: List[str] = []
         continue_check = False
         # Main IF condition
         condition = node.get("condition", "")
@@ -624,14 +701,13 @@ class FormatSQL:
         if condition.upper() == "TRUE":
             continue_check = True
         if not continue_check:
-            lines.append(self._indent(f"IF {condition} THEN", indent_level))
+            out.line(f"IF {condition} THEN", indent_level)
         
         
         # THEN statements
         then_statements = node.get("then_statements", [])
         if then_statements:
-            then_lines = self._render_statement_list(then_statements, indent_level + 1, db_type, "then_statements")
-            lines.extend(then_lines)
+            self._render_statement_list(out, then_statements, indent_level + 1, db_type, "then_statements")
         
         
         if not continue_check:
@@ -644,43 +720,36 @@ class FormatSQL:
                 if db_type == "PostgreSQL":
                     elif_condition = self._apply_function_mappings(elif_condition)
                 
-                lines.append(self._indent(f"ELSIF {elif_condition} THEN", indent_level))
+                out.line(f"ELSIF {elif_condition} THEN", indent_level)
                 
                 elif_then_statements = elif_stmt.get("then_statements", [])
                 if elif_then_statements:
-                    elif_lines = self._render_statement_list(elif_then_statements, indent_level + 1, db_type, "if_elses")
-                    lines.extend(elif_lines)
+                    self._render_statement_list(out, elif_then_statements, indent_level + 1, db_type, "if_elses")
             # ELSE statements
             else_statements = node.get("else_statements", [])
             if else_statements:
-                lines.append(self._indent("ELSE", indent_level))
-                else_lines = self._render_statement_list(else_statements, indent_level + 1, db_type, "else_statements")
-                lines.extend(else_lines)
-            lines.append(self._indent("END IF;", indent_level))
-        return lines
+                out.line("ELSE", indent_level)
+                self._render_statement_list(out, else_statements, indent_level + 1, db_type, "else_statements")
+            out.line("END IF;", indent_level)
 
-    def _render_case_when(self, node: Dict[str, Any], indent_level: int, db_type: str) -> List[str]:
+    def _render_case_when(self, out: SqlWriter, node: Dict[str, Any], indent_level: int, db_type: str) -> None:
         """
         Render CASE-WHEN statements for the specified database type.
         
         Args:
+            out (SqlWriter): Writer the lines are written to
             node (Dict[str, Any]): CASE-WHEN node
             indent_level (int): Current indentation level
             db_type (str): Database type ("Oracle" or "PostgreSQL")
-            
-        Returns:
-            List[str]: List of formatted CASE-WHEN lines
         """
-        lines: List[str] = []
-        
         condition = node.get("condition", "")
         if condition and db_type == "PostgreSQL":
             condition = self._apply_function_mappings(condition)
             
         if condition:
-            lines.append(self._indent(f"CASE {condition}", indent_level))
+            out.line(f"CASE {condition}", indent_level)
         else:
-            lines.append(self._indent("CASE", indent_level))
+            out.line("CASE", indent_level)
         
         # WHEN clauses
         when_clauses = node.get("when_clauses", [])
@@ -689,89 +758,75 @@ class FormatSQL:
             if db_type == "PostgreSQL":
                 when_condition = self._apply_function_mappings(when_condition)
                 
-            lines.append(self._indent(f"WHEN {when_condition} THEN", indent_level))
+            out.line(f"WHEN {when_condition} THEN", indent_level)
             
             when_statements = when_clause.get("then_statements", [])
             if when_statements:
                 self.json_convert_sql['when_statement'] += 1
             if when_statements:
-                when_lines = self._render_statement_list(when_statements, indent_level + 1, db_type, "when_clauses")
-                lines.extend(when_lines)
+                self._render_statement_list(out, when_statements, indent_level + 1, db_type, "when_clauses")
         
         # ELSE statements
         else_statements = node.get("else_statements", [])
         if else_statements:
-            lines.append(self._indent("ELSE", indent_level))
-            else_lines = self._render_statement_list(else_statements, indent_level + 1, db_type, "else_statements")
-            lines.extend(else_lines)
+            out.line("ELSE", indent_level)
+            self._render_statement_list(out, else_statements, indent_level + 1, db_type, "else_statements")
         
-        lines.append(self._indent("END CASE;", indent_level))
-        return lines
+        out.line("END CASE;", indent_level)
 
-    def _render_for_loop(self, node: Dict[str, Any], indent_level: int, db_type: str) -> List[str]:
+    def _render_for_loop(self, out: SqlWriter, node: Dict[str, Any], indent_level: int, db_type: str) -> None:
         """
         Render FOR loop statements for the specified database type.
         
         Args:
+            out (SqlWriter): Writer the lines are written to
             node (Dict[str, Any]): FOR loop node
             indent_level (int): Current indentation level
             db_type (str): Database type ("Oracle" or "PostgreSQL")
-            
-        Returns:
-            List[str]: List of formatted FOR loop lines
         """
-        lines: List[str] = []
-        
         loop_variable = node.get("loop_variable", "")
         for_expression = node.get("for_expression", "")
         
         if db_type == "PostgreSQL":
             for_expression = self._apply_function_mappings(for_expression)
         
-        lines.append(self._indent(f"FOR {loop_variable} IN {for_expression} LOOP", indent_level))
+        out.line(f"FOR {loop_variable} IN {for_expression} LOOP", indent_level)
         
         # Loop statements
         for_statements = node.get("for_statements", [])
         if for_statements:
-            for_lines = self._render_statement_list(for_statements, indent_level + 1, db_type, "for_statements")
-            lines.extend(for_lines)
+            self._render_statement_list(out, for_statements, indent_level + 1, db_type, "for_statements")
         
-        lines.append(self._indent("END LOOP;", indent_level))
-        return lines
+        out.line("END LOOP;", indent_level)
 
-    def _render_begin_end_block(self, node: Dict[str, Any], indent_level: int, db_type: str) -> List[str]:
+    def _render_begin_end_block(self, out: SqlWriter, node: Dict[str, Any], indent_level: int, db_type: str) -> None:
         """
         Render nested BEGIN-END blocks for the specified database type.
         
         Args:
+            out (SqlWriter): Writer the lines are written to
             node (Dict[str, Any]): BEGIN-END block node
             indent_level (int): Current indentation level
             db_type (str): Database type ("Oracle" or "PostgreSQL")
-            
-        Returns:
-            List[str]: List of formatted BEGIN-END block lines
         """
-        return self._render_main_block(node, indent_level, wrap_begin_end=False, db_type=db_type)
+        self._render_main_block(out, node, indent_level, wrap_begin_end=False, db_type=db_type)
 
-    def _render_sql_statement(self, node: Dict[str, Any], indent_level: int, db_type: str) -> List[str]:
+    def _render_sql_statement(self, out: SqlWriter, node: Dict[str, Any], indent_level: int, db_type: str) -> None:
         """
         Render SQL statements (SELECT, INSERT, UPDATE, DELETE) for the specified database type.
         
         Args:
+            out (SqlWriter): Writer the lines are written to
             node (Dict[str, Any]): SQL statement node
             indent_level (int): Current indentation level
             db_type (str): Database type ("Oracle" or "PostgreSQL")
-            
-        Returns:
-            List[str]: List of formatted SQL statement lines
         """
         sql_statement = node.get("sql_statement", "")
         if sql_statement:
             if db_type == "PostgreSQL":
                 sql_statement = self._apply_function_mappings(sql_statement)
                 sql_statement = self._apply_schema_mappings(sql_statement)
-            return [self._indent(f"{sql_statement}", indent_level)]
-        return []
+            out.line(f"{sql_statement}", indent_level)
     def _apply_schema_mappings(self, text: str) -> str:
         """
         Apply schema mappings to the specified text.
@@ -792,32 +847,19 @@ class FormatSQL:
         if not isinstance(text, str):
             text = str(text)
             
-        result = text
-        
         # Apply schema mappings for table names (e.g., V_MATERIALS -> HR.EMPLOYEES)
-        for oracle_schema, postgres_schema in self.schema_mappings.items():
-            try:
-                # Match the PostgreSQL schema name (which represents the table name) and replace with Oracle schema
-                # This reverses the mapping: postgres_schema (table name) -> oracle_schema.table_name
-                pattern = re.compile(r'\b' + re.escape(str(postgres_schema)) + r'\b', re.IGNORECASE)
-                result = pattern.sub(str(oracle_schema) + '.' + str(postgres_schema), result)
-            except Exception as e:
-                # Log the error and continue with next mapping
-                logger.debug(f"Error applying schema mapping {postgres_schema} -> {oracle_schema}.{postgres_schema}: {str(e)}")
-                continue
-        
-        return result
-    def _render_assignment(self, node: Dict[str, Any], indent_level: int, db_type: str) -> List[str]:
+        # Match the PostgreSQL schema name (which represents the table name) and replace with Oracle schema
+        # This reverses the mapping: postgres_schema (table name) -> oracle_schema.table_name
+        return self._schema_rewriter().rewrite(text)
+    def _render_assignment(self, out: SqlWriter, node: Dict[str, Any], indent_level: int, db_type: str) -> None:
         """
         Render variable assignment statements for the specified database type.
         
         Args:
+            out (SqlWriter): Writer the lines are written to
             node (Dict[str, Any]): Assignment node
             indent_level (int): Current indentation level
             db_type (str): Database type ("Oracle" or "PostgreSQL")
-            
-        Returns:
-            List[str]: List of formatted assignment lines
         """
         variable_name = node.get("variable_name", "")
         expression = node.get("expression", "")
@@ -830,29 +872,25 @@ class FormatSQL:
             if db_type == "PostgreSQL":
                 expression = self._apply_function_mappings(expression)
                 
-            return [self._indent(f"{variable_name} := {expression};", indent_level)]
-        return []
+            out.line(f"{variable_name} := {expression};", indent_level)
 
-    def _render_raise_statement(self, node: Dict[str, Any], indent_level: int, db_type: str) -> List[str]:
+    def _render_raise_statement(self, out: SqlWriter, node: Dict[str, Any], indent_level: int, db_type: str) -> None:
         """
         Render RAISE statements for the specified database type.
         
         Args:
+            out (SqlWriter): Writer the lines are written to
             node (Dict[str, Any]): RAISE statement node
             indent_level (int): Current indentation level
             db_type (str): Database type ("Oracle" or "PostgreSQL")
-            
-        Returns:
-            List[str]: List of formatted RAISE statement lines
         """
         exception_name = node.get("exception_name", "")
         if exception_name:
             if db_type == "PostgreSQL":
                 exception_name = self._apply_exception_mappings(exception_name)
-                return [self._indent(f"RAISE EXCEPTION '{exception_name}';", indent_level)]
+                out.line(f"RAISE EXCEPTION '{exception_name}';", indent_level)
             else:
-                return [self._indent(f"RAISE {exception_name};", indent_level)]
-        return []
+                out.line(f"RAISE {exception_name};", indent_level)
 
     def _apply_exception_mappings(self, text: str) -> str:
         """
@@ -860,17 +898,15 @@ class FormatSQL:
         """
         return self.exception_mapping.get(text.upper(), text)
 
-    def _render_function_call(self, node: Dict[str, Any], indent_level: int, db_type: str) -> List[str]:
+    def _render_function_call(self, out: SqlWriter, node: Dict[str, Any], indent_level: int, db_type: str) -> None:
         """
         Render function call statements for the specified database type.
         
         Args:
+            out (SqlWriter): Writer the lines are written to
             node (Dict[str, Any]): Function call node
             indent_level (int): Current indentation level
             db_type (str): Database type ("Oracle" or "PostgreSQL")
-            
-        Returns:
-            List[str]: List of formatted function call lines
         """
         function_name = node.get("function_name", "")
         parameters = node.get("parameters", {})
@@ -894,72 +930,64 @@ class FormatSQL:
                     param_text = ", ".join(param_pairs)
             
             if parameters["positional_params"] != 'no_parameters':
-                return [self._indent(f"{function_name};", indent_level)]
+                out.line(f"{function_name};", indent_level)
             elif param_text:
-                return [self._indent(f"{function_name}({param_text});", indent_level)]
+                out.line(f"{function_name}({param_text});", indent_level)
             else:
-                return [self._indent(f"{function_name}();", indent_level)]
-        
-        return []
+                out.line(f"{function_name}();", indent_level)
 
-    def _render_null_statement(self, node: Dict[str, Any], indent_level: int, db_type: str) -> List[str]:
+    def _render_null_statement(self, out: SqlWriter, node: Dict[str, Any], indent_level: int, db_type: str) -> None:
         """
         Render NULL statements for the specified database type.
         
         Args:
+            out (SqlWriter): Writer the lines are written to
             node (Dict[str, Any]): NULL statement node
             indent_level (int): Current indentation level
             db_type (str): Database type ("Oracle" or "PostgreSQL")
-            
-        Returns:
-            List[str]: List of formatted NULL statement lines
         """
-        return [self._indent("NULL;", indent_level)]
+        out.line("NULL;", indent_level)
 
-    def _render_return_statement(self, node: Dict[str, Any], indent_level: int, db_type: str) -> List[str]:
+    def _render_return_statement(self, out: SqlWriter, node: Dict[str, Any], indent_level: int, db_type: str) -> None:
         """
         Render RETURN statements for the specified database type.
         
         Args:
+            out (SqlWriter): Writer the lines are written to
             node (Dict[str, Any]): RETURN statement node
             indent_level (int): Current indentation level
             db_type (str): Database type ("Oracle" or "PostgreSQL")
-            
-        Returns:
-            List[str]: List of formatted RETURN statement lines
         """
         sql_statement = node.get("sql_statement", "")
         if sql_statement:
             if db_type == "PostgreSQL":
                 sql_statement = self._apply_function_mappings(sql_statement)
-            return [self._indent(f"{sql_statement}", indent_level)]
-        return []
+            out.line(f"{sql_statement}", indent_level)
 
-    def _render_unknown_statement(self, node: Dict[str, Any], indent_level: int, db_type: str) -> List[str]:
+    def _render_unknown_statement(self, out: SqlWriter, node: Dict[str, Any], indent_level: int, db_type: str) -> None:
         """
         Render unknown statement types as fallback for the specified database type.
         
         Args:
+            out (SqlWriter): Writer the lines are written to
             node (Dict[str, Any]): Unknown statement node
             indent_level (int): Current indentation level
             db_type (str): Database type ("Oracle" or "PostgreSQL")
-            
-        Returns:
-            List[str]: List of formatted unknown statement lines
         """
         statement_type = node.get("type", "unknown")
-        logger.warning(f"Unknown statement type: {statement_type}")
+        logger.warning("Unknown statement type: %s", statement_type)
         
         # Try to extract any SQL content
         sql_statement = node.get("sql_statement", "")
         if sql_statement:
             if db_type == "PostgreSQL":
                 sql_statement = self._apply_function_mappings(sql_statement)
-            return [self._indent(f"{sql_statement}", indent_level)]
+            out.line(f"{sql_statement}", indent_level)
+            return
         
-        return [self._indent(f"-- Unknown statement type: {statement_type}", indent_level)]
+        out.line(f"-- Unknown statement type: {statement_type}", indent_level)
 
-    def _render_with_statement(self, node: Dict[str, Any], indent_level: int, db_type: str) -> List[str]:
+    def _render_with_statement(self, out: SqlWriter, node: Dict[str, Any], indent_level: int, db_type: str) -> None:
         """
         Render WITH statements captured by the analyzer.
         
@@ -974,7 +1002,6 @@ class FormatSQL:
         )
         and leave it as-is for both Oracle and PostgreSQL.
         """
-        lines: List[str] = []
         with_values = node.get("with_values", "").strip()
         with_statements = node.get("with_statements", "").strip()
 
@@ -986,42 +1013,34 @@ class FormatSQL:
             with_values_mapped = with_values
             with_body_mapped = with_statements
 
-        lines.append(self._indent(f"WITH {with_values_mapped} AS (", indent_level))
+        out.line(f"WITH {with_values_mapped} AS (", indent_level)
         # The body may contain multiple lines; split safely on newlines if present
         body_lines = with_body_mapped.split("\n") if "\n" in with_body_mapped else [with_body_mapped]
         for bl in body_lines:
             if bl.strip():
-                lines.append(self._indent(bl.strip(), indent_level + 1))
-        lines.append(self._indent(")", indent_level))
-        return lines
+                out.line(bl.strip(), indent_level + 1)
+        out.line(")", indent_level)
 
-    def _render_exception_handler(self, handler: Dict[str, Any], indent_level: int, db_type: str) -> List[str]:
+    def _render_exception_handler(self, out: SqlWriter, handler: Dict[str, Any], indent_level: int, db_type: str) -> None:
         """
         Render exception handlers for the specified database type.
         
         Args:
+            out (SqlWriter): Writer the lines are written to
             handler (Dict[str, Any]): Exception handler node
             indent_level (int): Current indentation level
             db_type (str): Database type ("Oracle" or "PostgreSQL")
-            
-        Returns:
-            List[str]: List of formatted exception handler lines
         """
-        lines: List[str] = []
-        
         exception_name = handler.get("exception_name", "")
         if exception_name:
             self.json_convert_sql['exception_handler'] += 1
         
-        lines.append(self._indent(f"WHEN {exception_name} THEN", indent_level))
+        out.line(f"WHEN {exception_name} THEN", indent_level)
         
         # Exception statements
         exception_statements = handler.get("exception_statements", [])
         if exception_statements:
-            exception_lines = self._render_statement_list(exception_statements, indent_level + 1, db_type, "exception_statements")
-            lines.extend(exception_lines)
-        
-        return lines
+            self._render_statement_list(out, exception_statements, indent_level + 1, db_type, "exception_statements")
 
     def _apply_function_mappings(self, text: str) -> str:
         """
@@ -1040,69 +1059,57 @@ class FormatSQL:
         if not isinstance(text, str):
             text = str(text)
             
-        result = text
-        
-        # Apply function mappings (case-insensitive)
-        for oracle_func, postgres_func in self.func_mapping.items():
-            try:
-                # Use regex to match whole words only
-                pattern = re.compile(r'\b' + re.escape(str(oracle_func)) + r'\b', re.IGNORECASE)
-                result = pattern.sub(str(postgres_func), result)
-            except Exception as e:
-                # Log the error and continue with next mapping
-                logger.debug(f"Error applying function mapping {oracle_func} -> {postgres_func}: {str(e)}")
-                continue
+        # Apply function mappings (case-insensitive, whole words only)
+        result = self._function_rewriter().rewrite(text)
         result = result.replace(":new.", ":new_")
         return result
 
-    # -----------------------------
-    # Utility Methods
-    # -----------------------------
-    def _indent(self, text: str, level: int) -> str:
-        """
-        Add proper indentation to a text line based on nesting level.
-        
-        This utility method applies consistent indentation to each line of SQL code
-        based on its nesting level in the code structure. The indentation unit
-        is defined at the class level (typically 2 or 4 spaces).
-        
-        Proper indentation is crucial for:
-        - Code readability
-        - Visualizing code structure
-        - Maintaining consistent formatting
-        - Highlighting the logical flow
-        
-        Args:
-            text (str): The text content to indent
-            level (int): Indentation level (number of indent units to apply)
-            
-        Returns:
-            str: The properly indented text with the correct amount of spaces
-        """
-        # Ensure level is non-negative
-        indent_level = max(level, 0)
-        
-        # Apply indentation by multiplying the indent unit by the level
-        indentation = self.indent_unit * indent_level
-        
-        # Combine indentation with the text
-        indented_text = f"{indentation}{text}"
-        
-        # For very deep nesting, log a warning (could indicate over-complex code)
-        if level > 5:
-            logger.debug(f"Deep nesting detected (level {level}): '{text[:30]}...'")
-            
-        return indented_text
+    def _function_rewriter(self) -> MappingRewriter:
+        """Return the compiled rewriter of the function mappings."""
+        return self._get_rewriter("function_mappings", self.func_mapping, lambda mapping: list(mapping.items()), "function")
+
+    def _schema_rewriter(self) -> MappingRewriter:
+        """Return the compiled rewriter of the schema mappings (table name → schema.table name)."""
+        return self._get_rewriter(
+            "schema_mappings",
+            self.schema_mappings,
+            lambda mapping: [(postgres_schema, str(oracle_schema) + '.' + str(postgres_schema)) for oracle_schema, postgres_schema in mapping.items()],
+            "schema",
+        )
 
-    def _indent_lines(self, lines: List[str], level: int) -> List[str]:
+    def compile_mappings(self) -> None:
+        """Compile the function and schema rewriters now instead of on first use."""
+        self._function_rewriter()
+        self._schema_rewriter()
+
+    # Compiled rewriters keyed by (label, source of the mapping): the MappingStore fingerprint
+    # of the sheet, or "default" for DEFAULT_MAPPINGS. Each table is compiled once per
+    # process and again only when its sheet changes.
+    _rewriter_cache: Dict[Tuple[str, str], MappingRewriter] = {}
+
+    def _get_rewriter(self, sheet_name: str, mapping: Mapping[str, str], build_entries, label: str) -> MappingRewriter:
         """
-        Add indentation to a list of text lines.
-        
+        Return the compiled MappingRewriter for a mapping table.
+
         Args:
-            lines (List[str]): List of text lines
-            level (int): Indentation level
-            
+            sheet_name (str): Sheet the mapping was loaded from
+            mapping (Mapping[str, str]): Function or schema mapping table
+            build_entries: Callable turning the mapping into (key, replacement) pairs in order
+            label (str): Mapping table name used in debug messages
+
         Returns:
-            List[str]: List of indented text lines
+            MappingRewriter: Rewriter that applies every entry in one pass where possible
         """
-        return [self._indent(line, level) for line in lines]
\ No newline at end of file
+        loaded, source = self._mapping_sources.get(sheet_name, (None, None))
+        if loaded is not mapping:
+            # Not the mapping load_mapping() returned (replaced by the caller): no known source
+            return MappingRewriter(build_entries(mapping), label)
+        cache_key = (label, source)
+        rewriter = self._rewriter_cache.get(cache_key)
+        if rewriter is None:
+            rewriter = MappingRewriter(build_entries(mapping), label)
+            if len(self._rewriter_cache) >= 32:
+                # One entry per table and workbook version; drop the old versions
+                self._rewriter_cache.clear()
+            self._rewriter_cache[cache_key] = rewriter
+        return rewriter
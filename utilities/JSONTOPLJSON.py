@@ -1,13 +1,95 @@
 import json
-from typing import Any, Dict, List, Tuple
+import re
+from typing import Any, Dict, List, Set, Tuple
 
-from utilities.FormatSQL import FormatSQL
+from utilities.ast_nodes import Node, tree_from_dicts, tree_to_dicts
 from utilities.common import (
     logger,
     setup_logging,
 )
+from utilities.tree_walker import ABORT_LIST, rewrite_statement_lists, statement_lists, walk
 import copy
 
+# Identifier tokens of PL/SQL text (unquoted identifiers may also hold $ and #)
+IDENTIFIER_PATTERN = re.compile(r"[A-Z_][A-Z0-9_$#]*")
+
+
+def referenced_identifiers(main: Any) -> Set[str]:
+    """
+    Collect the identifiers the PostgreSQL render of a main block references, in one walk.
+
+    Only the text FormatSQL.to_sql("PostgreSQL") writes for `{"main": main}` is
+    tokenized, following its rules:
+    - the exception handlers of the main block are skipped (those of nested
+      BEGIN blocks are rendered)
+    - an IF whose condition is TRUE renders its THEN statements only; its
+      condition, ELSIF branches and ELSE statements are skipped
+    - a procedure call renders its name, not its parameters
+    - an assignment renders only when both sides are set
+    Node types, positions and other metadata are never tokenized. String literals
+    are, so a name that only appears inside one still counts as referenced.
+
+    Args:
+        main (Any): The main block node (or its dict form)
+
+    Returns:
+        Set[str]: Upper-cased identifiers (PL/SQL identifiers are case-insensitive)
+    """
+    identifiers: Set[str] = set()
+
+    def add(*texts: Any) -> None:
+        for text in texts:
+            if isinstance(text, str) and text:
+                identifiers.update(IDENTIFIER_PATTERN.findall(text.upper()))
+
+    if not isinstance(main, (dict, Node)):
+        return identifiers
+    stack = list(main.get("begin_end_statements", []) or [])
+    while stack:
+        statement = stack.pop()
+        if isinstance(statement, str):
+            add(statement)
+            continue
+        if not isinstance(statement, (dict, Node)):
+            continue
+        statement_type = statement.get("type", "")
+        if statement_type == "if_else":
+            stack.extend(statement.get("then_statements", []) or [])
+            condition = statement.get("condition", "")
+            if condition.upper() != "TRUE":
+                add(condition)
+                for elif_clause in statement.get("if_elses", []) or []:
+                    add(elif_clause.get("condition", ""))
+                    stack.extend(elif_clause.get("then_statements", []) or [])
+                stack.extend(statement.get("else_statements", []) or [])
+        elif statement_type == "case_when":
+            add(statement.get("condition", ""))
+            for when_clause in statement.get("when_clauses", []) or []:
+                add(when_clause.get("condition", ""))
+                stack.extend(when_clause.get("then_statements", []) or [])
+            stack.extend(statement.get("else_statements", []) or [])
+        elif statement_type == "for_loop":
+            add(statement.get("loop_variable", ""), statement.get("for_expression", ""))
+            stack.extend(statement.get("for_statements", []) or [])
+        elif statement_type == "begin_end":
+            stack.extend(statement.get("begin_end_statements", []) or [])
+            for handler in statement.get("exception_handlers", []) or []:
+                add(handler.get("exception_name", ""))
+                stack.extend(handler.get("exception_statements", []) or [])
+        elif statement_type == "assignment":
+            if statement.get("variable_name") and statement.get("expression"):
+                add(statement["variable_name"], statement["expression"])
+        elif statement_type == "raise_statement":
+            add(statement.get("exception_name", ""))
+        elif statement_type == "function_calling":
+            add(statement.get("function_name", ""))
+        elif statement_type == "with_statement":
+            add(statement.get("with_values", ""), statement.get("with_statements", ""))
+        elif statement_type != "null_statement":
+            add(statement.get("sql_statement", ""))
+    return identifiers
+
+
 class JSONTOPLJSON:
     def __init__(self, json_data):
         """__init__ function."""
@@ -44,7 +126,7 @@ class JSONTOPLJSON:
         Returns:
             str: Modified condition suitable for PostgreSQL or 'TRUE' if empty
         """
-        logger.debug(f"Starting condition modification: '{condition}'")
+        logger.debug("Starting condition modification: '%s'", condition)
         
         # Handle empty or None condition
         if not condition:
@@ -52,7 +134,7 @@ class JSONTOPLJSON:
             return "TRUE"
         
         condition = condition.strip()
-        logger.debug(f"Stripped condition: '{condition}'")
+        logger.debug("Stripped condition: '%s'", condition)
         
         # Step 1: Define keywords and patterns to remove
         # Keywords to remove (case-insensitive)
@@ -77,14 +159,14 @@ class JSONTOPLJSON:
             before_sub = modified_condition
             modified_condition = pattern.sub("", modified_condition)
             if before_sub != modified_condition:
-                logger.debug(f"Removed keyword '{keyword}': '{before_sub}' → '{modified_condition}'")
+                logger.debug("Removed keyword '%s': '%s' → '%s'", keyword, before_sub, modified_condition)
         
         # Step 3: Remove PostgreSQL TG_OP patterns (case-insensitive)
         for pattern in tg_op_patterns:
             before_sub = modified_condition
             modified_condition = re.sub(pattern, "", modified_condition, flags=re.IGNORECASE)
             if before_sub != modified_condition:
-                logger.debug(f"Removed TG_OP pattern '{pattern}': '{before_sub}' → '{modified_condition}'")
+                logger.debug("Removed TG_OP pattern '%s': '%s' → '%s'", pattern, before_sub, modified_condition)
         
         # Step 4: Clean up syntax issues resulting from removals
         
@@ -92,14 +174,14 @@ class JSONTOPLJSON:
         before_sub = modified_condition
         modified_condition = re.sub(r'\s+', ' ', modified_condition)
         if before_sub != modified_condition:
-            logger.debug(f"Normalized spaces: '{before_sub}' → '{modified_condition}'")
+            logger.debug("Normalized spaces: '%s' → '%s'", before_sub, modified_condition)
             
         # Fix double operators
         before_sub = modified_condition
         modified_condition = re.sub(r'\s*AND\s*AND\s*', ' AND ', modified_condition, flags=re.IGNORECASE)
         modified_condition = re.sub(r'\s*OR\s*OR\s*', ' OR ', modified_condition, flags=re.IGNORECASE)
         if before_sub != modified_condition:
-            logger.debug(f"Fixed double operators: '{before_sub}' → '{modified_condition}'")
+            logger.debug("Fixed double operators: '%s' → '%s'", before_sub, modified_condition)
         
         # Remove leading and trailing operators
         before_sub = modified_condition
@@ -108,7 +190,7 @@ class JSONTOPLJSON:
         modified_condition = re.sub(r'\s*AND\s*$', '', modified_condition, flags=re.IGNORECASE)
         modified_condition = re.sub(r'\s*OR\s*$', '', modified_condition, flags=re.IGNORECASE)
         if before_sub != modified_condition:
-            logger.debug(f"Removed leading/trailing operators: '{before_sub}' → '{modified_condition}'")
+            logger.debug("Removed leading/trailing operators: '%s' → '%s'", before_sub, modified_condition)
         
         # Clean up parentheses
         before_sub = modified_condition
@@ -116,7 +198,7 @@ class JSONTOPLJSON:
         modified_condition = re.sub(r'^\s*\)\s*$', '', modified_condition)  # Single closing parenthesis
         modified_condition = re.sub(r'^\s*\(\s*\)\s*$', '', modified_condition)  # Empty parentheses
         if before_sub != modified_condition:
-            logger.debug(f"Cleaned up parentheses: '{before_sub}' → '{modified_condition}'")
+            logger.debug("Cleaned up parentheses: '%s' → '%s'", before_sub, modified_condition)
         
         # Strip whitespace
         modified_condition = modified_condition.strip()
@@ -126,7 +208,7 @@ class JSONTOPLJSON:
             logger.debug("Condition is empty after processing, returning 'TRUE'")
             return "TRUE"
         
-        logger.debug(f"Final modified condition: '{modified_condition}'")
+        logger.debug("Final modified condition: '%s'", modified_condition)
         return modified_condition
 
     def process_condition(self, condition, condition_type):
@@ -148,17 +230,17 @@ class JSONTOPLJSON:
         """
         # Skip empty conditions
         if not condition:
-            logger.debug(f"Empty condition provided for {condition_type}, returning False")
+            logger.debug("Empty condition provided for %s, returning False", condition_type)
             return False
             
         # Clean up condition for analysis
         condition = condition.strip()
-        logger.debug(f"Processing condition for {condition_type}: '{condition}'")
+        logger.debug("Processing condition for %s: '%s'", condition_type, condition)
         
         # Remove surrounding parentheses if present for cleaner analysis
         if condition.startswith("(") and condition.endswith(")"):
             condition = condition[1:-1]
-            logger.debug(f"Removed outer parentheses: '{condition}'")
+            logger.debug("Removed outer parentheses: '%s'", condition)
         
         # Check for operation-specific keywords in the condition
         condition_dict = {
@@ -171,9 +253,9 @@ class JSONTOPLJSON:
                 self.sql_content[key] += 1
         # Log which operation keywords were found in this condition
         logger.debug("Operation keywords found in condition:")
-        logger.debug(f"  - INSERT keywords: {condition_dict['on_insert']}")
-        logger.debug(f"  - UPDATE keywords: {condition_dict['on_update']}")
-        logger.debug(f"  - DELETE keywords: {condition_dict['on_delete']}")
+        logger.debug("  - INSERT keywords: %s", condition_dict['on_insert'])
+        logger.debug("  - UPDATE keywords: %s", condition_dict['on_update'])
+        logger.debug("  - DELETE keywords: %s", condition_dict['on_delete'])
         
         # Decision logic:
         # 1. If condition mentions current operation type, remove it (return False)
@@ -181,9 +263,9 @@ class JSONTOPLJSON:
         # 3. If condition mentions other operations but not this one, keep it (return True)
         
         # Case 1: Condition mentions current operation - remove from current operation's code
-        logger.debug(f"condition_dict: {condition_dict} {condition_type} {condition}")
+        logger.debug("condition_dict: %s %s %s", condition_dict, condition_type, condition)
         if condition_dict[condition_type]:
-            logger.debug(f"REMOVE: Condition contains {condition_type} keywords")
+            logger.debug("REMOVE: Condition contains %s keywords", condition_type)
             return False
             
         # Case 2: Condition doesn't mention any specific operation - keep for all operations
@@ -193,95 +275,93 @@ class JSONTOPLJSON:
             
         # Case 3: Condition mentions other operations but not this one - keep for this operation
         else:
-            logger.debug(f"KEEP: Condition mentions other operations but not {condition_type}")
+            logger.debug("KEEP: Condition mentions other operations but not %s", condition_type)
             return True
 
     def _process_on_json(self, statements, json_path="", condition_type:str = "on_insert"):
-            """_process_on_json function."""
-            item = []
-            # Handle nested structures (begin_end blocks, exception handlers, etc.)
-            for statement in statements:
-                if isinstance(statement, dict) and "type" in statement:
-                    if statement["type"] == "begin_end":
-                        # Process IF statements in begin_end_statements
-                        if "begin_end_statements" in statement:
-                            statement["begin_end_statements"] = self._process_on_json(statement["begin_end_statements"],f"{json_path}.begin_end_statements",condition_type,)
-
-                        # Process IF statements in exception_handlers
-                        if "exception_handlers" in statement:
-                            statement["exception_handlers"] = self._process_on_json(statement["exception_handlers"],f"{json_path}.exception_handlers",condition_type,)
-                            for handler_index, handler in enumerate(statement["exception_handlers"]):
-                                if "exception_statements" in handler:
-                                    handler["exception_statements"] = self._process_on_json(handler["exception_statements"],f"{json_path}.exception_handlers.{handler_index}.exception_statements",condition_type,)
-
-                    elif statement["type"] == "if_else":
-                        # Process IF statements in then_statements, if_elses, and else_statements
-                        json_path = f"{json_path}.if_else"
-                        main_if_else_condition = self.process_condition(statement["condition"], condition_type)
-                        statement["condition"] = self.modify_condition(statement["condition"])
-                        if "then_statements" in statement:
-                            statement["then_statements"] = self._process_on_json(statement["then_statements"],f"{json_path}.then_statements",condition_type,)
-                        if "else_statements" in statement:
-                            statement["else_statements"] = self._process_on_json(statement["else_statements"],f"{json_path}.else_statements",condition_type,)
-                        if "if_elses" in statement:
-                            json_path = f"{json_path}.if_elses"
-                            after_parse_if_elses = []
-                            for i, if_elses_item in enumerate(statement["if_elses"]):
-                                if_elses_condition = self.process_condition(if_elses_item["condition"], condition_type)
-                                if_elses_item["condition"] = self.modify_condition(if_elses_item["condition"])
-                                json_path = f"{json_path}.{i}"
-                                if not if_elses_condition:
-                                    json_path = f"{json_path}.then_statements"
-                                    if_elses_item["then_statements"] = self._process_on_json(if_elses_item["then_statements"],f"{json_path}.then_statements",condition_type,)
-                                    after_parse_if_elses.append(if_elses_item)
-                            statement["if_elses"] = after_parse_if_elses
-                        if  main_if_else_condition and len(statement["if_elses"]) == 0:
-                            continue
-                        elif main_if_else_condition and len(statement["if_elses"]) > 0:
-                            statement["condition"] = self.modify_condition(statement["if_elses"][0]["condition"])
-                            statement["then_statements"] = statement["if_elses"][0]["then_statements"]
-                            statement["if_elses"] = statement["if_elses"][1:]
-                        elif main_if_else_condition:
-                            logger.debug(f"if_else_delete_path: {json_path}.if_else -- {statement}")
-
-                    elif statement["type"] == "case_when":
-                        # Process main case condition
-                        if "condition" in  statement and  statement["condition"]:
-                            main_case_condition = self.process_condition( statement["condition"], condition_type)
-                            if main_case_condition:
-                                # If condition should be removed for this operation, return None
-                                logger.debug(f"case_when main condition removal: {json_path}.case_when.condition")
-                                return None
-                            else:
-                                # Modify the condition for PostgreSQL compatibility
-                                 statement["condition"] = self.modify_condition( statement["condition"])
-
-                        # Process when clauses conditions and statements
-                        if "when_clauses" in statement:
-                            for clause_index, clause in enumerate(statement["when_clauses"]):
-                                # Process when clause condition
-                                if "condition" in clause and clause["condition"]:
-                                    when_condition_result = self.process_condition(clause["condition"], condition_type)
-                                    if when_condition_result:
-                                        # If condition should be removed, skip this when clause
-                                        logger.debug(f"when_clause condition removal: {json_path}.when_clauses.{clause_index}.condition")
-                                        continue
-                                    else:
-                                        # Modify the when condition for PostgreSQL compatibility
-                                        clause["condition"] = self.modify_condition(clause["condition"])
-                                
-                                # Process then_statements within when clauses
-                                if "then_statements" in clause:
-                                    clause["then_statements"] = self._process_on_json(clause["then_statements"],f"{json_path}.then_statements",condition_type,)
-                        if "else_statements" in statement:
-                            statement["else_statements"] = self._process_on_json(statement["else_statements"],f"{json_path}.else_statements",condition_type,)
-
-                    elif statement["type"] == "for_loop":
-                        # Process IF statements in loop_statements
-                        if "loop_statements" in statement:
-                            statement["loop_statements"] = self._process_on_json(statement["loop_statements"],f"{json_path}.loop_statements",condition_type,)
-                item.append(statement)
-            return item
+        """
+        Filter a statement list (and the lists nested in it) for one operation type.
+
+        IF, ELSIF and WHEN branches whose condition only applies to other operations are
+        removed and the remaining conditions are cleaned (see process_condition and
+        modify_condition). An IF whose own condition does not apply is replaced by its
+        first remaining ELSIF, or removed.
+
+        Args:
+            statements (list): Statement list to filter
+            json_path (str): Path of the list, used in debug logs
+            condition_type (str): "on_insert", "on_update" or "on_delete"
+
+        Returns:
+            list: The filtered list, or None when a CASE condition of the list only
+                applies to other operations
+        """
+        # Result of process_condition for the main condition of each IF being processed
+        main_if_else_conditions = {}
+
+        def enter(statement):
+            """Clean the conditions of a node and return the statement lists to filter below it."""
+            if statement["type"] == "begin_end":
+                return statement_lists(statement)
+            if statement["type"] == "if_else":
+                main_if_else_conditions[id(statement)] = self.process_condition(statement["condition"], condition_type)
+                statement["condition"] = self.modify_condition(statement["condition"])
+                lists = [(statement, key) for key in ("then_statements", "else_statements") if key in statement]
+                if "if_elses" in statement:
+                    after_parse_if_elses = []
+                    for if_elses_item in statement["if_elses"]:
+                        if_elses_condition = self.process_condition(if_elses_item["condition"], condition_type)
+                        if_elses_item["condition"] = self.modify_condition(if_elses_item["condition"])
+                        if not if_elses_condition:
+                            lists.append((if_elses_item, "then_statements"))
+                            after_parse_if_elses.append(if_elses_item)
+                    statement["if_elses"] = after_parse_if_elses
+                return lists
+            if statement["type"] == "case_when":
+                # Process main case condition
+                if "condition" in statement and statement["condition"]:
+                    if self.process_condition(statement["condition"], condition_type):
+                        # If condition should be removed for this operation, drop the whole list
+                        logger.debug("case_when main condition removal: %s.case_when.condition", json_path)
+                        return ABORT_LIST
+                    # Modify the condition for PostgreSQL compatibility
+                    statement["condition"] = self.modify_condition(statement["condition"])
+                lists = []
+                if "when_clauses" in statement:
+                    for clause_index, clause in enumerate(statement["when_clauses"]):
+                        if "condition" in clause and clause["condition"]:
+                            if self.process_condition(clause["condition"], condition_type):
+                                # If condition should be removed, skip this when clause
+                                logger.debug("when_clause condition removal: %s.when_clauses.%s.condition", json_path, clause_index)
+                                continue
+                            # Modify the when condition for PostgreSQL compatibility
+                            clause["condition"] = self.modify_condition(clause["condition"])
+                        if "then_statements" in clause:
+                            lists.append((clause, "then_statements"))
+                if "else_statements" in statement:
+                    lists.append((statement, "else_statements"))
+                return lists
+            if statement["type"] == "for_loop" and "loop_statements" in statement:
+                return [(statement, "loop_statements")]
+            return []
+
+        def leave(statement):
+            """Keep (True) or drop (False) a node once the lists below it are filtered."""
+            if statement["type"] != "if_else":
+                return True
+            main_if_else_condition = main_if_else_conditions.pop(id(statement))
+            if main_if_else_condition and len(statement["if_elses"]) == 0:
+                logger.debug("if_else_delete_path: %s.if_else", json_path)
+                return False
+            if main_if_else_condition:
+                statement["condition"] = self.modify_condition(statement["if_elses"][0]["condition"])
+                statement["then_statements"] = statement["if_elses"][0]["then_statements"]
+                statement["if_elses"] = statement["if_elses"][1:]
+            return True
+
+        holder = {"statements": statements}
+        rewrite_statement_lists([(holder, "statements")], enter=enter, leave=leave)
+        return holder["statements"]
 
     def rest_strings(self,sql_json) -> Dict:
         """
@@ -320,28 +400,24 @@ class JSONTOPLJSON:
             "bulk_statement": 0,
         }
 
-        def extract_rest_strings_from_item(statement):
-            """Recursively extract rest strings from any statement"""
-            if isinstance(statement, dict):
-                if "type" in statement:
-                    logger.debug(f"statement: {statement}")
-                    strng_convert_json[statement["type"]] += 1
-                # Recursively process all values in the dictionary
-                for value in statement.values():
-                    extract_rest_strings_from_item(value)
-
-            elif isinstance(statement, list):
-                # Recursively process all items in the list
-                for sub_item in statement:
-                    extract_rest_strings_from_item(sub_item)
+        def count_statement(statement):
+            """Count a node by type"""
+            if "type" in statement:
+                logger.debug("statement: %s", statement)
+                strng_convert_json[statement["type"]] += 1
 
         # Process main_section_lines
-        extract_rest_strings_from_item(sql_json)
+        walk(sql_json, count_statement)
 
     def _find_declarations(self, declarations, sql_json):
         """
         find declarations from sql_json and add if present.
         
+        A declaration is kept when its name is one of the identifiers the PostgreSQL
+        render of sql_json references (see `referenced_identifiers`), compared
+        case-insensitively on token boundaries: `v_id` is not kept because `v_id_old`
+        is used.
+        
         Args:
             declarations (dict): The current declarations dictionary to populate
             sql_json (dict): The source JSON data not containing declarations only main section
@@ -350,7 +426,7 @@ class JSONTOPLJSON:
             dict: Updated declarations dictionary with parsed declarations if present
         """
         logger.debug("=== Starting _parse_declarations ===")
-        logger.debug(f"sql_json: {declarations}")
+        logger.debug("sql_json: %s", declarations)
         # Check if sql_json has declarations
         if sql_json == {} or declarations == {}:
             logger.debug("No declarations found in sql_json - skipping")
@@ -363,54 +439,52 @@ class JSONTOPLJSON:
         }
 
         
-        analyzer = FormatSQL({"main": sql_json})
-        sql_content: str = analyzer.to_sql("PostgreSQL")
-        # logger.info(f"sql_content: {sql_content}")
+        identifiers = referenced_identifiers(sql_json)
+        logger.debug("Operation tree references %s identifiers", len(identifiers))
         # Check each type of declaration and add if present
         declaration_types = parsed_declarations.keys()
         
         for decl_type in declaration_types:
             if decl_type in declarations:
                 for decl in declarations[decl_type]:
-                    if decl["name"] in sql_content["sql"]:
-                        # logger.info(f"Found {decl['name']} in sql_content")
+                    if decl["name"].upper() in identifiers:
                         parsed_declarations[decl_type].append(decl)
-                logger.debug(f"Found {len(declarations[decl_type])} {decl_type} - adding to declarations")
+                logger.debug("Found %s %s - adding to declarations", len(declarations[decl_type]), decl_type)
             else:
-                logger.debug(f"No {decl_type} found in source declarations")
+                logger.debug("No %s found in source declarations", decl_type)
         
-        logger.debug(f"Final declarations structure: {len(parsed_declarations.get('variables', []))} variables,{len(parsed_declarations.get('constants', []))} constants,{len(parsed_declarations.get('exceptions', []))} exceptions")
+        logger.debug("Final declarations structure: %s variables,%s constants,%s exceptions", len(parsed_declarations.get('variables', [])), len(parsed_declarations.get('constants', [])), len(parsed_declarations.get('exceptions', [])))
         
         logger.debug("=== _parse_declarations complete ===")
         return parsed_declarations
 
-    def to_sql(self):
+    def to_dict(self) -> Dict:
         """
         Clean the JSON data by removing conditional statements that don't apply to specific operations,
         then transform the analysis JSON into an operation-specific target structure.
         
         This function:
-        1. Makes deep copies of the original JSON data for each operation type
+        1. Builds a node tree of the main block for each operation type (new nodes and
+           lists, so the input is not modified)
         2. Processes each copy to filter out operation-specific code blocks
         3. Combines the processed data into the final structure with on_insert, on_update, and on_delete sections
-        4. Returns the formatted JSON string
         
         Returns:
-            str: JSON string containing the operation-specific trigger code
+            Dict: The operation-specific trigger code (the "metadata" entry is shared with the input)
         """
-        logger.debug("=== Starting to_sql() conversion process ===")
+        logger.debug("=== Starting to_dict() conversion process ===")
         
-        # Step 1: Create deep copies of the JSON data for each operation type to process independently
-        logger.debug("Creating deep copies of JSON data for each operation type")
-        self.after_parse_on_insert = copy.deepcopy(self.json_data.get("main", []))
-        self.after_parse_on_update = copy.deepcopy(self.json_data.get("main", []))
-        self.after_parse_on_delete = copy.deepcopy(self.json_data.get("main", []))
+        # Step 1: Build a node tree of the main block for each operation type to process independently
+        logger.debug("Building node trees of the main block for each operation type")
+        self.after_parse_on_insert = tree_from_dicts(self.json_data.get("main", []))
+        self.after_parse_on_update = tree_from_dicts(self.json_data.get("main", []))
+        self.after_parse_on_delete = tree_from_dicts(self.json_data.get("main", []))
         self.declarations = copy.deepcopy(self.json_data.get("declarations", {}))
         
         # Log the structure we're working with
         logger.debug("JSON data structure:")
-        logger.debug(f"  - Main blocks: {len(self.json_data.get('main', []))} items")
-        logger.debug(f"  - Declarations: {len(self.declarations.get('variables', []))} variables, {len(self.declarations.get('constants', []))} constants, {len(self.declarations.get('exceptions', []))} exceptions")
+        logger.debug("  - Main blocks: %s items", len(self.json_data.get('main', [])))
+        logger.debug("  - Declarations: %s variables, %s constants, %s exceptions", len(self.declarations.get('variables', [])), len(self.declarations.get('constants', [])), len(self.declarations.get('exceptions', [])))
 
         # Step 2: Process each operation type to filter relevant code
         logger.debug("=== Processing INSERT operations ===")
@@ -431,29 +505,41 @@ class JSONTOPLJSON:
         if self.sql_content["on_insert"] > 0:
             converted["on_insert"] = {
                 "declarations": self._find_declarations(self.declarations, self.after_parse_on_insert),
-                "main": self.after_parse_on_insert,
+                "main": tree_to_dicts(self.after_parse_on_insert),
                 # "conversion_stats": self.rest_strings(self.after_parse_on_insert),
             }
         if self.sql_content["on_update"] > 0:
             converted["on_update"] = {
                 "declarations": self._find_declarations(self.declarations, self.after_parse_on_update),
-                "main": self.after_parse_on_update,
+                "main": tree_to_dicts(self.after_parse_on_update),
                 # "conversion_stats": self.rest_strings(self.after_parse_on_update),
             }
         if self.sql_content["on_delete"] > 0:
             converted["on_delete"] = {
                 "declarations": self._find_declarations(self.declarations, self.after_parse_on_delete),
-                "main": self.after_parse_on_delete,
+                "main": tree_to_dicts(self.after_parse_on_delete),
                 # "conversion_stats": self.rest_strings(self.after_parse_on_delete),
             }
         converted["metadata"] = self.json_data['metadata']
+        logger.debug("=== to_dict() conversion complete ===")
+        return converted
+
+    def to_sql(self):
+        """
+        Transform the analysis JSON into the operation-specific structure (see `to_dict`)
+        and return it as a formatted JSON string.
+        
+        Returns:
+            str: JSON string containing the operation-specific trigger code
+        """
+        converted = self.to_dict()
 
-        # Step 4: Convert to JSON string
+        # Convert to JSON string
         logger.debug("Converting to JSON string")
         sql_content = json.dumps(converted, ensure_ascii=False, indent=2)
         
         # Log the result size
-        logger.debug(f"Generated JSON string with {len(sql_content)} characters")
+        logger.debug("Generated JSON string with %s characters", len(sql_content))
         logger.debug("=== to_sql() conversion complete ===")
         
         return sql_content
\ No newline at end of file
@@ -3,12 +3,29 @@ from math import e
 import os
 import re
 import time
-from typing import Any, Dict, List, Tuple
+from contextlib import contextmanager
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
 import pandas as pd
 from numpy import copy
+from utilities.ast_nodes import (
+    Assignment,
+    BeginEnd,
+    CaseWhen,
+    ElsifClause,
+    ExceptionHandler,
+    ForLoop,
+    FunctionCall,
+    IfElse,
+    RaiseStatement,
+    SqlStatement,
+    WhenClause,
+    WithStatement,
+    tree_to_dicts,
+)
+from utilities.block_index import BlockIndex
 from utilities.common import (
     logger,
-    main_excel_file,
     setup_logging,
     debug,
     warning,
@@ -18,6 +35,33 @@ from utilities.common import (
 )
 # Import here to avoid circular imports
 from utilities.streamlit_utils import ConfigManager
+from utilities.line_matchers import FunctionCallMatcher, StatementTypeMatcher
+from utilities.line_table import LineTable
+from utilities.mapping_store import MappingStore
+from utilities.pass_profile import PassProfile, tree_profile
+from utilities.rest_string_sink import RestStringSink
+from utilities.single_pass_parser import SinglePassParser
+from utilities.sql_lexer import SqlScan, find_matching_paren, find_top_level, scan_sql, split_top_level
+from utilities.tree_walker import rewrite_statement_lists, statement_lists, walk
+
+# Parser engines selectable through OracleTriggerAnalyzer(parser_engine=...)
+PARSER_ENGINES = ("legacy", "single_pass")
+# Side-effect writes the analyzer can defer (see OracleTriggerAnalyzer.deferring_writes)
+DEFERRED_WRITE_KINDS = ("rest_strings", "exception_names")
+# Reported as metadata.parser_version; increment when making significant parser changes
+PARSER_VERSION = "1.1"
+# Statement types used when the "statement_mappings" sheet is missing, empty or unreadable
+DEFAULT_STATEMENT_MAPPINGS = {
+    "SELECT": "select_statement",
+    "INSERT": "insert_statement",
+    "UPDATE": "update_statement",
+    "DELETE": "delete_statement",
+    "RAISE": "raise_statement",
+    "NULL": "null_statement",
+    "RETURN": "return_statement",
+    "MERGE": "merge_statement",
+    "BULK": "bulk_statement",
+}
 class OracleTriggerAnalyzer:
     """
     Parser and analyzer for Oracle PL/SQL trigger bodies.
@@ -29,13 +73,34 @@ class OracleTriggerAnalyzer:
       begin_end, if_else, case_when_statements, for_loop, DML/select, assignment, raise.
     - Finally, `to_json()` emits a dict with `declarations`, `main`, and `sql_comments`.
     """
-    def __init__(self, filepath: str, encoding: str = 'utf-8'):
+    # The writes of the innermost open `deferring_writes` block: each kind it defers
+    # ("rest_strings": list, "exception_names": dict) is collected here instead of being
+    # written to rest_list.csv or the Excel workbook per trigger.
+    deferred_writes: Optional[Dict[str, Any]] = None
+    # Engine used when the constructor gets no parser_engine; main() sets it from
+    # --parser-engine before any worker process starts so the workers inherit it.
+    default_parser_engine: str = "legacy"
+    def __init__(
+        self,
+        filepath: str,
+        encoding: str = 'utf-8',
+        parser_engine: Optional[str] = None,
+        sql_content: Optional[str] = None,
+        file_details: Optional[Dict[str, Any]] = None,
+    ):
         """
         Initialize the OracleTriggerAnalyzer with SQL content.
         Args:
-            sql_content (str): The raw SQL trigger content to analyze
+            filepath (str): Path of the trigger file to read, or the trigger's file name
+                when sql_content is given
+            encoding (str): Encoding of the trigger file
+            sql_content (str, optional): The raw SQL trigger content to analyze instead of
+                reading filepath (e.g. one unit of a multi-trigger dump)
             file_details (Dict[str, Any], optional): Dictionary containing file information
                 with keys like 'filename', 'filepath', 'filesize', etc.
+            parser_engine (str, optional): "legacy" runs one pass per statement kind over the
+                main section; "single_pass" builds the same tree in one recursive descent
+                (default: OracleTriggerAnalyzer.default_parser_engine)
         Process flow:
             1. Store the raw SQL content
             2. Initialize data structures for parsed components
@@ -43,147 +108,132 @@ class OracleTriggerAnalyzer:
             4. Parse SQL into declare and main sections
             5. Validate formatting rules
         """
-        start_time = time.time()
+        # perf_counter_ns spans of every pass, reported as metadata.profile by to_json()
+        self.profile: PassProfile = PassProfile()
         debug(
             "Initializing OracleTriggerAnalyzer with %d characters of SQL",
             len(filepath),
         )
         
-        if not os.path.exists(filepath):
+        if sql_content is None and not os.path.exists(filepath):
             raise FileNotFoundError(f"File not found: {filepath}")
+        if parser_engine is None:
+            parser_engine = self.default_parser_engine
+        if parser_engine not in PARSER_ENGINES:
+            raise ValueError(f"Unknown parser engine: {parser_engine} (expected one of {', '.join(PARSER_ENGINES)})")
+        self.parser_engine: str = parser_engine
         
-        # Extract file details
-        file_details = self.extract_file_details(filepath)
-        
-        # Read file content
-        with open(filepath, 'r', encoding=encoding) as f:
-            sql_content = f.read()
+        if sql_content is None:
+            # Extract file details
+            file_details = self.extract_file_details(filepath)
+            # Read file content
+            with open(filepath, 'r', encoding=encoding) as f:
+                sql_content = f.read()
+        elif file_details is None:
+            file_details = {"filename": os.path.basename(filepath), "filepath": filepath, "filesize": len(sql_content.encode(encoding))}
         self.sql_content: str = sql_content
         self.file_details: Dict[str, Any] = file_details or {}
         self.declare_section: List[int] = [0, 0]
         # self.main_section: List[int] = [0, 0]
-        self.main_section_lines: Dict = {}
+        self.main_section_lines: Any = {}  # BeginEnd once the main section is parsed
         self.variables: List[Dict[str, Any]] = []
         self.constants: List[Dict[str, Any]] = []
         self.exceptions: List[Dict[str, Any]] = []
         self.sql_comments: List[str] = []
-        self.structured_lines: List[Dict[str, Any]] = []
+        self.line_table: LineTable = LineTable("")
+        self.sql_scan: SqlScan = scan_sql("")
+        self.block_index: BlockIndex = BlockIndex()
+        self.structured_lines: Sequence[Dict[str, Any]] = []
         self.rest_string_list: List = []
         self.found_exception_names: Dict = {}  # Track found exception names
         # Initialize strng_convert_json dynamically based on statement mappings
-        self.strng_convert_json: Dict = self._initialize_conversion_stats()
-        logger.debug(f"structured lines conversion {len(self.structured_lines)} lines processed",)
+        with self.profile.span("load_mappings"):
+            self.strng_convert_json: Dict = self._initialize_conversion_stats()
+        logger.debug("structured lines conversion %s lines processed", len(self.structured_lines),)
         # Step 3: Parse SQL into declare and main sections
         logger.debug("SQL section parsing")
         self._parse_sql()
         logger.debug("SQL section parsing")
-        duration = time.time() - start_time
-        logger.debug(f"OracleTriggerAnalyzer initialization {duration} seconds")
+        self.parse_ns: int = time.perf_counter_ns() - self.profile.start_ns
+        logger.debug("OracleTriggerAnalyzer initialization %.3f seconds", self.parse_ns / 1e9)
     def _convert_to_structured_lines(self):
         """
         Convert raw SQL content into a structured line representation.
-        Each line is represented as a dictionary with the following structure:
+        Lines are stored in a LineTable (indent, line number and offsets into
+        sql_content), and self.structured_lines is its dict view, where each line is:
         {
             "indent": int,           # The indentation level (number of leading spaces)
-            "line": str,             # The line content without leading whitespace
+            "line": str,             # The line content without trailing whitespace
             "line_no": int,          # The line number (1-based)
-            "is_end_semicolon": bool # Whether the line ends with a semicolon
         }
         This structured format makes it easier to:
         1. Process lines based on their indentation level (nesting)
-        2. Track statement boundaries via semicolons
-        3. Maintain line numbers for error reporting
-        4. Handle comment removal while preserving structure
+        2. Maintain line numbers for error reporting
+        3. Handle comment removal while preserving structure
+        Empty and whitespace-only lines are skipped.
         """
         debug("Converting SQL content to structured lines")
-        raw_lines = self.sql_content.splitlines()
-        self.structured_lines = []
-        # Track statistics for debugging
-        semicolon_lines = 0
-        empty_lines = 0
-        for i, line in enumerate(raw_lines, start=1):
-            # Calculate indentation level (number of leading spaces)
-            indent_level = len(line) - len(line.lstrip())
-            # Get content without leading whitespace
-            content = line.rstrip()
-            # Skip completely empty lines from structured representation
-            if not content:
-                empty_lines += 1
-                continue
-            # Check if line ends with semicolon
-            is_end_semicolon = content.rstrip().endswith(";")
-            if is_end_semicolon:
-                semicolon_lines += 1
-            self.structured_lines.append(
-                {
-                    "indent": indent_level,
-                    "line": content,
-                    "line_no": i,
-                    # "is_end_semicolon": is_end_semicolon,
-                }
-            )
+        self.line_table = LineTable.from_text(self.sql_content)
+        self.structured_lines = self.line_table.records()
         debug(
-            "Structured lines conversion complete: %d total, %d with semicolons, %d empty lines skipped",
-            len(self.structured_lines),
-            semicolon_lines,
-            empty_lines,
+            "Structured lines conversion complete: %d lines",
+            len(self.line_table),
         )
-    def load_function_name(self):
+    @classmethod
+    def load_function_name(cls):
         """
         Load function name from the excel file (utilities/oracle_postgresql_mappings.xlsx) in sheet "function_list".
+        The names come from the process-wide MappingStore as a read-only tuple.
+        """
+        return MappingStore.column("function_list", "function_name")
+    @staticmethod
+    def _build_statement_mappings(frames) -> Mapping[str, str]:
         """
-        function_list = pd.read_excel(main_excel_file, sheet_name="function_list")
-        function_name = function_list["function_name"].tolist()
-        return function_name    
-    def load_statement_mappings(self):
+        Build the read-only statement → statement type map from the "statement_mappings" sheet.
+        """
+        statement_df = frames.get('statement_mappings', pd.DataFrame())
+        
+        if statement_df.empty:
+            # Return default mappings if sheet doesn't exist or is empty
+            return MappingProxyType(dict(DEFAULT_STATEMENT_MAPPINGS))
+        
+        # Convert DataFrame to dictionary
+        stmt_type_map = {}
+        for _, row in statement_df.iterrows():
+            oracle_stmt = row.get('statement', '').strip()
+            statement_type = row.get('statement_type', '').strip()
+            if oracle_stmt and statement_type:
+                stmt_type_map[oracle_stmt.upper().strip()] = statement_type.lower().strip()
+        
+        logger.debug("Loaded %s statement mappings from Excel", len(stmt_type_map))
+        return MappingProxyType(stmt_type_map)
+    @classmethod
+    def load_statement_mappings(cls):
         """
         Load statement mappings from the excel file (utilities/oracle_postgresql_mappings.xlsx) in sheet "statement_mappings".
-        Returns a dictionary mapping Oracle statement types to their corresponding statement types.
+        Returns a read-only mapping of Oracle statement types to their corresponding statement types,
+        built once per workbook version by the MappingStore.
         """
         try:
-            
-            mappings = ConfigManager.load_excel_mappings()
-            statement_df = mappings.get('statement_mappings', pd.DataFrame())
-            
-            if statement_df.empty:
-                # Return default mappings if sheet doesn't exist or is empty
-                return {
-                    "SELECT": "select_statement",
-                    "INSERT": "insert_statement", 
-                    "UPDATE": "update_statement",
-                    "DELETE": "delete_statement",
-                    "RAISE": "raise_statement",
-                    "NULL": "null_statement",
-                    "RETURN": "return_statement",
-                    "MERGE": "merge_statement",
-                    "BULK": "bulk_statement",
-                }
-            
-            # Convert DataFrame to dictionary
-            stmt_type_map = {}
-            for _, row in statement_df.iterrows():
-                oracle_stmt = row.get('statement', '').strip()
-                statement_type = row.get('statement_type', '').strip()
-                if oracle_stmt and statement_type:
-                    stmt_type_map[oracle_stmt.upper().strip()] = statement_type.lower().strip()
-            
-            logger.debug(f"Loaded {len(stmt_type_map)} statement mappings from Excel")
-            return stmt_type_map
-            
+            return MappingStore.view("statement_mappings", cls._build_statement_mappings)
         except Exception as e:
-            logger.error(f"Error loading statement mappings: {str(e)}")
+            logger.error("Error loading statement mappings: %s", str(e))
             # Return default mappings on error
-            return {
-                "SELECT": "select_statement",
-                "INSERT": "insert_statement",
-                "UPDATE": "update_statement", 
-                "DELETE": "delete_statement",
-                "RAISE": "raise_statement",
-                "NULL": "null_statement",
-                "RETURN": "return_statement",
-                "MERGE": "merge_statement",
-                "BULK": "bulk_statement",
-            }    
+            return MappingProxyType(dict(DEFAULT_STATEMENT_MAPPINGS))
+    @classmethod
+    def function_call_matcher(cls) -> FunctionCallMatcher:
+        """
+        Return the precompiled matcher for the "function_list" names.
+        Built once per process (and per workbook version) through the MappingStore.
+        """
+        return MappingStore.view("function_call_matcher", lambda frames: FunctionCallMatcher(cls.load_function_name()))
+    @classmethod
+    def statement_type_matcher(cls) -> StatementTypeMatcher:
+        """
+        Return the precompiled matcher for the "statement_mappings" keywords.
+        Built once per process (and per workbook version) through the MappingStore.
+        """
+        return MappingStore.view("statement_type_matcher", lambda frames: StatementTypeMatcher(cls.load_statement_mappings()))
     def _initialize_conversion_stats(self):
         """
         Initialize conversion statistics dictionary dynamically based on statement mappings.
@@ -209,7 +259,7 @@ class OracleTriggerAnalyzer:
                 if statement_type not in base_stats:
                     base_stats[statement_type] = 0
         except Exception as e:
-            logger.debug(f"Could not load statement mappings for stats initialization: {str(e)}")
+            logger.debug("Could not load statement mappings for stats initialization: %s", str(e))
             # Add default statement types if loading fails
             default_statements = [
                 "select_statement", "insert_statement", "update_statement", 
@@ -221,105 +271,23 @@ class OracleTriggerAnalyzer:
                     base_stats[stmt_type] = 0
         
         return base_stats    
-    def _strip_block_comments(self):
+    def _strip_comments(self):
         """
-        Strip block comments (/* ... */) from structured lines.
-        This method processes each line to remove block comments while preserving
-        the structure of the original content. It handles multi-line block comments
-        that span across multiple structured lines.
+        Strip block (/* ... */) and inline (-- ...) comments from structured lines.
+        The comment spans come from one literal-aware scan of the source (see
+        utilities/sql_lexer.py), so "--" or "/*" inside a string literal is kept and
+        a "/*" after "--" belongs to the inline comment.
         Performance optimization:
-            - Fast path check for lines without any block comments
+            - Lines without comments are kept as they are
+            - Lines are narrowed in the LineTable by offset instead of being copied
             - Preserves line numbers and indentation for proper error reporting
         """
-        clean_lines = []
-        extracted_comments = []
-        in_block_comment = False
-        current_comment = ""
-        for line_info in self.structured_lines:
-            line = line_info["line"]
-            # Fast path: if no block comment markers, keep line as is
-            if "/*" not in line and "*/" not in line and not in_block_comment:
-                clean_lines.append(line_info)
-                continue
-            # Process line with potential block comments
-            clean_line = ""
-            i = 0
-            while i < len(line):
-                if not in_block_comment:
-                    # Look for start of block comment
-                    if line[i : i + 2] == "/*":
-                        in_block_comment = True
-                        current_comment = "/*"
-                        i += 2
-                    else:
-                        clean_line += line[i]
-                        i += 1
-                else:
-                    # Inside block comment, look for end
-                    if line[i : i + 2] == "*/":
-                        in_block_comment = False
-                        current_comment += "*/"
-                        extracted_comments.append(current_comment)
-                        current_comment = ""
-                        i += 2
-                    else:
-                        current_comment += line[i]
-                        i += 1
-            # If we're still in a block comment, add newline to current comment
-            if in_block_comment:
-                current_comment += "\n"
-            # Only add line if it has content after comment removal
-            if clean_line.strip():
-                clean_lines.append(
-                    {
-                        "indent": line_info["indent"],
-                        "line": clean_line,
-                        "line_no": line_info["line_no"],
-                        # "is_end_semicolon": clean_line.rstrip().endswith(";"),
-                    }
-                )
-        # If we end with an unclosed block comment, add it to extracted comments
-        if in_block_comment and current_comment:
-            extracted_comments.append(current_comment)
-            logger.debug("Unclosed block comment detected")
-        # Update self.structured_lines and self.sql_comments
-        self.structured_lines = clean_lines
-        self.sql_comments.extend(extracted_comments)
-        logger.debug("Block comment stripping complete: %d comments extracted, %d lines cleaned", len(extracted_comments), len(clean_lines))
-    def _strip_inline_comments_from_lines(self):
-        """
-        Remove inline comments (-- ...) from structured lines.
-        This method updates self.structured_lines and adds extracted comments to self.sql_comments.
-        """
-        clean_lines = []
-        extracted_comments = []
-        for line_info in self.structured_lines:
-            line = line_info["line"]
-            # Find the position of the first inline comment
-            comment_pos = line.find("--")
-            if comment_pos == -1:
-                # No inline comment found, keep line as is
-                clean_lines.append(line_info)
-            else:
-                # Extract the comment
-                comment = line[comment_pos:].strip()
-                extracted_comments.append(comment)
-                # Keep the part before the comment
-                clean_part = line[:comment_pos].rstrip()
-                if clean_part:
-                    # Only add line if there's content after comment removal
-                    clean_lines.append(
-                        {
-                            "indent": line_info["indent"],
-                            "line": clean_part,
-                            "line_no": line_info["line_no"],
-                            # "is_end_semicolon": clean_part.rstrip().endswith(";"),
-                        }
-                    )
+        block_comments, inline_comments = self.line_table.strip_comments(self.sql_scan)
         # Update self.structured_lines and self.sql_comments
-        self.structured_lines = clean_lines
-        self.sql_comments.extend(extracted_comments)
-        logger.debug("Inline comment stripping complete: %d comments extracted, %d lines cleaned", len(extracted_comments), len(clean_lines))
+        self.structured_lines = self.line_table.records()
+        self.sql_comments.extend(block_comments)
+        self.sql_comments.extend(inline_comments)
+        logger.debug("Comment stripping complete: %d block and %d inline comments extracted, %d lines cleaned", len(block_comments), len(inline_comments), len(self.line_table))
     def _parse_sql(self) -> None:
         """
         Split SQL content into DECLARE and main (BEGIN...END) sections.
@@ -332,26 +300,32 @@ class OracleTriggerAnalyzer:
         """
         # Step 1: Convert to structured lines
         logger.debug("structured lines conversion")
-        self._convert_to_structured_lines()
+        with self.profile.span("structured_lines"):
+            self._convert_to_structured_lines()
         logger.debug("structured lines conversion")
-        # Step 2: Remove block comments (/* ... */)
-        self._strip_block_comments()
-        logger.debug("Removed block comments from main section")
-        # Step 3: Remove inline comments (-- ...)
-        self._strip_inline_comments_from_lines()
-        logger.debug("Removed inline comments from main section")
+        # Step 2: Scan once for comments, literals and parentheses
+        with self.profile.span("scan_sql"):
+            self.sql_scan = scan_sql(self.sql_content)
+        # Step 3: Remove block (/* ... */) and inline (-- ...) comments
+        with self.profile.span("strip_comments"):
+            self._strip_comments()
+        logger.debug("Removed comments from main section")
+        # Step 4: Pair block openers with their closers once for all parse passes
+        with self.profile.span("block_index"):
+            self.block_index = BlockIndex.from_line_table(self.line_table)
         # Find DECLARE and BEGIN sections
         declare_start = -1
         begin_start = -1
-        for i, line_info in enumerate(self.structured_lines):
-            line_content = line_info["line"].strip().upper()
+        line_table = self.line_table
+        for i in range(len(line_table)):
+            line_content = line_table.line(i).strip().upper()
             # Find DECLARE section
             if line_content.startswith("DECLARE"):
-                declare_start = line_info["line_no"]
+                declare_start = line_table.line_no[i]
                 logger.debug("Found DECLARE at line %d", declare_start)
                 # Find BEGIN section
             elif line_content.startswith("BEGIN") and begin_start == -1:
-                begin_start = line_info["line_no"]
+                begin_start = line_table.line_no[i]
                 logger.debug("Found BEGIN at line %d", begin_start)
             # elif line_content.endswith("END;"):
             #     begin_end_start = line_info["line_no"]
@@ -366,13 +340,78 @@ class OracleTriggerAnalyzer:
             logger.debug("No DECLARE section found")
         # Process declarations if DECLARE section exists
         if self.declare_section[0] > 0 and self.declare_section[1] >= self.declare_section[0]:
-            self._parse_declarations()
+            with self.profile.span("declarations"):
+                self._parse_declarations()
         # Process main section if main section exists
         if begin_start != len(self.structured_lines):
             self._process_main_section()
         
         # Save found exception names to Excel after parsing is complete
-        self.save_exception_names_to_excel()
+        with self.profile.span("exception_names"):
+            self._record_exception_names()
+    def _record_exception_names(self) -> None:
+        """Hand the exception names found to the open deferral block, or save them to the workbook."""
+        self.flush_deferred_writes({"exception_names": self.found_exception_names})
+    @classmethod
+    @contextmanager
+    def deferring_writes(
+        cls,
+        kinds: Sequence[str] = DEFERRED_WRITE_KINDS,
+        flush: bool = True,
+        save_exception_names: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Collect the analyzer's side-effect writes of the given kinds inside the block.
+        A process-pool worker defers both kinds and returns them to the parent
+        (flush=False). A run defers only the exception names, so the workbook is
+        written once; rest strings are already buffered by RestStringSink. Blocks nest:
+        the inner one collects, and on exit `flush_deferred_writes` hands its writes to
+        the enclosing block, or writes them when none is open.
+        Args:
+            kinds (Sequence[str]): Names from DEFERRED_WRITE_KINDS to collect
+            flush (bool): Flush the collected writes when the block exits (also on errors)
+            save_exception_names (bool): When flushing, write exception names to the
+                workbook; when False they are dropped (read-only runs)
+        Yields:
+            Dict[str, Any]: The collected writes, one entry per kind
+        """
+        previous = cls.deferred_writes
+        writes: Dict[str, Any] = {kind: ([] if kind == "rest_strings" else {}) for kind in kinds}
+        cls.deferred_writes = writes
+        try:
+            yield writes
+        finally:
+            cls.deferred_writes = previous
+            if flush:
+                cls.flush_deferred_writes(writes, save_exception_names)
+    @classmethod
+    def flush_deferred_writes(cls, writes: Dict[str, Any], save_exception_names: bool = True) -> None:
+        """
+        Hand collected writes to the open deferral block, or write them out.
+        Each kind the open block defers is merged into it (exception names keep the first
+        message and the order found); any other kind is written: rest strings to
+        RestStringSink, exception names to the workbook unless save_exception_names is False.
+        Args:
+            writes (Dict[str, Any]): "rest_strings" and/or "exception_names"
+            save_exception_names (bool): Write exception names that no open block collects
+        """
+        open_writes = cls.deferred_writes or {}
+        rest_strings = writes.get("rest_strings")
+        if rest_strings:
+            if "rest_strings" in open_writes:
+                open_writes["rest_strings"].extend(rest_strings)
+            else:
+                cls.append_rest_strings(rest_strings)
+        exception_names = writes.get("exception_names")
+        if exception_names:
+            if "exception_names" in open_writes:
+                for exception_name, message in exception_names.items():
+                    open_writes["exception_names"].setdefault(exception_name, message)
+            elif save_exception_names:
+                logger.debug("Merging %d exception names into exception_mappings", len(exception_names))
+                cls.save_exception_names(exception_names)
+            else:
+                logger.info("Skipping exception mapping update (%d names found, read-only run)", len(exception_names))
     def _parse_declarations(self) -> None:
         """
         Parse the DECLARE section and categorize declarations into:
@@ -389,13 +428,13 @@ class OracleTriggerAnalyzer:
         logger.debug("Starting declaration parsing")
         # Get all lines from the DECLARE section
         decl_lines = []
-        for line_info in self.structured_lines:
+        for i in range(len(self.line_table)):
             if (
                 self.declare_section[0] + 1
-                <= line_info["line_no"]
+                <= self.line_table.line_no[i]
                 <= self.declare_section[1]
             ):
-                decl_lines.append(line_info["line"])
+                decl_lines.append(self.line_table.line(i))
         # Join lines and split by semicolons
         full_declaration = " ".join(decl_lines)
         segments = [seg.strip() for seg in full_declaration.split(";") if seg.strip()]
@@ -575,7 +614,7 @@ class OracleTriggerAnalyzer:
         # Collect exception names for saving to Excel
         if exc_name and exc_name not in self.found_exception_names:
             self.found_exception_names[exc_name] = f'-- TODO: Map Oracle exception "{exc_name}" to PostgreSQL equivalent'
-        logger.debug(f"Found exception name: {exc_name}")
+        logger.debug("Found exception name: %s", exc_name)
         return {"name": exc_name, "type": "EXCEPTION"}
     def _process_main_section(self) -> None:
         """
@@ -583,15 +622,24 @@ class OracleTriggerAnalyzer:
         This method populates self.main_section_lines with the lines from
         the main section of the Oracle PL/SQL trigger.
         """
-        self._parse_begin_blocks()
-        self._parse_begin_end_statements()
-        self._parse_with_statements()
-        self._parse_case_when()
-        self._parse_if_else()
-        self._parse_for_loop()
-        self._parse_function_calling_statements()
-        self._parse_sql_statements()
-        self.rest_strings()
+        if self.parser_engine == "single_pass":
+            with self.profile.span("single_pass"):
+                SinglePassParser(self).parse()
+        else:
+            for parse_pass in (
+                self._parse_begin_blocks,
+                self._parse_begin_end_statements,
+                self._parse_with_statements,
+                self._parse_case_when,
+                self._parse_if_else,
+                self._parse_for_loop,
+                self._parse_function_calling_statements,
+                self._parse_sql_statements,
+            ):
+                with self.profile.span(parse_pass.__name__):
+                    parse_pass()
+        with self.profile.span("rest_strings"):
+            self.rest_strings()
 
     def _parse_with_statements(self):
         """
@@ -599,90 +647,41 @@ class OracleTriggerAnalyzer:
         Extracts the structure and processes inner blocks recursively.
         Updates self.main_section_lines with parsed blocks.
         """
-        def parse_with_statements(working_lines: List[Dict[str, Any]]):
-            with_statements = []
-            i = 0
-            with_params = -1
-            while i < len(working_lines):
+        def with_grouper(working_lines: List[Dict[str, Any]]):
+            def group(i: int):
                 item = working_lines[i]
-                if "line" in item:
-                    line_upper = item["line"].strip().upper()
-                    if line_upper.startswith("WITH ") or line_upper == "WITH":
-                        logger.debug(f"with_indent: {item['line_no']}")
-                        with_start = i
-                        with_params = 0
-                        # Find the complete WITH statement by tracking parentheses
-                        for j in range(i, len(working_lines)):
-                            line_info = working_lines[j]
-                            if "line" in line_info:
-                                line_content = line_info["line"].strip()
-                                # Count opening and closing parentheses
-                                for char in line_content:
-                                    if char == "(":
-                                        with_params += 1
-                                    elif char == ")":
-                                        with_params -= 1
-                                logger.debug(f"with_params: {with_params}")
-                                if line_info["indent"] == item["indent"] and with_params == 0:
-                                    logger.debug(f"with_start: {item['line_no']} with_end: {line_info['line_no']}")
-                                    with_statement = self._parse_with_statement(working_lines[with_start : j+1])
-                                    with_statements.append(with_statement)
-                                    i = j
-                                    break
-                    else:
-                        with_statements.append(item)
-                elif "type" in item:
-                    if item["type"] == "begin_end":
-                        # Process IF statements in begin_end_statements
-                        if "begin_end_statements" in item:
-                            item["begin_end_statements"] = parse_with_statements(item["begin_end_statements"])
-                        # Process IF statements in exception_handlers
-                        if "exception_handlers" in item:
-                            for handler in item["exception_handlers"]:
-                                if "exception_statements" in handler:
-                                    handler["exception_statements"] = parse_with_statements(handler["exception_statements"])
-                    elif item["type"] == "case_when":
-                        if "when_clauses" in item:
-                            for clause in item["when_clauses"]:
-                                if "then_statements" in clause:
-                                    clause["then_statements"] = parse_with_statements(clause["then_statements"])
-                        # Process CASE statements in top-level else_statements
-                        if "else_statements" in item:
-                            item["else_statements"] = parse_with_statements(item["else_statements"])
-                    elif item["type"] == "if_else":
-                        # Process CASE statements in then_statements, if_elses, and else_statements
-                        if "then_statements" in item:
-                            item["then_statements"] = parse_with_statements(item["then_statements"])   
-                        if "if_elses" in item:
-                            for elsif_block in item["if_elses"]:
-                                if "then_statements" in elsif_block:
-                                        elsif_block["then_statements"] = parse_with_statements(elsif_block["then_statements"])
-                        if "else_statements" in item:
-                            item["else_statements"] = parse_with_statements(item["else_statements"])
-                    # Process SQL statements in for_loop
-                    elif item["type"] == "for_loop" and "for_statements" in item:
-                        item["for_statements"] = parse_with_statements(item["for_statements"])
-                    with_statements.append(item)
-                i += 1
-            return with_statements
-        self.main_section_lines["begin_end_statements"] = parse_with_statements(self.main_section_lines["begin_end_statements"])
-        for k, handler in enumerate(self.main_section_lines["exception_handlers"]):
-            if "exception_statements" in handler:
-                self.main_section_lines['exception_handlers'][k]["exception_statements"] = parse_with_statements(handler["exception_statements"])
+                line_upper = item["line"].strip().upper()
+                if not (line_upper.startswith("WITH ") or line_upper == "WITH"):
+                    return None
+                logger.debug("with_indent: %s", item['line_no'])
+                with_params = 0
+                # Find the complete WITH statement by tracking parentheses
+                for j in range(i, len(working_lines)):
+                    line_info = working_lines[j]
+                    if "line" in line_info:
+                        # Count opening and closing parentheses (outside comments and literals)
+                        with_params += self.sql_scan.line_paren_delta(line_info["line_no"])
+                        logger.debug("with_params: %s", with_params)
+                        if line_info["indent"] == item["indent"] and with_params == 0:
+                            logger.debug("with_start: %s with_end: %s", item['line_no'], line_info['line_no'])
+                            return [self._parse_with_statement(working_lines[i : j+1])], j + 1, ()
+                # Unbalanced WITH: the line is dropped
+                return [], i + 1, ()
+            return group
+        rewrite_statement_lists(statement_lists(self.main_section_lines), with_grouper)
     def _parse_with_statement(self, working_lines: List[Dict[str, Any]]):
         """
         Parse with statement from the main section of SQL.
         Extracts the structure and processes inner blocks recursively.
         Updates self.main_section_lines with parsed blocks.
         """
-        with_statement = {
-            "type": "with_statement",
-            "with_line_no": working_lines[0]["line_no"],
-            "with_indent": working_lines[0]["indent"],
-            "with_values": "",
-            "with_statements": "",
-            "with_end_line_no": working_lines[-1]["line_no"],
-        }
+        with_statement = WithStatement(
+            with_line_no=working_lines[0]["line_no"],
+            with_indent=working_lines[0]["indent"],
+            with_values="",
+            with_statements="",
+            with_end_line_no=working_lines[-1]["line_no"],
+        )
         as_i = -1
         if working_lines[0]["line"].strip().upper().endswith("("):
             with_statement['with_values'] = working_lines[0]["line"].strip()[4:-5]
@@ -692,7 +691,7 @@ class OracleTriggerAnalyzer:
             for j in range(1, len(working_lines)):
                 line_info = working_lines[j]
                 line_upper = line_info["line"].strip().upper()
-                logger.debug(f"line_info : {line_info}")
+                logger.debug("line_info : %s", line_info)
                 if line_upper.endswith("("):
                     with_statement['with_values'] += " " + line_info["line"].strip()[:-5]
                     as_i = j
@@ -710,119 +709,55 @@ class OracleTriggerAnalyzer:
         Updates self.main_section_lines with parsed blocks.
         Detects function calling statements in the main section of SQL.
         """
-        def parse_function_calling_statements(working_lines: List[Dict[str, Any]]):
-            function_calling = []
-            function_calling_names = self.load_function_name()
-            i = 0
-            logger.debug(f"working_lines: {working_lines}")
+        # Resolved once for the whole tree instead of once per nested block
+        function_call_matcher = self.function_call_matcher()
+        def function_calling_grouper(working_lines: List[Dict[str, Any]]):
+            # An unterminated call stays open and swallows the following lines of the list
             function_calling_i = -1
             call_type = -1
             perform_type = -1
             function_calling_name = ""
-            while i < len(working_lines):
-                logger.debug(f"i: {i}")
+            def group(i: int):
+                nonlocal function_calling_i, call_type, perform_type, function_calling_name
                 item = working_lines[i]
-                if "line" in item:
-                    logger.debug(f"item: {item}")
-                    line_upper = item["line"].strip().upper()
-                    if function_calling_i == -1:
-                        for name in function_calling_names:
-                            # Handle function names with and without quotes
-                            # name_with_quotes = name.replace("'", "''")  # Escape single quotes
-                            name_patterns = [
-                                name,
-                                f"'{name}'",
-                                f"\"{name}\"",
-                                f"CALL {name}",
-                                f"CALL '{name}'",
-                                f"CALL \"{name}\"",
-                                f"PERFORM {name}",
-                                f"PERFORM '{name}'",
-                                f"PERFORM \"{name}\""
-                            ]
-                            for pattern in name_patterns:
-                                if line_upper.startswith(pattern.upper()):
-                                    if "CALL " in line_upper:
-                                        call_type = i
-                                    elif "PERFORM " in line_upper:
-                                        perform_type = i
-                                    function_calling_i = i
-                                    function_calling_name = name
-                                    logger.debug(f"function_calling_name: {function_calling_name}")
-                                    break
-                    if call_type != -1:
-                        function_calling_name = "CALL " + function_calling_name
-                    elif perform_type != -1:
-                        function_calling_name = "PERFORM " + function_calling_name
-                    if function_calling_i != -1:
-                        logger.debug(f"item: {line_upper}")
-                        logger.debug(f"function calling start: {item['line_no']}")
-                        if function_calling_name == "RAISE_APPLICATION_ERROR":
-                            # Collect exception names for saving to Excel
-                            if exception_name and exception_name not in self.found_exception_names:
-                                self.found_exception_names[exception_name] = f'-- TODO: Map Oracle exception "{exception_name}" to PostgreSQL equivalent'
-                                logger.debug(f"Found exception name: {exception_name}") 
-                        if line_upper.endswith(";"):
-                            logger.debug(f"function calling end: {item['line_no']}")                         
-                            function_calling.append(self._parse_function_calling([item],function_calling_name))
-                            function_calling_i = -1  # Reset for next iteration
-                            call_type = -1
-                            perform_type = -1
-                        else:
-                            for j in range(i + 1, len(working_lines)):
-                                line_info = working_lines[j]
-                                if "line" in line_info:
-                                    line_upper = line_info["line"].strip().upper()
-                                    if line_upper.endswith(";"):
-                                        logger.debug(f"function calling end: {line_info['line_no']}")                          
-                                        function_calling.append(self._parse_function_calling(working_lines[i:j+1],function_calling_name))
-                                        i = j
-                                        function_calling_i = -1
-                                        call_type = -1
-                                        perform_type = -1
-                                        break
-                    else:
-                        function_calling.append(item)
-                # Handle nested structures (begin_end blocks, exception handlers, etc.)
-                # Process IF statements in begin_end_statements
-                elif "type" in item:
-                    if item["type"] == "begin_end":
-                        # Process IF statements in begin_end_statements
-                        if "begin_end_statements" in item:
-                            item["begin_end_statements"] = parse_function_calling_statements(item["begin_end_statements"])
-                        # Process IF statements in exception_handlers
-                        if "exception_handlers" in item:
-                            for handler in item["exception_handlers"]:
-                                if "exception_statements" in handler:
-                                    handler["exception_statements"] = parse_function_calling_statements(handler["exception_statements"])
-                    elif item["type"] == "case_when":
-                        if "when_clauses" in item:
-                            for clause in item["when_clauses"]:
-                                if "then_statements" in clause:
-                                    clause["then_statements"] = parse_function_calling_statements(clause["then_statements"])
-                        # Process CASE statements in top-level else_statements
-                        if "else_statements" in item:
-                            item["else_statements"] = parse_function_calling_statements(item["else_statements"])
-                    elif item["type"] == "if_else":
-                        # Process CASE statements in then_statements, if_elses, and else_statements
-                        if "then_statements" in item:
-                            item["then_statements"] = parse_function_calling_statements(item["then_statements"])   
-                        if "if_elses" in item:
-                            for elsif_block in item["if_elses"]:
-                                if "then_statements" in elsif_block:
-                                        elsif_block["then_statements"] = parse_function_calling_statements(elsif_block["then_statements"])
-                        if "else_statements" in item:
-                            item["else_statements"] = parse_function_calling_statements(item["else_statements"])
-                    # Process SQL statements in for_loop
-                    elif item["type"] == "for_loop" and "for_statements" in item:
-                        item["for_statements"] = parse_function_calling_statements(item["for_statements"])
-                    function_calling.append(item)
-                i += 1
-            return function_calling
-        self.main_section_lines["begin_end_statements"] = parse_function_calling_statements(self.main_section_lines["begin_end_statements"])
-        for k, handler in enumerate(self.main_section_lines["exception_handlers"]):
-            if "exception_statements" in handler:
-                self.main_section_lines['exception_handlers'][k]["exception_statements"] = parse_function_calling_statements(handler["exception_statements"])
+                logger.debug("item: %s", item)
+                line_upper = item["line"].strip().upper()
+                if function_calling_i == -1:
+                    matched_name = function_call_matcher.match(line_upper)
+                    if matched_name is not None:
+                        if "CALL " in line_upper:
+                            call_type = i
+                        elif "PERFORM " in line_upper:
+                            perform_type = i
+                        function_calling_i = i
+                        function_calling_name = matched_name
+                        logger.debug("function_calling_name: %s", function_calling_name)
+                if call_type != -1:
+                    function_calling_name = "CALL " + function_calling_name
+                elif perform_type != -1:
+                    function_calling_name = "PERFORM " + function_calling_name
+                if function_calling_i == -1:
+                    return None
+                logger.debug("function calling start: %s", item['line_no'])
+                end_i = -1
+                if line_upper.endswith(";"):
+                    end_i = i
+                else:
+                    for j in range(i + 1, len(working_lines)):
+                        line_info = working_lines[j]
+                        if "line" in line_info and line_info["line"].strip().upper().endswith(";"):
+                            end_i = j
+                            break
+                if end_i == -1:
+                    return [], i + 1, ()
+                logger.debug("function calling end: %s", working_lines[end_i]['line_no'])
+                function_call = self._parse_function_calling(working_lines[i:end_i+1], function_calling_name)
+                function_calling_i = -1  # Reset for next iteration
+                call_type = -1
+                perform_type = -1
+                return [function_call], end_i + 1, ()
+            return group
+        rewrite_statement_lists(statement_lists(self.main_section_lines), function_calling_grouper)
     def _parse_sql_statements(self):
         """
         Parse SQL statements from the main section of SQL.
@@ -841,108 +776,44 @@ class OracleTriggerAnalyzer:
             ":=": "assignment",
             }
         """
-        def parse_sql_statements(working_lines: List[Dict[str, Any]]):
-            # Load statement mappings from Excel
-            STMT_TYPE_MAP = self.load_statement_mappings()
-            sql_statements = []
-            i = 0
+        # Resolved once for the whole tree instead of once per nested block
+        statement_type_matcher = self.statement_type_matcher()
+        def sql_statement_grouper(working_lines: List[Dict[str, Any]]):
+            # An unterminated statement stays open and swallows the following lines of the list
             stmt_i = -1
             stmt_type = ""
-            logger.debug(f"working_lines: {working_lines}")
-            while i < len(working_lines):
-                logger.debug(f"i: {i}")
+            def find_end(i: int) -> int:
+                for j in range(i, len(working_lines)):
+                    if working_lines[j]["line"].strip().upper().endswith(";"):
+                        return j
+                return -1
+            def group(i: int):
+                nonlocal stmt_i, stmt_type
                 item = working_lines[i]
-                if "line" in item:
-                    logger.debug(f"item: {item['line']} || {item['line_no']} || {item['indent']}")
-                    line_upper = item["line"].strip().upper()
-                    for type_name, type_value in STMT_TYPE_MAP.items():
-                        name_patterns = [
-                                type_name,
-                                f"{type_name} ",
-                                f"{type_name};",
-                        ]
-                        for pattern in name_patterns:
-                            if line_upper.startswith(pattern.upper()):
-                                logger.debug(f"stmt start: {item['line_no']} || {type_value} || {pattern}")
-                                stmt_i = i
-                                stmt_type = type_value
-                                logger.debug(f"stmt start: {item['line_no']} || {stmt_type}")
-                                break
-                    if stmt_i != -1:
-                        logger.debug(f"stmt start: {item['line_no']} || {stmt_type}")
-                        if line_upper.endswith(";"):
-                            logger.debug(f"stmt end: {item['line_no']} || {stmt_type}")                         
-                            sql_statements.append(self._parse_sql_statement([item], stmt_type))
-                            stmt_i = -1
-                        else:
-                            for j in range(i + 1, len(working_lines)):
-                                line_info = working_lines[j]
-                                line_upper = line_info["line"].strip().upper()
-                                if line_upper.endswith(";"):
-                                    logger.debug(f"stmt end: {line_info['line_no']} || {stmt_type}")                         
-                                    sql_statements.append(self._parse_sql_statement(working_lines[i:j+1], stmt_type))
-                                    stmt_i = -1
-                                    i = j
-                                    break
-                    elif ":=" in line_upper:
-                        stmt_type = "assignment"
-                        logger.debug(f"stmt start: {item['line_no']} || assignment")
-                        if line_upper.endswith(";"):
-                            logger.debug(f"stmt end: {item['line_no']} || assignment")                         
-                            sql_statements.append(self._parse_assignment_statement([item]))
-                            stmt_i = -1
-                        else:
-                            for j in range(i + 1, len(working_lines)):
-                                line_info = working_lines[j]
-                                line_upper = line_info["line"].strip().upper()
-                                if line_upper.endswith(";"):
-                                    logger.debug(f"stmt end: {line_info['line_no']} || assignment")                         
-                                    sql_statements.append(self._parse_assignment_statement(working_lines[i:j+1]))
-                                    stmt_i = -1
-                                    i = j
-                                    break
-                    else:
-                        sql_statements.append(item)
-                # Handle nested structures (begin_end blocks, exception handlers, etc.)
-                # Process IF statements in begin_end_statements
-                elif "type" in item:
-                    if item["type"] == "begin_end":
-                        # Process IF statements in begin_end_statements
-                        if "begin_end_statements" in item:
-                            item["begin_end_statements"] = parse_sql_statements(item["begin_end_statements"])
-                        # Process IF statements in exception_handlers
-                        if "exception_handlers" in item:
-                            for handler in item["exception_handlers"]:
-                                if "exception_statements" in handler:
-                                    handler["exception_statements"] = parse_sql_statements(handler["exception_statements"])
-                    elif item["type"] == "case_when":
-                        if "when_clauses" in item:
-                            for clause in item["when_clauses"]:
-                                if "then_statements" in clause:
-                                    clause["then_statements"] = parse_sql_statements(clause["then_statements"])
-                        # Process CASE statements in top-level else_statements
-                        if "else_statements" in item:
-                            item["else_statements"] = parse_sql_statements(item["else_statements"])
-                    elif item["type"] == "if_else":
-                        # Process CASE statements in then_statements, if_elses, and else_statements
-                        if "then_statements" in item:
-                            item["then_statements"] = parse_sql_statements(item["then_statements"])   
-                        if "if_elses" in item:
-                            for elsif_block in item["if_elses"]:
-                                if "then_statements" in elsif_block:
-                                        elsif_block["then_statements"] = parse_sql_statements(elsif_block["then_statements"])
-                        if "else_statements" in item:
-                            item["else_statements"] = parse_sql_statements(item["else_statements"])
-                    # Process SQL statements in for_loop
-                    elif item["type"] == "for_loop" and "for_statements" in item:
-                        item["for_statements"] = parse_sql_statements(item["for_statements"])
-                    sql_statements.append(item)
-                i += 1
-            return sql_statements
-        self.main_section_lines["begin_end_statements"] = parse_sql_statements(self.main_section_lines["begin_end_statements"])
-        for k, handler in enumerate(self.main_section_lines["exception_handlers"]):
-            if "exception_statements" in handler:
-                self.main_section_lines['exception_handlers'][k]["exception_statements"] = parse_sql_statements(handler["exception_statements"])
+                logger.debug("item: %s || %s || %s", item['line'], item['line_no'], item['indent'])
+                line_upper = item["line"].strip().upper()
+                matched_type = statement_type_matcher.match(line_upper)
+                if matched_type is not None:
+                    stmt_i = i
+                    stmt_type = matched_type
+                    logger.debug("stmt start: %s || %s", item['line_no'], stmt_type)
+                if stmt_i == -1 and ":=" not in line_upper:
+                    return None
+                if stmt_i == -1:
+                    stmt_type = "assignment"
+                    logger.debug("stmt start: %s || assignment", item['line_no'])
+                end_i = find_end(i)
+                if end_i == -1:
+                    return [], i + 1, ()
+                logger.debug("stmt end: %s || %s", working_lines[end_i]['line_no'], stmt_type)
+                if stmt_i == -1:
+                    statement = self._parse_assignment_statement(working_lines[i:end_i+1])
+                else:
+                    statement = self._parse_sql_statement(working_lines[i:end_i+1], stmt_type)
+                stmt_i = -1
+                return [statement], end_i + 1, ()
+            return group
+        rewrite_statement_lists(statement_lists(self.main_section_lines), sql_statement_grouper)
     def _parse_sql_statement(self, working_lines: List[Dict[str, Any]], stmt_type: str):
         """
         Parse SQL statements from the main section of SQL.
@@ -952,23 +823,22 @@ class OracleTriggerAnalyzer:
         if stmt_type == "raise_statement":
             line = self.combine_lines(working_lines)
             exception_name = line.replace("RAISE", "")[:-1].strip()
-            sql_statement = {
-                "type": stmt_type,
-                "exception_name": exception_name,
-                "statement_line_no": working_lines[0]["line_no"],
-                "statement_indent": working_lines[0]["indent"],
-            }
+            sql_statement = RaiseStatement(
+                exception_name=exception_name,
+                statement_line_no=working_lines[0]["line_no"],
+                statement_indent=working_lines[0]["indent"],
+            )
             # Collect exception names for saving to Excel
             if exception_name and exception_name not in self.found_exception_names:
                 self.found_exception_names[exception_name] = f'-- TODO: Map Oracle exception "{exception_name}" to PostgreSQL equivalent'
-                logger.debug(f"Found exception name: {exception_name}") 
+                logger.debug("Found exception name: %s", exception_name) 
         else:
-            sql_statement = {
-                "type": stmt_type,
-                "sql_statement": self.combine_lines(working_lines),
-                "statement_line_no": working_lines[0]["line_no"],
-                "statement_indent": working_lines[0]["indent"],
-            }
+            sql_statement = SqlStatement(
+                type=stmt_type,
+                sql_statement=self.combine_lines(working_lines),
+                statement_line_no=working_lines[0]["line_no"],
+                statement_indent=working_lines[0]["indent"],
+            )
         return sql_statement
     def _parse_assignment_statement(self, working_lines: List[Dict[str, Any]]):
         """
@@ -979,15 +849,14 @@ class OracleTriggerAnalyzer:
         Uses structured line dictionaries.
         """
         line = self.combine_lines(working_lines)
-        assignment_statement = {
-            "type": "assignment",
-            "variable_name": line.split(":=")[0].strip(),
-            "assignment_operator": ":=",
-            "expression": line.split(":=")[1][:-1].strip(),
-            "assignment_line_no": working_lines[0]["line_no"],
-            "assignment_indent": working_lines[0]["indent"],
-        }
-        logger.debug(f"assignment_statement: {assignment_statement}")
+        assignment_statement = Assignment(
+            variable_name=line.split(":=")[0].strip(),
+            assignment_operator=":=",
+            expression=line.split(":=")[1][:-1].strip(),
+            assignment_line_no=working_lines[0]["line_no"],
+            assignment_indent=working_lines[0]["indent"],
+        )
+        logger.debug("assignment_statement: %s", assignment_statement)
         return assignment_statement
         
     def _parse_for_loop(self):
@@ -1000,81 +869,38 @@ class OracleTriggerAnalyzer:
             statements...
         END LOOP;
         And converts them to a structured JSON representation.
-        """ 
-        def parse_for_loop(working_lines: List[Dict[str, Any]]):
-            for_loop_statements = []
-            i = 0
-            while i < len(working_lines):
+        """
+        def for_loop_grouper(working_lines: List[Dict[str, Any]]):
+            positions = None
+            def group(i: int):
+                nonlocal positions
                 item = working_lines[i]
-                if "line" in item:
-                    line_upper = item["line"].strip().upper()
-                    if line_upper.startswith("FOR") :
-                        for j in range(i + 1, len(working_lines)):
-                            line_info = working_lines[j]
-                            if "line" in line_info:
-                                line_upper = line_info["line"].strip().upper()
-                                if line_upper.startswith("END LOOP;") and line_info["indent"] == item["indent"]:
-                                    logger.debug(f"for_i: {working_lines[i]["line_no"]} i: {item["line_no"]}")
-                                    for_loop_statements.append(self._parse_for_loop_statement(working_lines[i:j+1]))
-                                    i = j
-                                    break
-                    else:
-                        for_loop_statements.append(item)
-                # Handle nested structures (begin_end blocks, exception handlers, etc.)
-                # Process FOR loop statements in begin_end_statements
-                elif "type" in item:
-                    if item["type"] == "begin_end":
-                        if "begin_end_statements" in item:
-                            item["begin_end_statements"] = parse_for_loop(item["begin_end_statements"])
-                        # Process FOR loop statements in exception_handlers
-                        if "exception_handlers" in item:
-                            for handler in item["exception_handlers"]:
-                                if "exception_statements" in handler:
-                                    handler["exception_statements"] = parse_for_loop(handler["exception_statements"])
-                    # Process FOR loop statements in case_when
-                    elif item["type"] == "case_when":
-                        if "when_clauses" in item:
-                            for clause in item["when_clauses"]:
-                                if "then_statements" in clause:
-                                    clause["then_statements"] = parse_for_loop(clause["then_statements"])
-                        # Process FOR loop statements in else_statements
-                        if "else_statements" in item:
-                            item["else_statements"] = parse_for_loop(item["else_statements"])
-                    # Process FOR loop statements in if_else
-                    elif item["type"] == "if_else":
-                        if "then_statements" in item:
-                            item["then_statements"] = parse_for_loop(item["then_statements"])
-                        if "if_elses" in item:
-                            for elsif_block in item["if_elses"]:
-                                if "then_statements" in elsif_block:
-                                    elsif_block["then_statements"] = parse_for_loop(elsif_block["then_statements"])
-                        if "else_statements" in item:
-                            item["else_statements"] = parse_for_loop(item["else_statements"])
-                    # Process FOR loop statements in for_loop
-                    elif item["type"] == "for_loop" and "for_statements" in item:
-                        item["for_statements"] = parse_for_loop(item["for_statements"])
-                    for_loop_statements.append(item)
-                i += 1
-            return for_loop_statements
-        self.main_section_lines["begin_end_statements"] = parse_for_loop(self.main_section_lines["begin_end_statements"])
-        for k, handler in enumerate(self.main_section_lines["exception_handlers"]):
-            if "exception_statements" in handler:
-                self.main_section_lines['exception_handlers'][k]["exception_statements"] = parse_for_loop(handler["exception_statements"])
+                if not item["line"].strip().upper().startswith("FOR"):
+                    return None
+                if positions is None:
+                    positions = BlockIndex.positions(working_lines)
+                j = self.block_index.find_closer("FOR", working_lines, i, positions)
+                if j == -1:
+                    return [], i + 1, ()
+                logger.debug("for_i: %s i: %s", item["line_no"], working_lines[j]["line_no"])
+                # Loops nested in the new loop's body are not grouped
+                return [self._parse_for_loop_statement(working_lines[i:j+1])], j + 1, ()
+            return group
+        rewrite_statement_lists(statement_lists(self.main_section_lines), for_loop_grouper)
     def _parse_for_loop_statement(self, working_lines: List[Dict[str, Any]]):
         """
         Parse FOR loop statement from the main section of SQL.
         Extracts the structure and processes inner blocks recursively.
         Updates self.main_section_lines with parsed blocks.
         """
-        for_loop_statement = {
-            "for_expression": "",
-            "type": "for_loop",
-            "for_line_no": working_lines[0]["line_no"],
-            "for_indent": working_lines[0]["indent"],
-            "end_for_line_no": working_lines[-1]["line_no"],
-            "loop_variable": "",
-            "for_statements": [],
-        }
+        for_loop_statement = ForLoop(
+            for_expression="",
+            for_line_no=working_lines[0]["line_no"],
+            for_indent=working_lines[0]["indent"],
+            end_for_line_no=working_lines[-1]["line_no"],
+            loop_variable="",
+            for_statements=[],
+        )
         in_i = -1
         if "IN" in working_lines[0]["line"]:
             in_position = working_lines[0]["line"].strip().upper().find("IN")
@@ -1099,7 +925,7 @@ class OracleTriggerAnalyzer:
         else:
             in_position = working_lines[in_i]["line"].strip().upper().find("IN")
             for_loop_statement["for_expression"] = working_lines[in_i]["line"].strip()[in_position+2:].strip()
-            logger.debug(f"for_loop_statement for_expression: {for_loop_statement["for_expression"]} in_position: {in_position}")
+            logger.debug("for_loop_statement for_expression: %s in_position: %s", for_loop_statement["for_expression"], in_position)
             for k in range(in_i+1, len(working_lines)):
                 line_info = working_lines[k]
                 line_upper = line_info["line"].strip().upper()
@@ -1107,11 +933,11 @@ class OracleTriggerAnalyzer:
                     loop_position = line_upper.find("LOOP")
                     for_loop_statement["for_expression"] += " " + line_info["line"].strip()[:loop_position].strip()
                     loop_i = k
-                    logger.debug(f"for_loop_statement for_expression: {for_loop_statement["for_expression"]} in_position: {in_position} loop_position: {loop_position}")
+                    logger.debug("for_loop_statement for_expression: %s in_position: %s loop_position: %s", for_loop_statement["for_expression"], in_position, loop_position)
                     break
                 for_loop_statement["for_expression"] += " " + line_info["line"].strip()
         for_loop_statement['for_statements'] = working_lines[loop_i+1:-1]
-        logger.debug(f"for_loop_statement: {for_loop_statement} {working_lines[in_i]['line_no']} {working_lines[loop_i]['line_no']}")
+        logger.debug("for_loop_statement: %s %s %s", for_loop_statement, working_lines[in_i]['line_no'], working_lines[loop_i]['line_no'])
         return for_loop_statement
     def _parse_if_else(self):
         """
@@ -1120,92 +946,44 @@ class OracleTriggerAnalyzer:
         Maintains the hierarchical structure of IF-ELSIF-ELSE blocks by checking indentation levels.
         Updates self.main_section_lines with parsed blocks.
         """
-        def parse_if_else(working_lines: List[Dict[str, Any]]):
-            if_else_statements = []
-            i = 0
-            while i < len(working_lines):
+        def if_else_grouper(working_lines: List[Dict[str, Any]]):
+            positions = None
+            def group(i: int):
+                nonlocal positions
                 item = working_lines[i]
-                if "line" in item:
-                    logger.debug(f"item: {item}")
-                    line_upper = item["line"].strip().upper()
-                    if line_upper.startswith("IF ") or line_upper == "IF":
-                        logger.debug(f"if_indent: {item['line_no']}")
-                        for j in range(i + 1, len(working_lines)):
-                            line_info = working_lines[j]
-                            if "line" in line_info:
-                                line_upper = line_info["line"].strip().upper()
-                                if line_upper.startswith("END IF;") and line_info["indent"] == item["indent"]:
-                                    logger.debug(f"if_i: {item['line_no']} i: {line_info['line_no']}")
-                                    logger.debug(f"if_elses working_lines lenght: {len(working_lines[i : j+1])}")
-                                    if_else_statement = self._parse_if_else_statements(working_lines[i : j+1])
-                                    if_else_statement["then_statements"] = parse_if_else(if_else_statement["then_statements"])
-                                    for elif_clause in if_else_statement["if_elses"]:
-                                        elif_clause["then_statements"] = parse_if_else(elif_clause["then_statements"])
-                                    logger.debug(f"if_else_statement else_statements: {if_else_statement['else_statements']}")
-                                    if_else_statement["else_statements"] = parse_if_else(if_else_statement["else_statements"])
-                                    logger.debug(f"if_else_statement else_statements: {if_else_statement['else_statements']}")
-                                    if_else_statements.append(if_else_statement)
-                                    i = j
-                                    break
-                    else:
-                        if_else_statements.append(item)
-                # Handle nested structures (begin_end blocks, exception handlers, etc.)
-                # Process IF statements in begin_end_statements
-                elif "type" in item:
-                    if item["type"] == "begin_end":
-                        # Process IF statements in begin_end_statements
-                        if "begin_end_statements" in item:
-                            item["begin_end_statements"] = parse_if_else(item["begin_end_statements"])
-                        # Process IF statements in exception_handlers
-                        if "exception_handlers" in item:
-                            for handler in item["exception_handlers"]:
-                                if "exception_statements" in handler:
-                                    handler["exception_statements"] = parse_if_else(handler["exception_statements"])
-                    elif item["type"] == "case_when":
-                        if "when_clauses" in item:
-                            for clause in item["when_clauses"]:
-                                if "then_statements" in clause:
-                                    clause["then_statements"] = parse_if_else(clause["then_statements"])
-                        # Process CASE statements in top-level else_statements
-                        if "else_statements" in item:
-                            item["else_statements"] = parse_if_else(item["else_statements"])
-                    elif item["type"] == "if_else":
-                        # Process CASE statements in then_statements, if_elses, and else_statements
-                        if "then_statements" in item:
-                            item["then_statements"] = parse_if_else(item["then_statements"])
-                        if "if_elses" in item:
-                            for elsif_block in item["if_elses"]:
-                                if "then_statements" in elsif_block:
-                                    elsif_block["then_statements"] = parse_if_else(elsif_block["then_statements"])
-                        if "else_statements" in item:
-                            item["else_statements"] = parse_if_else(item["else_statements"])
-                    # Process IF statements in for_loop
-                    elif item["type"] == "for_loop" and "for_statements" in item:
-                        item["for_statements"] = parse_if_else(item["for_statements"])
-                    if_else_statements.append(item)
-                i += 1
-            return if_else_statements
-        self.main_section_lines["begin_end_statements"] = parse_if_else(self.main_section_lines["begin_end_statements"])
-        for k, handler in enumerate(self.main_section_lines["exception_handlers"]):
-            if "exception_statements" in handler:
-                self.main_section_lines['exception_handlers'][k]["exception_statements"] = parse_if_else(handler["exception_statements"])
+                logger.debug("item: %s", item)
+                line_upper = item["line"].strip().upper()
+                if not (line_upper.startswith("IF ") or line_upper == "IF"):
+                    return None
+                logger.debug("if_indent: %s", item['line_no'])
+                if positions is None:
+                    positions = BlockIndex.positions(working_lines)
+                j = self.block_index.find_closer("IF", working_lines, i, positions)
+                if j == -1:
+                    return [], i + 1, ()
+                logger.debug("if_i: %s i: %s", item['line_no'], working_lines[j]['line_no'])
+                logger.debug("if_elses working_lines lenght: %s", j + 1 - i)
+                if_else_statement = self._parse_if_else_statements(working_lines[i : j+1])
+                # The THEN, ELSIF and ELSE statements are grouped next
+                return [if_else_statement], j + 1, statement_lists(if_else_statement)
+            return group
+        rewrite_statement_lists(statement_lists(self.main_section_lines), if_else_grouper)
     def _parse_if_else_statements(self, working_lines: List[Dict[str, Any]]):
         """
         Parse elif and else statements from the main section of SQL.
         Extracts the structure and processes inner blocks recursively.
         Updates self.main_section_lines with parsed blocks.
         """
-        if_else_statements = {
-            "condition": "",
-            "type": "if_else",
-            "if_line_no": working_lines[0]["line_no"],
-            "then_line_no": 0,
-            "if_indent": working_lines[0]["indent"],
-            "end_if_line_no": working_lines[-1]["line_no"],
-            "then_statements": [],
-            "if_elses": [],
-            "else_statements": [],
-        }
+        if_else_statements = IfElse(
+            condition="",
+            if_line_no=working_lines[0]["line_no"],
+            then_line_no=0,
+            if_indent=working_lines[0]["indent"],
+            end_if_line_no=working_lines[-1]["line_no"],
+            then_statements=[],
+            if_elses=[],
+            else_statements=[],
+        )
         then_i = -1
         elif_line_indent = working_lines[0]["indent"]
         if working_lines[0]["line"].strip().upper().endswith("THEN") or working_lines[0]["line"].strip().upper() == "THEN":
@@ -1216,64 +994,48 @@ class OracleTriggerAnalyzer:
             for j in range(1, len(working_lines)):
                 line_info = working_lines[j]
                 line_upper = line_info["line"].strip().upper()
-                logger.debug(f"line_info : {line_info}")
+                logger.debug("line_info : %s", line_info)
                 if line_upper.endswith("THEN") or line_upper == "THEN":
                     if_else_statements['condition'] += " " + line_info["line"].strip()[:-4]
                     then_i = j
                     break
                 if_else_statements['condition'] += " " + line_info["line"].strip()
         if_else_statements['then_line_no'] = working_lines[then_i]["line_no"]
-        i = then_i + 1
         elif_i = -1
         else_i = -1
-        while i < len(working_lines):
-            item = working_lines[i]
-            if "line" in item:
-                line_upper = item["line"].strip().upper()
-                if line_upper.startswith("ELSIF") and item["indent"] == elif_line_indent:
-                    if elif_i == -1:
-                        logger.debug(f"then_statements: {0} {i}")
-                        if_else_statements['then_statements'].extend(working_lines[then_i+1:i])
+        # ELSIF / ELSE / END IF; lines at the IF indent, from the index instead of a forward scan
+        positions = BlockIndex.positions(working_lines)
+        split_points = self.block_index.split_points(("ELSIF", "ELSE", "END IF;"), elif_line_indent, positions, working_lines[0]["line_no"], working_lines[-1]["line_no"])
+        for i, keyword in split_points:
+            if i <= then_i:
+                continue
+            if elif_i == -1:
+                if keyword == "ELSIF":
+                    logger.debug("then_statements: %s %s", 0, i)
+                    if_else_statements['then_statements'].extend(working_lines[then_i+1:i])
                     elif_i = i
-                    j = i + 1
-                    while j < len(working_lines):
-                        line_info = working_lines[j]
-                        logger.debug(f"line_info: {line_info}")
-                        if "line" in line_info:
-                            line_upper = line_info["line"].strip().upper()
-                            if line_upper.startswith("ELSIF") and line_info["indent"] == elif_line_indent:
-                                logger.debug(working_lines[elif_i],working_lines[j])
-                                if_else_statements['if_elses'].append(self._parse_elif_else_then_statements(working_lines[elif_i : j]))
-                                elif_i = j
-                            elif line_upper.startswith("ELSE") and line_info["indent"] == elif_line_indent:
-                                logger.debug(working_lines[elif_i],working_lines[j - 1])
-                                if_else_statements['if_elses'].append(self._parse_elif_else_then_statements(working_lines[elif_i:j]))
-                                logger.debug(working_lines[j + 1],working_lines[-1])
-                                if_else_statements['else_statements'].extend(working_lines[j + 1 :-1])
-                                logger.debug(f"else_statements: {if_else_statements['else_statements']}")
-                                i = len(working_lines)
-                                break
-                            elif line_upper.startswith("END IF;") and line_info["indent"] == elif_line_indent:
-                                logger.debug(working_lines[elif_i],working_lines[j])
-                                if_else_statements['if_elses'].append(self._parse_elif_else_then_statements(working_lines[elif_i : j]))
-                                i = len(working_lines)
-                                break
-                        j += 1
-                elif line_upper.startswith("ELSE") and item["indent"] == elif_line_indent:
+                elif keyword == "ELSE":
                     else_i = i
-                    if elif_i == -1:
-                        if_else_statements['then_statements'].extend(working_lines[then_i+1:i])
-                    # logger.debug(f"else_statements: {working_lines[i+1]["line_no"]}, {working_lines[-1]["line_no"]}")
+                    if_else_statements['then_statements'].extend(working_lines[then_i+1:i])
                     if_else_statements['else_statements'].extend(working_lines[i + 1 :-1])
-                    logger.debug(f"if_else_statement else_statements: {if_else_statements['else_statements']}")
-                    i = len(working_lines)
-            i += 1
+                    logger.debug("if_else_statement else_statements: %s", if_else_statements['else_statements'])
+                    break
+                continue
+            # Each ELSIF clause runs up to the next ELSIF, ELSE or END IF;
+            if_else_statements['if_elses'].append(self._parse_elif_else_then_statements(working_lines[elif_i:i]))
+            if keyword == "ELSIF":
+                elif_i = i
+            else:
+                if keyword == "ELSE":
+                    if_else_statements['else_statements'].extend(working_lines[i + 1 :-1])
+                    logger.debug("else_statements: %s", if_else_statements['else_statements'])
+                break
         if else_i == -1 and elif_i == -1:
-            logger.debug(f"else_i: {else_i} elif_i: {elif_i} then_statements: { working_lines[then_i+1:-1]}")
+            logger.debug("else_i: %s elif_i: %s then_statements: %s", else_i, elif_i, working_lines[then_i+1:-1])
             # if then_i+1 == len(working_lines):
             if_else_statements['then_statements'].extend(working_lines[then_i+1:-1])
             # logger.debug(f"if_else_statement else_statements: {if_else_statements['else_statements']}")
-        logger.debug(f"if_else_statements : {if_else_statements}")
+        logger.debug("if_else_statements : %s", if_else_statements)
         return if_else_statements
     def _parse_elif_else_then_statements(self, working_lines: List[Dict[str, Any]]):
         """
@@ -1282,11 +1044,11 @@ class OracleTriggerAnalyzer:
         Updates self.main_section_lines with parsed blocks.
         """
         elif_else_then_statements = working_lines
-        logger.debug(f"elif_else_then_statements: {elif_else_then_statements}")
+        logger.debug("elif_else_then_statements: %s", elif_else_then_statements)
         logger.debug(elif_else_then_statements)
         condition = ""
         then_i = 0
-        logger.debug(f"elif_else_then_statements[0]: {elif_else_then_statements[0]}")
+        logger.debug("elif_else_then_statements[0]: %s", elif_else_then_statements[0])
         if elif_else_then_statements[0]["line"].strip().upper().endswith("THEN"):
             then_i = 0
             condition = self._extract_value_from_when_then(
@@ -1299,7 +1061,7 @@ class OracleTriggerAnalyzer:
             j = 1
             while j < len(elif_else_then_statements):
                 # Extract value from current line
-                logger.debug(f"elif_else_then_statements[j]: {elif_else_then_statements[j]}")
+                logger.debug("elif_else_then_statements[j]: %s", elif_else_then_statements[j])
                 if (
                     elif_else_then_statements[j]["line"]
                     .strip()
@@ -1313,17 +1075,16 @@ class OracleTriggerAnalyzer:
                 condition = self._extract_value_from_when_then(
                     elif_else_then_statements[: then_i + 1], ["ELSIF", "THEN"]
                 )
-        logger.debug(f"elif_else_then_statements 0: {elif_else_then_statements[0]['line_no']} then_i: {elif_else_then_statements[then_i]['line_no']}")
-        logger.debug(f"case_when_then_statements: {elif_else_then_statements}")
-        logger.debug(f"elif_else_then_statements[0]['indent']: {elif_else_then_statements[0]['indent']}")
-        elif_statements = {
-            "type": "elif_statement",
-            "elif_line_no": elif_else_then_statements[0]["line_no"],
-            "elif_indent": elif_else_then_statements[0]["indent"],
-            "condition": condition,
-            "then_line_no": elif_else_then_statements[then_i]["line_no"],
-            "then_statements": elif_else_then_statements[then_i + 1 :],
-        }
+        logger.debug("elif_else_then_statements 0: %s then_i: %s", elif_else_then_statements[0]['line_no'], elif_else_then_statements[then_i]['line_no'])
+        logger.debug("case_when_then_statements: %s", elif_else_then_statements)
+        logger.debug("elif_else_then_statements[0]['indent']: %s", elif_else_then_statements[0]['indent'])
+        elif_statements = ElsifClause(
+            elif_line_no=elif_else_then_statements[0]["line_no"],
+            elif_indent=elif_else_then_statements[0]["indent"],
+            condition=condition,
+            then_line_no=elif_else_then_statements[then_i]["line_no"],
+            then_statements=elif_else_then_statements[then_i + 1 :],
+        )
         return elif_statements
     def _parse_case_when(self):
         """
@@ -1332,119 +1093,64 @@ class OracleTriggerAnalyzer:
         Maintains the hierarchical structure of CASE-WHEN-ELSE blocks by checking indentation levels.
         Updates self.main_section_lines with parsed blocks.
         """
-        def parse_case_when(working_lines: List[Dict[str, Any]]):
-            case_when_statements = []
-            i = 0
-            while i < len(working_lines):
+        def case_when_grouper(working_lines: List[Dict[str, Any]]):
+            positions = None
+            def group(i: int):
+                nonlocal positions
                 item = working_lines[i]
-                if "line" in item:
-                    line_upper = item["line"].strip().upper()
-                    if line_upper.startswith("CASE"):
-                        for j in range(i + 1, len(working_lines)):
-                            line_info = working_lines[j]
-                            if "line" in line_info:
-                                line_upper = line_info["line"].strip().upper()
-                                if line_upper.startswith("END CASE;") and line_info["indent"] == item["indent"]:
-                                    logger.debug(f"case_i: {item["line_no"]} i: {line_info["line_no"]}")
-                                    case_when_statement = self._parse_case_when_statements(working_lines[i: j+1])
-                                    for when_clause in case_when_statement["when_clauses"]:
-                                        when_clause["then_statements"] = parse_case_when(when_clause["then_statements"])
-                                    case_when_statement["else_statements"] = parse_case_when(case_when_statement["else_statements"])
-                                    case_when_statements.append(case_when_statement)
-                                    i = j
-                                    break
-                    else:
-                        case_when_statements.append(item)
-                # Handle nested structures (begin_end blocks, exception handlers, etc.)
-                # Process CASE statements in begin_end_statements
-                elif "type" in item:
-                    if item["type"] == "begin_end":
-                        # Process CASE statements in begin_end_statements
-                        if "begin_end_statements" in item:
-                            item["begin_end_statements"] = parse_case_when(item["begin_end_statements"])
-                        # Process CASE statements in exception_handlers
-                        if "exception_handlers" in item:
-                            for handler in item["exception_handlers"]:
-                                if "exception_statements" in handler:
-                                    handler["exception_statements"] = parse_case_when(handler["exception_statements"])
-                    elif item["type"] == "case_when":
-                        if "when_clauses" in item:
-                            for clause in item["when_clauses"]:
-                                if "then_statements" in clause:
-                                    clause["then_statements"] = parse_case_when(clause["then_statements"])
-                        # Process CASE statements in top-level else_statements
-                        if "else_statements" in item:
-                            item["else_statements"] = parse_case_when(item["else_statements"])
-                    # Process CASE statements in for_loop
-                    elif item["type"] == "for_loop" and "for_statements" in item:
-                        item["for_statements"] = parse_case_when(item["for_statements"])
-                    # Process CASE statements in if_else
-                    elif item["type"] == "if_else":
-                        if "then_statements" in item:
-                            item["then_statements"] = parse_case_when(item["then_statements"])
-                        if "if_elses" in item:
-                            for elsif_block in item["if_elses"]:
-                                if "then_statements" in elsif_block:
-                                    elsif_block["then_statements"] = parse_case_when(elsif_block["then_statements"])
-                        if "else_statements" in item:
-                            item["else_statements"] = parse_case_when(item["else_statements"])
-                    case_when_statements.append(item)
-                i += 1
-            return case_when_statements
-        self.main_section_lines["begin_end_statements"] = parse_case_when(self.main_section_lines["begin_end_statements"])
-        for k, handler in enumerate(self.main_section_lines["exception_handlers"]):
-            if "exception_statements" in handler:
-                self.main_section_lines['exception_handlers'][k]["exception_statements"] = parse_case_when(handler["exception_statements"])
+                if not item["line"].strip().upper().startswith("CASE"):
+                    return None
+                if positions is None:
+                    positions = BlockIndex.positions(working_lines)
+                j = self.block_index.find_closer("CASE", working_lines, i, positions)
+                if j == -1:
+                    return [], i + 1, ()
+                logger.debug("case_i: %s i: %s", item["line_no"], working_lines[j]["line_no"])
+                case_when_statement = self._parse_case_when_statements(working_lines[i: j+1])
+                # The WHEN and ELSE statements are grouped next
+                return [case_when_statement], j + 1, statement_lists(case_when_statement)
+            return group
+        rewrite_statement_lists(statement_lists(self.main_section_lines), case_when_grouper)
     def _parse_case_when_statements(self, working_lines: List[Dict[str, Any]]):
         """
         Parse case when statements from the main section of SQL.
         Extracts the structure and processes inner blocks recursively.
         Updates self.main_section_lines with parsed blocks.
         """
-        case_when_statement = {
-            "condition": working_lines[0]["line"].strip()[4:],
-            "type": "case_when",
-            "case_line_no": working_lines[0]["line_no"],
-            "case_indent": working_lines[0]["indent"],
-            "end_case_line_no": working_lines[-1]["line_no"],
-            "when_clauses": [],
-            "else_statements": [],
-        }
+        case_when_statement = CaseWhen(
+            condition=working_lines[0]["line"].strip()[4:],
+            case_line_no=working_lines[0]["line_no"],
+            case_indent=working_lines[0]["indent"],
+            end_case_line_no=working_lines[-1]["line_no"],
+            when_clauses=[],
+            else_statements=[],
+        )
         then_i = 0
         for j in range(1, len(working_lines)):
             line_info = working_lines[j]
             line_upper = line_info["line"].strip().upper()
-            logger.debug(f"line_info : {line_info}")
+            logger.debug("line_info : %s", line_info)
             if line_upper.startswith("WHEN") or line_upper.startswith("ELSE"):
                 then_i = j
                 break
             case_when_statement["condition"] += line_info["line"].strip()
         when_line_indent = working_lines[then_i]["indent"]
         when_i = -1
-        i = then_i
-        while i < len(working_lines):
-            line_info = working_lines[i]
-            line_upper = line_info["line"].strip().upper()
-            if line_upper.startswith("WHEN") and line_info["indent"] == when_line_indent:
+        # WHEN / ELSE lines at the WHEN indent, from the index instead of a forward scan
+        positions = BlockIndex.positions(working_lines)
+        split_points = self.block_index.split_points(("WHEN", "ELSE"), when_line_indent, positions, working_lines[0]["line_no"], working_lines[-1]["line_no"])
+        for i, keyword in split_points:
+            if i < then_i:
+                continue
+            if keyword == "WHEN":
+                if when_i != -1:
+                    case_when_statement["when_clauses"].append(self._parse_case_when_then_statements(working_lines[when_i:i]))
                 when_i = i
-                i += 1
-                while i < len(working_lines):
-                    line_info = working_lines[i]
-                    line_upper = line_info["line"].strip().upper()
-                    if line_upper.startswith("WHEN") and line_info["indent"] == when_line_indent:
-                        i -= 1
-                        # logger.debug(working_lines[when_i] working_lines[i])
-                        case_when_statement["when_clauses"].append(self._parse_case_when_then_statements(working_lines[when_i : i + 1]))
-                        break
-                    if line_upper.startswith("ELSE") and line_info["indent"] == when_line_indent:
-                        # logger.debug(working_lines[when_i], working_lines[i - 1])
-                        case_when_statement["when_clauses"].append(self._parse_case_when_then_statements(working_lines[when_i:i]))
-                        logger.debug(working_lines[i + 1], working_lines[-1])
-                        case_when_statement["else_statements"] = working_lines[i + 1 : len(working_lines)-1]
-                        i = len(working_lines)
-                        break
-                    i += 1
-            i += 1
+            elif when_i != -1:
+                # ELSE closes the last WHEN clause; a WHEN clause not followed by ELSE is dropped
+                case_when_statement["when_clauses"].append(self._parse_case_when_then_statements(working_lines[when_i:i]))
+                case_when_statement["else_statements"] = working_lines[i + 1 : len(working_lines)-1]
+                break
         return case_when_statement
     def _parse_case_when_then_statements(self, working_lines: List[Dict[str, Any]]):
         """
@@ -1469,16 +1175,15 @@ class OracleTriggerAnalyzer:
                 j += 1
             if then_i != -1:
                 condition = self._extract_value_from_when_then(case_when_then_statements[: then_i + 1], ["WHEN", "THEN"])
-        logger.debug(f"case_when_then_statements 0: {case_when_then_statements[0]['line_no']} then_i: {case_when_then_statements[then_i]['line_no']}")
-        logger.debug(f"case_when_then_statements: {case_when_then_statements}")
-        when_statements = {
-            "type": "when_statement",
-            "when_line_no": case_when_then_statements[0]["line_no"],
-            "when_indent": case_when_then_statements[0]["indent"],
-            "condition": condition,
-            "then_line_no": case_when_then_statements[then_i]["line_no"],
-            "then_statements": case_when_then_statements[then_i + 1 :],
-        }
+        logger.debug("case_when_then_statements 0: %s then_i: %s", case_when_then_statements[0]['line_no'], case_when_then_statements[then_i]['line_no'])
+        logger.debug("case_when_then_statements: %s", case_when_then_statements)
+        when_statements = WhenClause(
+            when_line_no=case_when_then_statements[0]["line_no"],
+            when_indent=case_when_then_statements[0]["indent"],
+            condition=condition,
+            then_line_no=case_when_then_statements[then_i]["line_no"],
+            then_statements=case_when_then_statements[then_i + 1 :],
+        )
         return when_statements
     def _parse_begin_blocks(self):
         """
@@ -1492,111 +1197,66 @@ class OracleTriggerAnalyzer:
         begin_line_indent = -1
         exception_lines_no = -1
         end_line_no = -1
-        for i in range(len(self.structured_lines)):
-            line_info = self.structured_lines[i]
-            line_upper = line_info["line"].strip().upper()
+        line_table = self.line_table
+        for i in range(len(line_table)):
+            line_upper = line_table.line(i).strip().upper()
+            indent = line_table.indent[i]
             if line_upper.startswith("BEGIN") and begin_line_no == -1:
                 begin_line_no = i
-                begin_line_indent = line_info["indent"]
-            if line_upper.startswith("EXCEPTION") and line_info["indent"] == begin_line_indent:
+                begin_line_indent = indent
+            if line_upper.startswith("EXCEPTION") and indent == begin_line_indent:
                 exception_lines_no = i
-            if line_upper.endswith("END;") and line_info["indent"] == begin_line_indent:
+            if line_upper.endswith("END;") and indent == begin_line_indent:
                 end_line_no = i
-        self.main_section_lines = {
-            "type": "begin_end",
-            "begin_line_no": self.structured_lines[begin_line_no]["line_no"],
-            "begin_indent": self.structured_lines[begin_line_no]["indent"],
-            "begin_end_statements": self.structured_lines[begin_line_no + 1 : exception_lines_no] if exception_lines_no != -1 else self.structured_lines[begin_line_no + 1 : end_line_no],
-            "exception_handlers": self._parse_exception_handlers(self.structured_lines[exception_lines_no + 1 : end_line_no]) if exception_lines_no != -1 else [],
-            "exception_line_no": self.structured_lines[exception_lines_no]["line_no"] if exception_lines_no != -1 else -1,
-            "end_line_no": self.structured_lines[end_line_no]["line_no"],
-        }
+        self.main_section_lines = BeginEnd(
+            begin_line_no=self.structured_lines[begin_line_no]["line_no"],
+            begin_indent=self.structured_lines[begin_line_no]["indent"],
+            begin_end_statements=self.structured_lines[begin_line_no + 1 : exception_lines_no] if exception_lines_no != -1 else self.structured_lines[begin_line_no + 1 : end_line_no],
+            exception_handlers=self._parse_exception_handlers(self.structured_lines[exception_lines_no + 1 : end_line_no]) if exception_lines_no != -1 else [],
+            exception_line_no=self.structured_lines[exception_lines_no]["line_no"] if exception_lines_no != -1 else -1,
+            end_line_no=self.structured_lines[end_line_no]["line_no"],
+        )
     def _parse_begin_end_statements(self):
         """
         Parse begin_end_statements from the main section of SQL.
         Extracts the structure and processes inner blocks recursively.
         Updates self.main_section_lines with parsed blocks.
         """
-        def parse_begin_end_statements(working_lines: List[Dict[str, Any]]):
-            begin_end_statements = []
-            i = 0
-            begin_i = -1
-            begin_line_indent = -1
-            exception_i = -1
-            while i < len(working_lines):
+        def begin_end_grouper(working_lines: List[Dict[str, Any]]):
+            positions = None
+            def group(i: int):
+                nonlocal positions
                 item = working_lines[i]
-                if "line" in item:
-                    line_upper = item["line"].strip().upper()
-                    if line_upper.startswith("BEGIN") and begin_i == -1:
-                        logger.debug(f"Begin line: {item} {i}")
-                        begin_i = i
-                        begin_line_indent = item["indent"]
-                        while i < len(working_lines):
-                            item = working_lines[i]
-                            line_upper = item["line"].strip().upper()
-                            if line_upper.startswith("EXCEPTION") and item["indent"] == begin_line_indent:
-                                logger.debug(f"Exception line: {item} {i}")
-                                exception_i = i
-                            if line_upper.endswith("END;") and item["indent"] == begin_line_indent:
-                                        logger.debug(f"End line: {item} {i}")
-                                        begin_end_statements.append(
-                                            {
-                                                "type": "begin_end",
-                                                "begin_line_no": working_lines[begin_i]["line_no"],
-                                                "begin_indent": begin_line_indent,
-                                                "begin_end_statements": parse_begin_end_statements(working_lines[begin_i + 1 : exception_i] if exception_i != -1 else working_lines[begin_i + 1 : i]),
-                                                "exception_handlers": self._parse_exception_handlers(working_lines[exception_i + 1 : i]) if exception_i != -1 else [],
-                                                "exception_line_no": working_lines[exception_i]["line_no"] if exception_i != -1 else -1,
-                                                "end_line_no": item["line_no"],
-                                            }
-                                        )
-                                        begin_i = -1
-                                        begin_line_indent = -1
-                                        exception_i = -1
-                                        break
-                            i += 1
-                    else:
-                        begin_end_statements.append(item)
-                # Handle nested structures (begin_end blocks, exception handlers, etc.)
-                # Process CASE statements in begin_end_statements
-                elif "type" in item:
-                    if item["type"] == "begin_end":
-                        # Process CASE statements in begin_end_statements
-                        if "begin_end_statements" in item:
-                            item["begin_end_statements"] = parse_begin_end_statements(item["begin_end_statements"])
-                        # Process CASE statements in exception_handlers
-                        if "exception_handlers" in item:
-                            for handler in item["exception_handlers"]:
-                                if "exception_statements" in handler:
-                                    handler["exception_statements"] = parse_begin_end_statements(handler["exception_statements"])
-                    elif item["type"] == "case_when":
-                        if "when_clauses" in item:
-                            for clause in item["when_clauses"]:
-                                if "then_statements" in clause:
-                                    clause["then_statements"] = parse_begin_end_statements(clause["then_statements"])
-                        # Process CASE statements in top-level else_statements
-                        if "else_statements" in item:
-                            item["else_statements"] = parse_begin_end_statements(item["else_statements"])
-                    # Process CASE statements in for_loop
-                    elif item["type"] == "for_loop" and "for_statements" in item:
-                        item["for_statements"] = parse_begin_end_statements(item["for_statements"])
-                    # Process CASE statements in if_else
-                    elif item["type"] == "if_else":
-                        if "then_statements" in item:
-                            item["then_statements"] = parse_begin_end_statements(item["then_statements"])
-                        if "if_elses" in item:
-                            for elsif_block in item["if_elses"]:
-                                if "then_statements" in elsif_block:
-                                    elsif_block["then_statements"] = parse_begin_end_statements(elsif_block["then_statements"])
-                        if "else_statements" in item:
-                            item["else_statements"] = parse_begin_end_statements(item["else_statements"])
-                    begin_end_statements.append(item)
-                i += 1
-            return begin_end_statements
-        self.main_section_lines["begin_end_statements"] = parse_begin_end_statements(self.main_section_lines["begin_end_statements"])
-        for k, handler in enumerate(self.main_section_lines["exception_handlers"]):
-            if "exception_statements" in handler:
-                self.main_section_lines['exception_handlers'][k]["exception_statements"] = parse_begin_end_statements(handler["exception_statements"])
+                if not item["line"].strip().upper().startswith("BEGIN"):
+                    return None
+                logger.debug("Begin line: %s %s", item, i)
+                begin_line_indent = item["indent"]
+                if positions is None:
+                    positions = BlockIndex.positions(working_lines)
+                end_i = self.block_index.find_closer("BEGIN", working_lines, i, positions)
+                if end_i == -1:
+                    # No END; at this indent: the rest of the list is dropped
+                    return [], len(working_lines), ()
+                end_item = working_lines[end_i]
+                logger.debug("End line: %s %s", end_item, end_i)
+                exception_i = -1
+                exception_points = self.block_index.split_points(("EXCEPTION",), begin_line_indent, positions, item["line_no"], end_item["line_no"])
+                if exception_points:
+                    # The last EXCEPTION at the BEGIN indent starts the handlers
+                    exception_i = exception_points[-1][0]
+                    logger.debug("Exception line: %s %s", working_lines[exception_i], exception_i)
+                begin_end = BeginEnd(
+                    begin_line_no=item["line_no"],
+                    begin_indent=begin_line_indent,
+                    begin_end_statements=working_lines[i + 1 : exception_i] if exception_i != -1 else working_lines[i + 1 : end_i],
+                    exception_handlers=self._parse_exception_handlers(working_lines[exception_i + 1 : end_i]) if exception_i != -1 else [],
+                    exception_line_no=working_lines[exception_i]["line_no"] if exception_i != -1 else -1,
+                    end_line_no=end_item["line_no"],
+                )
+                # Nested blocks of the new block's body are grouped next; its handlers are not searched
+                return [begin_end], end_i + 1, statement_lists(begin_end, ("begin_end_statements",))
+            return group
+        rewrite_statement_lists(statement_lists(self.main_section_lines), begin_end_grouper)
     def _parse_exception_handlers(self, working_lines: List[Dict[str, Any]]):
         """
         Parse exception_handlers from the main section of SQL.
@@ -1632,18 +1292,17 @@ class OracleTriggerAnalyzer:
                         i += 1
                         continue
                 # Create exception handler structure
-                exception_handler = {
-                    "type": "exception_handler",
-                    "exception_name": (
+                exception_handler = ExceptionHandler(
+                    exception_name=(
                         self._extract_value_from_when_then([working_lines[when_i]], ["WHEN", "THEN"])
                         if when_i == then_i
                         else self._extract_value_from_when_then(working_lines[when_i : then_i + 1], ["WHEN", "THEN"])
                     ),
-                    "when_line_no": working_lines[when_i]["line_no"],
-                    "when_indent": working_lines[when_i]["indent"],
-                    "then_line_no": working_lines[then_i]["line_no"],
-                    "exception_statements": [],
-                }
+                    when_line_no=working_lines[when_i]["line_no"],
+                    when_indent=working_lines[when_i]["indent"],
+                    then_line_no=working_lines[then_i]["line_no"],
+                    exception_statements=[],
+                )
                 # Collect exception statements (lines after THEN until next WHEN or end)
                 k = then_i + 1
                 while k < len(working_lines):
@@ -1662,7 +1321,7 @@ class OracleTriggerAnalyzer:
                 i = k  # Continue from where we left off
             else:
                 i += 1
-        logger.debug(f"exception_handler: {exception_handlers}")
+        logger.debug("exception_handler: %s", exception_handlers)
         return exception_handlers
     def _parse_function_calling(self, working_lines: List[Dict[str, Any]], function_name: str):
         """
@@ -1677,7 +1336,7 @@ class OracleTriggerAnalyzer:
         """
         # Combine all lines into a single string
         combined_line = self.combine_lines(working_lines)
-        logger.debug(f"combined_line: {combined_line}")
+        logger.debug("combined_line: %s", combined_line)
         # Remove trailing semicolon if present
         combined_line = combined_line.rstrip(";").strip()
         # Find the opening parenthesis after function name
@@ -1686,46 +1345,36 @@ class OracleTriggerAnalyzer:
         params_start = open_paren_pos + 1
         params_end = self._find_matching_closing_paren(combined_line, open_paren_pos)
         if params_end == -1 and open_paren_pos == -1:
-            return {
-            "type": "function_calling",
-            "function_name": combined_line,
-            "parameters": {
-                "parameter_type": "no_parameters",
-                "positional_params": [],
-                "named_params": {},
-                "raw_text": ""
-            },
-        }
+            return FunctionCall(
+                function_name=combined_line,
+                parameters={
+                    "parameter_type": "no_parameters",
+                    "positional_params": [],
+                    "named_params": {},
+                    "raw_text": ""
+                },
+            )
         params_text = combined_line[params_start:params_end].strip()
         # Parse the parameters using the enhanced parser
         parameters = self._parse_function_calling_params(params_text, function_name)
         # Create the structured representation
-        result = {
-            "type": "function_calling",
-            "function_name": function_name,
-            "parameters": parameters,
-        }
-        logger.debug(f"function_calling: {result}")
+        result = FunctionCall(
+            function_name=function_name,
+            parameters=parameters,
+        )
+        logger.debug("function_calling: %s", result)
         return result
     def _find_matching_closing_paren(self, text: str, open_pos: int) -> int:
         """
         Find the matching closing parenthesis for an opening parenthesis.
-        Handles nested parentheses correctly.
+        Handles nested parentheses and ignores parentheses inside string literals.
         Args:
             text (str): The text to search in
             open_pos (int): Position of the opening parenthesis
         Returns:
             int: Position of the matching closing parenthesis, or -1 if not found
         """
-        stack = 0
-        for i in range(open_pos, len(text)):
-            if text[i] == "(":
-                stack += 1
-            elif text[i] == ")":
-                stack -= 1
-                if stack == 0:
-                    return i
-        return -1
+        return find_matching_paren(text, open_pos)
     def _parse_function_calling_params(self, params_text: str, function_name: str) -> Dict[str, Any]:
         """
         Parse the parameters of a function call.
@@ -1868,33 +1517,7 @@ class OracleTriggerAnalyzer:
         Returns:
             List[str]: List of parameter parts
         """
-        parts = []
-        current_part = ""
-        paren_stack = 0
-        in_single_quote = False
-        in_double_quote = False
-        
-        for char in params_text:
-            if char == "'" and not in_double_quote:
-                in_single_quote = not in_single_quote
-            elif char == '"' and not in_single_quote:
-                in_double_quote = not in_double_quote
-            elif char == "(" and not in_single_quote and not in_double_quote:
-                paren_stack += 1
-            elif char == ")" and not in_single_quote and not in_double_quote:
-                paren_stack -= 1
-            elif char == "," and paren_stack == 0 and not in_single_quote and not in_double_quote:
-                parts.append(current_part.strip())
-                current_part = ""
-                continue
-            
-            current_part += char
-        
-        # Add the last part
-        if current_part.strip():
-            parts.append(current_part.strip())
-        
-        return parts
+        return split_top_level(params_text, ",")
     def _extract_named_parameter(self, param_part: str) -> Tuple[str, str]:
         """
         Extract parameter name and value from a named parameter.
@@ -1906,23 +1529,7 @@ class OracleTriggerAnalyzer:
             Tuple[str, str]: (parameter_name, parameter_value)
         """
         # Find the first occurrence of "=>" (not inside quotes or parentheses)
-        arrow_pos = -1
-        paren_stack = 0
-        in_single_quote = False
-        in_double_quote = False
-        
-        for i, char in enumerate(param_part):
-            if char == "'" and not in_double_quote:
-                in_single_quote = not in_single_quote
-            elif char == '"' and not in_single_quote:
-                in_double_quote = not in_double_quote
-            elif char == "(" and not in_single_quote and not in_double_quote:
-                paren_stack += 1
-            elif char == ")" and not in_single_quote and not in_double_quote:
-                paren_stack -= 1
-            elif char == "=" and i + 1 < len(param_part) and param_part[i + 1] == ">" and paren_stack == 0 and not in_single_quote and not in_double_quote:
-                arrow_pos = i
-                break
+        arrow_pos = find_top_level(param_part, "=>")
         
         if arrow_pos == -1:
             return "", param_part
@@ -1989,35 +1596,32 @@ class OracleTriggerAnalyzer:
             List[str]: List of all rest string content found
         """
         rest_strings_list = []
-        def extract_rest_strings_from_item(item):
-            """Recursively extract rest strings from any item"""
-            if isinstance(item, dict):
-                # Check for "indent" field which contains rest string content
-                if "indent" in item:
-                    logger.debug(item["line"])
-                    item["filename"] = self.file_details["filename"]
-                    item["line"] = item["line"].strip()
-                    rest_strings_list.append(item)
-                if "type" in item:
-                    logger.debug(f"item: {item}")
-                    self.strng_convert_json[item["type"]] += 1
-                # Recursively process all values in the dictionary
-                for value in item.values():
-                    extract_rest_strings_from_item(value)
-            elif isinstance(item, list):
-                # Recursively process all items in the list
-                for sub_item in item:
-                    extract_rest_strings_from_item(sub_item)
+        def extract_rest_string(item):
+            """Collect a line that no pass grouped, and count a node by type"""
+            # Check for "indent" field which contains rest string content
+            if "indent" in item:
+                logger.debug(item["line"])
+                item["filename"] = self.file_details["filename"]
+                item["line"] = item["line"].strip()
+                rest_strings_list.append(item)
+            if "type" in item:
+                # Type and first line only: the repr of a node serializes its whole subtree
+                line_no = next((item[key] for key in item.keys() if key.endswith("_line_no")), None)
+                logger.debug("item: %s at line %s", item["type"], line_no)
+                self.strng_convert_json[item["type"]] += 1
         # Process main_section_lines
-        extract_rest_strings_from_item(self.main_section_lines)
-        logger.debug(f'rest_strings_list {rest_strings_list}')	
+        walk(self.main_section_lines, extract_rest_string)
+        logger.debug("rest_strings_list %s", rest_strings_list)	
         self.rest_string_list = rest_strings_list
-        # rest_strings_list to covert like ("filename","line","line_no") and add to available_rest_strings
-        dataframe_rest_strings = pd.read_csv("utilities/rest_list.csv",header=0,index_col=None)
-        rest_strings_dataframe = pd.DataFrame(self.rest_string_list,index=None)
-        dataframe_rest_strings = pd.concat([dataframe_rest_strings, rest_strings_dataframe], ignore_index=True)
-        dataframe_rest_strings.to_csv("utilities/rest_list.csv",mode='w',index=False)
-        logger.debug(f"dataframe_rest_strings: {dataframe_rest_strings}")
+        self.flush_deferred_writes({"rest_strings": self.rest_string_list})
+    @classmethod
+    def append_rest_strings(cls, rest_strings: List[Dict[str, Any]]) -> None:
+        """
+        Append rest strings to utilities/rest_list.csv through the buffered RestStringSink.
+        Args:
+            rest_strings (List[Dict[str, Any]]): Rest string items ("filename", "line", "line_no", ...)
+        """
+        RestStringSink.append(rest_strings)
     def to_json(self):
         """
         Convert the analyzed trigger structure to a JSON-serializable dictionary.
@@ -2035,7 +1639,7 @@ class OracleTriggerAnalyzer:
                 "constants": self.constants,
                 "exceptions": self.exceptions,
             },
-            "main": self.main_section_lines,
+            "main": tree_to_dicts(self.main_section_lines),
             "sql_comments": self.sql_comments,
             # "sql_lines": self.structured_lines,
             "rest_string_list": self.rest_string_list,
@@ -2051,15 +1655,34 @@ class OracleTriggerAnalyzer:
             "comment_count": len(self.sql_comments),
             "sql_convert_count": self.strng_convert_json,
         }
-        # Include parse timestamp and file details
+        # Include parse timestamp, file details and the time spent in each pass
         result["metadata"] = {
             "parse_timestamp": self._get_timestamp(),
-            "parser_version": "1.0",  # Increment when making significant parser changes
+            "parser_version": PARSER_VERSION,
             "file_details": self.file_details,
+            "profile": self.profile_dict(),
         }
         # Log detailed statistics for troubleshooting
-        logger.debug(f"JSON conversion complete: {len(self.variables)} vars, {len(self.constants)} consts, {len(self.exceptions)} excs, {len(self.sql_comments)} comments")
+        logger.debug("JSON conversion complete: %s vars, %s consts, %s excs, %s comments", len(self.variables), len(self.constants), len(self.exceptions), len(self.sql_comments))
         return result
+    def profile_dict(self) -> Dict[str, Any]:
+        """
+        Return the parse profile reported as metadata.profile.
+
+        Returns:
+            Dict[str, Any]: parser_engine, total_ns (construction up to the end of
+                parsing), spans_ns per pass (structured_lines, scan_sql, strip_comments,
+                block_index, declarations, each _parse_* pass or single_pass, rest_strings,
+                plus load_mappings and exception_names),
+                source_line_count, and node_count, line_count and max_depth of the tree
+        """
+        profile = self.profile.to_dict(
+            parser_engine=self.parser_engine,
+            source_line_count=len(self.line_table),
+            **tree_profile(self.main_section_lines),
+        )
+        profile["total_ns"] = self.parse_ns
+        return profile
     def _get_timestamp(self):
         """Get current timestamp in ISO format for metadata"""
         from datetime import datetime
@@ -2134,7 +1757,17 @@ class OracleTriggerAnalyzer:
         Returns:
             bool: True if successful, False otherwise
         """
-        if not self.found_exception_names:
+        return self.save_exception_names(self.found_exception_names)
+    @classmethod
+    def save_exception_names(cls, exception_names: Dict[str, str]) -> bool:
+        """
+        Merge exception names into the Excel file's exception_mappings sheet.
+        Args:
+            exception_names (Dict[str, str]): Exception names in the order they were found
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not exception_names:
             logger.debug("No exception names found to save")
             return True
         
@@ -2151,14 +1784,14 @@ class OracleTriggerAnalyzer:
             # Add new exception names that don't already exist
             new_exceptions = []
             existing_exceptions = set(exception_df['Oracle_Exception'].astype(str).str.strip().tolist())
-            for exception_name in self.found_exception_names:
+            for exception_name in exception_names:
                 exception_name_upper = exception_name.upper()
                 if exception_name_upper not in existing_exceptions:
                     new_exceptions.append({
                         'Oracle_Exception': exception_name_upper,
                         'PostgreSQL_Message': f'-- TODO: Map Oracle exception "{exception_name}" to PostgreSQL equivalent'
                     })
-                    logger.debug(f"Adding new exception mapping: {exception_name}")
+                    logger.debug("Adding new exception mapping: %s", exception_name)
             
             if new_exceptions:
                 # Add new rows to the dataframe
@@ -2167,7 +1800,7 @@ class OracleTriggerAnalyzer:
                 
                 # Save back to Excel
                 if ConfigManager.save_excel_sheet('exception_mappings', updated_df):
-                    logger.info(f"Successfully saved {len(new_exceptions)} new exception mappings")
+                    logger.info("Successfully saved %s new exception mappings", len(new_exceptions))
                     return True
                 else:
                     logger.error("Failed to save exception mappings to Excel")
@@ -2177,7 +1810,7 @@ class OracleTriggerAnalyzer:
                 return True
                 
         except Exception as e:
-            logger.error(f"Error saving exception names to Excel: {str(e)}")
+            logger.error("Error saving exception names to Excel: %s", str(e))
             return False
     
     @classmethod
@@ -2197,7 +1830,7 @@ class OracleTriggerAnalyzer:
             analyzer = cls(filepath)
             return analyzer.save_exception_names_to_excel()
         except Exception as e:
-            logger.error(f"Error processing file {filepath}: {str(e)}")
+            logger.error("Error processing file %s: %s", filepath, str(e))
             return False    
     def format_values(self, values: str):
         """
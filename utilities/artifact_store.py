@@ -0,0 +1,592 @@
+"""
+Pluggable storage for the artifacts of the conversion stages.
+
+Every stage keeps its outputs as one file per trigger and artifact in
+`files/format_json`, `format_sql`, `format_pl_json` and `format_plsql`. With
+thousands of triggers that is tens of thousands of small files. Every
+listing, stats call and ZIP export scans the directories and opens each file,
+which is slow on a network filesystem. `ArtifactStore` is the one place the
+pipeline, the UI pages and the download package read and write artifacts
+through. Its backend is selected per process:
+
+- "directory" (the default): the existing layout, one file per artifact. Calls
+  are the same file operations as before, so the files are byte-identical.
+- "sqlite": one archive file (`files/artifacts.sqlite` by default) with a row
+  per artifact, keyed by stage (the directory name, e.g. "format_json") and
+  artifact name (the file name: trigger name plus the stage suffix, e.g.
+  `TRG_EMP_analysis.json`).
+
+Callers keep using the paths of the directory layout. A path in one of the
+`STAGE_DIRECTORIES` is mapped to its (stage, name) key by an archive
+backend. Any other path, such as the Oracle sources in `files/oracle`, is a
+plain file for every backend.
+
+The SQLite archive has a single writer. Inside `capture()` (the worker
+processes of main.py) archive writes are collected and returned to the
+parent, which applies them in file order with `apply()`. Inside `batch()` the
+writes share one transaction instead of one commit per artifact. The
+connection is committed and closed before `fork`, so worker processes open
+their own connection and never inherit one.
+
+Workers still read the archive (the inputs of later stages) while the parent
+holds its stage transaction open. In the default rollback journal, a
+transaction that outgrows SQLite's page cache (about 2 MB) takes an
+EXCLUSIVE lock, and those reads would wait out the busy timeout while the
+parent waits for the workers. The archive therefore uses WAL journaling,
+where readers see the last commit and never wait for the writer.
+
+The backend is process-wide (like the ArtifactJSON format). `configure()` also
+sets the environment variables, so the Streamlit app and spawned processes
+use the same backend.
+
+Usage:
+    ArtifactStore.configure(backend="sqlite")
+    with ArtifactStore.batch():
+        ArtifactStore.write_text("files/format_sql/TRG_EMP_analysis.sql", sql)
+    with ArtifactStore.open_text("files/format_plsql/TRG_EMP_analysis_postgresql.sql") as f:
+        FormatSQL(analysis).write_sql(f, "PostgreSQL")
+    names = ArtifactStore.list_names("files/format_sql")
+"""
+
+import errno
+import hashlib
+import io
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+
+ARTIFACT_STORES = ("directory", "sqlite")
+# Environment variables that select the backend when configure() was not called
+ARTIFACT_STORE_ENV = "ORACLE_CONVERTER_ARTIFACT_STORE"
+ARTIFACT_ARCHIVE_ENV = "ORACLE_CONVERTER_ARTIFACT_ARCHIVE"
+DEFAULT_ARCHIVE_PATH = "files/artifacts.sqlite"
+# Stage -> directory of the default layout (see FileManager.DIRECTORIES)
+STAGE_DIRECTORIES = {
+    "format_json": "files/format_json",
+    "format_sql": "files/format_sql",
+    "format_pl_json": "files/format_pl_json",
+    "format_plsql": "files/format_plsql",
+}
+# Seconds a connection waits for another process's lock on the archive
+SQLITE_BUSY_TIMEOUT = 60.0
+# (stage, name, content); content None deletes the artifact
+ArtifactWrite = Tuple[str, str, Optional[bytes]]
+
+
+def _missing(path: str) -> FileNotFoundError:
+    return FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), path)
+
+
+class DirectoryBackend:
+    """Default backend: one file per artifact in the stage directories."""
+
+    name = "directory"
+
+    def is_archive(self, directory: str) -> bool:
+        """Return True if the artifacts of `directory` are kept in an archive instead of files."""
+        return False
+
+    def artifact_key(self, path: str) -> Optional[Tuple[str, str]]:
+        """Return the archive (stage, name) key of a path, or None if it is a plain file."""
+        return None
+
+    def list_names(self, directory: str) -> List[str]:
+        """
+        Return the artifact names of a directory.
+
+        Raises:
+            FileNotFoundError: If a directory that is not archived does not exist
+        """
+        return [f for f in os.listdir(directory) if os.path.isfile(os.path.join(directory, f))]
+
+    def iter_contents(self, directory: str) -> Iterator[Tuple[str, bytes]]:
+        """Yield (name, content) of every artifact of a directory."""
+        for name in self.list_names(directory):
+            yield name, self.read_bytes(os.path.join(directory, name))
+
+    def exists(self, path: str) -> bool:
+        return os.path.exists(path)
+
+    def size(self, path: str) -> int:
+        return os.path.getsize(path)
+
+    def read_bytes(self, path: str) -> bytes:
+        with open(path, "rb") as f:
+            return f.read()
+
+    def read_text(self, path: str) -> str:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def write_bytes(self, path: str, content: bytes) -> None:
+        with open(path, "wb") as f:
+            f.write(content)
+
+    def write_text(self, path: str, content: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+    @contextmanager
+    def open_text(self, path: str) -> Iterator[TextIO]:
+        """Open a file for writing UTF-8 text; a partial file is removed if the block raises."""
+        with open(path, "w", encoding="utf-8") as f:
+            try:
+                yield f
+            except BaseException:
+                f.close()
+                os.remove(path)
+                raise
+
+    def write_artifact(self, stage: str, name: str, content: Optional[bytes]) -> None:
+        """Store (or, with content None, delete) one artifact by key."""
+        path = os.path.join(STAGE_DIRECTORIES[stage], name)
+        if content is None:
+            if os.path.exists(path):
+                os.remove(path)
+        else:
+            self.write_bytes(path, content)
+
+    def delete(self, path: str) -> None:
+        os.remove(path)
+
+    def rename(self, old_path: str, new_path: str) -> None:
+        os.rename(old_path, new_path)
+
+    def sha256(self, path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def begin(self) -> None:
+        """Start grouping writes (no-op for files)."""
+
+    def commit(self) -> None:
+        """Make grouped writes visible to other processes (no-op for files)."""
+
+    def close(self) -> None:
+        """Release open handles (no-op for files)."""
+
+    def detach(self) -> None:
+        """Forget the parent's handles and batches in a forked child (no-op for files)."""
+
+
+class SQLiteBackend(DirectoryBackend):
+    """Single-file archive: one row per artifact of the stage directories, keyed by (stage, name)."""
+
+    name = "sqlite"
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS artifacts ("
+        "stage TEXT NOT NULL, name TEXT NOT NULL, content BLOB NOT NULL, modified REAL NOT NULL, "
+        "PRIMARY KEY (stage, name))"
+    )
+
+    def __init__(self, path: str = DEFAULT_ARCHIVE_PATH):
+        self.path = path
+        self._connection: Optional[sqlite3.Connection] = None
+        self._batch_depth = 0
+        # Absolute stage directory -> stage, for the working directory in _stage_cwd
+        self._stages: Dict[str, str] = {}
+        self._stage_cwd: Optional[str] = None
+
+    def _db(self) -> sqlite3.Connection:
+        """Return the connection of this process, opening the archive (and its table) if needed."""
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Autocommit mode; batch() opens the transactions explicitly
+            connection = sqlite3.connect(self.path, timeout=SQLITE_BUSY_TIMEOUT, isolation_level=None)
+            # WAL: readers in worker processes are not blocked by the parent's open batch
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(self._SCHEMA)
+            self._connection = connection
+            if self._batch_depth:
+                connection.execute("BEGIN")
+        return self._connection
+
+    def artifact_key(self, path: str) -> Optional[Tuple[str, str]]:
+        cwd = os.getcwd()
+        if cwd != self._stage_cwd:
+            self._stages = {os.path.abspath(directory): stage for stage, directory in STAGE_DIRECTORIES.items()}
+            self._stage_cwd = cwd
+        directory, name = os.path.split(os.path.abspath(path))
+        stage = self._stages.get(directory)
+        return None if stage is None or not name else (stage, name)
+
+    def is_archive(self, directory: str) -> bool:
+        return self.artifact_key(os.path.join(directory, "_")) is not None
+
+    def list_names(self, directory: str) -> List[str]:
+        key = self.artifact_key(os.path.join(directory, "_"))
+        if key is None:
+            return super().list_names(directory)
+        rows = self._db().execute("SELECT name FROM artifacts WHERE stage = ? ORDER BY name", (key[0],)).fetchall()
+        return [name for (name,) in rows]
+
+    def iter_contents(self, directory: str) -> Iterator[Tuple[str, bytes]]:
+        key = self.artifact_key(os.path.join(directory, "_"))
+        if key is None:
+            yield from super().iter_contents(directory)
+            return
+        # One query for the whole stage instead of one per artifact
+        cursor = self._db().execute("SELECT name, content FROM artifacts WHERE stage = ? ORDER BY name", (key[0],))
+        try:
+            yield from cursor
+        finally:
+            cursor.close()
+
+    def _lookup(self, path: str, key: Tuple[str, str], column: str = "content") -> Any:
+        """Return one column of an artifact's row (FileNotFoundError if there is none)."""
+        # fetchall() finishes the statement: an unfinished SELECT would keep the read
+        # lock of an idle worker and block the parent's commit
+        rows = self._db().execute(f"SELECT {column} FROM artifacts WHERE stage = ? AND name = ?", key).fetchall()
+        if not rows:
+            raise _missing(path)
+        return rows[0][0]
+
+    def exists(self, path: str) -> bool:
+        key = self.artifact_key(path)
+        if key is None:
+            return super().exists(path)
+        try:
+            self._lookup(path, key, "1")
+        except FileNotFoundError:
+            return False
+        return True
+
+    def size(self, path: str) -> int:
+        key = self.artifact_key(path)
+        return super().size(path) if key is None else self._lookup(path, key, "length(content)")
+
+    def read_bytes(self, path: str) -> bytes:
+        key = self.artifact_key(path)
+        return super().read_bytes(path) if key is None else self._lookup(path, key)
+
+    def read_text(self, path: str) -> str:
+        key = self.artifact_key(path)
+        return super().read_text(path) if key is None else self._lookup(path, key).decode("utf-8")
+
+    def write_bytes(self, path: str, content: bytes) -> None:
+        key = self.artifact_key(path)
+        if key is None:
+            super().write_bytes(path, content)
+        else:
+            self.write_artifact(key[0], key[1], content)
+
+    def write_text(self, path: str, content: str) -> None:
+        key = self.artifact_key(path)
+        if key is None:
+            super().write_text(path, content)
+        else:
+            self.write_artifact(key[0], key[1], content.encode("utf-8"))
+
+    @contextmanager
+    def open_text(self, path: str) -> Iterator[TextIO]:
+        if self.artifact_key(path) is None:
+            with super().open_text(path) as f:
+                yield f
+        else:
+            # An artifact row is written whole; buffer the text until the block exits
+            buffer = io.StringIO()
+            yield buffer
+            self.write_text(path, buffer.getvalue())
+
+    def write_artifact(self, stage: str, name: str, content: Optional[bytes]) -> None:
+        if content is None:
+            self._db().execute("DELETE FROM artifacts WHERE stage = ? AND name = ?", (stage, name))
+        else:
+            self._db().execute(
+                "INSERT OR REPLACE INTO artifacts (stage, name, content, modified) VALUES (?, ?, ?, ?)",
+                (stage, name, content, time.time()),
+            )
+
+    def delete(self, path: str) -> None:
+        key = self.artifact_key(path)
+        if key is None:
+            super().delete(path)
+        elif self._db().execute("DELETE FROM artifacts WHERE stage = ? AND name = ?", key).rowcount == 0:
+            raise _missing(path)
+
+    def rename(self, old_path: str, new_path: str) -> None:
+        old_key, new_key = self.artifact_key(old_path), self.artifact_key(new_path)
+        if old_key is None and new_key is None:
+            super().rename(old_path, new_path)
+            return
+        if old_key is not None and new_key is not None:
+            db = self._db()
+            if not self.exists(old_path):
+                raise _missing(old_path)
+            db.execute("DELETE FROM artifacts WHERE stage = ? AND name = ?", new_key)
+            db.execute("UPDATE artifacts SET stage = ?, name = ? WHERE stage = ? AND name = ?", new_key + old_key)
+            return
+        # Between the archive and a plain directory
+        self.write_bytes(new_path, self.read_bytes(old_path))
+        self.delete(old_path)
+
+    def sha256(self, path: str) -> str:
+        key = self.artifact_key(path)
+        return super().sha256(path) if key is None else hashlib.sha256(self._lookup(path, key)).hexdigest()
+
+    def begin(self) -> None:
+        self._batch_depth += 1
+        if self._batch_depth == 1 and self._connection is not None:
+            self._connection.execute("BEGIN")
+
+    def commit(self) -> None:
+        self._batch_depth -= 1
+        if self._batch_depth == 0 and self._connection is not None and self._connection.in_transaction:
+            self._connection.execute("COMMIT")
+
+    def close(self) -> None:
+        """Commit any open batch and close the connection; the next call reopens it."""
+        if self._connection is not None:
+            if self._connection.in_transaction:
+                self._connection.execute("COMMIT")
+            self._connection.close()
+            self._connection = None
+
+    def detach(self) -> None:
+        # The parent closed its connection before the fork (ArtifactStore.close); a worker
+        # must not reopen it inside the parent's batch, or its read transaction would
+        # block the parent's commit
+        self._connection = None
+        self._batch_depth = 0
+
+
+class ArtifactStore:
+    """Process-wide artifact backend, addressed by the paths of the directory layout."""
+
+    _backend: Optional[DirectoryBackend] = None
+    # Archive writes collected by capture(), or None
+    _captured: Optional[List[ArtifactWrite]] = None
+
+    @classmethod
+    def configure(cls, backend: Optional[str] = None, archive_path: Optional[str] = None) -> None:
+        """
+        Select the backend used from now on (None keeps the environment's or the default).
+
+        Args:
+            backend (Optional[str]): One of ARTIFACT_STORES
+            archive_path (Optional[str]): Archive file of the "sqlite" backend
+                (default: DEFAULT_ARCHIVE_PATH)
+
+        Raises:
+            ValueError: If backend is not one of ARTIFACT_STORES
+        """
+        if backend is not None:
+            os.environ[ARTIFACT_STORE_ENV] = backend
+        if archive_path is not None:
+            os.environ[ARTIFACT_ARCHIVE_ENV] = archive_path
+        if cls._backend is not None:
+            cls._backend.close()
+            cls._backend = None
+        cls.backend()
+
+    @classmethod
+    def backend(cls) -> DirectoryBackend:
+        """
+        Return the backend of this process, created from the environment on first use.
+
+        Raises:
+            ValueError: If the environment names an unknown backend
+        """
+        if cls._backend is None:
+            name = os.environ.get(ARTIFACT_STORE_ENV) or "directory"
+            if name not in ARTIFACT_STORES:
+                raise ValueError(f"Unknown artifact store: {name} (expected one of {', '.join(ARTIFACT_STORES)})")
+            if name == "sqlite":
+                cls._backend = SQLiteBackend(os.environ.get(ARTIFACT_ARCHIVE_ENV) or DEFAULT_ARCHIVE_PATH)
+            else:
+                cls._backend = DirectoryBackend()
+        return cls._backend
+
+    @classmethod
+    def is_archive(cls, directory: str) -> bool:
+        """Return True if the artifacts of `directory` are kept in an archive instead of files."""
+        return cls.backend().is_archive(directory)
+
+    @classmethod
+    def list_names(cls, directory: str) -> List[str]:
+        """
+        Return the artifact (file) names of a directory.
+
+        Raises:
+            FileNotFoundError: If a directory that is not archived does not exist
+        """
+        return cls.backend().list_names(directory)
+
+    @classmethod
+    def iter_contents(cls, directory: str) -> Iterator[Tuple[str, bytes]]:
+        """Yield (name, content) of every artifact of a directory (one query for an archive)."""
+        return cls.backend().iter_contents(directory)
+
+    @classmethod
+    def exists(cls, path: str) -> bool:
+        return cls.backend().exists(path)
+
+    @classmethod
+    def size(cls, path: str) -> int:
+        """Return the size of an artifact in bytes (FileNotFoundError if it is missing)."""
+        return cls.backend().size(path)
+
+    @classmethod
+    def read_bytes(cls, path: str) -> bytes:
+        """Return the content of an artifact (FileNotFoundError if it is missing)."""
+        return cls.backend().read_bytes(path)
+
+    @classmethod
+    def read_text(cls, path: str) -> str:
+        """Return the UTF-8 text of an artifact (FileNotFoundError if it is missing)."""
+        return cls.backend().read_text(path)
+
+    @classmethod
+    def _capture(cls, path: str, content: Optional[bytes]) -> bool:
+        """Collect an archive write inside capture(); return True if it was collected."""
+        if cls._captured is None:
+            return False
+        key = cls.backend().artifact_key(path)
+        if key is None:
+            return False
+        cls._captured.append((key[0], key[1], content))
+        return True
+
+    @classmethod
+    def write_bytes(cls, path: str, content: bytes) -> None:
+        """Write an artifact, replacing any previous content."""
+        if not cls._capture(path, content):
+            cls.backend().write_bytes(path, content)
+
+    @classmethod
+    def write_text(cls, path: str, content: str) -> None:
+        """Write an artifact as UTF-8 text, replacing any previous content."""
+        if not cls._capture(path, content.encode("utf-8")):
+            cls.backend().write_text(path, content)
+
+    @classmethod
+    @contextmanager
+    def open_text(cls, path: str) -> Iterator[TextIO]:
+        """
+        Open an artifact for writing UTF-8 text, replacing any previous content.
+
+        Files are written as the text arrives, so a renderer can stream into them. Archive
+        artifacts (and any archive write inside capture()) are buffered and stored when
+        the block exits. If the block raises, nothing is stored and a partial file is removed.
+
+        Yields:
+            TextIO: Object to `write()` the text to
+        """
+        if cls._captured is not None and cls.backend().artifact_key(path) is not None:
+            buffer = io.StringIO()
+            yield buffer
+            cls.write_text(path, buffer.getvalue())
+        else:
+            with cls.backend().open_text(path) as f:
+                yield f
+
+    @classmethod
+    def delete(cls, path: str) -> None:
+        """
+        Delete an artifact.
+
+        Raises:
+            FileNotFoundError: If the artifact does not exist (not checked inside capture())
+        """
+        if not cls._capture(path, None):
+            cls.backend().delete(path)
+
+    @classmethod
+    def discard(cls, path: str) -> None:
+        """
+        Delete an artifact if it exists.
+
+        Inside capture() the delete is collected without looking the artifact up, so a
+        worker does not query the archive for it; `apply()` ignores missing artifacts.
+        """
+        if cls._capture(path, None):
+            return
+        if cls.backend().exists(path):
+            cls.backend().delete(path)
+
+    @classmethod
+    def rename(cls, old_path: str, new_path: str) -> None:
+        """Rename an artifact, replacing any artifact at new_path."""
+        cls.backend().rename(old_path, new_path)
+
+    @classmethod
+    def sha256(cls, path: str) -> str:
+        """Return the sha256 hex digest of an artifact's content."""
+        return cls.backend().sha256(path)
+
+    @classmethod
+    def begin(cls) -> None:
+        """Start grouping writes into one transaction; pair with `commit()` (may nest)."""
+        cls.backend().begin()
+
+    @classmethod
+    def commit(cls) -> None:
+        """End the group started by the matching `begin()`; the outermost one commits."""
+        cls.backend().commit()
+
+    @classmethod
+    @contextmanager
+    def batch(cls) -> Iterator[None]:
+        """Group the writes inside the block into one transaction (blocks may nest)."""
+        cls.begin()
+        try:
+            yield
+        finally:
+            cls.commit()
+
+    @classmethod
+    @contextmanager
+    def capture(cls) -> Iterator[List[ArtifactWrite]]:
+        """
+        Collect the archive writes made inside the block instead of applying them.
+
+        Used in worker processes so the parent stays the archive's only writer. File
+        writes (the directory backend, or paths outside the stages) happen immediately,
+        so the list stays empty for them.
+
+        Yields:
+            List[ArtifactWrite]: The collected writes, to pass to `apply()` in the parent
+        """
+        if cls._captured is not None:
+            yield []
+            return
+        cls._captured = captured = []
+        try:
+            yield captured
+        finally:
+            cls._captured = None
+
+    @classmethod
+    def apply(cls, writes: List[ArtifactWrite]) -> None:
+        """Apply writes collected by `capture()`, in order."""
+        if not writes:
+            return
+        backend = cls.backend()
+        with cls.batch():
+            for stage, name, content in writes:
+                backend.write_artifact(stage, name, content)
+
+    @classmethod
+    def close(cls) -> None:
+        """Commit and close the backend's open handles; they are reopened on the next call."""
+        if cls._backend is not None:
+            cls._backend.close()
+
+    @classmethod
+    def _detach(cls) -> None:
+        if cls._backend is not None:
+            cls._backend.detach()
+
+
+if hasattr(os, "register_at_fork"):
+    # A forked child must not share the parent's SQLite connection or batch
+    os.register_at_fork(before=ArtifactStore.close, after_in_child=ArtifactStore._detach)
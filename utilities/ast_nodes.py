@@ -0,0 +1,406 @@
+"""
+Slotted node classes for the statement tree of an analysis (`main`).
+
+The analyzer used to build every node of `main_section_lines` as a plain
+dict. Each node then carried a hash table holding the same keys
+(`begin_end_statements`, `then_statements`, `statement_line_no`, ...) as
+every other node of its kind. For large triggers that per-dict overhead was
+most of the tree's memory. Each node kind is now a `__slots__` class:
+
+- `FIELDS` lists the keys of the node's JSON object, in output order.
+  `type` is a class constant, except on `SqlStatement`, which serves every
+  `*_statement` type from the statement mappings.
+- A node supports the dict operations the parse passes and renderers use
+  (`node["key"]`, `node["key"] = value`, `"key" in node`, `get`, `keys`,
+  `values`, `items`), so code written against the dict tree keeps working.
+  A field that was never set is absent, as a missing key would be. That is
+  how trees read back from files written with `--strip-line-no` look.
+- `to_dict()` returns the exact dict the analyzer used to build, so the JSON
+  artifacts do not change. `Node.from_dict()` dispatches on "type" to
+  rebuild a node.
+
+Line dicts (`indent` / `line` / `line_no`) that no pass grouped stay plain
+dicts, and so does the `parameters` payload of a function call.
+`tree_to_dicts` and `tree_from_dicts` convert whole trees, lists included.
+
+Usage:
+    node = BeginEnd(begin_line_no=1, begin_indent=0, begin_end_statements=[], exception_handlers=[], exception_line_no=-1, end_line_no=9)
+    node["begin_end_statements"].append(SqlStatement("null_statement", "NULL;", 2, 2))
+    data = node.to_dict()
+    assert tree_to_dicts(tree_from_dicts(data)) == data
+"""
+
+from typing import Any, Dict, FrozenSet, Iterator, List, Tuple, Type
+
+
+# Default of getattr() for fields that were never set
+_UNSET = object()
+
+
+class Node:
+    """Base class of the statement tree nodes; a fixed-key, dict-compatible record."""
+
+    __slots__ = ()
+    # Keys of the JSON object in output order (set by each node class)
+    FIELDS: Tuple[str, ...] = ()
+    _KEYS: FrozenSet[str] = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._KEYS = frozenset(cls.FIELDS)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._KEYS:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                pass
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self._KEYS:
+            raise KeyError(f"{type(self).__name__} node has no field {key!r}")
+        setattr(self, key, value)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._KEYS and hasattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def __repr__(self) -> str:
+        return repr(self.to_dict())
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the value of a field, or default if the node has no such field set."""
+        if key in self._KEYS:
+            return getattr(self, key, default)
+        return default
+
+    def keys(self) -> List[str]:
+        """Return the set fields in output order."""
+        return [key for key in self.FIELDS if hasattr(self, key)]
+
+    def values(self) -> List[Any]:
+        """Return the values of the set fields in output order."""
+        return [getattr(self, key) for key in self.keys()]
+
+    def items(self) -> List[Tuple[str, Any]]:
+        """Return (field, value) pairs of the set fields in output order."""
+        return [(key, getattr(self, key)) for key in self.keys()]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the node and the nodes below it to the dicts the JSON artifacts hold.
+
+        Returns:
+            Dict[str, Any]: The node's fields in output order; lists are rebuilt, line
+                dicts and other plain values are shared with the node
+        """
+        return tree_to_dicts(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Node":
+        """
+        Build a node (and the nodes below it) from its dict form.
+
+        Called on `Node`, the class is chosen by data["type"]. Missing keys are left
+        unset, so stripped artifacts load as well.
+
+        Args:
+            data (Dict[str, Any]): The node's dict, as written by `to_dict`
+
+        Returns:
+            Node: The node
+
+        Raises:
+            ValueError: If the type is unknown or data has a key the node does not have
+        """
+        node_class = cls if cls.FIELDS else _class_of_type(data.get("type"))
+        if node_class is None:
+            raise ValueError(f"Unknown node type: {data.get('type')!r}")
+        unknown = data.keys() - node_class._KEYS
+        if unknown:
+            raise ValueError(f"{node_class.__name__} node has no fields {', '.join(sorted(unknown))}")
+        node = node_class.__new__(node_class)
+        for key, value in data.items():
+            if key != "type" or "type" in node_class.__slots__:
+                setattr(node, key, tree_from_dicts(value))
+        return node
+
+
+class BeginEnd(Node):
+    """BEGIN ... [EXCEPTION ...] END; block."""
+
+    __slots__ = ("begin_line_no", "begin_indent", "begin_end_statements", "exception_handlers", "exception_line_no", "end_line_no")
+    type = "begin_end"
+    FIELDS = ("type",) + __slots__
+
+    def __init__(self, begin_line_no: int, begin_indent: int, begin_end_statements: List[Any], exception_handlers: List["ExceptionHandler"], exception_line_no: int, end_line_no: int):
+        self.begin_line_no = begin_line_no
+        self.begin_indent = begin_indent
+        self.begin_end_statements = begin_end_statements
+        self.exception_handlers = exception_handlers
+        self.exception_line_no = exception_line_no
+        self.end_line_no = end_line_no
+
+
+class ExceptionHandler(Node):
+    """WHEN exception_name THEN ... handler of a BEGIN block."""
+
+    __slots__ = ("exception_name", "when_line_no", "when_indent", "then_line_no", "exception_statements")
+    type = "exception_handler"
+    FIELDS = ("type",) + __slots__
+
+    def __init__(self, exception_name: str, when_line_no: int, when_indent: int, then_line_no: int, exception_statements: List[Any]):
+        self.exception_name = exception_name
+        self.when_line_no = when_line_no
+        self.when_indent = when_indent
+        self.then_line_no = then_line_no
+        self.exception_statements = exception_statements
+
+
+class IfElse(Node):
+    """IF ... THEN ... [ELSIF ...] [ELSE ...] END IF; block."""
+
+    __slots__ = ("condition", "if_line_no", "then_line_no", "if_indent", "end_if_line_no", "then_statements", "if_elses", "else_statements")
+    type = "if_else"
+    FIELDS = ("condition", "type") + __slots__[1:]
+
+    def __init__(self, condition: str, if_line_no: int, then_line_no: int, if_indent: int, end_if_line_no: int, then_statements: List[Any], if_elses: List["ElsifClause"], else_statements: List[Any]):
+        self.condition = condition
+        self.if_line_no = if_line_no
+        self.then_line_no = then_line_no
+        self.if_indent = if_indent
+        self.end_if_line_no = end_if_line_no
+        self.then_statements = then_statements
+        self.if_elses = if_elses
+        self.else_statements = else_statements
+
+
+class ElsifClause(Node):
+    """ELSIF condition THEN ... clause of an IF block."""
+
+    __slots__ = ("elif_line_no", "elif_indent", "condition", "then_line_no", "then_statements")
+    type = "elif_statement"
+    FIELDS = ("type",) + __slots__
+
+    def __init__(self, elif_line_no: int, elif_indent: int, condition: str, then_line_no: int, then_statements: List[Any]):
+        self.elif_line_no = elif_line_no
+        self.elif_indent = elif_indent
+        self.condition = condition
+        self.then_line_no = then_line_no
+        self.then_statements = then_statements
+
+
+class CaseWhen(Node):
+    """CASE ... WHEN ... [ELSE ...] END CASE; block."""
+
+    __slots__ = ("condition", "case_line_no", "case_indent", "end_case_line_no", "when_clauses", "else_statements")
+    type = "case_when"
+    FIELDS = ("condition", "type") + __slots__[1:]
+
+    def __init__(self, condition: str, case_line_no: int, case_indent: int, end_case_line_no: int, when_clauses: List["WhenClause"], else_statements: List[Any]):
+        self.condition = condition
+        self.case_line_no = case_line_no
+        self.case_indent = case_indent
+        self.end_case_line_no = end_case_line_no
+        self.when_clauses = when_clauses
+        self.else_statements = else_statements
+
+
+class WhenClause(Node):
+    """WHEN value THEN ... clause of a CASE block."""
+
+    __slots__ = ("when_line_no", "when_indent", "condition", "then_line_no", "then_statements")
+    type = "when_statement"
+    FIELDS = ("type",) + __slots__
+
+    def __init__(self, when_line_no: int, when_indent: int, condition: str, then_line_no: int, then_statements: List[Any]):
+        self.when_line_no = when_line_no
+        self.when_indent = when_indent
+        self.condition = condition
+        self.then_line_no = then_line_no
+        self.then_statements = then_statements
+
+
+class ForLoop(Node):
+    """FOR loop_variable IN ... LOOP ... END LOOP; block."""
+
+    __slots__ = ("for_expression", "for_line_no", "for_indent", "end_for_line_no", "loop_variable", "for_statements")
+    type = "for_loop"
+    FIELDS = ("for_expression", "type") + __slots__[1:]
+
+    def __init__(self, for_expression: str, for_line_no: int, for_indent: int, end_for_line_no: int, loop_variable: str, for_statements: List[Any]):
+        self.for_expression = for_expression
+        self.for_line_no = for_line_no
+        self.for_indent = for_indent
+        self.end_for_line_no = end_for_line_no
+        self.loop_variable = loop_variable
+        self.for_statements = for_statements
+
+
+class WithStatement(Node):
+    """WITH ... AS ( ... ) statement; the body is kept as one string."""
+
+    __slots__ = ("with_line_no", "with_indent", "with_values", "with_statements", "with_end_line_no")
+    type = "with_statement"
+    FIELDS = ("type",) + __slots__
+
+    def __init__(self, with_line_no: int, with_indent: int, with_values: str, with_statements: str, with_end_line_no: int):
+        self.with_line_no = with_line_no
+        self.with_indent = with_indent
+        self.with_values = with_values
+        self.with_statements = with_statements
+        self.with_end_line_no = with_end_line_no
+
+
+class SqlStatement(Node):
+    """Single SQL statement of a statement-mappings type (select_statement, null_statement, ...)."""
+
+    __slots__ = ("type", "sql_statement", "statement_line_no", "statement_indent")
+    FIELDS = __slots__
+
+    def __init__(self, type: str, sql_statement: str, statement_line_no: int, statement_indent: int):
+        self.type = type
+        self.sql_statement = sql_statement
+        self.statement_line_no = statement_line_no
+        self.statement_indent = statement_indent
+
+
+class RaiseStatement(Node):
+    """RAISE exception_name; statement."""
+
+    __slots__ = ("exception_name", "statement_line_no", "statement_indent")
+    type = "raise_statement"
+    FIELDS = ("type",) + __slots__
+
+    def __init__(self, exception_name: str, statement_line_no: int, statement_indent: int):
+        self.exception_name = exception_name
+        self.statement_line_no = statement_line_no
+        self.statement_indent = statement_indent
+
+
+class Assignment(Node):
+    """variable := expression; statement."""
+
+    __slots__ = ("variable_name", "assignment_operator", "expression", "assignment_line_no", "assignment_indent")
+    type = "assignment"
+    FIELDS = ("type",) + __slots__
+
+    def __init__(self, variable_name: str, assignment_operator: str, expression: str, assignment_line_no: int, assignment_indent: int):
+        self.variable_name = variable_name
+        self.assignment_operator = assignment_operator
+        self.expression = expression
+        self.assignment_line_no = assignment_line_no
+        self.assignment_indent = assignment_indent
+
+
+class FunctionCall(Node):
+    """Call of a mapped function or procedure; `parameters` is a plain dict."""
+
+    __slots__ = ("function_name", "parameters")
+    type = "function_calling"
+    FIELDS = ("type",) + __slots__
+
+    def __init__(self, function_name: str, parameters: Dict[str, Any]):
+        self.function_name = function_name
+        self.parameters = parameters
+
+
+# Node "type" -> class, for from_dict (SqlStatement serves every other *_statement type)
+NODE_TYPES: Dict[str, Type[Node]] = {
+    node_class.type: node_class
+    for node_class in (BeginEnd, ExceptionHandler, IfElse, ElsifClause, CaseWhen, WhenClause, ForLoop, WithStatement, RaiseStatement, Assignment, FunctionCall)
+}
+
+
+def _class_of_type(node_type: Any) -> Any:
+    """Return the node class of a "type" value, or None if it is not a node type."""
+    if not isinstance(node_type, str):
+        return None
+    node_class = NODE_TYPES.get(node_type)
+    if node_class is None and node_type.endswith("_statement"):
+        return SqlStatement
+    return node_class
+
+
+def _node_class(data: Dict[str, Any]) -> Any:
+    """Return the node class of a dict, or None if it is not a node (line dict, parameters, ...)."""
+    node_class = _class_of_type(data.get("type"))
+    if node_class is None or not node_class._KEYS.issuperset(data.keys()):
+        return None
+    return node_class
+
+
+def tree_to_dicts(value: Any) -> Any:
+    """
+    Convert the nodes in a tree (a node, a list or a plain value) to dicts.
+
+    Lists are rebuilt; dicts and other values that are not nodes are returned as they are.
+    The tree is walked with an explicit stack, so its depth is not limited by recursion.
+    """
+    result = [None]
+    # (value, container, slot): the converted value goes to container[slot]
+    stack = [(value, result, 0)]
+    while stack:
+        item, container, slot = stack.pop()
+        if isinstance(item, Node):
+            converted = {}
+            for key in item.FIELDS:
+                field = getattr(item, key, _UNSET)
+                if field is _UNSET:
+                    continue
+                # Set the key now so the dict keeps the field order
+                converted[key] = field
+                if isinstance(field, (Node, list)):
+                    stack.append((field, converted, key))
+            container[slot] = converted
+        elif isinstance(item, list):
+            converted_list = list(item)
+            stack.extend(
+                (child, converted_list, index) for index, child in enumerate(item) if isinstance(child, (Node, list))
+            )
+            container[slot] = converted_list
+        else:
+            container[slot] = item
+    return result[0]
+
+
+def tree_from_dicts(value: Any) -> Any:
+    """
+    Convert the node dicts in a tree (as written to the JSON artifacts) to nodes.
+
+    Dicts whose "type" and keys match a node class become nodes and lists are rebuilt,
+    so the result can be modified without touching `value`. Other dicts (line dicts,
+    function parameters, unknown node types) are returned as they are. The tree is
+    walked with an explicit stack.
+    """
+    result = [None]
+    # (value, container, slot): the converted value goes to container[slot]
+    stack = [(value, result, 0)]
+    while stack:
+        item, container, slot = stack.pop()
+        node_class = _node_class(item) if isinstance(item, dict) else None
+        if node_class is not None:
+            node = node_class.__new__(node_class)
+            for key, field in item.items():
+                if key == "type" and "type" not in node_class.__slots__:
+                    continue
+                if isinstance(field, (dict, list)):
+                    stack.append((field, node, key))
+                else:
+                    setattr(node, key, field)
+            container[slot] = node
+        elif isinstance(item, list):
+            converted_list = list(item)
+            stack.extend(
+                (child, converted_list, index) for index, child in enumerate(item) if isinstance(child, (dict, list))
+            )
+            container[slot] = converted_list
+        else:
+            container[slot] = item
+    return result[0]
@@ -0,0 +1,159 @@
+"""
+Block-pairing index for the OracleTriggerAnalyzer parse passes.
+
+`_parse_begin_end_statements`, `_parse_case_when`, `_parse_if_else` and
+`_parse_for_loop` each find a block opener and used to scan forward, line by
+line, for its closer: the first following `END ...` line at the same
+indent. They repeated that scan at every nesting level, and the IF/CASE
+helpers scanned the block again for their ELSIF/ELSE/WHEN split points.
+That is quadratic for long or deeply nested triggers.
+
+`BlockIndex` is built once, after comment stripping, in one pass over the
+line table:
+
+- Each opener is pushed on a stack of pending openers for its kind and
+  indent. The next closer of that kind and indent pairs with every opener
+  on the stack. Each closer also links to the next closer of the same kind
+  and indent.
+- Lines that start with a split keyword (EXCEPTION, ELSIF, ELSE, WHEN,
+  END IF;) are listed per keyword and indent, so the split points of a
+  block are found with two bisects.
+
+The passes work on lists that mix line dicts with nodes built by earlier
+passes, and a closer may already be folded into such a node.
+`find_closer()` then follows the closer links to the next candidate that is
+still in the list. This gives the same result as the forward scan.
+Everything is keyed by `line_no`, which is unique per line.
+
+Usage:
+    block_index = BlockIndex.from_line_table(line_table)
+    positions = BlockIndex.positions(working_lines)
+    j = block_index.find_closer("IF", working_lines, i, positions)
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from utilities.line_table import LineTable
+
+# Block kind -> (opener test, closer test) on the stripped upper-case line.
+# A BEGIN line that itself ends with "END;" closes its own block.
+BLOCK_KINDS: Dict[str, Tuple[Callable[[str], bool], Callable[[str], bool]]] = {
+    "BEGIN": (lambda upper: upper.startswith("BEGIN"), lambda upper: upper.endswith("END;")),
+    "CASE": (lambda upper: upper.startswith("CASE"), lambda upper: upper.startswith("END CASE;")),
+    "IF": (lambda upper: upper.startswith("IF ") or upper == "IF", lambda upper: upper.startswith("END IF;")),
+    "FOR": (lambda upper: upper.startswith("FOR"), lambda upper: upper.startswith("END LOOP;")),
+}
+# Keywords that split a block into sections (matched with startswith)
+SPLIT_KEYWORDS = ("EXCEPTION", "ELSIF", "ELSE", "WHEN", "END IF;")
+
+
+class BlockIndex:
+    """Opener → closer pairs and split-point lines of one trigger, keyed by line number."""
+
+    __slots__ = ("closers", "next_closers", "splits")
+
+    def __init__(self):
+        # (kind, opener line_no) -> line_no of the first closer at the same indent
+        self.closers: Dict[Tuple[str, int], int] = {}
+        # (kind, closer line_no) -> line_no of the next closer at the same indent
+        self.next_closers: Dict[Tuple[str, int], int] = {}
+        # (keyword, indent) -> line numbers of the lines starting with keyword, ascending
+        self.splits: Dict[Tuple[str, int], array] = {}
+
+    @classmethod
+    def from_line_table(cls, line_table: LineTable) -> "BlockIndex":
+        """
+        Build the index in one pass over the (comment-stripped) rows of a LineTable.
+
+        Args:
+            line_table (LineTable): The analyzer's line table
+
+        Returns:
+            BlockIndex: The pairing and split-point index
+        """
+        index = cls()
+        # (kind, indent) -> opener line numbers waiting for a closer
+        pending: Dict[Tuple[str, int], List[int]] = {}
+        # (kind, indent) -> line number of the last closer seen
+        last_closer: Dict[Tuple[str, int], int] = {}
+        for row in range(len(line_table)):
+            upper = line_table.line(row).strip().upper()
+            indent = line_table.indent[row]
+            line_no = line_table.line_no[row]
+            for kind, (is_opener, is_closer) in BLOCK_KINDS.items():
+                key = (kind, indent)
+                if is_opener(upper):
+                    pending.setdefault(key, []).append(line_no)
+                if is_closer(upper):
+                    for opener_line_no in pending.pop(key, ()):
+                        index.closers[(kind, opener_line_no)] = line_no
+                    previous = last_closer.get(key)
+                    if previous is not None:
+                        index.next_closers[(kind, previous)] = line_no
+                    last_closer[key] = line_no
+            for keyword in SPLIT_KEYWORDS:
+                if upper.startswith(keyword):
+                    index.splits.setdefault((keyword, indent), array("l")).append(line_no)
+        return index
+
+    @staticmethod
+    def positions(working_lines: Sequence[Dict[str, Any]]) -> Dict[int, int]:
+        """Return line_no -> position of the line dicts in a statement list, in list order."""
+        return {item["line_no"]: position for position, item in enumerate(working_lines) if "line" in item}
+
+    def find_closer(self, kind: str, working_lines: Sequence[Dict[str, Any]], open_i: int, positions: Dict[int, int]) -> int:
+        """
+        Return the position of the closer of the block opened at working_lines[open_i].
+
+        Same result as scanning working_lines forward for the first line of the closing
+        kind at the opener's indent (from open_i itself for BEGIN, from open_i + 1
+        otherwise).
+
+        Args:
+            kind (str): Block kind ("BEGIN", "CASE", "IF" or "FOR")
+            working_lines (Sequence[Dict[str, Any]]): The statement list
+            open_i (int): Position of the opener in working_lines
+            positions (Dict[int, int]): `positions(working_lines)`
+
+        Returns:
+            int: Position of the closer in working_lines, or -1 if the block is not closed
+        """
+        if not positions:
+            return -1
+        last_line_no = next(reversed(positions))
+        line_no = self.closers.get((kind, working_lines[open_i]["line_no"]))
+        while line_no is not None and line_no <= last_line_no:
+            position = positions.get(line_no)
+            if position is not None and position >= open_i:
+                return position
+            # Folded into a node built by an earlier pass; try the next closer
+            line_no = self.next_closers.get((kind, line_no))
+        return -1
+
+    def split_points(
+        self,
+        keywords: Sequence[str],
+        indent: int,
+        positions: Dict[int, int],
+        first_line_no: int,
+        last_line_no: int,
+    ) -> List[Tuple[int, str]]:
+        """
+        Return (position, keyword) of the lines at `indent` that start with one of `keywords`.
+
+        Only lines of the statement list (`positions`) numbered first_line_no to
+        last_line_no are returned, in list order.
+        """
+        points = []
+        for keyword in keywords:
+            line_nos = self.splits.get((keyword, indent))
+            if not line_nos:
+                continue
+            for k in range(bisect_left(line_nos, first_line_no), bisect_right(line_nos, last_line_no)):
+                position = positions.get(line_nos[k])
+                if position is not None:
+                    points.append((position, keyword))
+        points.sort()
+        return points
@@ -0,0 +1,145 @@
+"""
+Content-hash build cache for the main.py pipeline (incremental mode).
+
+Each `process_files` stage maps one input file to one output file. In
+incremental mode (`python main.py --incremental`) the manifest
+`files/.build_cache.json` records, per stage and input file:
+
+- `key`: a hash of the stage name, the input file content, the mapping sheets
+  the stage depends on, the parser version (`metadata.parser_version`) and
+  the JSON artifact options (`--json-format`, `--strip-line-no`)
+- `output` / `output_hash`: the output file written for that key (read through
+  ArtifactStore, so it may be an entry of the artifact archive)
+- `rest_strings` / `exception_names`: side effects of the SQL → JSON stage, so
+  they can be replayed into rest_list.csv and the exception batch on a hit
+
+A file is skipped when its key matches and the recorded output still exists
+unchanged. Hit and miss counts are kept per stage in `BuildCache.stats`.
+
+Usage:
+    build_cache = BuildCache.load()
+    key = build_cache.input_key("sql_to_json", src_path, ("function_list",))
+    entry = build_cache.lookup("sql_to_json", src_path, key, out_path)
+    ...
+    build_cache.store("sql_to_json", src_path, key, out_path, deferred_writes)
+    build_cache.save()
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, Optional, Sequence
+
+from utilities.artifact_json import ArtifactJSON
+from utilities.artifact_store import ArtifactStore
+from utilities.common import debug, info, warning
+from utilities.mapping_store import MappingStore
+from utilities.OracleTriggerAnalyzer import PARSER_VERSION
+
+# Bump to invalidate every manifest entry (e.g. after a renderer change)
+CACHE_FORMAT_VERSION = 1
+
+
+class BuildCache:
+    """Manifest of stage outputs keyed on input content, mapping sheets, parser version and output options."""
+
+    DEFAULT_PATH = "files/.build_cache.json"
+
+    def __init__(self, path: str = DEFAULT_PATH, entries: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.path = path
+        # step -> input path -> entry
+        self.entries: Dict[str, Dict[str, Any]] = entries or {}
+        # step -> {"hits": int, "misses": int}
+        self.stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_PATH) -> "BuildCache":
+        """Load the manifest, starting empty if it is missing, unreadable or from another format version."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("version") == CACHE_FORMAT_VERSION:
+                debug("Loaded build cache manifest from %s", path)
+                return cls(path, manifest.get("steps", {}))
+            info("Build cache manifest %s has an old format, starting a new one", path)
+        except FileNotFoundError:
+            debug("No build cache manifest at %s, starting a new one", path)
+        except (OSError, ValueError) as e:
+            warning("Ignoring unreadable build cache manifest %s: %s", path, str(e))
+        return cls(path)
+
+    def save(self) -> None:
+        """Write the manifest atomically."""
+        with self._lock:
+            manifest = {"version": CACHE_FORMAT_VERSION, "steps": self.entries}
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(manifest, f)
+            os.replace(temp_path, self.path)
+
+    def input_key(self, step: str, src_path: str, mapping_sheets: Sequence[str] = ()) -> str:
+        """
+        Return the cache key of one stage input.
+
+        Args:
+            step (str): Stage name
+            src_path (str): Input file
+            mapping_sheets (Sequence[str]): Mapping sheets the stage output depends on
+
+        Returns:
+            str: Hex digest combining stage, input content, mapping sheets, parser version
+            and the ArtifactJSON options the output was written with
+        """
+        digest = hashlib.sha256()
+        for part in (
+            str(CACHE_FORMAT_VERSION),
+            PARSER_VERSION,
+            step,
+            MappingStore.fingerprint(mapping_sheets),
+            ArtifactStore.sha256(src_path),
+            ArtifactJSON.json_format,
+            str(ArtifactJSON.strip_line_no),
+        ):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _count(self, step: str, outcome: str) -> None:
+        step_stats = self.stats.setdefault(step, {"hits": 0, "misses": 0})
+        step_stats[outcome] += 1
+
+    def lookup(self, step: str, src_path: str, key: str, out_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the manifest entry if `out_path` is still the output built for `key`.
+
+        Counts a hit or a miss for the stage.
+        """
+        with self._lock:
+            entry = self.entries.get(step, {}).get(src_path)
+        hit = (
+            entry is not None
+            and entry.get("key") == key
+            and entry.get("output") == out_path
+            and ArtifactStore.exists(out_path)
+            and ArtifactStore.sha256(out_path) == entry.get("output_hash")
+        )
+        with self._lock:
+            self._count(step, "hits" if hit else "misses")
+        return entry if hit else None
+
+    def store(self, step: str, src_path: str, key: str, out_path: str, deferred_writes: Optional[Dict[str, Any]] = None) -> None:
+        """Record the output built for `key`, with the side effects to replay on later hits."""
+        if not ArtifactStore.exists(out_path):
+            # Nothing was written (e.g. an analysis with an "error" key); rebuild next time
+            return
+        entry = {"key": key, "output": out_path, "output_hash": ArtifactStore.sha256(out_path)}
+        if deferred_writes:
+            entry["rest_strings"] = deferred_writes.get("rest_strings", [])
+            entry["exception_names"] = deferred_writes.get("exception_names", {})
+        with self._lock:
+            self.entries.setdefault(step, {})[src_path] = entry
@@ -1,11 +1,18 @@
+import atexit
+import gzip
 import json
 import os
 import logging
+import multiprocessing
 import time
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from typing import Optional, Any, Tuple
 import pandas as pd
 
+from utilities.artifact_json import GZIP_SUFFIX, ArtifactJSON
+from utilities.artifact_store import ArtifactStore
+
 """
 Common utilities module for the Oracle to PostgreSQL converter.
 
@@ -17,22 +24,63 @@ This module provides:
 
 
 The logging system is designed to output both to console (for immediate visibility)
-and to timestamped log files (for later analysis and debugging).
+and to timestamped log files (for later analysis and debugging). Batch runs use the
+"production" profile (see setup_logging), which skips debug records and rotates the
+log file by size.
 """
 
 main_excel_file = "utilities/oracle_postgresql_mappings.xlsx"
+# Logging profiles:
+# - "development": everything down to DEBUG is written straight to the log file
+# - "production": INFO and above only, so debug calls return before formatting their
+#   arguments; the file is written by a QueueListener thread and rotated by size
+LOG_PROFILES = ("development", "production")
+# Environment variable that selects the profile used when the module is imported
+LOG_PROFILE_ENV = "ORACLE_CONVERTER_LOG_PROFILE"
+LOG_MAX_BYTES = 50 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+
+# Listener of the production profile, stopped when logging is set up again or at exit
+_log_listener: Optional[QueueListener] = None
+
+
+def _stop_log_listener() -> None:
+    """Flush and stop the production-profile queue listener, if one is running."""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        for handler in _log_listener.handlers:
+            handler.close()
+        _log_listener = None
+
+
 # Configure logging system
-def setup_logging(log_dir="output", log_level="INFO"):
+def setup_logging(log_dir="output", log_level="INFO", profile=None):
     """
     Set up logging configuration to output to both console and file.
+
+    The "development" profile (the default) logs everything down to DEBUG to the file.
+    The "production" profile raises the root level to INFO, so `logger.debug("...%s", x)`
+    calls are dropped before their arguments are formatted, and hands file records to
+    a QueueListener through a multiprocessing queue. The listener writes them to a
+    RotatingFileHandler (LOG_MAX_BYTES per file, LOG_BACKUP_COUNT backups). Worker
+    processes forked from the caller share the queue, so only one process writes and
+    rotates the file.
    
     Args:
         log_dir (str): Directory to store log files
         log_level (str): Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+        profile (str): "development" or "production" (default: the ORACLE_CONVERTER_LOG_PROFILE
+            environment variable, else "development")
    
     Returns:
         tuple: (logger, log_file_path)
     """
+    profile = (profile or os.environ.get(LOG_PROFILE_ENV) or "development").lower()
+    if profile not in LOG_PROFILES:
+        raise ValueError(f"Unknown logging profile: {profile} (expected one of {', '.join(LOG_PROFILES)})")
+    production = profile == "production"
+
     # Create log directory if it doesn't exist
     if not os.path.exists(log_dir):
         os.makedirs(log_dir)
@@ -44,11 +92,13 @@ def setup_logging(log_dir="output", log_level="INFO"):
    
     # Configure the root logger
     logger = logging.getLogger()
-    logger.setLevel(logging.DEBUG)  # Capture all levels
+    # Capture all levels in development; production drops debug records up front
+    logger.setLevel(logging.INFO if production else logging.DEBUG)
    
     # Clear any existing handlers (in case setup_logging is called multiple times)
     if logger.hasHandlers():
         logger.handlers.clear()
+    _stop_log_listener()
     # logger.handlers.clear()
     # Create formatters with more detailed information
     file_formatter = logging.Formatter(
@@ -59,8 +109,14 @@ def setup_logging(log_dir="output", log_level="INFO"):
     )
    
     # Create file handler for all log messages
-    file_handler = logging.FileHandler(log_file, encoding='utf-8')
-    file_handler.setLevel(logging.DEBUG)
+    if production:
+        file_handler = RotatingFileHandler(
+            log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding='utf-8'
+        )
+        file_handler.setLevel(logging.INFO)
+    else:
+        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(file_formatter)
    
     # Create console handler with configurable log level
@@ -70,7 +126,21 @@ def setup_logging(log_dir="output", log_level="INFO"):
     console_handler.setFormatter(console_formatter)
    
     # Add handlers to logger
-    logger.addHandler(file_handler)
+    if production:
+        global _log_listener
+        log_queue = multiprocessing.Queue(-1)
+        _log_listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+        _log_listener.start()
+        # Registered after the queue exists, so it runs before the multiprocessing exit
+        # hooks close the queue (atexit calls handlers in reverse order)
+        atexit.unregister(_stop_log_listener)
+        atexit.register(_stop_log_listener)
+        logger.addHandler(QueueHandler(log_queue))
+        # Written to the file only; the first record also starts the queue's feeder
+        # thread, which stop() needs at exit
+        logger.info("Logging profile: production (%d bytes per file, %d backups)", LOG_MAX_BYTES, LOG_BACKUP_COUNT)
+    else:
+        logger.addHandler(file_handler)
     logger.addHandler(console_handler)
    
     return logger, log_file
@@ -257,12 +327,12 @@ def alert(msg: str, *args, **kwargs) -> None:
 
 def clean_json_remove_line_no(data: Any) -> Any:
     """
-    Recursively remove all keys containing 'line_no' from a JSON data structure.
+    Remove all keys containing 'line_no' from a JSON data structure.
    
     This function traverses a complex nested JSON structure and removes any dictionary
-    keys that contain the string 'line_no' (case insensitive). It works recursively
-    through dictionaries and lists, preserving the original structure but excluding
-    the line number metadata.
+    keys that contain the string 'line_no' (case insensitive). It walks dictionaries
+    and lists with an explicit stack (so deep nesting cannot raise RecursionError),
+    preserving the original structure but excluding the line number metadata.
    
     Line number information is useful during development and debugging but is not needed
     in the final output JSON, making the files cleaner and smaller.
@@ -278,25 +348,28 @@ def clean_json_remove_line_no(data: Any) -> Any:
         >>> clean_json_remove_line_no(data)
         {"name": "func1", "params": [{"name": "p1"}]}
     """
-    # Process dictionary objects
-    if isinstance(data, dict):
-        # Create a new dict without keys containing 'line_no'
-        cleaned_dict = {}
-        for key, value in data.items():
-            # Skip keys containing 'line_no' (case insensitive)
-            if 'line_no' not in key.lower():
-                # Recursively clean the value
-                cleaned_dict[key] = clean_json_remove_line_no(value)
-        return cleaned_dict
-       
-    # Process list objects
-    elif isinstance(data, list):
-        # Process each item in the list recursively
-        return [clean_json_remove_line_no(item) for item in data]
-       
-    # Return primitive values as-is (strings, numbers, booleans, None)
-    else:
-        return data
+    # Holder for the result; each stack entry fills one slot of an already built container
+    result = [None]
+    stack = [(data, result, 0)]
+    while stack:
+        value, container, slot = stack.pop()
+        if isinstance(value, dict):
+            cleaned_dict = {}
+            container[slot] = cleaned_dict
+            for key, item in value.items():
+                # Skip keys containing 'line_no' (case insensitive)
+                if 'line_no' not in key.lower():
+                    # Reserve the key now so the copy keeps the key order
+                    cleaned_dict[key] = None
+                    stack.append((item, cleaned_dict, key))
+        elif isinstance(value, list):
+            cleaned_list = [None] * len(value)
+            container[slot] = cleaned_list
+            stack.extend((item, cleaned_list, index) for index, item in enumerate(value))
+        else:
+            # Primitive values as-is (strings, numbers, booleans, None)
+            container[slot] = value
+    return result[0]
 
 
 
@@ -312,7 +385,9 @@ def clean_json_files() -> None:
     4. Logs the progress and any errors encountered
    
     Line number information is useful during analysis but not needed in the final output,
-    removing it makes the JSON files smaller and cleaner.
+    removing it makes the JSON files smaller and cleaner. New runs can leave it out while
+    writing instead (main.py --strip-line-no). Gzipped analyses (.json.gz) are cleaned too
+    and stay gzipped.
     """
     # Define directory
     json_dir = "files/format_json"
@@ -326,7 +401,7 @@ def clean_json_files() -> None:
 
 
     # Process all JSON files in the directory
-    json_files = [f for f in os.listdir(json_dir) if f.endswith(".json")]
+    json_files = [f for f in ArtifactStore.list_names(json_dir) if ArtifactJSON.matches(f, ".json")]
     debug(f"Found {len(json_files)} JSON files to clean")
 
 
@@ -339,9 +414,8 @@ def clean_json_files() -> None:
        
         try:
             # Read the JSON file
-            with open(json_path, "r", encoding="utf-8") as f:
-                json_data = json.load(f)
-                debug(f"Successfully loaded JSON data ({len(str(json_data))} bytes)")
+            json_data = ArtifactJSON.read(json_path)
+            debug(f"Successfully loaded JSON data ({len(str(json_data))} bytes)")
             if "error" in json_data:
                 debug(f"Skipping file {json_file} due to existing 'error' key")
                 continue
@@ -352,8 +426,11 @@ def clean_json_files() -> None:
             debug(f"Cleaned JSON data in {duration:.3f} seconds")
            
             # Save the cleaned JSON back to the same file
-            with open(json_path, "w", encoding="utf-8") as f:
-                json.dump(cleaned_data, f, indent=2, ensure_ascii=False)
+            if json_file.endswith(GZIP_SUFFIX):
+                content = json.dumps(cleaned_data, separators=(",", ":"), ensure_ascii=False)
+                ArtifactStore.write_bytes(json_path, gzip.compress(content.encode("utf-8")))
+            else:
+                ArtifactStore.write_text(json_path, json.dumps(cleaned_data, indent=2, ensure_ascii=False))
            
             logger.debug(f"✅ Cleaned {json_file}")
             cleaned_count += 1
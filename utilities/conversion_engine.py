@@ -0,0 +1,145 @@
+"""
+Long-lived conversion session for converting many triggers from text.
+
+`OracleTriggerAnalyzer(filepath)` needs a file on disk, and every analyzer and
+`FormatSQL` instance looks its mappings up again: each lookup checks the
+workbook's mtime and size, and the first trigger of a process also builds the
+matchers and rewriters. `ConversionEngine` is built once per process:
+
+- The constructor builds the mapping views, the function/statement matchers
+  and the function/schema rewriters up front (`warm()`).
+- Every call runs with the MappingStore `pinned()`, so lookups inside a
+  trigger are dictionary hits. Between calls the store still notices a
+  changed workbook.
+- Triggers are taken as text (`analyze_text`), so callers that read
+  triggers from a database, an archive or a dump need no temporary files.
+- With `render_cache=True`, `render` reuses the rendered SQL of subtrees it
+  has already rendered (see utilities/render_cache.py).
+
+Exception names found by `analyze_many` are merged into the workbook once, when
+the generator finishes, as `main.read_oracle_triggers_to_json` does for a batch.
+
+Usage:
+    engine = ConversionEngine()
+    for name, analysis in engine.analyze_many(("TRG_A.sql", text) for text in texts):
+        oracle_sql = engine.render(analysis, "Oracle")
+        operations = engine.split_operations(analysis)
+"""
+
+from typing import Any, ContextManager, Dict, Iterable, Iterator, Optional, Tuple
+
+from utilities.common import debug, error
+from utilities.FormatSQL import FormatSQL
+from utilities.JSONTOPLJSON import JSONTOPLJSON
+from utilities.mapping_store import MappingStore
+from utilities.OracleTriggerAnalyzer import PARSER_ENGINES, OracleTriggerAnalyzer
+from utilities.render_cache import RenderCache
+
+
+class ConversionEngine:
+    """Reusable analyzer/renderer session with mappings and matchers loaded once."""
+
+    def __init__(self, parser_engine: str = "legacy", save_exception_names: bool = True, render_cache: bool = False):
+        """
+        Args:
+            parser_engine (str): Parser engine passed to OracleTriggerAnalyzer
+                ("legacy" or "single_pass")
+            save_exception_names (bool): Write newly found exception names to the mapping
+                workbook; when False they are dropped (read-only runs)
+            render_cache (bool): Keep a RenderCache for `render` (its stats are in
+                `self.render_cache.stats()`)
+
+        Raises:
+            ValueError: If parser_engine is unknown
+        """
+        if parser_engine not in PARSER_ENGINES:
+            raise ValueError(f"Unknown parser engine: {parser_engine} (expected one of {', '.join(PARSER_ENGINES)})")
+        self.parser_engine = parser_engine
+        self.save_exception_names = save_exception_names
+        self.render_cache: Optional[RenderCache] = RenderCache() if render_cache else None
+        self.warm()
+
+    def warm(self) -> None:
+        """Build the mapping views, matchers and rewriters now instead of on the first trigger."""
+        with MappingStore.pinned():
+            OracleTriggerAnalyzer.function_call_matcher()
+            OracleTriggerAnalyzer.statement_type_matcher()
+            FormatSQL({}).compile_mappings()
+        debug("Conversion engine ready (parser engine: %s)", self.parser_engine)
+
+    def _exception_name_batch(self) -> ContextManager[Dict[str, Any]]:
+        """
+        Collect the exception names found inside the block and merge them into the workbook once.
+
+        Inside an already open deferral block (a run or a worker), the names are handed
+        to that block instead.
+        """
+        return OracleTriggerAnalyzer.deferring_writes(("exception_names",), save_exception_names=self.save_exception_names)
+
+    def analyze_text(self, text: str, name: str, file_details: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Parse one trigger from its text.
+
+        Args:
+            text (str): The PL/SQL block of the trigger (from DECLARE or BEGIN)
+            name (str): File name of the trigger (e.g. "TRG_EMP.sql"), used in the
+                metadata and the rest list
+            file_details (Optional[Dict[str, Any]]): File details for the metadata
+                (default: name and size of the text)
+
+        Returns:
+            Dict[str, Any]: The analysis produced by OracleTriggerAnalyzer.to_json()
+        """
+        with self._exception_name_batch(), MappingStore.pinned():
+            analyzer = OracleTriggerAnalyzer(name, parser_engine=self.parser_engine, sql_content=text, file_details=file_details)
+            return analyzer.to_json()
+
+    def render(self, analysis: Dict[str, Any], db_type: str = "Oracle") -> str:
+        """
+        Render an analysis as formatted SQL.
+
+        Args:
+            analysis (Dict[str, Any]): Analysis produced by `analyze_text`
+            db_type (str): "Oracle" or "PostgreSQL"
+
+        Returns:
+            str: The rendered SQL
+        """
+        with MappingStore.pinned():
+            return FormatSQL(analysis, render_cache=self.render_cache).to_sql(db_type)["sql"]
+
+    def split_operations(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Split an analysis into its on_insert / on_update / on_delete PL/JSON.
+
+        Args:
+            analysis (Dict[str, Any]): Analysis produced by `analyze_text` (not modified)
+
+        Returns:
+            Dict[str, Any]: The PL/JSON produced by JSONTOPLJSON.to_dict()
+        """
+        with MappingStore.pinned():
+            return JSONTOPLJSON(analysis).to_dict()
+
+    def analyze_many(self, triggers: Iterable[Tuple[str, str]]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Parse triggers lazily, yielding each analysis as soon as it is ready.
+
+        A trigger that fails to parse is logged and yielded as {"error": message}, so one
+        bad trigger does not stop the batch. Exception names found are merged into the
+        workbook once, when the generator is exhausted or closed.
+
+        Args:
+            triggers (Iterable[Tuple[str, str]]): (name, text) pairs, see `analyze_text`
+
+        Yields:
+            Tuple[str, Dict[str, Any]]: (name, analysis)
+        """
+        with self._exception_name_batch():
+            for name, text in triggers:
+                try:
+                    analysis = self.analyze_text(text, name)
+                except Exception as e:
+                    error("Failed to analyze %s: %s", name, str(e))
+                    analysis = {"error": str(e)}
+                yield name, analysis
@@ -0,0 +1,116 @@
+"""
+Precompiled line matchers for the function-call and SQL-statement passes.
+
+`parse_function_calling_statements` and `parse_sql_statements` used to reload
+the `function_list` / `statement_mappings` sheets and rebuild every candidate
+prefix for every line of every nested block. These matchers build the
+upper-cased prefixes once. `OracleTriggerAnalyzer.function_call_matcher()` and
+`statement_type_matcher()` cache them per process through the MappingStore,
+so they are rebuilt only when the workbook changes.
+
+Both matchers keep the legacy resolution rule: when several entries match a
+line, the last entry in sheet order wins. Every prefix goes into a
+`KeywordTrie` whose nodes hold the highest sheet position ending there, so a
+line is classified in a single walk over its first characters instead of one
+`startswith` call per prefix.
+"""
+
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
+
+
+class KeywordTrie:
+    """Character trie that finds the highest-ranked keyword a text starts with."""
+
+    # Key of the rank stored on a keyword's last node; never collides with a single character
+    _RANK = ""
+
+    def __init__(self):
+        self._root: Dict[str, Any] = {}
+
+    def add(self, keyword: str, rank: int) -> None:
+        """Insert a keyword, keeping the highest rank if it was already present."""
+        node = self._root
+        for char in keyword:
+            node = node.setdefault(char, {})
+        if node.get(self._RANK, -1) < rank:
+            node[self._RANK] = rank
+
+    def best_prefix_rank(self, text: str) -> int:
+        """
+        Return the highest rank among the keywords `text` starts with.
+
+        Args:
+            text (str): Text to classify
+
+        Returns:
+            int: The highest rank, or -1 if no keyword is a prefix of `text`
+        """
+        node = self._root
+        best = node.get(self._RANK, -1)
+        for char in text:
+            node = node.get(char)
+            if node is None:
+                break
+            rank = node.get(self._RANK, -1)
+            if rank > best:
+                best = rank
+        return best
+
+
+class FunctionCallMatcher:
+    """Match the start of a line against the names in the `function_list` sheet."""
+
+    def __init__(self, function_names: Sequence[str]):
+        self.function_names: Tuple[str, ...] = tuple(function_names)
+        # Every upper-cased prefix accepted for a name, ranked by the name's sheet position
+        self._trie = KeywordTrie()
+        for rank, name in enumerate(self.function_names):
+            for pattern in (
+                name,
+                f"'{name}'",
+                f"\"{name}\"",
+                f"CALL {name}",
+                f"CALL '{name}'",
+                f"CALL \"{name}\"",
+                f"PERFORM {name}",
+                f"PERFORM '{name}'",
+                f"PERFORM \"{name}\"",
+            ):
+                self._trie.add(pattern.upper(), rank)
+
+    def match(self, line_upper: str) -> Optional[str]:
+        """
+        Return the function name the upper-cased, stripped line starts with.
+
+        Args:
+            line_upper (str): Stripped, upper-cased source line
+
+        Returns:
+            Optional[str]: The last matching name from the sheet, or None
+        """
+        rank = self._trie.best_prefix_rank(line_upper)
+        return self.function_names[rank] if rank >= 0 else None
+
+
+class StatementTypeMatcher:
+    """Match the start of a line against the keywords in the `statement_mappings` sheet."""
+
+    def __init__(self, stmt_type_map: Mapping[str, str]):
+        self.statement_types: Tuple[str, ...] = tuple(stmt_type_map.values())
+        # Upper-cased keywords ranked by their sheet position
+        self._trie = KeywordTrie()
+        for rank, type_name in enumerate(stmt_type_map):
+            self._trie.add(type_name.upper(), rank)
+
+    def match(self, line_upper: str) -> Optional[str]:
+        """
+        Return the statement type of the upper-cased, stripped line.
+
+        Args:
+            line_upper (str): Stripped, upper-cased source line
+
+        Returns:
+            Optional[str]: The type of the last matching keyword from the sheet, or None
+        """
+        rank = self._trie.best_prefix_rank(line_upper)
+        return self.statement_types[rank] if rank >= 0 else None
@@ -0,0 +1,211 @@
+"""
+Compact line table for the OracleTriggerAnalyzer source text.
+
+`_convert_to_structured_lines` used to build one `{"indent", "line",
+"line_no"}` dict per source line. Each comment-stripping pass then copied
+every line into a second list of dicts. `LineTable` keeps one row per
+non-empty line in four `array` columns instead:
+
+- `indent`: number of leading whitespace characters
+- `line_no`: 1-based line number in the source
+- `start` / `end`: offsets of the line text in the original `sql_content`
+
+Stripping comments (using the spans found by `utilities.sql_lexer`) only
+narrows or drops rows; the source text is never copied. The exception is a
+line whose remaining text is not one contiguous slice, e.g.
+`a := 1; /* note */ b := 2;`. Its joined text is kept in the sparse
+`overrides` dict.
+
+The parser still works on line dicts: lines that no pass groups into a
+node (`utilities.ast_nodes`) stay dicts in the statement tree.
+`records()` returns a read-only sequence view that builds the dict of a
+row on first access and then returns that same object every time.
+
+Usage:
+    table = LineTable.from_text(sql_content)
+    block_comments, inline_comments = table.strip_comments(scan_sql(sql_content))
+    structured_lines = table.records()
+"""
+
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from utilities.sql_lexer import SqlScan, iter_line_spans
+
+
+def _block_comment_text(text: str) -> str:
+    """
+    Return a block comment as the line-based stripping reported it.
+
+    Each line of the comment is right-trimmed, blank lines are left out, and the lines
+    are joined with "\n". An unclosed comment ends with "\n".
+    """
+    closed = len(text) >= 4 and text.endswith("*/")
+    lines = [text[start:end] for start, end in iter_line_spans(text)]
+    if closed and len(lines) == 1:
+        return text
+    last_line = lines.pop() if closed else None
+    kept = [line.rstrip() for i, line in enumerate(lines) if i == 0 or line.strip()]
+    if last_line is None:
+        return "".join(line + "\n" for line in kept)
+    return "\n".join(kept + [last_line])
+
+
+class LineTable:
+    """Offset-based table of the non-empty lines of a source text."""
+
+    __slots__ = ("text", "indent", "line_no", "start", "end", "overrides")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.indent = array("l")
+        self.line_no = array("l")
+        self.start = array("q")
+        self.end = array("q")
+        # row -> line text, for rows that are not a single slice of `text`
+        self.overrides: Dict[int, str] = {}
+
+    @classmethod
+    def from_text(cls, text: str) -> "LineTable":
+        """
+        Build the table of the lines of `text` that are not empty or whitespace only.
+
+        A row's text is the source line with trailing whitespace removed; leading
+        whitespace is kept and its length stored as the row's indent.
+        """
+        table = cls(text)
+        for line_no, (start, end) in enumerate(iter_line_spans(text), start=1):
+            line = text[start:end]
+            content_length = len(line.rstrip())
+            if not content_length:
+                continue
+            table.indent.append(len(line) - len(line.lstrip()))
+            table.line_no.append(line_no)
+            table.start.append(start)
+            table.end.append(start + content_length)
+        return table
+
+    def __len__(self) -> int:
+        return len(self.line_no)
+
+    def line(self, row: int) -> str:
+        """Return the text of one row."""
+        override = self.overrides.get(row)
+        if override is not None:
+            return override
+        return self.text[self.start[row]:self.end[row]]
+
+    def record(self, row: int) -> Dict[str, Any]:
+        """Return a new `{"indent", "line", "line_no"}` dict for one row."""
+        return {"indent": self.indent[row], "line": self.line(row), "line_no": self.line_no[row]}
+
+    def records(self) -> "LineRecords":
+        """Return the dict view of the table (see LineRecords)."""
+        return LineRecords(self)
+
+    def _keep(self, kept: "LineTable", row: int, start: int, end: int, override: Optional[str] = None) -> None:
+        """Append one row of this table to `kept`, with new offsets or text."""
+        if override is not None:
+            kept.overrides[len(kept)] = override
+        kept.indent.append(self.indent[row])
+        kept.line_no.append(self.line_no[row])
+        kept.start.append(start)
+        kept.end.append(end)
+
+    def _replace_rows(self, kept: "LineTable") -> None:
+        """Take over the rows of `kept`."""
+        self.indent, self.line_no, self.start, self.end, self.overrides = kept.indent, kept.line_no, kept.start, kept.end, kept.overrides
+
+    def strip_comments(self, scan: SqlScan) -> Tuple[List[str], List[str]]:
+        """
+        Remove the comments found by `scan_sql` from the rows.
+
+        Text kept around a block comment is not trimmed; text before an inline comment
+        is right-trimmed. Rows left empty or whitespace only are dropped.
+
+        Args:
+            scan (SqlScan): Scan of this table's source text
+
+        Returns:
+            Tuple[List[str], List[str]]: (block comments, stripped inline comments), each
+            in source order
+        """
+        text = self.text
+        spans = scan.comment_spans()
+        kept = LineTable(text)
+        k = 0
+        for row in range(len(self)):
+            row_start, row_end = self.start[row], self.end[row]
+            override = self.overrides.get(row)
+            # Skip comments that end before this row
+            while k < len(spans) and spans[k][1] <= row_start:
+                k += 1
+            if k == len(spans) or spans[k][0] >= row_end:
+                self._keep(kept, row, row_start, row_end, override)
+                continue
+            pieces: List[Tuple[int, int]] = []
+            position = row_start
+            has_inline_comment = False
+            j = k
+            while j < len(spans) and spans[j][0] < row_end:
+                comment_start, comment_end, is_inline = spans[j]
+                if comment_start > position:
+                    pieces.append((position, comment_start))
+                position = max(position, comment_end)
+                has_inline_comment = has_inline_comment or is_inline
+                if comment_end > row_end:
+                    break
+                j += 1
+            if position < row_end:
+                pieces.append((position, row_end))
+            clean_line = "".join(text[a:b] for a, b in pieces)
+            if has_inline_comment:
+                clean_line = clean_line.rstrip()
+            if not clean_line.strip():
+                continue
+            if len(pieces) == 1 and override is None:
+                self._keep(kept, row, pieces[0][0], pieces[0][0] + len(clean_line))
+            else:
+                self._keep(kept, row, row_start, row_end, clean_line)
+        self._replace_rows(kept)
+        block_comments = [_block_comment_text(text[start:end]) for start, end in scan.block_comments]
+        inline_comments = [text[start:end].strip() for start, end in scan.inline_comments]
+        return block_comments, inline_comments
+
+
+class LineRecords(Sequence):
+    """
+    Read-only sequence of `{"indent", "line", "line_no"}` dicts over a LineTable.
+
+    A row's dict is built on first access and the same object is returned afterwards,
+    so dicts taken from the view can be used as identities and placed in the output
+    tree. Build a new view after the table is stripped.
+    """
+
+    __slots__ = ("_table", "_cache")
+
+    def __init__(self, table: LineTable):
+        self._table = table
+        self._cache: Dict[int, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def _record(self, row: int) -> Dict[str, Any]:
+        record = self._cache.get(row)
+        if record is None:
+            record = self._cache[row] = self._table.record(row)
+        return record
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._record(row) for row in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("line table index out of range")
+        return self._record(index)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for row in range(len(self)):
+            yield self._record(row)
@@ -0,0 +1,127 @@
+"""
+Whole-word mapping rewrites compiled once per mapping table.
+
+`FormatSQL._apply_function_mappings` and `_apply_schema_mappings` used to
+compile `\\bKEY\\b` (case-insensitive) for every mapping entry and run one
+`sub` per entry, on every statement of every render. `MappingRewriter`
+compiles a table once and produces exactly the same text.
+
+How the legacy loop is reproduced:
+- Entries are applied in table order, and a replacement can be rewritten
+  again by later entries (for example `SUBSTR` runs before `DBMS_LOB.SUBSTR`).
+- Consecutive entries whose key is a plain ASCII word form one run. A
+  whole-word match of such a key is always one complete word token, so each
+  token can be rewritten on its own. The run becomes a single alternation
+  regex (longest key first) with a dict-lookup callback. That callback
+  rewrites the replacement recursively with the run's later entries only.
+- Any other entry (dotted names, operators, replacements containing a
+  backslash, non-ASCII keys) stays a separate precompiled `sub` step at its
+  original position, with the legacy template semantics and error handling.
+
+Usage:
+    rewriter = MappingRewriter([(oracle_func, postgres_func), ...], "function")
+    sql = rewriter.rewrite(sql)
+"""
+
+import re
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from utilities.common import debug
+
+# Keys that can share one alternation pass: plain ASCII word tokens
+_WORD_KEY = re.compile(r"[A-Za-z0-9_]+")
+
+
+class _WordRun:
+    """Consecutive plain-word entries rewritten with one compiled alternation."""
+
+    def __init__(self, entries: Sequence[Tuple[str, str]]):
+        self.keys: List[str] = [key for key, _ in entries]
+        self.replacements: List[str] = [replacement for _, replacement in entries]
+        self.key_patterns = [re.compile(r'\b' + re.escape(key) + r'\b', re.IGNORECASE) for key in self.keys]
+        # Lower-cased key -> entry positions in table order
+        self.positions: Dict[str, List[int]] = {}
+        for position, key in enumerate(self.keys):
+            self.positions.setdefault(key.lower(), []).append(position)
+        alternation = "|".join(re.escape(key) for key in sorted(set(self.keys), key=len, reverse=True))
+        self.pattern = re.compile(r'\b(?:' + alternation + r')\b', re.IGNORECASE)
+        self._memo: Dict[Tuple[str, int], str] = {}
+
+    def _first_position(self, token: str, start: int) -> Optional[int]:
+        """Return the first entry at or after `start` whose key matches the whole token."""
+        if token.isascii():
+            for position in self.positions.get(token.lower(), ()):
+                if position >= start:
+                    return position
+            return None
+        # Non-ASCII tokens can still match under Unicode case folding; ask the regex engine
+        for position in range(start, len(self.keys)):
+            if self.key_patterns[position].fullmatch(token):
+                return position
+        return None
+
+    def _rewrite_token(self, token: str, start: int) -> str:
+        """Rewrite one word token with the entries from `start` on, as the sequential loop would."""
+        memo_key = (token, start)
+        cached = self._memo.get(memo_key)
+        if cached is not None:
+            return cached
+        position = self._first_position(token, start)
+        if position is None:
+            result = token
+        else:
+            # Later entries of the run see the replacement, earlier ones already ran
+            result = self.pattern.sub(lambda match: self._rewrite_token(match.group(0), position + 1), self.replacements[position])
+        self._memo[memo_key] = result
+        return result
+
+    def apply(self, text: str) -> str:
+        return self.pattern.sub(lambda match: self._rewrite_token(match.group(0), 0), text)
+
+
+class _SingleEntry:
+    """One entry applied with its own precompiled pattern, exactly like the legacy loop."""
+
+    def __init__(self, key: str, replacement: str, label: str):
+        self.key = key
+        self.replacement = replacement
+        self.label = label
+        self.pattern = re.compile(r'\b' + re.escape(key) + r'\b', re.IGNORECASE)
+
+    def apply(self, text: str) -> str:
+        try:
+            return self.pattern.sub(self.replacement, text)
+        except Exception as e:
+            # Log the error and continue with next mapping
+            debug("Error applying %s mapping %s -> %s: %s", self.label, self.key, self.replacement, e)
+            return text
+
+
+class MappingRewriter:
+    """Apply an ordered list of whole-word, case-insensitive rewrites in as few passes as possible."""
+
+    def __init__(self, entries: Sequence[Tuple[str, str]], label: str = "function"):
+        """
+        Args:
+            entries (Sequence[Tuple[str, str]]): (key, replacement) pairs in application order
+            label (str): Mapping table name used in debug messages
+        """
+        self.steps: List[Callable[[str], str]] = []
+        run: List[Tuple[str, str]] = []
+        for key, replacement in entries:
+            key, replacement = str(key), str(replacement)
+            if _WORD_KEY.fullmatch(key) and "\\" not in replacement:
+                run.append((key, replacement))
+                continue
+            if run:
+                self.steps.append(_WordRun(run).apply)
+                run = []
+            self.steps.append(_SingleEntry(key, replacement, label).apply)
+        if run:
+            self.steps.append(_WordRun(run).apply)
+
+    def rewrite(self, text: str) -> str:
+        """Return `text` with every entry applied in order."""
+        for step in self.steps:
+            text = step(text)
+        return text
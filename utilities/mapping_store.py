@@ -0,0 +1,211 @@
+"""
+Process-wide cache of the Oracle → PostgreSQL mapping workbook.
+
+`utilities/oracle_postgresql_mappings.xlsx` used to be opened by every
+`FormatSQL` instance (once per sheet) and again by `OracleTriggerAnalyzer`
+through `ConfigManager.load_excel_mappings()`, for every file of every stage.
+`MappingStore` parses all sheets in one read, keeps them in memory, and
+reloads only when the workbook's mtime or size changes.
+
+A long conversion session (see `ConversionEngine`) can `pinned()` the cache:
+while pinned, lookups skip the mtime/size check and use the loaded workbook.
+`invalidate()` (called after the workbook is written) still forces a reload.
+
+Callers get read-only data:
+- `sheet()` / `sheets()` return copies of the cached DataFrames, so edits in
+  the UI never leak into the cache.
+- `mapping()`, `column()` and `view()` return immutable views
+  (`MappingProxyType`, tuples, frozensets) built once per workbook version.
+
+Usage:
+    func_mapping = MappingStore.mapping("function_mappings")
+    function_names = MappingStore.column("function_list", "function_name")
+"""
+
+import hashlib
+import os
+import threading
+from contextlib import contextmanager
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Hashable, Iterator, Mapping, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from utilities.common import debug, main_excel_file, warning, error
+
+
+class MappingStore:
+    """Mtime/size-invalidated in-memory cache of the mapping workbook sheets."""
+
+    EXCEL_MAPPING_PATH = main_excel_file
+    SHEETS = (
+        "data_type_mappings",
+        "function_mappings",
+        "function_list",
+        "exception_mappings",
+        "schema_mappings",
+        "statement_mappings",
+    )
+
+    _lock = threading.RLock()
+    _signature: Optional[Tuple[str, int, int]] = None
+    _frames: Dict[str, pd.DataFrame] = {}
+    _views: Dict[Hashable, Any] = {}
+    # Number of open pinned() blocks
+    _pins = 0
+
+    @classmethod
+    def _file_signature(cls) -> Optional[Tuple[str, int, int]]:
+        """Return (path, mtime_ns, size) of the workbook, or None if it does not exist."""
+        try:
+            stat = os.stat(cls.EXCEL_MAPPING_PATH)
+        except OSError:
+            return None
+        return (cls.EXCEL_MAPPING_PATH, stat.st_mtime_ns, stat.st_size)
+
+    @classmethod
+    def _refresh(cls) -> Dict[str, pd.DataFrame]:
+        """Reload the workbook if it changed since the last read and return the cached frames."""
+        if cls._pins and cls._signature is not None:
+            return cls._frames
+        signature = cls._file_signature()
+        with cls._lock:
+            if signature == cls._signature:
+                return cls._frames
+            frames: Dict[str, pd.DataFrame] = {}
+            if signature is not None:
+                try:
+                    workbook = pd.read_excel(cls.EXCEL_MAPPING_PATH, sheet_name=None)
+                    for sheet_name in cls.SHEETS:
+                        if sheet_name in workbook:
+                            frames[sheet_name] = workbook[sheet_name]
+                        else:
+                            warning("Could not load sheet %s: sheet not found", sheet_name)
+                    debug("Loaded %d mapping sheets from %s", len(frames), cls.EXCEL_MAPPING_PATH)
+                except Exception as e:
+                    error("Error loading Excel mappings: %s", str(e))
+                    # Do not remember the signature so the next access retries the read
+                    cls._signature, cls._frames, cls._views = None, {}, {}
+                    return cls._frames
+            cls._signature, cls._frames, cls._views = signature, frames, {}
+            return cls._frames
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Drop the cached workbook so the next access reads it again (call after writing it)."""
+        with cls._lock:
+            cls._signature, cls._frames, cls._views = None, {}, {}
+
+    @classmethod
+    @contextmanager
+    def pinned(cls) -> Iterator[None]:
+        """
+        Use the loaded workbook without checking its mtime and size on every lookup.
+
+        Pins nest. The workbook is loaded (or reloaded if it changed) on entry.
+        """
+        cls._refresh()
+        with cls._lock:
+            cls._pins += 1
+        try:
+            yield
+        finally:
+            with cls._lock:
+                cls._pins -= 1
+
+    @classmethod
+    def exists(cls) -> bool:
+        """Return True if the mapping workbook exists on disk."""
+        if cls._pins and cls._signature is not None:
+            return True
+        return cls._file_signature() is not None
+
+    @classmethod
+    def sheets(cls) -> Dict[str, pd.DataFrame]:
+        """Return copies of all loaded sheets keyed by sheet name."""
+        return {name: frame.copy() for name, frame in cls._refresh().items()}
+
+    @classmethod
+    def sheet(cls, sheet_name: str) -> pd.DataFrame:
+        """Return a copy of one sheet, or an empty DataFrame if it is not available."""
+        frame = cls._refresh().get(sheet_name)
+        return frame.copy() if frame is not None else pd.DataFrame()
+
+    @classmethod
+    def view(cls, key: Hashable, builder: Callable[[Mapping[str, pd.DataFrame]], Any]) -> Any:
+        """
+        Return a derived view of the workbook, building it once per workbook version.
+
+        Args:
+            key (Hashable): Cache key identifying the view
+            builder (Callable): Receives the cached frames (read-only) and returns an
+                immutable value (MappingProxyType, tuple, frozenset, ...)
+
+        Returns:
+            Any: The cached view. Exceptions raised by the builder propagate and nothing is cached.
+        """
+        frames = cls._refresh()
+        with cls._lock:
+            if frames is cls._frames and key in cls._views:
+                return cls._views[key]
+        value = builder(MappingProxyType(frames))
+        with cls._lock:
+            if frames is cls._frames:
+                cls._views[key] = value
+        return value
+
+    @classmethod
+    def mapping(cls, sheet_name: str) -> Optional[Mapping[Any, Any]]:
+        """
+        Return a read-only key → value mapping built from the first two columns of a sheet.
+
+        `Oracle_Type`/`PostgreSQL_Type` are used when present. Rows with empty keys or
+        values are dropped.
+
+        Args:
+            sheet_name (str): Name of the sheet
+
+        Returns:
+            Optional[Mapping[Any, Any]]: The mapping, or None if the sheet is missing or
+            has fewer than two columns
+        """
+        def build(frames: Mapping[str, pd.DataFrame]) -> Optional[Mapping[Any, Any]]:
+            df = frames.get(sheet_name)
+            if df is None or len(df.columns) < 2:
+                return None
+            if 'Oracle_Type' in df.columns and 'PostgreSQL_Type' in df.columns:
+                mapping_dict = dict(zip(df['Oracle_Type'], df['PostgreSQL_Type']))
+            else:
+                mapping_dict = dict(zip(df.iloc[:, 0], df.iloc[:, 1]))
+            mapping_dict = {k: v for k, v in mapping_dict.items() if k is not None and v is not None and str(k).strip() and str(v).strip()}
+            return MappingProxyType(mapping_dict)
+        return cls.view(("mapping", sheet_name), build)
+
+    @classmethod
+    def column(cls, sheet_name: str, column_name: str) -> Tuple[Any, ...]:
+        """
+        Return the values of one column of a sheet, in row order, as a tuple.
+
+        Raises:
+            KeyError: If the sheet or column does not exist
+        """
+        def build(frames: Mapping[str, pd.DataFrame]) -> Tuple[Any, ...]:
+            return tuple(frames[sheet_name][column_name].tolist())
+        return cls.view(("column", sheet_name, column_name), build)
+
+    @classmethod
+    def fingerprint(cls, sheet_names: Sequence[str]) -> str:
+        """
+        Return a content hash of the given sheets (missing sheets hash as empty).
+
+        Used by the build cache to key stage outputs on the mappings they depend on.
+        """
+        def build(frames: Mapping[str, pd.DataFrame]) -> str:
+            digest = hashlib.sha256()
+            for sheet_name in sheet_names:
+                digest.update(sheet_name.encode("utf-8"))
+                frame = frames.get(sheet_name)
+                if frame is not None:
+                    digest.update(frame.to_csv(index=False).encode("utf-8"))
+            return digest.hexdigest()
+        return cls.view(("fingerprint", tuple(sheet_names)), build)
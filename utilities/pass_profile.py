@@ -0,0 +1,120 @@
+"""
+Per-pass timings of the analyzer and the renderer, for finding slow files.
+
+OracleTriggerAnalyzer only logged its total init time (`time.time()`), and
+FormatSQL logged coarse phase timings at debug level. When one trigger took
+much longer than the others, nothing showed which pass was responsible.
+
+- `PassProfile` records `perf_counter_ns` spans by name. A name used twice
+  adds up, and spans keep the order in which they were first recorded.
+- `tree_profile()` counts the nodes and line dicts of a statement tree and
+  its maximum nesting depth, with the explicit-stack walk of tree_walker.
+- `slowest_files()` ranks per-file profiles for the run report of main.py.
+
+OracleTriggerAnalyzer.to_json() writes its profile to `metadata.profile`.
+FormatSQL.to_sql() returns the render profile next to the SQL.
+
+Usage:
+    profile = PassProfile()
+    with profile.span("strip_comments"):
+        strip_comments()
+    analysis["metadata"]["profile"] = profile.to_dict(**tree_profile(main))
+    for file_name, total_ns, profiles in slowest_files(file_profiles, top_n=10):
+        ...
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Mapping, Tuple
+
+from utilities.tree_walker import child_items, is_node
+
+
+class PassProfile:
+    """Named `perf_counter_ns` spans of one analysis or render."""
+
+    __slots__ = ("spans_ns", "start_ns")
+
+    def __init__(self):
+        self.spans_ns: Dict[str, int] = {}
+        self.start_ns = time.perf_counter_ns()
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Time the body of a `with` block and add it to the span `name`."""
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter_ns() - start)
+
+    def add(self, name: str, duration_ns: int) -> None:
+        """Add `duration_ns` nanoseconds to the span `name`."""
+        self.spans_ns[name] = self.spans_ns.get(name, 0) + duration_ns
+
+    def to_dict(self, **extra: Any) -> Dict[str, Any]:
+        """
+        Return the profile as a JSON-serializable dict.
+
+        Args:
+            **extra: Further entries (node counts, for example)
+
+        Returns:
+            Dict[str, Any]: total_ns (time since the profile was created), spans_ns and extra
+        """
+        return {"total_ns": time.perf_counter_ns() - self.start_ns, "spans_ns": dict(self.spans_ns), **extra}
+
+
+def tree_profile(root: Any) -> Dict[str, int]:
+    """
+    Count the nodes and line dicts of a statement tree and measure its nesting depth.
+
+    Args:
+        root (Any): A node (or its dict form), a line dict or a list of items
+
+    Returns:
+        Dict[str, int]: node_count, line_count (line dicts left in the tree) and max_depth
+            (1 for a node without nested nodes, 0 for a tree without nodes)
+    """
+    node_count = line_count = max_depth = 0
+    # (item, depth of the nodes around it)
+    stack: List[Tuple[Any, int]] = [(root, 0)]
+    while stack:
+        item, depth = stack.pop()
+        if isinstance(item, list):
+            stack.extend((child, depth) for child in item)
+        elif is_node(item):
+            node_count += 1
+            depth += 1
+            max_depth = max(max_depth, depth)
+            stack.extend((child, depth) for child in child_items(item))
+        elif isinstance(item, dict) and "line" in item:
+            line_count += 1
+    return {"node_count": node_count, "line_count": line_count, "max_depth": max_depth}
+
+
+def slowest_files(file_profiles: Mapping[str, Mapping[str, Dict[str, Any]]], top_n: int = 10) -> List[Tuple[str, int, Mapping[str, Dict[str, Any]]]]:
+    """
+    Rank files by the sum of their profiles' total_ns.
+
+    Args:
+        file_profiles (Mapping[str, Mapping[str, Dict[str, Any]]]): File name -> stage
+            name ("analysis", "render", ...) -> profile dict
+        top_n (int): Number of files to return
+
+    Returns:
+        List[Tuple[str, int, Mapping[str, Dict[str, Any]]]]: (file name, total ns, profiles),
+            slowest first
+    """
+    ranked = [
+        (file_name, sum(profile.get("total_ns", 0) for profile in profiles.values()), profiles)
+        for file_name, profiles in file_profiles.items()
+    ]
+    ranked.sort(key=lambda entry: entry[1], reverse=True)
+    return ranked[:max(0, top_n)]
+
+
+def top_spans(profile: Mapping[str, Any], count: int = 3) -> List[Tuple[str, int]]:
+    """Return the `count` longest (span name, ns) pairs of a profile dict, longest first."""
+    spans = profile.get("spans_ns", {})
+    return sorted(spans.items(), key=lambda span: span[1], reverse=True)[:count]
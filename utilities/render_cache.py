@@ -0,0 +1,187 @@
+"""
+Opt-in cache of rendered statement subtrees for FormatSQL.
+
+The same statement subtrees are rendered over and over. JSONTOPLJSON splits a
+trigger into on_insert / on_update / on_delete trees that share most of
+their blocks. Each tree is rendered once to prune its declarations and once
+more to PostgreSQL by the format step. Boilerplate blocks repeat across the
+triggers of a corpus. `RenderCache` keeps the lines a subtree rendered to, so
+an identical subtree is written again without being rendered:
+
+- `structural_hashes()` digests every node of a tree bottom-up (one walk).
+  Line numbers and source indentation (`*_line_no`, `*_indent` fields) are
+  left out, since they do not change the rendered SQL. Identical blocks at
+  different places of the source therefore share one digest.
+- An entry is keyed by (digest, kind, db_type, indent level, indent unit,
+  mapping version). It holds the rendered lines plus the json_convert_sql
+  counts the render added, which are replayed on a hit.
+- `mapping_version()` changes when a renderer brings mappings that differ
+  from the previous ones. Entries of older versions are dropped then.
+- Entries are evicted least recently used once their lines exceed
+  `max_lines`.
+
+The cache is off unless set: `FormatSQL.render_cache` for the process, or
+`FormatSQL(analysis, render_cache=...)` for one renderer. `stats()` reports
+hits, misses and the hit rate.
+
+Usage:
+    FormatSQL.render_cache = RenderCache()
+    sql = FormatSQL(analysis).to_sql("PostgreSQL")["sql"]
+    info("Render cache hit rate: %.1f%%", FormatSQL.render_cache.stats()["hit_rate"] * 100)
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Mapping, Optional, Sequence, Tuple
+
+from utilities.tree_walker import child_items, is_node
+
+# Rendered lines budget of one cache (about 100 bytes per line)
+DEFAULT_MAX_LINES = 200_000
+# Node fields that only record where the node was in the source
+POSITION_SUFFIXES = ("_line_no", "_indent")
+
+# (rendered lines, (json_convert_sql key, count added) pairs)
+RenderEntry = Tuple[Tuple[str, ...], Tuple[Tuple[str, int], ...]]
+
+
+def _node_digest(node: Any, digests: Dict[int, bytes]) -> bytes:
+    """Digest one node from its own fields and the digests of its child nodes."""
+    digest = hashlib.blake2b(digest_size=16)
+    for key, value in node.items():
+        if key.endswith(POSITION_SUFFIXES):
+            continue
+        digest.update(key.encode("utf-8"))
+        if isinstance(value, list):
+            digest.update(b"=[")
+            for element in value:
+                child = digests.get(id(element)) if is_node(element) else None
+                if child is not None:
+                    digest.update(b"#")
+                    digest.update(child)
+                else:
+                    digest.update(repr(element).encode("utf-8"))
+                digest.update(b",")
+            digest.update(b"]")
+        else:
+            digest.update(b"=")
+            digest.update(repr(value).encode("utf-8"))
+        digest.update(b";")
+    return digest.digest()
+
+
+def structural_hashes(root: Any) -> Dict[int, bytes]:
+    """
+    Digest every node of a tree by its structure, children before parents.
+
+    Args:
+        root (Any): A node (or its dict form) or a list of items
+
+    Returns:
+        Dict[int, bytes]: id() of each node -> 16-byte digest (valid while the tree is alive)
+    """
+    digests: Dict[int, bytes] = {}
+    # (item, children already pushed)
+    stack: List[Tuple[Any, bool]] = [(root, False)]
+    while stack:
+        item, expanded = stack.pop()
+        if isinstance(item, list):
+            stack.extend((child, False) for child in item)
+        elif expanded:
+            digests[id(item)] = _node_digest(item, digests)
+        elif is_node(item):
+            stack.append((item, True))
+            stack.extend((child, False) for child in child_items(item))
+    return digests
+
+
+class RenderCache:
+    """LRU cache of rendered subtrees, with hit-rate statistics."""
+
+    def __init__(self, max_lines: int = DEFAULT_MAX_LINES):
+        """
+        Args:
+            max_lines (int): Rendered lines kept before the least recently used entries
+                are evicted
+        """
+        self.max_lines = max_lines
+        self._entries: "OrderedDict[Hashable, RenderEntry]" = OrderedDict()
+        self._lines = 0
+        self._lock = threading.Lock()
+        self._mappings: Tuple[Mapping[str, str], ...] = ()
+        self._mapping_version = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def mapping_version(self, mappings: Sequence[Mapping[str, str]]) -> int:
+        """
+        Return the version number of a renderer's mappings, to put in its cache keys.
+
+        The version goes up (and older entries are dropped) when the mappings differ
+        from those of the previous call, by identity and then by content.
+        """
+        mappings = tuple(mappings)
+        with self._lock:
+            if len(mappings) != len(self._mappings) or any(a is not b for a, b in zip(mappings, self._mappings)):
+                if mappings != self._mappings:
+                    self._mapping_version += 1
+                    self._entries.clear()
+                    self._lines = 0
+                self._mappings = mappings
+            return self._mapping_version
+
+    def get(self, key: Hashable) -> Optional[RenderEntry]:
+        """Return the entry of a key (counting a hit or a miss), or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Hashable, lines: Tuple[str, ...], counts: Tuple[Tuple[str, int], ...]) -> None:
+        """Store the lines and json_convert_sql counts a subtree rendered to."""
+        if len(lines) > self.max_lines:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._lines -= len(previous[0])
+            self._entries[key] = (lines, counts)
+            self._lines += len(lines)
+            while self._lines > self.max_lines:
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self._lines -= len(evicted)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._lines = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return the cache statistics.
+
+        Returns:
+            Dict[str, Any]: hits, misses, lookups, hit_rate (0.0 without lookups), entries,
+            lines (rendered lines held), evictions and mapping_version
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "lookups": lookups,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "lines": self._lines,
+                "evictions": self.evictions,
+                "mapping_version": self._mapping_version,
+            }
@@ -0,0 +1,135 @@
+"""
+Append-only sink for the "rest strings" collected by OracleTriggerAnalyzer.
+
+Rest strings are the source lines the parser could not place in any
+statement. They end up in `utilities/rest_list.csv` for review in the Rest
+List Manager page. The analyzer used to read the whole CSV, concatenate the
+new rows and rewrite the file after every parsed file, which is quadratic in
+the number of rows of a batch. `RestStringSink` buffers rows in memory and
+appends them to the CSV in one write when flushed.
+
+Flushing:
+- `process_files` in main.py flushes at the end of every stage.
+- `load()` flushes first, so readers always see every collected row.
+- An `atexit` hook flushes anything still buffered when the process ends.
+- The buffer also flushes itself once it holds `MAX_BUFFERED_ROWS` rows.
+
+Usage:
+    RestStringSink.append(rows)
+    RestStringSink.flush()
+    df = RestStringSink.load()
+"""
+
+import atexit
+import csv
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from utilities.common import debug, error
+
+
+class RestStringSink:
+    """Buffered, append-only writer (and reader) for utilities/rest_list.csv."""
+
+    PATH = "utilities/rest_list.csv"
+    COLUMNS = ["filename", "line", "line_no", "indent"]
+    MAX_BUFFERED_ROWS = 50000
+
+    _buffer: List[Dict[str, Any]] = []
+    _lock = threading.RLock()
+
+    @classmethod
+    def append(cls, rows: Iterable[Dict[str, Any]]) -> None:
+        """
+        Buffer rest-string rows for the next flush.
+
+        Args:
+            rows (Iterable[Dict[str, Any]]): Rest string items ("filename", "line", "line_no", "indent")
+        """
+        with cls._lock:
+            cls._buffer.extend(rows)
+            if len(cls._buffer) >= cls.MAX_BUFFERED_ROWS:
+                cls.flush()
+
+    @classmethod
+    def _file_columns(cls) -> Optional[List[str]]:
+        """Return the header of the CSV file, or None if the file is missing or empty."""
+        if not os.path.exists(cls.PATH):
+            return None
+        with open(cls.PATH, "r", encoding="utf-8", newline="") as f:
+            header = next(csv.reader(f), None)
+        return header or None
+
+    @classmethod
+    def flush(cls) -> int:
+        """
+        Append all buffered rows to the CSV file in one write.
+
+        Returns:
+            int: Number of rows written
+        """
+        with cls._lock:
+            if not cls._buffer:
+                return 0
+            rows, cls._buffer = cls._buffer, []
+            try:
+                columns = cls._file_columns()
+                if columns is None:
+                    columns = list(cls.COLUMNS)
+                    write_header = True
+                else:
+                    write_header = False
+                    missing = [column for column in cls.COLUMNS if column not in columns]
+                    if missing:
+                        # Older files were created with fewer columns; widen the header once
+                        existing = pd.read_csv(cls.PATH, header=0, index_col=None)
+                        columns = columns + missing
+                        existing.reindex(columns=columns).to_csv(cls.PATH, mode='w', index=False)
+                with open(cls.PATH, "a", encoding="utf-8", newline="") as f:
+                    writer = csv.DictWriter(f, fieldnames=columns, restval="", extrasaction="ignore", lineterminator="\n")
+                    if write_header:
+                        writer.writeheader()
+                    writer.writerows(rows)
+                debug("Appended %d rest strings to %s", len(rows), cls.PATH)
+                return len(rows)
+            except Exception as e:
+                # Keep the rows so a later flush can retry
+                cls._buffer = rows + cls._buffer
+                error("Error writing rest list: %s", str(e))
+                raise
+
+    @classmethod
+    def reset(cls) -> None:
+        """Drop buffered rows and recreate the CSV file with only the header."""
+        with cls._lock:
+            cls._buffer = []
+            pd.DataFrame(columns=cls.COLUMNS).to_csv(cls.PATH, mode='w', index=False)
+
+    @classmethod
+    def load(cls) -> Optional[pd.DataFrame]:
+        """Flush pending rows and return the whole rest list, or None if the file does not exist."""
+        with cls._lock:
+            cls.flush()
+            if not os.path.exists(cls.PATH):
+                return None
+            return pd.read_csv(cls.PATH)
+
+    @classmethod
+    def save(cls, dataframe: pd.DataFrame) -> None:
+        """Replace the rest list with `dataframe`, discarding buffered rows."""
+        with cls._lock:
+            cls._buffer = []
+            dataframe.to_csv(cls.PATH, index=False)
+
+
+def _flush_at_exit() -> None:
+    try:
+        RestStringSink.flush()
+    except Exception:
+        pass
+
+
+atexit.register(_flush_at_exit)
@@ -0,0 +1,352 @@
+"""
+Single-pass parser engine for OracleTriggerAnalyzer.
+
+The legacy engine groups the main section with eight successive passes
+(BEGIN/END, WITH, CASE, IF, FOR, function calls, SQL statements). Each pass
+re-walks the whole partially built tree and reloads the Excel mappings on
+every recursive call. This engine builds the same ``main`` structure in one
+recursive descent:
+
+1. Every structured line is tokenized once. Its stripped upper-case text and
+   the block kinds it can open are computed up front; the function-call and
+   statement-type matches and the parenthesis delta only when a scan asks.
+2. Each statement list is scanned left to right. When a line opens a block,
+   the scan looks ahead for the block's closer. On the way it groups every
+   block of a higher-precedence kind (one an earlier legacy pass would already
+   have grouped), so those lines are hidden from the closer search exactly
+   as they were in the legacy engine.
+3. Nodes are still built by the analyzer's own ``_parse_*``
+   helpers, so ``to_json()`` output is identical to the legacy engine.
+
+The engine is experimental. It scales linearly with the trigger size but is
+about as fast as the legacy engine, not faster, so "legacy" stays the default.
+
+Usage:
+    analyzer = OracleTriggerAnalyzer(path, parser_engine="single_pass")
+    python main.py --parser-engine single_pass
+"""
+
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from utilities.ast_nodes import BeginEnd
+from utilities.common import debug
+from utilities.line_matchers import FunctionCallMatcher, StatementTypeMatcher
+
+# Block kinds in legacy pass order. A lower value means an earlier pass, and
+# blocks of an earlier pass are grouped before later passes look at the lines.
+BEGIN_KIND = 0
+WITH_KIND = 1
+CASE_KIND = 2
+IF_KIND = 3
+FOR_KIND = 4
+CALL_KIND = 5
+SQL_KIND = 6
+ALL_KINDS: FrozenSet[int] = frozenset(range(7))
+NO_LIMIT = len(ALL_KINDS)
+# Not matched yet (LineToken.function_name / stmt_type)
+_UNSET = object()
+
+
+class LineToken:
+    """Per-line facts computed once during tokenization."""
+
+    __slots__ = ("upper", "indent", "ends_semicolon", "opens", "_line_no", "_paren_delta_of", "_paren_delta", "_matchers", "_function_name", "_stmt_type")
+
+    def __init__(
+        self,
+        item: Dict[str, Any],
+        function_matcher: FunctionCallMatcher,
+        statement_matcher: StatementTypeMatcher,
+        paren_delta_of: Callable[[int], int],
+    ):
+        text = item["line"].strip()
+        upper = text.upper()
+        self.upper = upper
+        self.indent = item["indent"]
+        self.ends_semicolon = upper.endswith(";")
+        # Parenthesis nesting change, looked up in the analyzer's SqlScan when a WITH needs it
+        self._line_no = item["line_no"]
+        self._paren_delta_of = paren_delta_of
+        self._paren_delta: Any = _UNSET
+        # The called function and statement type are matched on first use: lines inside
+        # a call or statement are scanned with a limit below those kinds and never need them
+        self._matchers = (function_matcher, statement_matcher)
+        self._function_name: Any = _UNSET
+        self._stmt_type: Any = _UNSET
+
+        opens = []
+        if upper.startswith("BEGIN"):
+            opens.append(BEGIN_KIND)
+        if upper.startswith("WITH ") or upper == "WITH":
+            opens.append(WITH_KIND)
+        if upper.startswith("CASE"):
+            opens.append(CASE_KIND)
+        if upper.startswith("IF ") or upper == "IF":
+            opens.append(IF_KIND)
+        if upper.startswith("FOR"):
+            opens.append(FOR_KIND)
+        # Block kinds only; CALL_KIND and SQL_KIND follow from function_name / stmt_type
+        self.opens: Tuple[int, ...] = tuple(opens)
+
+    @property
+    def paren_delta(self) -> int:
+        """Parenthesis nesting change of the line outside comments and literals."""
+        if self._paren_delta is _UNSET:
+            self._paren_delta = self._paren_delta_of(self._line_no)
+        return self._paren_delta
+
+    @property
+    def function_name(self) -> Optional[str]:
+        """The called function, resolved the way the legacy passes do (None if not a call)."""
+        if self._function_name is _UNSET:
+            upper = self.upper
+            function_name = self._matchers[0].match(upper)
+            if function_name is not None:
+                if "CALL " in upper:
+                    function_name = "CALL " + function_name
+                elif "PERFORM " in upper:
+                    function_name = "PERFORM " + function_name
+            self._function_name = function_name
+        return self._function_name
+
+    @property
+    def stmt_type(self) -> Optional[str]:
+        """The statement type of the line ("assignment" for :=), or None."""
+        if self._stmt_type is _UNSET:
+            stmt_type = self._matchers[1].match(self.upper)
+            if stmt_type is None and ":=" in self.upper:
+                stmt_type = "assignment"
+            self._stmt_type = stmt_type
+        return self._stmt_type
+
+
+class SinglePassParser:
+    """
+    Build ``main_section_lines`` for an OracleTriggerAnalyzer in one descent.
+
+    Every statement list is scanned with the set of block kinds the legacy
+    passes would still apply to it. Blocks found while looking for a closer
+    are kept as "shells" whose child lists are parsed only once the shell's
+    final position in the tree is known, because that position decides which
+    passes the legacy engine would have run on its children.
+    """
+
+    def __init__(self, analyzer):
+        self.analyzer = analyzer
+        self.function_matcher = analyzer.function_call_matcher()
+        self.statement_matcher = analyzer.statement_type_matcher()
+        self._tokens: Dict[int, LineToken] = {}
+        # id(node) -> [node, kind, kinds applied at outer levels before it was nested]
+        self._shells: Dict[int, list] = {}
+        self._raised: List[Tuple[int, str]] = []
+        # id(statement list) -> (list, BlockIndex.positions of it); the list is kept so its id stays unique
+        self._positions: Dict[int, Tuple[List[Dict[str, Any]], Dict[int, int]]] = {}
+
+    def parse(self) -> None:
+        """Group the analyzer's main section into the nested statement tree."""
+        analyzer = self.analyzer
+        line_paren_delta = analyzer.sql_scan.line_paren_delta
+        for item in analyzer.structured_lines:
+            self._tokens[id(item)] = LineToken(item, self.function_matcher, self.statement_matcher, line_paren_delta)
+        debug("Single-pass parser tokenized %d lines", len(self._tokens))
+
+        known_exceptions = dict(analyzer.found_exception_names)
+        analyzer._parse_begin_blocks()
+        main = analyzer.main_section_lines
+        main["begin_end_statements"] = self._parse_list(main["begin_end_statements"], ALL_KINDS)
+        for handler in main["exception_handlers"]:
+            handler["exception_statements"] = self._parse_list(handler["exception_statements"], ALL_KINDS)
+
+        # Statements are grouped depth-first, so re-apply source order to keep
+        # the exception names in the order the legacy SQL pass found them
+        for _, name in sorted(self._raised, key=lambda raised: raised[0]):
+            if name and name not in known_exceptions:
+                known_exceptions[name] = analyzer.found_exception_names[name]
+        analyzer.found_exception_names.clear()
+        analyzer.found_exception_names.update(known_exceptions)
+        self._shells.clear()
+        self._tokens.clear()
+        self._positions.clear()
+
+    def _parse_list(self, items: List[Dict[str, Any]], kinds: FrozenSet[int]) -> List[Dict[str, Any]]:
+        """Group one statement list and parse the children of every block in it."""
+        level, _ = self._scan(items, 0, kinds, NO_LIMIT)
+        for item in level:
+            shell = self._shells.pop(id(item), None)
+            if shell is not None:
+                self._parse_children(shell, kinds)
+        return level
+
+    def _parse_children(self, shell: list, list_kinds: FrozenSet[int]) -> None:
+        """Parse the child lists of a grouped block with the passes that reach them."""
+        node, kind, applied = shell
+        kinds = frozenset(k for k in list_kinds | applied if k >= kind)
+        if kind == BEGIN_KIND:
+            node["begin_end_statements"] = self._parse_list(node["begin_end_statements"], kinds)
+            for handler in node["exception_handlers"]:
+                handler["exception_statements"] = self._parse_list(handler["exception_statements"], kinds - {BEGIN_KIND})
+        elif kind == CASE_KIND:
+            for when_clause in node["when_clauses"]:
+                when_clause["then_statements"] = self._parse_list(when_clause["then_statements"], kinds)
+            node["else_statements"] = self._parse_list(node["else_statements"], kinds)
+        elif kind == IF_KIND:
+            node["then_statements"] = self._parse_list(node["then_statements"], kinds)
+            for elif_clause in node["if_elses"]:
+                elif_clause["then_statements"] = self._parse_list(elif_clause["then_statements"], kinds)
+            node["else_statements"] = self._parse_list(node["else_statements"], kinds)
+        elif kind == FOR_KIND:
+            node["for_statements"] = self._parse_list(node["for_statements"], kinds - {FOR_KIND})
+
+    def _opener_kind(self, token: LineToken, kinds: FrozenSet[int], limit: int) -> Optional[int]:
+        """Return the first kind below ``limit`` in ``kinds`` that the line opens, or None."""
+        for kind in token.opens:
+            if kind >= limit:
+                return None
+            if kind in kinds:
+                return kind
+        if limit <= CALL_KIND:
+            return None
+        if CALL_KIND in kinds and token.function_name is not None:
+            return CALL_KIND
+        if limit > SQL_KIND and SQL_KIND in kinds and token.stmt_type is not None:
+            return SQL_KIND
+        return None
+
+    def _scan(
+        self,
+        items: List[Dict[str, Any]],
+        start: int,
+        kinds: FrozenSet[int],
+        limit: int,
+        stop: Optional[Callable[[LineToken], bool]] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Group items[start:] into one level, considering only kinds below ``limit``.
+
+        When ``stop`` is given, the scan ends at the first ungrouped line it
+        accepts. Returns the grouped level and the index of that line, or None
+        when the scan ran off the end of the list.
+        """
+        level = []
+        drop_from = NO_LIMIT
+        i = start
+        while i < len(items):
+            item = items[i]
+            if "line" not in item:
+                level.append(item)
+                i += 1
+                continue
+            token = self._tokens[id(item)]
+            kind = self._opener_kind(token, kinds, limit)
+            if kind is None or kind >= drop_from:
+                # An unterminated call/statement swallows every later line of its pass
+                if drop_from != NO_LIMIT:
+                    i += 1
+                    continue
+                if stop is not None and stop(token):
+                    return level, i
+                level.append(item)
+                i += 1
+                continue
+            node, next_i = self._group(items, i, kind, kinds)
+            if node is not None:
+                level.append(node)
+            elif kind == BEGIN_KIND:
+                # An unterminated BEGIN swallows the rest of the list
+                break
+            elif kind == CALL_KIND or (kind == SQL_KIND and token.stmt_type != "assignment"):
+                drop_from = kind
+            i = next_i
+        return level, None
+
+    def _group(self, items: List[Dict[str, Any]], i: int, kind: int, kinds: FrozenSet[int]) -> Tuple[Optional[Dict[str, Any]], int]:
+        """Group the block opened at items[i]; returns (node or None, next index)."""
+        analyzer = self.analyzer
+        opener = items[i]
+        token = self._tokens[id(opener)]
+
+        if kind == BEGIN_KIND:
+            return self._group_begin(items, i)
+
+        if kind == WITH_KIND:
+            if token.paren_delta == 0:
+                return analyzer._parse_with_statement([opener]), i + 1
+            depth = [token.paren_delta]
+
+            def stop(line: LineToken) -> bool:
+                depth[0] += line.paren_delta
+                return line.indent == token.indent and depth[0] == 0
+        elif kind == CASE_KIND:
+            def stop(line: LineToken) -> bool:
+                return line.upper.startswith("END CASE;") and line.indent == token.indent
+        elif kind == IF_KIND:
+            def stop(line: LineToken) -> bool:
+                return line.upper.startswith("END IF;") and line.indent == token.indent
+        elif kind == FOR_KIND:
+            def stop(line: LineToken) -> bool:
+                return line.upper.startswith("END LOOP;") and line.indent == token.indent
+        else:
+            if token.ends_semicolon:
+                return self._build_statement([opener], kind, token), i + 1
+
+            def stop(line: LineToken) -> bool:
+                return line.ends_semicolon
+
+        inner, end = self._scan(items, i + 1, kinds, kind, stop)
+        if end is None:
+            return None, i + 1
+        view = [opener] + inner + [items[end]]
+        for item in inner:
+            shell = self._shells.get(id(item))
+            if shell is not None:
+                shell[2] = shell[2] | frozenset(k for k in kinds if shell[1] <= k < kind)
+
+        if kind == WITH_KIND:
+            node = analyzer._parse_with_statement(view)
+        elif kind == CASE_KIND:
+            node = analyzer._parse_case_when_statements(view)
+        elif kind == IF_KIND:
+            node = analyzer._parse_if_else_statements(view)
+        elif kind == FOR_KIND:
+            node = analyzer._parse_for_loop_statement(view)
+        else:
+            return self._build_statement(view, kind, token), end + 1
+        if kind != WITH_KIND:
+            self._shells[id(node)] = [node, kind, frozenset()]
+        return node, end + 1
+
+    def _group_begin(self, items: List[Dict[str, Any]], begin_i: int) -> Tuple[Optional[Dict[str, Any]], int]:
+        """Group a nested BEGIN ... [EXCEPTION ...] END; block."""
+        opener = items[begin_i]
+        block_index = self.analyzer.block_index
+        # A list with many BEGIN blocks is indexed once, not once per block
+        cached = self._positions.get(id(items))
+        if cached is None:
+            cached = self._positions[id(items)] = (items, block_index.positions(items))
+        positions = cached[1]
+        i = block_index.find_closer("BEGIN", items, begin_i, positions)
+        if i == -1:
+            return None, len(items)
+        exception_points = block_index.split_points(("EXCEPTION",), opener["indent"], positions, opener["line_no"], items[i]["line_no"])
+        exception_i = exception_points[-1][0] if exception_points else -1
+        node = BeginEnd(
+            begin_line_no=opener["line_no"],
+            begin_indent=opener["indent"],
+            begin_end_statements=items[begin_i + 1 : exception_i] if exception_i != -1 else items[begin_i + 1 : i],
+            exception_handlers=self.analyzer._parse_exception_handlers(items[exception_i + 1 : i]) if exception_i != -1 else [],
+            exception_line_no=items[exception_i]["line_no"] if exception_i != -1 else -1,
+            end_line_no=items[i]["line_no"],
+        )
+        self._shells[id(node)] = [node, BEGIN_KIND, frozenset()]
+        return node, i + 1
+
+    def _build_statement(self, view: List[Dict[str, Any]], kind: int, token: LineToken) -> Dict[str, Any]:
+        analyzer = self.analyzer
+        if kind == CALL_KIND:
+            return analyzer._parse_function_calling(view, token.function_name)
+        if token.stmt_type == "assignment":
+            return analyzer._parse_assignment_statement(view)
+        statement = analyzer._parse_sql_statement(view, token.stmt_type)
+        if token.stmt_type == "raise_statement":
+            self._raised.append((statement["statement_line_no"], statement["exception_name"]))
+        return statement
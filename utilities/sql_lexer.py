@@ -0,0 +1,234 @@
+"""
+One-pass, literal-aware lexer for Oracle PL/SQL trigger text.
+
+The analyzer used to scan the same text several times, one character at a
+time. The block-comment pass built the clean line char by char, the
+inline-comment pass ran a separate `find("--")`, the WITH pass counted
+parentheses per line, and the parameter helpers walked the parameter text
+again. None of these passes knew about string literals.
+
+`scan_sql()` walks the trigger once, jumping from one interesting token to
+the next with a compiled regex (`--`, `/*`, quotes and parentheses). It
+records:
+
+- `block_comments` / `inline_comments`: comment spans. A `--` or `/*`
+  inside a string literal or quoted identifier does not start a comment,
+  and a `/*` after `--` is part of the inline comment.
+- `literals`: spans of '...' strings (with '' escapes), q'[...]' strings
+  and "..." identifiers. Quotes inside comments are ignored.
+- parenthesis positions outside comments and literals, so
+  `line_paren_delta()` gives the nesting change of any source line.
+
+The same literal rules back `find_matching_paren`, `split_top_level` and
+`find_top_level`. These work on text assembled from several lines (e.g.
+function call parameters), where source offsets no longer apply.
+
+Usage:
+    scan = scan_sql(sql_content)
+    scan.line_paren_delta(12)
+    split_top_level("1, 'a,b', f(x, y)")  # ['1', "'a,b'", 'f(x, y)']
+"""
+
+import re
+from array import array
+from bisect import bisect_left
+from typing import Iterator, List, Tuple
+
+# Line boundaries recognised by str.splitlines()
+LINE_BREAK = re.compile("\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+
+# Start of a q-quoted literal (q'[...]', nq'{...}'); not part of a longer identifier
+_Q_QUOTE = r"(?<![\w$#])[nN]?[qQ]'"
+# Tokens the trigger scan stops at; everything in between is skipped in one jump
+_SQL_STOP = re.compile(r"--|/\*|" + _Q_QUOTE + r"|['\"()]")
+# Tokens the expression helpers stop at (no comments: they run on comment-free text)
+_EXPRESSION_STOP = re.compile(_Q_QUOTE + r"|['\"(),]|=>")
+_Q_CLOSERS = {"[": "]", "(": ")", "{": "}", "<": ">"}
+
+
+def iter_line_spans(text: str) -> Iterator[Tuple[int, int]]:
+    """Yield (start, end) offsets of the lines of `text`, exactly as str.splitlines() splits it."""
+    position = 0
+    for match in LINE_BREAK.finditer(text):
+        yield position, match.start()
+        position = match.end()
+    if position < len(text):
+        yield position, len(text)
+
+
+def _literal_end(text: str, start: int, token: str) -> int:
+    """
+    Return the offset just past the literal opened by `token` at `start`.
+
+    Unterminated literals run to the end of the text.
+    """
+    if token == '"':
+        end = text.find('"', start + 1)
+        return len(text) if end == -1 else end + 1
+    if token != "'":
+        # q'<delimiter> ... <closing delimiter>'
+        delimiter_pos = start + len(token)
+        if delimiter_pos >= len(text):
+            return len(text)
+        delimiter = text[delimiter_pos]
+        end = text.find(_Q_CLOSERS.get(delimiter, delimiter) + "'", delimiter_pos + 1)
+        return len(text) if end == -1 else end + 2
+    # '...' where '' is an escaped quote
+    end = start
+    while True:
+        end = text.find("'", end + 1)
+        if end == -1:
+            return len(text)
+        if text.startswith("'", end + 1):
+            end += 1
+            continue
+        return end + 1
+
+
+class SqlScan:
+    """Comment spans, literal spans and parenthesis positions of one source text."""
+
+    __slots__ = ("text", "block_comments", "inline_comments", "literals", "open_parens", "close_parens", "line_starts")
+
+    def __init__(self, text: str):
+        self.text = text
+        # (start, end) offsets, in source order
+        self.block_comments: List[Tuple[int, int]] = []
+        self.inline_comments: List[Tuple[int, int]] = []
+        self.literals: List[Tuple[int, int]] = []
+        # Offsets of "(" and ")" outside comments and literals
+        self.open_parens = array("q")
+        self.close_parens = array("q")
+        # Start offset of every line (index = line number - 1)
+        self.line_starts = array("q", (start for start, _ in iter_line_spans(text)))
+
+    def comment_spans(self) -> List[Tuple[int, int, bool]]:
+        """Return all comments as (start, end, is_inline) in source order."""
+        spans = [(start, end, False) for start, end in self.block_comments]
+        spans.extend((start, end, True) for start, end in self.inline_comments)
+        spans.sort()
+        return spans
+
+    def paren_delta(self, start: int, end: int) -> int:
+        """Return the number of "(" minus ")" in text[start:end], outside comments and literals."""
+        opens = bisect_left(self.open_parens, end) - bisect_left(self.open_parens, start)
+        closes = bisect_left(self.close_parens, end) - bisect_left(self.close_parens, start)
+        return opens - closes
+
+    def line_paren_delta(self, line_no: int) -> int:
+        """Return the parenthesis nesting change of one source line (1-based)."""
+        if not 1 <= line_no <= len(self.line_starts):
+            return 0
+        end = self.line_starts[line_no] if line_no < len(self.line_starts) else len(self.text)
+        return self.paren_delta(self.line_starts[line_no - 1], end)
+
+
+def scan_sql(text: str) -> SqlScan:
+    """
+    Scan a trigger once for comments, literals and parentheses.
+
+    Args:
+        text (str): Source text
+
+    Returns:
+        SqlScan: The spans and positions found
+    """
+    scan = SqlScan(text)
+    length = len(text)
+    search = _SQL_STOP.search
+    position = 0
+    while True:
+        match = search(text, position)
+        if match is None:
+            break
+        start = match.start()
+        token = match.group()
+        if token == "(":
+            scan.open_parens.append(start)
+            position = start + 1
+        elif token == ")":
+            scan.close_parens.append(start)
+            position = start + 1
+        elif token == "--":
+            line_break = LINE_BREAK.search(text, start)
+            position = line_break.start() if line_break else length
+            scan.inline_comments.append((start, position))
+        elif token == "/*":
+            close = text.find("*/", start + 2)
+            position = length if close == -1 else close + 2
+            scan.block_comments.append((start, position))
+        else:
+            position = _literal_end(text, start, token)
+            scan.literals.append((start, position))
+    return scan
+
+
+def _expression_tokens(text: str, start: int = 0) -> Iterator[Tuple[int, str]]:
+    """Yield (offset, token) for "(", ")", "," and "=>" outside literals, from `start` on."""
+    search = _EXPRESSION_STOP.search
+    position = start
+    while True:
+        match = search(text, position)
+        if match is None:
+            return
+        token = match.group()
+        if token in ("(", ")", ",", "=>"):
+            yield match.start(), token
+            position = match.end()
+        else:
+            position = _literal_end(text, match.start(), token)
+
+
+def find_matching_paren(text: str, open_pos: int) -> int:
+    """
+    Return the offset of the ")" closing the "(" at `open_pos`, or -1.
+
+    Parentheses inside literals are ignored.
+    """
+    if open_pos < 0:
+        return -1
+    depth = 0
+    for offset, token in _expression_tokens(text, open_pos):
+        if token == "(":
+            depth += 1
+        elif token == ")":
+            depth -= 1
+            if depth == 0:
+                return offset
+    return -1
+
+
+def split_top_level(text: str, separator: str = ",") -> List[str]:
+    """
+    Split `text` at the separators ("," or "=>") that are not nested in parentheses or literals.
+
+    Parts are stripped. Empty parts are kept, except a trailing one.
+    """
+    parts = []
+    depth = 0
+    part_start = 0
+    for offset, token in _expression_tokens(text):
+        if token == "(":
+            depth += 1
+        elif token == ")":
+            depth -= 1
+        elif token == separator and depth == 0:
+            parts.append(text[part_start:offset].strip())
+            part_start = offset + len(token)
+    last_part = text[part_start:].strip()
+    if last_part:
+        parts.append(last_part)
+    return parts
+
+
+def find_top_level(text: str, token: str) -> int:
+    """Return the offset of the first "," or "=>" not nested in parentheses or literals, or -1."""
+    depth = 0
+    for offset, found in _expression_tokens(text):
+        if found == "(":
+            depth += 1
+        elif found == ")":
+            depth -= 1
+        elif found == token and depth == 0:
+            return offset
+    return -1
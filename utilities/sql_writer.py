@@ -0,0 +1,112 @@
+"""
+Line writer the FormatSQL renderers write through.
+
+Every `_render_*` method of FormatSQL used to return a `List[str]` that its
+caller extended into its own list, so a line nested N blocks deep was copied
+N times on its way to `to_sql`, which then joined (and for PostgreSQL also
+stripped and re-joined) the whole output. The renderers now emit each line
+once into a `SqlWriter`, which applies the indentation and the line layout
+and writes straight to a sink: anything with a `write(str)` method, such as
+`io.StringIO`, an open text file or `socket.makefile("w")`. Apart from the
+sink's own buffer, memory is bounded by the depth of the statement tree.
+
+Layouts:
+- default: indented lines separated by "\\n", no trailing newline (Oracle)
+- `single_line=True`: each line stripped and separated by one space, as the
+  PostgreSQL `DO $$ ... $$` block is written
+
+Between `start_recording()` and `stop_recording()` the writer also keeps
+the lines it writes (indented or stripped, without separators), so the
+render cache (utilities/render_cache.py) can `replay()` them later.
+Recordings nest and share one log.
+
+Usage:
+    buffer = io.StringIO()
+    out = SqlWriter(buffer)
+    out.line("BEGIN", 0)
+    out.line("NULL;", 1)
+    out.line("END;", 0)
+    sql = buffer.getvalue()  # "BEGIN\\n  NULL;\\nEND;"
+"""
+
+from typing import Any, Iterable, List, Tuple
+
+
+class SqlWriter:
+    """Writes rendered SQL lines to a sink, indented by nesting level."""
+
+    __slots__ = ("_write", "indent_unit", "single_line", "line_count", "char_count", "_indents", "_recording", "_log")
+
+    def __init__(self, sink: Any, indent_unit: str = "  ", single_line: bool = False):
+        """
+        Args:
+            sink (Any): Object with a `write(str)` method
+            indent_unit (str): Indentation of one nesting level
+            single_line (bool): Strip each line and separate lines with a space instead of "\\n"
+        """
+        self._write = sink.write
+        self.indent_unit = indent_unit
+        self.single_line = single_line
+        self.line_count = 0
+        self.char_count = 0
+        # Indentation strings by level, grown on demand
+        self._indents: List[str] = [""]
+        # Open recordings, and the lines written since the outermost one started
+        self._recording = 0
+        self._log: List[str] = []
+
+    def line(self, text: str, level: int = 0) -> None:
+        """
+        Write one line at the given nesting level.
+
+        Args:
+            text (str): Line content without indentation
+            level (int): Indentation level (number of indent units; negative counts as 0)
+        """
+        if self.single_line:
+            piece = text.strip()
+            separator = " "
+        else:
+            level = max(level, 0)
+            indents = self._indents
+            while len(indents) <= level:
+                indents.append(indents[-1] + self.indent_unit)
+            piece = indents[level] + text
+            separator = "\n"
+        if self._recording:
+            self._log.append(piece)
+        if self.line_count:
+            piece = separator + piece
+        self._write(piece)
+        self.line_count += 1
+        self.char_count += len(piece)
+
+    def replay(self, pieces: Iterable[str]) -> None:
+        """Write lines kept by `stop_recording()`, already indented or stripped."""
+        separator = " " if self.single_line else "\n"
+        for piece in pieces:
+            if self._recording:
+                self._log.append(piece)
+            if self.line_count:
+                piece = separator + piece
+            self._write(piece)
+            self.line_count += 1
+            self.char_count += len(piece)
+
+    def start_recording(self) -> int:
+        """Start keeping the lines written; pass the returned mark to `stop_recording()`."""
+        self._recording += 1
+        return len(self._log)
+
+    def stop_recording(self, mark: int) -> Tuple[str, ...]:
+        """Return the lines written since `start_recording()` returned mark, and end that recording."""
+        pieces = tuple(self._log[mark:])
+        self._recording -= 1
+        if not self._recording:
+            self._log.clear()
+        return pieces
+
+    def raw(self, text: str) -> None:
+        """Write text as-is, outside the line layout (a header or footer)."""
+        self._write(text)
+        self.char_count += len(text)
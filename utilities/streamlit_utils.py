@@ -15,11 +15,20 @@ from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
 import streamlit as st
 
-from utilities.common import debug, info, warning, error
+from utilities.artifact_json import ArtifactJSON
+from utilities.artifact_store import ArtifactStore
+from utilities.common import debug, info, error
+from utilities.mapping_store import MappingStore
+from utilities.rest_string_sink import RestStringSink
 
 
 class FileManager:
-    """Utility class for managing files in the conversion workflow."""
+    """
+    Utility class for managing files in the conversion workflow.
+
+    Stage artifacts are listed, read and written through ArtifactStore, so the pages
+    work the same whether they are files or entries of the SQLite archive.
+    """
     
     DIRECTORIES = {
         "oracle": "files/oracle",
@@ -46,33 +55,47 @@ class FileManager:
             if name == "utilities" or name == "output":
                 continue  # Skip utility directories for stats
                 
-            if os.path.exists(path):
-                files = [f for f in os.listdir(path) 
-                        if os.path.isfile(os.path.join(path, f))]
-                stats[name] = len(files)
-            else:
-                stats[name] = 0
+            stats[name] = len(cls.get_files_in_directory(path))
         
         return stats
     
     @classmethod
     def get_files_in_directory(cls, directory: str) -> List[str]:
-        """Get list of files in a directory."""
-        if os.path.exists(directory):
-            return [f for f in os.listdir(directory) 
-                   if os.path.isfile(os.path.join(directory, f))]
-        return []
+        """Get list of files (or archived artifacts) in a directory."""
+        try:
+            return ArtifactStore.list_names(directory)
+        except FileNotFoundError:
+            return []
+    
+    @classmethod
+    def file_exists(cls, file_path: str) -> bool:
+        """Check whether a file (or archived artifact) exists."""
+        return ArtifactStore.exists(file_path)
     
     @classmethod
     def read_file_content(cls, file_path: str) -> Optional[str]:
-        """Read and return file content."""
+        """Read and return file content (`.json.gz` artifacts are decompressed)."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return f.read()
+            return ArtifactJSON.read_text(file_path)
         except Exception as e:
             error(f"Error reading file {file_path}: {str(e)}")
             return None
     
+    @classmethod
+    def write_file_content(cls, file_path: str, content: str) -> None:
+        """Replace the content of a file (or archived artifact); `.json.gz` artifacts are compressed again."""
+        ArtifactJSON.write_text(file_path, content)
+    
+    @classmethod
+    def delete_file(cls, file_path: str) -> None:
+        """Delete a file (or archived artifact)."""
+        ArtifactStore.delete(file_path)
+    
+    @classmethod
+    def rename_file(cls, file_path: str, new_path: str) -> None:
+        """Rename a file (or archived artifact)."""
+        ArtifactStore.rename(file_path, new_path)
+    
     @classmethod
     def save_uploaded_file(cls, uploaded_file, target_directory: str) -> bool:
         """Save an uploaded file to the target directory."""
@@ -103,7 +126,12 @@ class FileManager:
                 for dir_name in include_directories:
                     directory = cls.DIRECTORIES.get(dir_name)
                     
-                    if directory and os.path.exists(directory):
+                    if directory and ArtifactStore.is_archive(directory):
+                        # One archive query per stage instead of a directory walk
+                        for file, content in ArtifactStore.iter_contents(directory):
+                            arcname = os.path.relpath(os.path.join(directory, file), "files")
+                            zip_file.writestr(arcname, content)
+                    elif directory and os.path.exists(directory):
                         for root, dirs, files in os.walk(directory):
                             for file in files:
                                 file_path = os.path.join(root, file)
@@ -200,30 +228,16 @@ class ConfigManager:
     """Utility class for managing configuration files."""
     
     EXCEL_MAPPING_PATH = "utilities/oracle_postgresql_mappings.xlsx"
-    REST_LIST_PATH = "utilities/rest_list.csv"
+    REST_LIST_PATH = RestStringSink.PATH
     
     @classmethod
     def load_excel_mappings(cls) -> Dict[str, pd.DataFrame]:
         """Load Oracle-PostgreSQL mappings from Excel file."""
-        mappings = {}
-        
         if not os.path.exists(cls.EXCEL_MAPPING_PATH):
-            return mappings
-        
-        try:
-            sheets = ['data_type_mappings', 'function_mappings', 'function_list', 'exception_mappings', 'schema_mappings', 'statement_mappings']
-            
-            for sheet_name in sheets:
-                try:
-                    df = pd.read_excel(cls.EXCEL_MAPPING_PATH, sheet_name=sheet_name)
-                    mappings[sheet_name] = df
-                except Exception as e:
-                    warning(f"Could not load sheet {sheet_name}: {str(e)}")
-            
-        except Exception as e:
-            error(f"Error loading Excel mappings: {str(e)}")
+            return {}
         
-        return mappings
+        # Sheets are parsed once per workbook version by the MappingStore; the frames returned are copies
+        return MappingStore.sheets()
     
     @classmethod
     def save_excel_sheet(cls, sheet_name: str, dataframe: pd.DataFrame) -> bool:
@@ -241,11 +255,19 @@ class ConfigManager:
             # Add the updated sheet
             sheet_dict[sheet_name] = dataframe
             
-            # Write back to Excel
-            with pd.ExcelWriter(cls.EXCEL_MAPPING_PATH, engine='openpyxl') as writer:
-                for name, df in sheet_dict.items():
-                    df.to_excel(writer, sheet_name=name, index=False)
-            
+            # Write back to Excel: write a temporary workbook next to the original and swap it in,
+            # so readers never see a half-written file
+            temp_path = f"{os.path.splitext(cls.EXCEL_MAPPING_PATH)[0]}.tmp.xlsx"
+            try:
+                with pd.ExcelWriter(temp_path, engine='openpyxl') as writer:
+                    for name, df in sheet_dict.items():
+                        df.to_excel(writer, sheet_name=name, index=False)
+                os.replace(temp_path, cls.EXCEL_MAPPING_PATH)
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+            
+            MappingStore.invalidate()
             debug(f"Saved Excel sheet: {sheet_name}")
             return True
             
@@ -430,13 +452,9 @@ class ConfigManager:
     
     @classmethod
     def load_rest_list(cls) -> Optional[pd.DataFrame]:
-        """Load the rest list CSV file."""
-        if not os.path.exists(cls.REST_LIST_PATH):
-            return None
-        
+        """Load the rest list CSV file (including rows still buffered in the RestStringSink)."""
         try:
-            df = pd.read_csv(cls.REST_LIST_PATH)
-            return df
+            return RestStringSink.load()
         except Exception as e:
             error(f"Error loading rest list: {str(e)}")
             return None
@@ -445,7 +463,7 @@ class ConfigManager:
     def save_rest_list(cls, dataframe: pd.DataFrame) -> bool:
         """Save the rest list CSV file."""
         try:
-            dataframe.to_csv(cls.REST_LIST_PATH, index=False)
+            RestStringSink.save(dataframe)
             debug("Saved rest list CSV")
             return True
         except Exception as e:
@@ -455,7 +473,7 @@ class ConfigManager:
     @classmethod
     def clear_rest_list(cls) -> bool:
         """Clear the rest list by creating an empty CSV."""
-        empty_df = pd.DataFrame(columns=["filename", "line", "line_no", "indent"])
+        empty_df = pd.DataFrame(columns=RestStringSink.COLUMNS)
         return cls.save_rest_list(empty_df)
 
 
@@ -472,7 +490,7 @@ class UIHelpers:
             return
         
         # Display based on file type
-        if file_name.endswith('.json'):
+        if file_name.endswith(('.json', '.json.gz')):
             try:
                 json_data = json.loads(content)
                 st.json(json_data)
@@ -488,13 +506,12 @@ class UIHelpers:
                              mime_type: str = "text/plain") -> None:
         """Create a download button for a file."""
         try:
-            with open(file_path, "rb") as f:
-                st.download_button(
-                    label=label,
-                    data=f.read(),
-                    file_name=os.path.basename(file_path),
-                    mime=mime_type
-                )
+            st.download_button(
+                label=label,
+                data=ArtifactStore.read_bytes(file_path),
+                file_name=os.path.basename(file_path),
+                mime=mime_type
+            )
         except Exception as e:
             st.error(f"Error creating download button: {str(e)}")
     
@@ -550,7 +567,7 @@ class UIHelpers:
                 if st.session_state.get('confirm_delete', False):
                     # Delete the file
                     try:
-                        os.remove(file_path)
+                        FileManager.delete_file(file_path)
                         st.success(f"Deleted: {os.path.basename(file_path)}")
                         SessionManager.add_to_history("File Delete", "Success", f"Deleted {os.path.basename(file_path)}")
                         st.session_state['confirm_delete'] = False
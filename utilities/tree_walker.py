@@ -0,0 +1,213 @@
+"""
+Iterative walker for the statement tree of an analysis (`main`).
+
+The legacy parse passes of OracleTriggerAnalyzer, `rest_strings`, and
+JSONTOPLJSON's operation filter each had their own recursive descent into
+`begin_end_statements`, `exception_handlers`, `when_clauses`,
+`then_statements`, `if_elses`, `else_statements` and `for_statements`. They
+repeated the same branch per node type, and every nesting level of the
+trigger took Python stack frames. Deeply nested triggers could therefore
+hit `RecursionError`. This module keeps that descent in one place:
+
+- `CHILD_KEYS` maps each node type to the keys of its child lists, in
+  document order. `CLAUSE_KEYS` marks the lists that hold clauses
+  (exception handlers, ELSIF and WHEN clauses) rather than statements.
+- `walk()` visits every item of a tree in document order (pre-order).
+- `rewrite_statement_lists()` rebuilds statement lists in place, the way a
+  parse pass does. Line dicts go to a grouper that may fold them into a new
+  node. Existing nodes are descended into before the scan of their list
+  goes on, so side effects (found exception names, for example) happen in
+  the same order as in the recursive passes. `enter` / `leave` hooks let a
+  pass choose which child lists to rewrite and drop nodes afterwards.
+
+Both use an explicit stack, so nesting depth is not limited by the
+interpreter's recursion limit. Nodes may be `utilities.ast_nodes` nodes or
+their dict form.
+
+Usage:
+    walk(analysis["main"], lambda item: print(item.get("type")))
+    rewrite_statement_lists(statement_lists(main), group=for_loop_grouper)
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from utilities.ast_nodes import Node
+
+# Node type -> keys of its child lists, in document order
+CHILD_KEYS: Dict[str, Tuple[str, ...]] = {
+    "begin_end": ("begin_end_statements", "exception_handlers"),
+    "exception_handler": ("exception_statements",),
+    "if_else": ("then_statements", "if_elses", "else_statements"),
+    "elif_statement": ("then_statements",),
+    "case_when": ("when_clauses", "else_statements"),
+    "when_statement": ("then_statements",),
+    "for_loop": ("for_statements",),
+}
+# Child lists holding clause nodes; their statements are in the clauses' own lists
+CLAUSE_KEYS = frozenset(("exception_handlers", "if_elses", "when_clauses"))
+# Returned by an `enter` hook: stop rebuilding the current list and replace it with None
+ABORT_LIST = object()
+
+# A statement list, as the container (node or clause) and the key that holds it
+StatementList = Tuple[Any, str]
+# Called with the index of a line dict: None keeps the line, otherwise
+# (replacement items, index to continue from, statement lists to rewrite next)
+LineGrouper = Callable[[int], Optional[Tuple[List[Any], int, Sequence[StatementList]]]]
+
+
+def is_node(item: Any) -> bool:
+    """Return True for statement tree nodes (typed dicts included), False for line dicts and other values."""
+    if isinstance(item, Node):
+        return True
+    return isinstance(item, dict) and "type" in item and "line" not in item
+
+
+def child_items(node: Any) -> List[Any]:
+    """Return the items of the child lists of a node (statements and clauses), in document order."""
+    children = []
+    for key in CHILD_KEYS.get(node["type"], ()):
+        if key in node and isinstance(node[key], list):
+            children.extend(node[key])
+    return children
+
+
+def statement_lists(node: Any, keys: Optional[Sequence[str]] = None) -> List[StatementList]:
+    """
+    Return the statement lists directly below a node, in document order.
+
+    Clause lists are expanded into the statement lists of their clauses.
+
+    Args:
+        node (Any): A node (or its dict form)
+        keys (Optional[Sequence[str]]): Only these child keys of the node (default: all)
+
+    Returns:
+        List[StatementList]: (container, key) pairs
+    """
+    lists = []
+    for key in CHILD_KEYS.get(node["type"], ()):
+        if key not in node or (keys is not None and key not in keys):
+            continue
+        if key in CLAUSE_KEYS:
+            for clause in node[key]:
+                lists.extend(statement_lists(clause))
+        else:
+            lists.append((node, key))
+    return lists
+
+
+def walk(root: Any, visit: Callable[[Any], Any]) -> None:
+    """
+    Call `visit` on every item of a tree in document order, parents before children.
+
+    Args:
+        root (Any): A node, a line dict or a list of items
+        visit (Callable[[Any], Any]): Called with each item; returning False skips the
+            children of that item
+    """
+    stack = [root]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, list):
+            stack.extend(reversed(item))
+            continue
+        if visit(item) is False or not is_node(item):
+            continue
+        stack.extend(reversed(child_items(item)))
+
+
+class _ListFrame:
+    """A statement list being rebuilt."""
+
+    __slots__ = ("container", "key", "items", "i", "out", "group")
+
+    def __init__(self, container: Any, key: str, group: Optional[Callable[[List[Any]], LineGrouper]]):
+        self.container = container
+        self.key = key
+        self.items = container[key]
+        self.i = 0
+        self.out: List[Any] = []
+        self.group = group(self.items) if group is not None else None
+
+
+class _Leave:
+    """Pending `leave` call for a node whose child lists are being rebuilt."""
+
+    __slots__ = ("node", "frame")
+
+    def __init__(self, node: Any, frame: _ListFrame):
+        self.node = node
+        self.frame = frame
+
+
+def rewrite_statement_lists(
+    lists: Iterable[StatementList],
+    group: Optional[Callable[[List[Any]], LineGrouper]] = None,
+    enter: Optional[Callable[[Any], Any]] = None,
+    leave: Optional[Callable[[Any], bool]] = None,
+) -> None:
+    """
+    Rebuild statement lists in place, descending into the nodes found in them.
+
+    Each list is scanned in order and replaced by a new list:
+
+    - A line dict is passed to the list's grouper (`group(items)` is called once per
+      list and returns it). The grouper keeps the line (None) or replaces
+      items[i:next_i] with its replacement and names the new nodes' statement lists
+      to rewrite before the scan goes on.
+    - A node is kept, and the lists returned by `enter(node)` (default: all of its
+      statement lists) are rewritten before the scan goes on. `enter` may return
+      ABORT_LIST instead. After the lists are rewritten, `leave(node)` decides whether
+      the node stays (True) or is dropped (False).
+
+    Other items are kept as they are.
+
+    Args:
+        lists (Iterable[StatementList]): The lists to rewrite, in document order
+        group (Optional[Callable[[List[Any]], LineGrouper]]): Grouper factory (default:
+            keep every line)
+        enter (Optional[Callable[[Any], Any]]): Statement lists to rewrite below a node,
+            or ABORT_LIST
+        leave (Optional[Callable[[Any], bool]]): Keep (True) or drop (False) a node
+    """
+    stack: List[Any] = [_ListFrame(container, key, group) for container, key in reversed(list(lists))]
+    while stack:
+        top = stack[-1]
+        if isinstance(top, _Leave):
+            stack.pop()
+            if leave(top.node):
+                top.frame.out.append(top.node)
+            continue
+        frame = top
+        items, out, grouper = frame.items, frame.out, frame.group
+        # Scan the list up to the next item that has lists to rewrite below it
+        children = None
+        while frame.i < len(items):
+            item = items[frame.i]
+            if isinstance(item, dict) and "line" in item:
+                result = grouper(frame.i) if grouper is not None else None
+                if result is None:
+                    out.append(item)
+                    frame.i += 1
+                    continue
+                replacement, frame.i, children = result
+                out.extend(replacement)
+                break
+            frame.i += 1
+            if not is_node(item):
+                out.append(item)
+                continue
+            children = statement_lists(item) if enter is None else enter(item)
+            if leave is None:
+                out.append(item)
+            elif children is not ABORT_LIST:
+                stack.append(_Leave(item, frame))
+            break
+        if children is None:
+            stack.pop()
+            frame.container[frame.key] = out
+        elif children is ABORT_LIST:
+            stack.pop()
+            frame.container[frame.key] = None
+        else:
+            stack.extend(_ListFrame(container, key, group) for container, key in reversed(list(children)))
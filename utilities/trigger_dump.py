@@ -0,0 +1,162 @@
+"""
+Memory-mapped splitter for multi-trigger schema dumps.
+
+DBMS_METADATA exports arrive as one `.sql` file holding thousands of
+`CREATE OR REPLACE TRIGGER` units. They used to be split into one file per
+trigger with an external script before `files/oracle` could be processed,
+which wrote the whole dump to disk a second time. `TriggerDump` maps the
+dump with `mmap` and finds the units with a regex over the mapped bytes.
+Only the unit being analyzed is ever decoded, so memory stays bounded by
+the largest trigger and not by the dump size.
+
+Each `TriggerUnit` holds byte offsets into the dump:
+
+- `start` / `end`: the `CREATE ... TRIGGER` statement, up to its `/`
+  terminator line (or the next unit) with trailing whitespace removed.
+  Statements after the terminator, such as `ALTER TRIGGER ... ENABLE;`,
+  are not part of the unit.
+- `body_start`: the first line of the PL/SQL block (`DECLARE` or `BEGIN`).
+  `body()` returns the block, which is the form the per-trigger files in
+  `files/oracle` have and what OracleTriggerAnalyzer parses.
+
+Units are found lazily. A `TriggerUnit` is a small tuple, so worker
+processes get the unit and re-map the dump themselves instead of receiving
+the trigger text.
+
+Usage:
+    with TriggerDump("exports/hr_triggers.sql") as dump:
+        for unit in dump.units():
+            analyzer = OracleTriggerAnalyzer(unit.file_name, sql_content=dump.body(unit), file_details=dump.file_details(unit))
+"""
+
+import mmap
+import os
+import re
+from typing import Any, Dict, Iterator, NamedTuple, Optional
+
+# Quoted or plain Oracle identifier
+_IDENTIFIER = rb'(?:"[^"\r\n]+"|[A-Za-z][\w$#]*)'
+_TRIGGER_START = re.compile(
+    rb"^[ \t]*CREATE[ \t]+(?:OR[ \t]+REPLACE[ \t]+)?(?:(?:NON)?EDITIONABLE[ \t]+)?TRIGGER[ \t]+"
+    rb"(?:(?P<schema>" + _IDENTIFIER + rb")[ \t]*\.[ \t]*)?(?P<name>" + _IDENTIFIER + rb")",
+    re.IGNORECASE | re.MULTILINE,
+)
+# SQL*Plus statement terminator: a line holding only "/"
+_TERMINATOR = re.compile(rb"^[ \t]*/[ \t]*\r?$", re.MULTILINE)
+# First line of the PL/SQL block of a trigger
+_BODY_START = re.compile(rb"^[ \t]*(?:DECLARE|BEGIN)\b", re.IGNORECASE | re.MULTILINE)
+_TRAILING_WHITESPACE = b" \t\r\n\x0b\x0c"
+
+
+def _identifier(raw: Optional[bytes], encoding: str) -> Optional[str]:
+    """Decode an identifier; quoted names keep their case, plain names are upper-cased like Oracle does."""
+    if raw is None:
+        return None
+    text = raw.decode(encoding)
+    if text.startswith('"'):
+        return text[1:-1]
+    return text.upper()
+
+
+class TriggerUnit(NamedTuple):
+    """One trigger of a dump, as byte offsets into the mapped file."""
+
+    name: str
+    schema: Optional[str]
+    start: int
+    body_start: int
+    end: int
+
+    @property
+    def file_name(self) -> str:
+        """File name the trigger would have in files/oracle."""
+        return f"{self.name}.sql"
+
+
+class TriggerDump:
+    """Read-only memory map of a multi-trigger dump; use as a context manager."""
+
+    def __init__(self, path: str, encoding: str = "utf-8"):
+        self.path = path
+        self.encoding = encoding
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        # mmap cannot map an empty file
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+    def __enter__(self) -> "TriggerDump":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unmap and close the dump."""
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._data = b""
+        self._file.close()
+
+    def units(self) -> Iterator[TriggerUnit]:
+        """
+        Yield the trigger units of the dump in file order.
+
+        The dump is scanned lazily; each unit is yielded once the start of the next one
+        (or the end of the file) has been found.
+        """
+        data = self._data
+        pending = None
+        for match in _TRIGGER_START.finditer(data):
+            if pending is not None:
+                yield self._unit(pending, match.start())
+            pending = match
+        if pending is not None:
+            yield self._unit(pending, len(data))
+
+    def _unit(self, match: "re.Match[bytes]", limit: int) -> TriggerUnit:
+        """Build the unit of one CREATE TRIGGER match; `limit` is where the next unit starts."""
+        data = self._data
+        start = match.start() + len(match.group()) - len(match.group().lstrip())
+        terminator = _TERMINATOR.search(data, match.end(), limit)
+        end = terminator.start() if terminator else limit
+        while end > start and data[end - 1] in _TRAILING_WHITESPACE:
+            end -= 1
+        body = _BODY_START.search(data, match.end(), end)
+        body_start = start if body is None else body.start()
+        return TriggerUnit(
+            name=_identifier(match.group("name"), self.encoding),
+            schema=_identifier(match.group("schema"), self.encoding),
+            start=start,
+            body_start=body_start,
+            end=end,
+        )
+
+    def text(self, unit: TriggerUnit) -> str:
+        """Return the whole CREATE TRIGGER statement of a unit."""
+        return self._data[unit.start:unit.end].decode(self.encoding)
+
+    def body(self, unit: TriggerUnit) -> str:
+        """Return the PL/SQL block of a unit (from DECLARE or BEGIN)."""
+        return self._data[unit.body_start:unit.end].decode(self.encoding)
+
+    def file_details(self, unit: TriggerUnit) -> Dict[str, Any]:
+        """
+        Return OracleTriggerAnalyzer file details for a unit.
+
+        The keys match `OracleTriggerAnalyzer.extract_file_details`, plus the dump offsets.
+        """
+        stat = os.stat(self.path)
+        return {
+            "filename": unit.file_name,
+            "filepath": os.path.abspath(self.path),
+            "filesize": unit.end - unit.body_start,
+            "file_extension": ".sql",
+            "last_modified": stat.st_mtime,
+            "created_time": stat.st_ctime,
+            "is_file": False,
+            "is_readable": True,
+            "dump_schema": unit.schema,
+            "dump_offset": unit.start,
+            "dump_end": unit.end,
+        }
+